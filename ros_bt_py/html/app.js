@@ -115,6 +115,8 @@ class App extends Component
     });
 
     this.get_nodes_service = null;
+    // Version of the node catalogue in available_nodes
+    this.available_nodes_version = '';
 
     this.state.ros.getServices(function(result) {
       if (result.includes(this.state.bt_namespace + 'get_available_nodes'))
@@ -140,6 +142,26 @@ class App extends Component
       serviceType: 'ros_bt_py_msgs/RemoveNode'
     });
 
+    this.undo_service = new ROSLIB.Service({
+      ros: this.state.ros,
+      name: this.state.bt_namespace + 'undo',
+      serviceType: 'ros_bt_py_msgs/UndoEdit'
+    });
+
+    this.redo_service = new ROSLIB.Service({
+      ros: this.state.ros,
+      name: this.state.bt_namespace + 'redo',
+      serviceType: 'ros_bt_py_msgs/RedoEdit'
+    });
+
+    this.get_debug_info_service = new ROSLIB.Service({
+      ros: this.state.ros,
+      name: this.state.bt_namespace + 'debug/get_debug_info',
+      serviceType: 'ros_bt_py_msgs/GetDebugInfo'
+    });
+    // Set while the complete debug info is requested
+    this.debug_info_requested = false;
+
     this.set_execution_mode_service = new ROSLIB.Service({
       ros: this.state.ros,
       name: this.state.bt_namespace + 'debug/set_execution_mode',
@@ -275,8 +297,66 @@ class App extends Component
     }
   }
 
+  requestDebugInfo()
+  {
+    if (this.debug_info_requested)
+    {
+      return;
+    }
+    this.debug_info_requested = true;
+    var service = this.get_debug_info_service;
+    service.callService(
+      new ROSLIB.ServiceRequest({}),
+      function(response) {
+        if (service !== this.get_debug_info_service)
+        {
+          // The namespace changed in the meantime
+          return;
+        }
+        this.debug_info_requested = false;
+        if (!this.last_received_debug_msg
+            || this.last_received_debug_msg.version < response.debug_info.version)
+        {
+          this.onDebugUpdate(response.debug_info);
+        }
+      }.bind(this),
+      function(failed) {
+        if (service === this.get_debug_info_service)
+        {
+          this.debug_info_requested = false;
+        }
+        console.log('Failed to get the debug info: ' + failed);
+      }.bind(this));
+  }
+
   onDebugUpdate(msg)
   {
+    if (msg.is_delta)
+    {
+      if (this.last_received_debug_msg
+          && msg.version <= this.last_received_debug_msg.version)
+      {
+        // Already included in the debug info we have
+        return;
+      }
+      // A delta contains all subtrees that changed since base_version, so it
+      // applies to any version from base_version on. Without one, e.g. when
+      // another subscriber of the same connection got the complete message,
+      // ask for the complete debug info.
+      if (!this.last_received_debug_msg
+          || this.last_received_debug_msg.version < msg.base_version)
+      {
+        this.requestDebugInfo();
+        return;
+      }
+      var changed_names = msg.subtree_states.map(x => x.name);
+      var subtree_states = this.last_received_debug_msg.subtree_states
+          .filter(x => !changed_names.includes(x.name)
+                  && !msg.removed_subtrees.includes(x.name));
+      msg = Object.assign({}, msg, {
+        subtree_states: subtree_states.concat(msg.subtree_states)
+      });
+    }
     this.last_received_debug_msg = msg;
     this.setState({subtree_names: msg.subtree_states.map(x => x.name).sort()});
     if (this.state.selected_tree.is_subtree)
@@ -542,6 +622,7 @@ class App extends Component
 
       // Update GetAvailableNodes Service
       this.get_nodes_service = null;
+      this.available_nodes_version = '';
 
       this.state.ros.getServices(function(result) {
         if (result.includes(namespace + 'get_available_nodes'))
@@ -567,6 +648,27 @@ class App extends Component
         serviceType: 'ros_bt_py_msgs/RemoveNode'
       });
 
+      this.undo_service = new ROSLIB.Service({
+        ros: this.state.ros,
+        name: namespace + 'undo',
+        serviceType: 'ros_bt_py_msgs/UndoEdit'
+      });
+
+      this.redo_service = new ROSLIB.Service({
+        ros: this.state.ros,
+        name: namespace + 'redo',
+        serviceType: 'ros_bt_py_msgs/RedoEdit'
+      });
+
+      this.get_debug_info_service = new ROSLIB.Service({
+        ros: this.state.ros,
+        name: namespace + 'debug/get_debug_info',
+        serviceType: 'ros_bt_py_msgs/GetDebugInfo'
+      });
+      // The versions of the debug info of another tree are unrelated
+      this.last_received_debug_msg = null;
+      this.debug_info_requested = false;
+
       this.set_execution_mode_service = new ROSLIB.Service({
         ros: this.state.ros,
         name: namespace + 'debug/set_execution_mode',
@@ -635,11 +737,19 @@ class App extends Component
     {
       this.get_nodes_service.callService(
         new ROSLIB.ServiceRequest({
-          node_modules: [package_name]
+          node_modules: [package_name],
+          since_version: this.available_nodes_version
         }),
         function(response) {
           if (response.success) {
-            this.setState({available_nodes: response.available_nodes});
+            var available_nodes = response.available_nodes;
+            if (response.delta)
+            {
+              // Only the nodes added since our version were sent
+              available_nodes = this.state.available_nodes.concat(available_nodes);
+            }
+            this.available_nodes_version = response.version;
+            this.setState({available_nodes: available_nodes});
             var options = {
               shouldSort: true,
               threshold: 0.6,
@@ -653,7 +763,7 @@ class App extends Component
                 "module",
                 "tags"]
             };
-            var nodes = response.available_nodes.map( (node) => {
+            var nodes = available_nodes.map( (node) => {
               if (node.max_children < 0)
               {
                 node.node_type = "Flow control";
@@ -725,6 +835,24 @@ class App extends Component
             }
           }.bind(this));
       }
+      if ( this.state.copy_node && (e.ctrlKey || e.metaKey)
+           && (e.keyCode === 89 || (e.keyCode === 90 && e.shiftKey)) ) { // 89 = KeyY, 90 = KeyZ
+        this.redo_service.callService(
+          new ROSLIB.ServiceRequest({}),
+          function(response) {
+            if (!response.success) {
+              console.log('Failed to redo edit: ' + response.error_message);
+            }
+          }.bind(this));
+      } else if ( this.state.copy_node && e.keyCode === 90 && (e.ctrlKey || e.metaKey) ) { // 90 = KeyZ
+        this.undo_service.callService(
+          new ROSLIB.ServiceRequest({}),
+          function(response) {
+            if (!response.success) {
+              console.log('Failed to undo edit: ' + response.error_message);
+            }
+          }.bind(this));
+      }
       if (this.state.copy_node && this.state.selected_node && e.keyCode === 46) { // 46 = Delete
         if (this.state.selected_node_names.length > 1)
         {
@@ -3877,16 +3877,20 @@ class FileBrowser extends Component {
             highlighted_package: null,
         });
 
-        // get package structure
+        // get the top level of the package structure, subdirectories are
+        // loaded when they are opened
         this.get_package_structure_service.callService(
             new ROSLIB.ServiceRequest({
                 package: result,
                 show_hidden: this.state.show_hidden,
+                max_depth: 1,
             }),
             function (response) {
                 if (response.success) {
+                    var package_structure = JSON.parse(response.package_structure);
+                    this.max_item_id = this.maxItemId(package_structure);
                     this.setState({
-                        package_structure: JSON.parse(response.package_structure),
+                        package_structure: package_structure,
                         selected_directory: 0,
                     });
                     this.props.onSelectedPackageChange(result);
@@ -4050,6 +4054,50 @@ class FileBrowser extends Component {
             }.bind(this));
     }
 
+    maxItemId(item) {
+        var max_item_id = item.item_id;
+        if (item.type === "directory") {
+            item.children.forEach((child) => {
+                max_item_id = Math.max(max_item_id, this.maxItemId(child));
+            });
+        }
+        return max_item_id;
+    }
+
+    loadDirectory(directory, relative_path) {
+        this.get_package_structure_service.callService(
+            new ROSLIB.ServiceRequest({
+                package: this.state.selected_package,
+                show_hidden: this.state.show_hidden,
+                path: relative_path,
+                max_depth: 1,
+            }),
+            function (response) {
+                if (response.success) {
+                    var listing = JSON.parse(response.package_structure);
+                    // item ids are only unique within one response
+                    var id_offset = this.max_item_id;
+                    var renumber = (item) => {
+                        item.item_id += id_offset;
+                        item.parent += id_offset;
+                        if (item.type === "directory") {
+                            item.children.forEach(renumber);
+                        }
+                    };
+                    listing.children.forEach((child) => {
+                        renumber(child);
+                        child.parent = directory.item_id;
+                    });
+                    this.max_item_id = this.maxItemId(listing);
+                    directory.children = listing.children;
+                    directory.loaded = true;
+                    this.setState({package_structure: this.state.package_structure});
+                } else {
+                    console.log("error getting directory: ", response.error_message);
+                }
+            }.bind(this));
+    }
+
     search(item_id, parent) {
         const stack = [parent];
         while (stack.length) {
@@ -4355,6 +4403,10 @@ class FileBrowser extends Component {
                                        });
                                    } else {
                                        if (child.type === "directory") {
+                                           if (child.loaded === false) {
+                                               this.loadDirectory(
+                                                   child, path.concat(child.name).join("/"));
+                                           }
                                            this.setState({
                                                selected_directory: child.item_id,
                                                file_path: null,
@@ -0,0 +1,92 @@
+#!/usr/bin/env python
+# Copyright 2018-2023 FZI Forschungszentrum Informatik
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#    * Redistributions of source code must retain the above copyright
+#      notice, this list of conditions and the following disclaimer.
+#
+#    * Redistributions in binary form must reproduce the above copyright
+#      notice, this list of conditions and the following disclaimer in the
+#      documentation and/or other materials provided with the distribution.
+#
+#    * Neither the name of the FZI Forschungszentrum Informatik nor the names of its
+#      contributors may be used to endorse or promote products derived from
+#      this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+
+"""Benchmark how many nodes per second :meth:`ros_bt_py.node.Node.from_msg` creates.
+
+Converts a set of node messages with a mix of option, input and output types
+back into nodes and reports the throughput and the time per port.
+"""
+import argparse
+import timeit
+
+import rospy
+
+from ros_bt_py.node import Node
+from ros_bt_py.nodes.constant import Constant
+from ros_bt_py.nodes.passthrough_node import PassthroughNode
+
+
+def build_messages():
+    """Return node messages for a few common node and port types."""
+    nodes = [
+        PassthroughNode(name="passthrough_int", options={"passthrough_type": int}),
+        PassthroughNode(name="passthrough_str", options={"passthrough_type": str}),
+        PassthroughNode(name="passthrough_list", options={"passthrough_type": list}),
+        Constant(
+            name="constant_float",
+            options={"constant_type": float, "constant_value": 1.5},
+        ),
+        Constant(
+            name="constant_str",
+            options={"constant_type": str, "constant_value": "a"},
+        ),
+    ]
+    return [node.to_msg() for node in nodes]
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark instantiating nodes from their messages"
+    )
+    parser.add_argument("--nodes", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(rospy.myargv()[1:])
+
+    messages = build_messages()
+    ports = sum(
+        len(msg.options) + len(msg.inputs) + len(msg.outputs) for msg in messages
+    )
+    rounds = max(1, args.nodes // len(messages))
+
+    def instantiate():
+        for _ in range(rounds):
+            for msg in messages:
+                Node.from_msg(msg)
+
+    best = min(timeit.repeat(instantiate, number=1, repeat=args.repeat))
+    node_count = rounds * len(messages)
+    print(
+        f"{node_count} nodes in {best:.3f} s: {node_count / best:.0f} nodes/s, "
+        f"{best / (rounds * ports) * 1e6:.2f} us per port"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python
+# Copyright 2018-2023 FZI Forschungszentrum Informatik
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#    * Redistributions of source code must retain the above copyright
+#      notice, this list of conditions and the following disclaimer.
+#
+#    * Redistributions in binary form must reproduce the above copyright
+#      notice, this list of conditions and the following disclaimer in the
+#      documentation and/or other materials provided with the distribution.
+#
+#    * Neither the name of the FZI Forschungszentrum Informatik nor the names of its
+#      contributors may be used to endorse or promote products derived from
+#      this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+
+"""Benchmark how much memory the nodes of a large tree take.
+
+Builds a sequence with a chain of wired passthrough nodes and reports the memory
+allocated per node, as measured by :mod:`tracemalloc`.
+"""
+import argparse
+import gc
+import tracemalloc
+
+import rospy
+from ros_bt_py_msgs.msg import NodeDataLocation, NodeDataWiring
+
+from ros_bt_py.nodes.passthrough_node import PassthroughNode
+from ros_bt_py.nodes.sequence import Sequence
+
+
+def build_tree(node_count):
+    """Build a tree of `node_count` nodes and return its root."""
+    root = Sequence(name="root")
+    previous = None
+    for index in range(node_count - 1):
+        node = PassthroughNode(
+            name=f"passthrough_{index}", options={"passthrough_type": int}
+        )
+        root.add_child(node)
+        if previous is not None:
+            node.wire_data(
+                NodeDataWiring(
+                    source=NodeDataLocation(
+                        node_name=previous.name,
+                        data_key="out",
+                        data_kind=NodeDataLocation.OUTPUT_DATA,
+                    ),
+                    target=NodeDataLocation(
+                        node_name=node.name,
+                        data_key="in",
+                        data_kind=NodeDataLocation.INPUT_DATA,
+                    ),
+                )
+            )
+        previous = node
+    return root
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark the memory used by the nodes of a large tree"
+    )
+    parser.add_argument("--nodes", type=int, default=5000)
+    args = parser.parse_args(rospy.myargv()[1:])
+
+    # Build a small tree first, so imports and caches are not measured
+    build_tree(2)
+    gc.collect()
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    root = build_tree(args.nodes)
+    gc.collect()
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(
+        f"{len(list(root.get_children_recursive()))} nodes: "
+        f"{(after - before) / 1024.0 / 1024.0:.1f} MiB, "
+        f"{(after - before) / args.nodes:.0f} bytes per node"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+#!/usr/bin/env python
+# Copyright 2018-2023 FZI Forschungszentrum Informatik
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#    * Redistributions of source code must retain the above copyright
+#      notice, this list of conditions and the following disclaimer.
+#
+#    * Redistributions in binary form must reproduce the above copyright
+#      notice, this list of conditions and the following disclaimer in the
+#      documentation and/or other materials provided with the distribution.
+#
+#    * Neither the name of the FZI Forschungszentrum Informatik nor the names of its
+#      contributors may be used to endorse or promote products derived from
+#      this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+
+"""Benchmark how long the tree node takes to load its node modules at startup.
+
+Every measurement runs in a fresh interpreter, since Python caches imported modules.
+"""
+import argparse
+import os
+import pkgutil
+import statistics
+import subprocess
+import sys
+import tempfile
+
+import rospy
+
+EAGER = """
+import time
+start = time.perf_counter()
+from ros_bt_py.node import load_node_module
+for module_name in {modules!r}:
+    load_node_module(module_name)
+print(time.perf_counter() - start)
+"""
+
+LAZY = """
+import time
+start = time.perf_counter()
+from ros_bt_py.node_manifest import load_node_modules_lazily
+load_node_modules_lazily({modules!r}, manifest_path={manifest_path!r})
+print(time.perf_counter() - start)
+"""
+
+
+def default_node_modules():
+    """Return all node modules of ros_bt_py."""
+    modules = []
+    for package_name in ["ros_bt_py.nodes", "ros_bt_py.ros_nodes"]:
+        package = __import__(package_name, fromlist=["__path__"])
+        modules.extend(
+            f"{package_name}.{module.name}"
+            for module in pkgutil.iter_modules(package.__path__)
+            if not module.ispkg
+        )
+    return modules
+
+
+def measure(code, runs):
+    """Run `code` in `runs` fresh interpreters and return the reported times."""
+    times = []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, "-c", code],
+            check=True,
+            stdout=subprocess.PIPE,
+            universal_newlines=True,
+        ).stdout
+        times.append(float(output.strip().splitlines()[-1]))
+    return times
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark loading node modules at tree node startup"
+    )
+    parser.add_argument(
+        "modules",
+        nargs="*",
+        help="node modules to load, defaults to all node modules of ros_bt_py",
+    )
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args(rospy.myargv()[1:])
+    modules = args.modules or default_node_modules()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        manifest_path = os.path.join(tmp_dir, "node_manifest.json")
+        lazy = LAZY.format(modules=modules, manifest_path=manifest_path)
+        results = [
+            ("eager import", measure(EAGER.format(modules=modules), args.runs)),
+            ("manifest, cold", measure(lazy, 1)),
+            ("manifest, warm", measure(lazy, args.runs)),
+        ]
+
+    print(f"Loading {len(modules)} node modules, {args.runs} runs:")
+    for name, times in results:
+        print(
+            f"{name:>16}: median {statistics.median(times) * 1000.0:8.1f} ms, "
+            f"min {min(times) * 1000.0:8.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
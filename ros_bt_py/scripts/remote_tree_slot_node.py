@@ -35,7 +35,7 @@ from actionlib.action_server import ActionServer
 from ros_bt_py_msgs.msg import RemoteSlotState, RunTreeAction
 from ros_bt_py_msgs.srv import ControlTreeExecution, EvaluateUtility
 
-from ros_bt_py.remote_tree_slot import RemoteTreeSlot
+from ros_bt_py.remote_tree_slot import RemoteTreeSlot, RemoteTreeSlotPool
 
 
 def main():
@@ -49,6 +49,12 @@ def main():
     They are in the node's private namespace, making it possible to
     run multiple `RemoteTreeSlot` nodes in the same namespace.
 
+    The `~slots` parameter sets the number of slots hosted by this
+    node. With more than one slot, the interface of each slot lives in
+    `~slot_<index>`. All slots share the trees kept loaded for reuse,
+    at most `~max_cached_trees` of them. Up to `~max_received_trees`
+    compressed trees are kept, so senders can refer to them by their hash.
+
     Most useful in conjunction with the
     :class:`ros_bt_py.nodes.remote_tree.RemoteTree` Behavior Tree
     node, which will send
@@ -58,34 +64,49 @@ def main():
     """
     rospy.init_node("remote_tree_slot")
 
-    slot_state_pub = rospy.Publisher(
-        "~slot_state", RemoteSlotState, latch=True, queue_size=1
-    )
-    remote_slot = RemoteTreeSlot(publish_slot_state=slot_state_pub.publish)
-
-    # Connect the action server's callbacks to the RemoteTreeSlot
-    action_server = ActionServer(
-        "~run_tree",
-        RunTreeAction,
-        goal_cb=remote_slot.run_tree_handler,
-        cancel_cb=remote_slot.cancel_run_tree_handler,
-        auto_start=False,
+    slots = rospy.get_param("~slots", 1)
+    pool = RemoteTreeSlotPool(
+        max_cached_trees=rospy.get_param("~max_cached_trees", slots),
+        max_received_trees=rospy.get_param("~max_received_trees", 16),
     )
 
-    # Set up the service servers using the RemoteTreeSlot's handlers
-    rospy.Service(
-        "~control_slot_execution",
-        ControlTreeExecution,
-        handler=remote_slot.control_tree_execution_handler,
-    )
-    rospy.Service(
-        "~evaluate_utility",
-        EvaluateUtility,
-        handler=remote_slot.evaluate_utility_handler,
-    )
+    action_servers = []
+    for index in range(slots):
+        namespace = "~" if slots == 1 else f"~slot_{index}/"
+
+        slot_state_pub = rospy.Publisher(
+            f"{namespace}slot_state", RemoteSlotState, latch=True, queue_size=1
+        )
+        remote_slot = RemoteTreeSlot(
+            publish_slot_state=slot_state_pub.publish, pool=pool
+        )
+
+        # Connect the action server's callbacks to the RemoteTreeSlot
+        action_servers.append(
+            ActionServer(
+                f"{namespace}run_tree",
+                RunTreeAction,
+                goal_cb=remote_slot.run_tree_handler,
+                cancel_cb=remote_slot.cancel_run_tree_handler,
+                auto_start=False,
+            )
+        )
+
+        # Set up the service servers using the RemoteTreeSlot's handlers
+        rospy.Service(
+            f"{namespace}control_slot_execution",
+            ControlTreeExecution,
+            handler=remote_slot.control_tree_execution_handler,
+        )
+        rospy.Service(
+            f"{namespace}evaluate_utility",
+            EvaluateUtility,
+            handler=remote_slot.evaluate_utility_handler,
+        )
 
     # And go!
-    action_server.start()
+    for action_server in action_servers:
+        action_server.start()
     rospy.spin()
 
 
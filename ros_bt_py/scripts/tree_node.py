@@ -72,6 +72,10 @@ from ros_bt_py_msgs.srv import (
     GenerateSubtree,
     ReloadTree,
     ChangeTreeName,
+    EditTree,
+    UndoEdit,
+    RedoEdit,
+    GetDebugInfo,
 )
 
 from ros_bt_py.capability import (
@@ -85,8 +89,11 @@ from ros_bt_py.tree_manager import (
 )
 from ros_bt_py.debug_manager import DebugManager
 from ros_bt_py.migration import MigrationManager, check_node_versions
+from ros_bt_py.node_manifest import default_manifest_path, load_node_modules_lazily
+from ros_bt_py.node_pool import NodePool
 from ros_bt_py.package_manager import PackageManager
 from ros_bt_py.helpers import fix_yaml
+from ros_bt_py.ros_helpers import SubscriberAwarePublisher
 
 
 class TreeNode(object):
@@ -110,6 +117,20 @@ class TreeNode(object):
                 f"node_modules must be a list, but is a {type(node_module_names.__name__)}"
             )
 
+        lazy_node_modules = rospy.get_param("~lazy_node_modules", default=True)
+        node_manifest_path = rospy.get_param(
+            "~node_manifest_path", default=default_manifest_path()
+        )
+        if lazy_node_modules:
+            # Only import the modules that are not in the manifest yet, the others
+            # are imported once a tree uses them
+            failed_modules = load_node_modules_lazily(
+                node_module_names, manifest_path=node_manifest_path
+            )
+            if failed_modules:
+                rospy.logerr(f"Failed to load node modules: {failed_modules}")
+            node_module_names = []
+
         show_traceback_on_exception = rospy.get_param(
             "~show_traceback_on_exception", default=False
         )
@@ -127,6 +148,8 @@ class TreeNode(object):
         default_tree_control_command = rospy.get_param(
             "~default_tree_control_command", default=2
         )
+        # Nodes of cleared trees are kept for the next load_tree, 0 disables this
+        node_pool_size = rospy.get_param("~node_pool_size", default=0)
 
         local_mc_prefix = f"{rospy.get_namespace()}/mission_control"
 
@@ -154,18 +177,22 @@ class TreeNode(object):
             ),
         )
 
-        self.tree_pub = rospy.Publisher("~tree", Tree, latch=True, queue_size=1)
-        self.debug_info_pub = rospy.Publisher(
+        # The tree manager skips building messages for topics without
+        # subscribers and publishes everything again once someone subscribes
+        self.tree_pub = SubscriberAwarePublisher(
+            "~tree", Tree, latch=True, queue_size=1
+        )
+        self.debug_info_pub = SubscriberAwarePublisher(
             "~debug/debug_info", DebugInfo, latch=True, queue_size=1
         )
         self.debug_settings_pub = rospy.Publisher(
             "~debug/debug_settings", DebugSettings, latch=True, queue_size=1
         )
-        self.node_diagnostics_pub = rospy.Publisher(
+        self.node_diagnostics_pub = SubscriberAwarePublisher(
             "~debug/node_diagnostics", NodeDiagnostics, latch=True, queue_size=10
         )
 
-        self.tick_frequency_pub = rospy.Publisher(
+        self.tick_frequency_pub = SubscriberAwarePublisher(
             "~debug/tick_frequency", std_msgs.msg.Float64, latch=True, queue_size=10
         )
 
@@ -179,15 +206,18 @@ class TreeNode(object):
         self.tree_manager = TreeManager(
             module_list=node_module_names,
             debug_manager=self.debug_manager,
-            publish_tree_callback=self.tree_pub.publish,
-            publish_debug_info_callback=self.debug_info_pub.publish,
+            publish_tree_callback=self.tree_pub,
+            publish_debug_info_callback=self.debug_info_pub,
             publish_debug_settings_callback=self.debug_settings_pub.publish,
-            publish_node_diagnostics_callback=self.node_diagnostics_pub.publish,
+            publish_node_diagnostics_callback=self.node_diagnostics_pub,
             publish_diagnostic_callback=self.ros_diagnostics_pub.publish,
-            publish_tick_frequency_callback=self.tick_frequency_pub.publish,
+            publish_tick_frequency_callback=self.tick_frequency_pub,
             diagnostics_frequency=default_tree_diagnostics_frequency_hz,
             show_traceback_on_exception=show_traceback_on_exception,
+            node_pool=NodePool(max_size=node_pool_size) if node_pool_size > 0 else None,
         )
+        self.tree_pub.on_subscribe = self.tree_manager.publish_full_info
+        self.debug_info_pub.on_subscribe = self.tree_manager.publish_full_info
 
         self.add_node_service = rospy.Service(
             "~add_node", AddNode, self.tree_manager.add_node
@@ -237,6 +267,10 @@ class TreeNode(object):
             self.tree_manager.set_execution_mode,
         )
 
+        self.get_debug_info_service = rospy.Service(
+            "~debug/get_debug_info", GetDebugInfo, self.tree_manager.get_debug_info
+        )
+
         self.set_options_service = rospy.Service(
             "~set_options", SetOptions, self.tree_manager.set_options
         )
@@ -273,6 +307,14 @@ class TreeNode(object):
             "~change_tree_name", ChangeTreeName, self.tree_manager.change_tree_name
         )
 
+        self.edit_tree_service = rospy.Service(
+            "~edit_tree", EditTree, self.tree_manager.edit_tree
+        )
+
+        self.undo_service = rospy.Service("~undo", UndoEdit, self.tree_manager.undo)
+
+        self.redo_service = rospy.Service("~redo", RedoEdit, self.tree_manager.redo)
+
         self.fix_yaml_service = rospy.Service("~fix_yaml", FixYaml, fix_yaml)
 
         rospy.loginfo("initialized tree manager")
@@ -38,12 +38,13 @@ at runtime.
 import secrets
 import threading
 from abc import ABC
-from typing import Optional, List, Type, Dict
+from collections import OrderedDict
+from typing import Optional, List, Type, Dict, Tuple, Union
 
 import rospy
 from actionlib import SimpleActionClient
 from actionlib_msgs.msg import GoalStatus
-from rospy import ROSSerializationException, ROSException, Publisher, Subscriber
+from rospy import ROSSerializationException, ROSException, Publisher
 from std_msgs.msg import Time
 
 from ros_bt_py_msgs.msg import (
@@ -53,11 +54,11 @@ from ros_bt_py_msgs.msg import (
     ExecuteRemoteCapabilityAction,
     ExecuteRemoteCapabilityGoal,
     CapabilityIOBridgeData,
+    CapabilityIOBridgeBinaryData,
     CapabilityExecutionStatus,
     ExecuteRemoteCapabilityResult,
     NodeData as NodeDataMsg,
     UtilityBounds,
-    PingMsg,
 )
 from ros_bt_py_msgs.srv import (
     PrepareLocalImplementation,
@@ -75,15 +76,62 @@ from ros_bt_py_msgs.srv import (
     GetLocalBidResponse,
 )
 
+from ros_bt_py.capability_io import decode_value, encode_node_data_map
 from ros_bt_py.debug_manager import DebugManager
 from ros_bt_py.exceptions import BehaviorTreeException, TreeTopologyError
-from ros_bt_py.helpers import json_decode, json_encode, rgetattr
+from ros_bt_py.heartbeat import HeartbeatMultiplexer, get_heartbeat_multiplexer
+from ros_bt_py.helpers import (
+    json_decode,
+    json_decode_type,
+    json_encode,
+    rgetattr,
+    tree_hash,
+)
 from ros_bt_py.node import define_bt_node, Leaf, Node
 from ros_bt_py.node_config import NodeConfig
 from ros_bt_py.ros_helpers import AsyncServiceProxy
 from ros_bt_py.tree_manager import TreeManager
 
 
+def _set_outputs_from_bridge_msg(
+    node: Node, msg: Union[CapabilityIOBridgeData, CapabilityIOBridgeBinaryData]
+):
+    """
+    Set the outputs of a node from the values received via an IO bridge.
+
+    :param node: The node whose outputs should be set.
+    :param msg: The received bridge message, either JSON or binary encoded.
+    :return: None
+    """
+    binary = isinstance(msg, CapabilityIOBridgeBinaryData)
+    for node_data in msg.bridge_data:
+        try:
+            if binary:
+                node.outputs[node_data.key] = decode_value(node_data)
+            else:
+                node.outputs[node_data.key] = json_decode(node_data.serialized_value)
+        except TypeError as exc:
+            node.logwarn(f"Could not set output {node_data.key}: {exc}")
+            continue
+
+
+def _json_bridge_data(node_data_map) -> List[NodeDataMsg]:
+    """
+    Create the legacy JSON bridge data from a NodeDataMap.
+
+    :param node_data_map: The map to encode, usually the inputs of a node.
+    :return: List of NodeData messages.
+    """
+    bridge_data = []
+    for key in node_data_map:
+        node_data_msg = NodeDataMsg()
+        node_data_msg.key = key
+        node_data_msg.serialized_value = node_data_map.get_serialized(key=key)
+        node_data_msg.serialized_type = node_data_map.get_serialized_type(key=key)
+        bridge_data.append(node_data_msg)
+    return bridge_data
+
+
 class CapabilityDataBridge(ABC, Leaf):
     """Data bridge that allows the exchange of data between capability interfaces and nodes."""
 
@@ -115,6 +163,12 @@ class CapabilityDataBridge(ABC, Leaf):
         self.capability_io_topic: str = rospy.get_param(
             "capability_io_topic", "~/capabilities/io"
         )
+        self.capability_io_binary_topic: str = rospy.get_param(
+            "capability_io_binary_topic", "~/capabilities/io_binary"
+        )
+
+        self._binary_peer: bool = False
+        """If the peer with the same bridge id is known to understand the binary encoding."""
 
     @property
     def capability_bridge_id(self) -> str:
@@ -157,7 +211,13 @@ class CapabilityInputDataBridge(CapabilityDataBridge):
             succeed_always=succeed_always,
         )
         self._source_capability_inputs_subscriber: Optional[rospy.Subscriber] = None
-        self._current_received_msg: Optional[CapabilityIOBridgeData] = None
+        self._source_capability_binary_inputs_subscriber: Optional[
+            rospy.Subscriber
+        ] = None
+        self._ack_publisher: Optional[rospy.Publisher] = None
+        self._current_received_msg: Optional[
+            Union[CapabilityIOBridgeData, CapabilityIOBridgeBinaryData]
+        ] = None
         self._lock = threading.RLock()
         self._message_lock = threading.RLock()
 
@@ -165,6 +225,10 @@ class CapabilityInputDataBridge(CapabilityDataBridge):
         """
         Callback to store the received input message internally to be processed on the next tick.
 
+        JSON messages are ignored once the peer has been found to send binary data.
+        As the peer still sending them has not accepted an acknowledgement yet,
+        they are acknowledged again.
+
         :param msg: The received message.
         :return: None
         """
@@ -172,43 +236,83 @@ class CapabilityInputDataBridge(CapabilityDataBridge):
             if (msg.node_id == self.capability_bridge_id) and (
                 msg.type == CapabilityIOBridgeData.INPUT
             ):
+                if self._binary_peer:
+                    self._acknowledge_binary_inputs(msg.timestamp)
+                    return
                 rospy.logdebug("Recieved msg relevant to this input bridge!")
                 self._current_received_msg = msg
 
+    def _publish_binary_inputs_cb(self, msg: CapabilityIOBridgeBinaryData):
+        """
+        Callback to store the received binary input message to be processed on the next tick.
+
+        The first binary message is acknowledged, which allows the peer
+        to stop sending the JSON fallback.
+
+        :param msg: The received message.
+        :return: None
+        """
+        with self._message_lock:
+            if (msg.node_id == self.capability_bridge_id) and (
+                msg.type == CapabilityIOBridgeBinaryData.INPUT
+            ):
+                self._current_received_msg = msg
+                if not self._binary_peer:
+                    self._binary_peer = True
+                    self._acknowledge_binary_inputs(msg.timestamp)
+
+    def _acknowledge_binary_inputs(self, timestamp: rospy.Time):
+        """
+        Acknowledge the binary encoding of the inputs to the peer.
+
+        The acknowledgement echoes the timestamp of the acknowledged inputs,
+        which lets the peer tell it apart from acknowledgements of earlier inputs.
+
+        :param timestamp: The timestamp of the acknowledged input message.
+        :return: None
+        """
+        if self._ack_publisher is not None:
+            self._ack_publisher.publish(
+                CapabilityIOBridgeBinaryData(
+                    node_id=self.capability_bridge_id,
+                    type=CapabilityIOBridgeBinaryData.ACK,
+                    timestamp=timestamp,
+                )
+            )
+
     def _do_setup(self):
         with self._lock:
-
+            self._binary_peer = False
+            self._ack_publisher = rospy.Publisher(
+                self.capability_io_binary_topic,
+                CapabilityIOBridgeBinaryData,
+                queue_size=1,
+                latch=True,
+            )
             self._source_capability_inputs_subscriber = rospy.Subscriber(
                 self.capability_io_topic,
                 CapabilityIOBridgeData,
                 callback=self._publish_inputs_cb,
             )
-            try:
-                rospy.wait_for_message(
-                    self.capability_io_topic,
-                    CapabilityIOBridgeData,
-                    timeout=rospy.Duration.from_sec(10),
-                )
-            except ROSException as exc:
-                rospy.logwarn(
-                    f"Failed to receive an initial message for the input bridge: {self.name}"
-                )
-                raise BehaviorTreeException(
-                    f"Input bridge {self.name} messages not populated!"
-                ) from exc
+            self._source_capability_binary_inputs_subscriber = rospy.Subscriber(
+                self.capability_io_binary_topic,
+                CapabilityIOBridgeBinaryData,
+                callback=self._publish_binary_inputs_cb,
+            )
 
+            timeout = rospy.Time.now() + rospy.Duration.from_sec(10)
             while self._current_received_msg is None:
+                if rospy.Time.now() > timeout or rospy.is_shutdown():
+                    rospy.logwarn(
+                        f"Failed to receive an initial message for the input bridge: {self.name}"
+                    )
+                    raise BehaviorTreeException(
+                        f"Input bridge {self.name} messages not populated!"
+                    )
                 rospy.sleep(rospy.Duration.from_sec(0.1))
 
-            for bridge_data in self._current_received_msg.bridge_data:
-                node_data: NodeDataMsg = bridge_data
-                try:
-                    self.outputs[node_data.key] = json_decode(
-                        node_data.serialized_value
-                    )
-                except TypeError as exc:
-                    self.logwarn(f"Could not set output {node_data.key}: {exc}")
-                    continue
+            with self._message_lock:
+                _set_outputs_from_bridge_msg(self, self._current_received_msg)
             self._handle_outputs()
 
     def _do_tick(self):
@@ -219,18 +323,7 @@ class CapabilityInputDataBridge(CapabilityDataBridge):
             if self.state == NodeMsg.RUNNING:
                 with self._message_lock:
                     if self._current_received_msg is not None:
-                        for bridge_data in self._current_received_msg.bridge_data:
-                            node_data: NodeDataMsg = bridge_data
-                            try:
-                                self.outputs[node_data.key] = json_decode(
-                                    node_data.serialized_value
-                                )
-                            except TypeError as exc:
-                                self.logwarn(
-                                    f"Could not set output {node_data.key}: {exc}"
-                                )
-                                continue
-
+                        _set_outputs_from_bridge_msg(self, self._current_received_msg)
                         return NodeMsg.SUCCEEDED
                     return NodeMsg.RUNNING
             return self.state
@@ -252,13 +345,20 @@ class CapabilityInputDataBridge(CapabilityDataBridge):
             with self._message_lock:
                 self._current_received_msg = None
 
-            if self._source_capability_inputs_subscriber is not None:
-                try:
-                    self._source_capability_inputs_subscriber.unregister()
-                except AttributeError as exc:
-                    self.logfatal(f"Attribute error during unregister: {exc}")
+            for subscriber_or_publisher in [
+                self._source_capability_inputs_subscriber,
+                self._source_capability_binary_inputs_subscriber,
+                self._ack_publisher,
+            ]:
+                if subscriber_or_publisher is not None:
+                    try:
+                        subscriber_or_publisher.unregister()
+                    except AttributeError as exc:
+                        self.logfatal(f"Attribute error during unregister: {exc}")
 
-                self._source_capability_inputs_subscriber = None
+            self._source_capability_inputs_subscriber = None
+            self._source_capability_binary_inputs_subscriber = None
+            self._ack_publisher = None
 
 
 class CapabilityOutputDataBridge(CapabilityDataBridge):
@@ -285,35 +385,64 @@ class CapabilityOutputDataBridge(CapabilityDataBridge):
             simulate_tick=simulate_tick,
         )
         self._source_capability_outputs_publisher: Optional[rospy.Publisher] = None
+        self._source_capability_binary_outputs_publisher: Optional[
+            rospy.Publisher
+        ] = None
+        self._binary_inputs_subscriber: Optional[rospy.Subscriber] = None
         self._lock = threading.RLock()
 
+    def _binary_inputs_cb(self, msg: CapabilityIOBridgeBinaryData):
+        """
+        Callback marking the peer as binary capable once it sends binary inputs.
+
+        :param msg: The received message.
+        :return: None
+        """
+        if (msg.node_id == self.capability_bridge_id) and (
+            msg.type == CapabilityIOBridgeBinaryData.INPUT
+        ):
+            self._binary_peer = True
+
     def _do_setup(self):
         with self._lock:
+            self._binary_peer = False
             self._source_capability_outputs_publisher = rospy.Publisher(
                 self.capability_io_topic, CapabilityIOBridgeData, queue_size=10
             )
+            self._source_capability_binary_outputs_publisher = rospy.Publisher(
+                self.capability_io_binary_topic,
+                CapabilityIOBridgeBinaryData,
+                queue_size=10,
+            )
+            self._binary_inputs_subscriber = rospy.Subscriber(
+                self.capability_io_binary_topic,
+                CapabilityIOBridgeBinaryData,
+                callback=self._binary_inputs_cb,
+            )
 
     def _do_tick(self):
         with self._lock:
             if self.state == NodeMsg.IDLE:
                 return NodeMsg.RUNNING
             if self.state == NodeMsg.RUNNING:
-                if self._source_capability_outputs_publisher is not None:
-                    outputs = []
-                    for key in self.inputs:
-                        output = NodeDataMsg()
-                        output.key = key
-                        output.serialized_value = self.inputs.get_serialized(key=key)
-                        output.serialized_type = self.inputs.get_serialized_type(
-                            key=key
+                if self._binary_peer and (
+                    self._source_capability_binary_outputs_publisher is not None
+                ):
+                    self._source_capability_binary_outputs_publisher.publish(
+                        CapabilityIOBridgeBinaryData(
+                            node_id=self.capability_bridge_id,
+                            type=CapabilityIOBridgeBinaryData.OUTPUT,
+                            bridge_data=encode_node_data_map(self.inputs),
+                            timestamp=rospy.Time.now(),
                         )
-                        outputs.append(output)
-
+                    )
+                    return NodeMsg.SUCCEEDED
+                if self._source_capability_outputs_publisher is not None:
                     self._source_capability_outputs_publisher.publish(
                         CapabilityIOBridgeData(
                             node_id=self.capability_bridge_id,
                             type=CapabilityIOBridgeData.OUTPUT,
-                            bridge_data=outputs,
+                            bridge_data=_json_bridge_data(self.inputs),
                             timestamp=rospy.Time.now(),
                         )
                     )
@@ -331,12 +460,19 @@ class CapabilityOutputDataBridge(CapabilityDataBridge):
 
     def _do_shutdown(self):
         with self._lock:
-            if self._source_capability_outputs_publisher is not None:
-                try:
-                    self._source_capability_outputs_publisher.unregister()
-                except AttributeError as exc:
-                    self.logfatal(f"Attribute error during unregister: {exc}")
-                self._source_capability_outputs_publisher = None
+            for subscriber_or_publisher in [
+                self._source_capability_outputs_publisher,
+                self._source_capability_binary_outputs_publisher,
+                self._binary_inputs_subscriber,
+            ]:
+                if subscriber_or_publisher is not None:
+                    try:
+                        subscriber_or_publisher.unregister()
+                    except AttributeError as exc:
+                        self.logfatal(f"Attribute error during unregister: {exc}")
+            self._source_capability_outputs_publisher = None
+            self._source_capability_binary_outputs_publisher = None
+            self._binary_inputs_subscriber = None
 
 
 class Capability(ABC, Leaf):
@@ -375,6 +511,9 @@ class Capability(ABC, Leaf):
         self.capability_io_topic: str = rospy.get_param(
             "capability_io_topic", "~/capabilities/io"
         )
+        self.capability_io_binary_topic: str = rospy.get_param(
+            "capability_io_binary_topic", "~/capabilities/io_binary"
+        )
         self.wait_for_local_mission_control_timeout_sec: int = rospy.get_param(
             "wait_for_local_mission_control_timeout_sec", 2
         )
@@ -387,6 +526,10 @@ class Capability(ABC, Leaf):
         self.wait_for_outputs_timeout_sec: str = rospy.get_param(
             "wait_for_outputs_timeout_sec", 1
         )
+        self.warm_implementation_trees: int = rospy.get_param(
+            "capability_warm_implementation_trees", 4
+        )
+        """Amount of set up local implementation trees kept for reuse, 0 disables the cache."""
 
         if hasattr(self, "__capability_interface"):
             self.capability_interface = getattr(self, "__capability_interface")
@@ -407,15 +550,17 @@ class Capability(ABC, Leaf):
         self._internal_state = self.IDLE
         """Internal state used to track the execution progress of the capability."""
 
-        self.tree_manager = TreeManager(
-            name=name,
-            publish_tree_callback=self.nop,
-            publish_debug_info_callback=self.nop,
-            publish_debug_settings_callback=self.nop,
-            publish_node_diagnostics_callback=self.nop,
-            debug_manager=self.debug_manager,
+        self.tree_manager = self._create_tree_manager()
+        """Tree manager used to run the current local capability implementation."""
+
+        self._warm_implementation_trees: "OrderedDict[Tuple[str, str], TreeManager]" = (
+            OrderedDict()
         )
-        """Tree manager used to run the local capability implementations."""
+        """
+        Tree managers holding set up implementation trees, ordered from least to most recently
+        used. They are keyed by the implementation name and the hash of the prepared tree.
+        """
+        self._local_implementation_tree_key: Optional[Tuple[str, str]] = None
 
         self._old_state = self.state
         """Backup of the node state before the node enters the PAUSED state"""
@@ -439,11 +584,19 @@ class Capability(ABC, Leaf):
         self._io_bridge_id: Optional[str] = None
         self._io_publisher: Optional[rospy.Publisher] = None
         self._io_subscriber: Optional[rospy.Subscriber] = None
-        self._last_received_outputs: Optional[CapabilityIOBridgeData] = None
+        self._binary_io_publisher: Optional[rospy.Publisher] = None
+        self._binary_io_subscriber: Optional[rospy.Subscriber] = None
+        self._last_received_outputs: Optional[
+            Union[CapabilityIOBridgeData, CapabilityIOBridgeBinaryData]
+        ] = None
+
+        self._binary_io_peer: bool = False
+        """If the current implementation acknowledged the binary encoding of the inputs."""
+        self._binary_io_peer_since: Optional[rospy.Time] = None
+        """Acknowledgements echoing inputs published before this are from previous peers."""
 
-        # Ping used to indicate that a remote capability is still running!
-        self._ping_subscriber: Optional[Subscriber] = None
-        self._last_ping_timestamp: Optional[rospy.Time] = None
+        # Heartbeats indicate that a remote capability is still running!
+        self._heartbeat: Optional[HeartbeatMultiplexer] = None
 
         # Result variables used to track if the implementation is finished
         self._result_status: Optional[str] = None
@@ -467,35 +620,59 @@ class Capability(ABC, Leaf):
             local_bid_service_topic, GetLocalBid
         )
 
-    def _do_calculate_utility(self):
-        if self._io_publisher is not None:
-            input_data = []
-            for key in self.inputs:
-                input_data_msg = NodeDataMsg()
-                input_data_msg.key = key
-                input_data_msg.serialized_value = self.inputs.get_serialized(key=key)
-                input_data_msg.serialized_type = self.inputs.get_serialized_type(
-                    key=key
-                )
-                input_data.append(input_data_msg)
+    def _publish_inputs(self):
+        """
+        Publish the current inputs for the input data bridges of the implementation.
 
-            try:
+        The inputs are always published in the binary encoding. The JSON encoding is
+        published as well, until the implementation acknowledged the binary encoding.
+        This keeps implementations running an older version of this package working.
+
+        :raises BehaviorTreeException: If the inputs cannot be published.
+        :return: None
+        """
+        try:
+            timestamp = rospy.Time.now()
+            if self._binary_io_publisher is not None:
+                self._binary_io_publisher.publish(
+                    CapabilityIOBridgeBinaryData(
+                        node_id=self._io_bridge_id,
+                        type=CapabilityIOBridgeBinaryData.INPUT,
+                        bridge_data=encode_node_data_map(self.inputs),
+                        timestamp=timestamp,
+                    )
+                )
+            if self._io_publisher is not None and not self._binary_io_peer:
                 self._io_publisher.publish(
                     CapabilityIOBridgeData(
                         node_id=self._io_bridge_id,
                         type=CapabilityIOBridgeData.INPUT,
-                        bridge_data=input_data,
-                        timestamp=rospy.Time.now(),
+                        bridge_data=_json_bridge_data(self.inputs),
+                        timestamp=timestamp,
                     )
                 )
-            except ROSSerializationException as exc:
-                error_msg = f"Could not serialize inputs to publish: {exc}"
-                self.logerr(error_msg)
-                raise BehaviorTreeException(error_msg) from exc
-            except ROSException as exc:
-                error_msg = f"Input data bridge publisher could not publish: {exc}"
-                self.logerr(error_msg)
-                raise BehaviorTreeException(error_msg) from exc
+        except ROSSerializationException as exc:
+            error_msg = f"Could not serialize inputs to publish: {exc}"
+            self.logerr(error_msg)
+            raise BehaviorTreeException(error_msg) from exc
+        except ROSException as exc:
+            error_msg = f"Input data bridge publisher could not publish: {exc}"
+            self.logerr(error_msg)
+            raise BehaviorTreeException(error_msg) from exc
+
+    def _reset_binary_io_peer(self):
+        """
+        Forget the binary capability of the previous implementation.
+
+        Must be called whenever a new implementation is about to receive the inputs.
+        :return: None
+        """
+        with self._capability_lock:
+            self._binary_io_peer = False
+            self._binary_io_peer_since = rospy.Time.now()
+
+    def _do_calculate_utility(self):
+        self._publish_inputs()
 
         response: GetLocalBidResponse = self.__get_local_bid_service.call(
             GetLocalBidRequest(
@@ -524,6 +701,71 @@ class Capability(ABC, Leaf):
     def nop(msg):
         """no op "publisher" """
 
+    def _create_tree_manager(self) -> TreeManager:
+        """
+        Create a tree manager for running a local implementation.
+
+        :return: The new tree manager.
+        """
+        return TreeManager(
+            name=self.name,
+            publish_tree_callback=self.nop,
+            publish_debug_info_callback=self.nop,
+            publish_debug_settings_callback=self.nop,
+            publish_node_diagnostics_callback=self.nop,
+            debug_manager=self.debug_manager,
+        )
+
+    def _store_warm_implementation_tree(
+        self, key: Tuple[str, str], tree_manager: TreeManager
+    ):
+        """
+        Keep a set up implementation tree for reuse in later executions.
+
+        The least recently used trees are shut down once more than
+        `capability_warm_implementation_trees` trees are stored.
+
+        :param key: The implementation name and hash of the prepared tree.
+        :param tree_manager: The tree manager holding the set up tree.
+        :return: None
+        """
+        with self._capability_lock:
+            self._warm_implementation_trees[key] = tree_manager
+            self._warm_implementation_trees.move_to_end(key)
+            while len(self._warm_implementation_trees) > self.warm_implementation_trees:
+                _, evicted_tree_manager = self._warm_implementation_trees.popitem(
+                    last=False
+                )
+                self._discard_tree_manager(evicted_tree_manager)
+
+    def _discard_tree_manager(self, tree_manager: TreeManager):
+        """
+        Shut down and clear the tree held by a tree manager.
+
+        :param tree_manager: The tree manager to discard.
+        :return: None
+        """
+        try:
+            tree_manager.control_execution(
+                ControlTreeExecutionRequest(
+                    command=ControlTreeExecutionRequest.SHUTDOWN
+                )
+            )
+            tree_manager.clear(ClearTreeRequest())
+        except BehaviorTreeException as exc:
+            self.logwarn(f"Failed to discard local implementation tree: {exc}")
+
+    def _discard_warm_implementation_trees(self):
+        """
+        Shut down all trees kept for reuse.
+
+        :return: None
+        """
+        with self._capability_lock:
+            while self._warm_implementation_trees:
+                _, tree_manager = self._warm_implementation_trees.popitem()
+                self._discard_tree_manager(tree_manager)
+
     @staticmethod
     def __handle_async_service_call(service_proxy: AsyncServiceProxy):
         """
@@ -614,6 +856,24 @@ class Capability(ABC, Leaf):
             with self._capability_lock:
                 self._last_received_outputs = msg
 
+    def _publish_binary_outputs_cb(self, msg: CapabilityIOBridgeBinaryData):
+        """
+        Callback to store binary output values and to receive acknowledgements of the inputs.
+
+        :param msg: The received output values or acknowledgement.
+        :return:None
+        """
+        if msg.node_id != self._io_bridge_id:
+            return
+        with self._capability_lock:
+            if msg.type == CapabilityIOBridgeBinaryData.OUTPUT:
+                self._last_received_outputs = msg
+            elif msg.type == CapabilityIOBridgeBinaryData.ACK and (
+                self._binary_io_peer_since is None
+                or msg.timestamp >= self._binary_io_peer_since
+            ):
+                self._binary_io_peer = True
+
     def _do_setup(self):
         try:
             prepare_local_implementation_name = rospy.resolve_name(
@@ -663,13 +923,20 @@ class Capability(ABC, Leaf):
             CapabilityIOBridgeData,
             callback=self._publish_outputs_cb,
         )
-
-        self._ping_subscriber = rospy.Subscriber(
-            "~/capabilities/ping",
-            PingMsg,
-            self._update_remote_exec_ping,
+        self._binary_io_publisher = rospy.Publisher(
+            self.capability_io_binary_topic,
+            CapabilityIOBridgeBinaryData,
             queue_size=1,
+            latch=True,
+        )
+        self._binary_io_subscriber = rospy.Subscriber(
+            self.capability_io_binary_topic,
+            CapabilityIOBridgeBinaryData,
+            callback=self._publish_binary_outputs_cb,
         )
+        self._reset_binary_io_peer()
+
+        self._heartbeat = get_heartbeat_multiplexer()
 
         notify_capability_execution_status_topic = rospy.resolve_name(
             f"{self.local_mc_topic}/notify_capability_execution_status"
@@ -681,11 +948,6 @@ class Capability(ABC, Leaf):
             queue_size=1,
         )
 
-    def _update_remote_exec_ping(self, msg: PingMsg):
-        if self._io_bridge_id == msg.node_id:
-            with self._capability_lock:
-                self._last_ping_timestamp = msg.timestamp
-
     def _tick_unassigned(self) -> str:
         """
         Function performing the tick operation while in the UNASSIGNED state.
@@ -801,15 +1063,20 @@ class Capability(ABC, Leaf):
 
         return NodeMsg.BROKEN
 
-    def _setup_local_implementation_tree(self, tree: Tree):
+    def _setup_local_implementation_tree(self, tree: Tree, key: Tuple[str, str]):
         """
         Function to run in a separate thread used to set up the local implementation tree.
         :param tree: The tree to set up.
+        :param key: The implementation name and hash of the tree, used to keep it warm.
         :return: None
         """
         with self._capability_lock:
             self._setup_local_implementation_tree_status = NodeMsg.RUNNING
 
+            if self.warm_implementation_trees > 0:
+                # Other implementations might be kept warm in the current tree manager
+                self.tree_manager = self._create_tree_manager()
+
             load_tree_response = self.tree_manager.load_tree(
                 request=LoadTreeRequest(tree=tree), prefix=self.name + "_"
             )
@@ -834,6 +1101,11 @@ class Capability(ABC, Leaf):
 
             self._local_implementation_tree_root.shutdown()
             self._local_implementation_tree_root.setup()
+            self._local_implementation_tree = tree
+            self._local_implementation_tree_key = key
+
+            if self.warm_implementation_trees > 0:
+                self._store_warm_implementation_tree(key, self.tree_manager)
 
             if self.debug_manager and self.debug_manager.get_publish_subtrees():
                 self.debug_manager.add_subtree_info(
@@ -843,6 +1115,47 @@ class Capability(ABC, Leaf):
             self._setup_local_implementation_tree_status = NodeMsg.SUCCESS
             return
 
+    def _use_warm_implementation_tree(self, tree: Tree, key: Tuple[str, str]) -> bool:
+        """
+        Use a previously set up implementation tree for the execution, if available.
+
+        :param tree: The prepared implementation tree.
+        :param key: The implementation name and hash of the tree.
+        :return: True if a warm tree is used, False if the tree has to be set up.
+        """
+        with self._capability_lock:
+            tree_manager = self._warm_implementation_trees.get(key)
+            if tree_manager is None:
+                return False
+            self._warm_implementation_trees.move_to_end(key)
+
+            try:
+                root = tree_manager.find_root()
+            except TreeTopologyError:
+                root = None
+            if root is None or root.state != NodeMsg.IDLE:
+                del self._warm_implementation_trees[key]
+                self._discard_tree_manager(tree_manager)
+                return False
+
+            self.tree_manager = tree_manager
+            set_capability_io_bridge_id(
+                tree_manager=self.tree_manager,
+                interface=self.capability_interface,
+                io_bridge_id=self._io_bridge_id,
+            )
+            self._local_implementation_tree_root = root
+            self._local_implementation_tree = tree
+            self._local_implementation_tree_key = key
+
+            if self.debug_manager and self.debug_manager.get_publish_subtrees():
+                self.debug_manager.add_subtree_info(
+                    self.name, self.tree_manager.to_msg()
+                )
+
+            self._setup_local_implementation_tree_status = NodeMsg.SUCCESS
+            return True
+
     def _tick_prepare_local_execution(self) -> str:
         """
         Perform tick operation while the node is prepared for local capability execution.
@@ -896,9 +1209,22 @@ class Capability(ABC, Leaf):
             self.logerr(error_msg)
             raise BehaviorTreeException(error_msg)
 
+        tree = prepare_local_implementation_response.implementation_subtree
+        key = (self._implementation_name, tree_hash(tree))
+        if self._use_warm_implementation_tree(tree, key):
+            self._capability_execution_status_publisher.publish(
+                CapabilityExecutionStatus(
+                    interface=self.capability_interface,
+                    node_name=self.name,
+                    status=CapabilityExecutionStatus.EXECUTING,
+                )
+            )
+            return NodeMsg.RUNNING
+
+        self._reset_binary_io_peer()
         self._prepare_local_tree_thread = threading.Thread(
             target=self._setup_local_implementation_tree,
-            args=(prepare_local_implementation_response.implementation_subtree,),
+            args=(tree, key),
         )
         self._prepare_local_tree_thread.start()
 
@@ -932,6 +1258,7 @@ class Capability(ABC, Leaf):
             self._execute_capability_remote_client_connection_tries += 1
             return NodeMsg.ASSIGNED
 
+        self._reset_binary_io_peer()
         self._execute_capability_remote_client.send_goal(
             ExecuteRemoteCapabilityGoal(
                 interface=self.capability_interface,
@@ -939,8 +1266,7 @@ class Capability(ABC, Leaf):
                 node_id=self._io_bridge_id,
             )
         )
-        with self._capability_lock:
-            self._last_ping_timestamp = rospy.Time.now()
+        self._heartbeat.watch(self._io_bridge_id, self.options["execution_timeout_sec"])
 
         self._capability_execution_status_publisher.publish(
             CapabilityExecutionStatus(
@@ -983,7 +1309,6 @@ class Capability(ABC, Leaf):
                     status=status,
                 )
             )
-            self._local_implementation_tree_root.shutdown()
             self._shutdown_local_implementation_tree()
             # Not sure why this would be needed,
             # as reset should be called which performs this action too.
@@ -998,9 +1323,7 @@ class Capability(ABC, Leaf):
         """
 
         # Check if the action ran into a timeout.
-        if rospy.Time.now() - self._last_ping_timestamp > rospy.Duration(
-            self.options["execution_timeout_sec"]
-        ):
+        if self._heartbeat.timed_out(self._io_bridge_id):
             self.logerr(
                 "ExecuteRemoteCapability action timed out after"
                 f' {self.options["execution_timeout_sec"]} seconds'
@@ -1043,16 +1366,7 @@ class Capability(ABC, Leaf):
 
         if self._internal_state == self.WAITING_FOR_OUTPUT_VALUES:
             if self._last_received_outputs is not None:
-                for bridge_data in self._last_received_outputs.bridge_data:
-                    node_data: NodeDataMsg = bridge_data
-
-                    try:
-                        self.outputs[node_data.key] = json_decode(
-                            node_data.serialized_value
-                        )
-                    except TypeError as exc:
-                        self.logwarn(f"Could not set output {node_data.key}: {exc}")
-                        continue
+                _set_outputs_from_bridge_msg(self, self._last_received_outputs)
                 return self._result_status
 
             if rospy.Time.now() - self._result_timestamp > rospy.Duration(
@@ -1079,33 +1393,7 @@ class Capability(ABC, Leaf):
         return new_state
 
     def _do_tick(self):
-        if self._io_publisher is not None:
-            input_data = []
-            for key in self.inputs:
-                input_data_msg = NodeDataMsg()
-                input_data_msg.key = key
-                input_data_msg.serialized_value = self.inputs.get_serialized(key=key)
-                input_data_msg.serialized_type = self.inputs.get_serialized_type(
-                    key=key
-                )
-                input_data.append(input_data_msg)
-            try:
-                self._io_publisher.publish(
-                    CapabilityIOBridgeData(
-                        node_id=self._io_bridge_id,
-                        type=CapabilityIOBridgeData.INPUT,
-                        bridge_data=input_data,
-                        timestamp=rospy.Time.now(),
-                    )
-                )
-            except ROSSerializationException as exc:
-                error_msg = f"Could not serialize inputs to publish: {exc}"
-                self.logerr(error_msg)
-                raise BehaviorTreeException(error_msg) from exc
-            except ROSException as exc:
-                error_msg = f"Input data bridge publisher could not publish: {exc}"
-                self.logerr(error_msg)
-                raise BehaviorTreeException(error_msg) from exc
+        self._publish_inputs()
 
         if self.simulate_tick:
             # self.logdebug(f"Simulating tick. {self.name} is not executing!")
@@ -1183,11 +1471,12 @@ class Capability(ABC, Leaf):
                 )
             )
         self._shutdown_local_implementation_tree()
+        # The bridge ids of the warm trees are tied to this setup of the node
+        self._discard_warm_implementation_trees()
         self._unregister_io_bridge_publishers_subscribers()
 
-        if self._ping_subscriber is not None:
-            self._ping_subscriber.unregister()
-            del self._ping_subscriber
+        if self._heartbeat is not None:
+            self._heartbeat.unwatch(self._io_bridge_id)
 
         self._stop_calls_action_clients_async_service_clients()
 
@@ -1196,9 +1485,11 @@ class Capability(ABC, Leaf):
 
         self._cleanup()
 
-        self._ping_subscriber = None
+        self._heartbeat = None
         self._io_subscriber = None
         self._io_publisher = None
+        self._binary_io_subscriber = None
+        self._binary_io_publisher = None
 
         self._request_capability_execution_service_proxy = None
         self._prepare_local_implementation_service_proxy = None
@@ -1219,6 +1510,14 @@ class Capability(ABC, Leaf):
             self._io_publisher.unregister()
             del self._io_publisher
 
+        if self._binary_io_subscriber is not None:
+            self._binary_io_subscriber.unregister()
+            del self._binary_io_subscriber
+
+        if self._binary_io_publisher is not None:
+            self._binary_io_publisher.unregister()
+            del self._binary_io_publisher
+
     def _stop_calls_action_clients_async_service_clients(self):
         """
         Shuts down the running goals of action clients and Async Service clients.
@@ -1248,6 +1547,20 @@ class Capability(ABC, Leaf):
         """
         if self._local_implementation_tree is not None:
             with self._capability_lock:
+                if (
+                    self._local_implementation_tree_key
+                    in self._warm_implementation_trees
+                ):
+                    # Keep the tree set up, so the next execution can start right away
+                    try:
+                        self._local_implementation_tree_root.reset()
+                        return True
+                    except BehaviorTreeException as exc:
+                        self.logwarn(f"Could not reset local capability tree: {exc}")
+                        del self._warm_implementation_trees[
+                            self._local_implementation_tree_key
+                        ]
+
                 self._local_implementation_tree_root.shutdown()
 
                 response = self.tree_manager.control_execution(
@@ -1270,6 +1583,11 @@ class Capability(ABC, Leaf):
         """
         if self._local_implementation_tree is not None:
             with self._capability_lock:
+                if (
+                    self._local_implementation_tree_key
+                    in self._warm_implementation_trees
+                ):
+                    return True
                 response = self.tree_manager.clear(ClearTreeRequest())
                 if not response.success:
                     self.logwarn(
@@ -1304,6 +1622,7 @@ class Capability(ABC, Leaf):
 
             self._local_implementation_tree: Optional[Tree] = None
             self._local_implementation_tree_root: Optional[Node] = None
+            self._local_implementation_tree_key = None
             self._setup_local_implementation_tree_status = NodeMsg.IDLE
 
             del self._execute_capability_remote_client
@@ -1332,11 +1651,13 @@ def capability_node_class_from_capability_interface(
     """
     inputs_dict = {}
     for input_node_data in capability_interface.inputs:
-        inputs_dict[input_node_data.key] = json_decode(input_node_data.serialized_type)
+        inputs_dict[input_node_data.key] = json_decode_type(
+            input_node_data.serialized_type
+        )
 
     outputs_dict = {}
     for output_node_data in capability_interface.outputs:
-        outputs_dict[output_node_data.key] = json_decode(
+        outputs_dict[output_node_data.key] = json_decode_type(
             output_node_data.serialized_type
         )
 
@@ -1375,7 +1696,9 @@ def capability_input_data_bridge_from_interface(
     """
     inputs_dict = {}
     for input_node_data in capability_interface.inputs:
-        inputs_dict[input_node_data.key] = json_decode(input_node_data.serialized_type)
+        inputs_dict[input_node_data.key] = json_decode_type(
+            input_node_data.serialized_type
+        )
 
     capability_input_bridge_node_class = type(
         f"{capability_interface.name}_InputDataBridge",
@@ -1403,7 +1726,7 @@ def capability_output_data_bridge_from_interface(
 
     outputs_dict = {}
     for output_node_data in capability_interface.outputs:
-        outputs_dict[output_node_data.key] = json_decode(
+        outputs_dict[output_node_data.key] = json_decode_type(
             output_node_data.serialized_type
         )
 
@@ -0,0 +1,195 @@
+# Copyright 2018-2023 FZI Forschungszentrum Informatik
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#    * Redistributions of source code must retain the above copyright
+#      notice, this list of conditions and the following disclaimer.
+#
+#    * Redistributions in binary form must reproduce the above copyright
+#      notice, this list of conditions and the following disclaimer in the
+#      documentation and/or other materials provided with the distribution.
+#
+#    * Neither the name of the FZI Forschungszentrum Informatik nor the names of its
+#      contributors may be used to endorse or promote products derived from
+#      this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+"""
+Binary encoding for the data exchanged by capability IO bridges.
+
+ROS message values are transported as their genpy serialization, primitive python values
+with a compact fixed-width encoding. Everything else falls back to jsonpickle, exactly like
+the legacy :class:`ros_bt_py_msgs.msg.CapabilityIOBridgeData` transport.
+"""
+
+# pylint: disable=no-name-in-module,import-error
+
+import struct
+from io import BytesIO
+from typing import Any, List
+
+import genpy
+
+from ros_bt_py_msgs.msg import BinaryNodeData
+
+from ros_bt_py.helpers import (
+    json_decode,
+    json_decode_type,
+    json_encode,
+    json_encode_type,
+)
+from ros_bt_py.node_data import NodeDataMap
+
+_NONE = b"N"
+_TRUE = b"T"
+_FALSE = b"F"
+_INT = b"i"
+_FLOAT = b"d"
+_STRING = b"s"
+_BYTES = b"b"
+
+_INT_STRUCT = struct.Struct("<q")
+_FLOAT_STRUCT = struct.Struct("<d")
+
+
+def _encode_primitive(value: Any) -> bytes:
+    """
+    Encode a primitive python value.
+
+    :param value: The value to encode.
+    :raises TypeError: If the value is not a supported primitive.
+    :returns: The tagged binary representation of the value.
+    """
+    # bool has to be checked before int, as it is a subclass of it
+    if value is None:
+        return _NONE
+    if isinstance(value, bool):
+        return _TRUE if value else _FALSE
+    if isinstance(value, int):
+        return _INT + _INT_STRUCT.pack(value)
+    if isinstance(value, float):
+        return _FLOAT + _FLOAT_STRUCT.pack(value)
+    if isinstance(value, str):
+        return _STRING + value.encode("utf-8")
+    if isinstance(value, (bytes, bytearray)):
+        return _BYTES + bytes(value)
+    raise TypeError(f"{type(value).__name__} is not a primitive type")
+
+
+def _decode_primitive(data: bytes) -> Any:
+    """
+    Decode a value encoded with :func:`_encode_primitive`.
+
+    :param data: The tagged binary representation.
+    :raises TypeError: If the tag is unknown.
+    :returns: The decoded value.
+    """
+    tag, payload = data[:1], data[1:]
+    if tag == _NONE:
+        return None
+    if tag == _TRUE:
+        return True
+    if tag == _FALSE:
+        return False
+    if tag == _INT:
+        return _INT_STRUCT.unpack(payload)[0]
+    if tag == _FLOAT:
+        return _FLOAT_STRUCT.unpack(payload)[0]
+    if tag == _STRING:
+        return payload.decode("utf-8")
+    if tag == _BYTES:
+        return bytes(payload)
+    raise TypeError(f"Unknown primitive tag {tag!r}")
+
+
+def encode_value(key: str, value: Any, serialized_type: str) -> BinaryNodeData:
+    """
+    Encode a single value for the binary IO bridge.
+
+    :param key: The key of the node data.
+    :param value: The value to encode.
+    :param serialized_type: The jsonpickle encoded type of the node data.
+    :returns: The encoded value, using the most compact encoding available.
+    """
+    if isinstance(value, genpy.Message):
+        buff = BytesIO()
+        try:
+            value.serialize(buff)
+            return BinaryNodeData(
+                key=key,
+                encoding=BinaryNodeData.GENPY,
+                serialized_type=json_encode_type(type(value)),
+                data=buff.getvalue(),
+            )
+        except (genpy.SerializationError, struct.error, TypeError, ValueError):
+            # Invalid field values can still be transported as json
+            pass
+    else:
+        try:
+            return BinaryNodeData(
+                key=key,
+                encoding=BinaryNodeData.PRIMITIVE,
+                serialized_type=serialized_type,
+                data=_encode_primitive(value),
+            )
+        except (TypeError, struct.error):
+            pass
+
+    return BinaryNodeData(
+        key=key,
+        encoding=BinaryNodeData.JSON,
+        serialized_type=serialized_type,
+        data=json_encode(value).encode("utf-8"),
+    )
+
+
+def decode_value(node_data: BinaryNodeData) -> Any:
+    """
+    Decode a value encoded with :func:`encode_value`.
+
+    :param node_data: The encoded value.
+    :raises TypeError: If the value cannot be decoded.
+    :returns: The decoded value.
+    """
+    if node_data.encoding == BinaryNodeData.GENPY:
+        message_class = json_decode_type(node_data.serialized_type)
+        try:
+            return message_class().deserialize(bytes(node_data.data))
+        except genpy.DeserializationError as exc:
+            raise TypeError(
+                f"Could not deserialize {message_class.__name__}: {exc}"
+            ) from exc
+    if node_data.encoding == BinaryNodeData.PRIMITIVE:
+        return _decode_primitive(bytes(node_data.data))
+    if node_data.encoding == BinaryNodeData.JSON:
+        return json_decode(bytes(node_data.data).decode("utf-8"))
+    raise TypeError(f"Unknown encoding {node_data.encoding} for {node_data.key}")
+
+
+def encode_node_data_map(node_data_map: NodeDataMap) -> List[BinaryNodeData]:
+    """
+    Encode all values of a NodeDataMap for the binary IO bridge.
+
+    :param node_data_map: The map to encode, usually the inputs of a node.
+    :returns: List of encoded values.
+    """
+    return [
+        encode_value(
+            key=key,
+            value=node_data_map[key],
+            serialized_type=node_data_map.get_serialized_type(key),
+        )
+        for key in node_data_map
+    ]
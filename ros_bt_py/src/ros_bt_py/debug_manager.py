@@ -36,6 +36,7 @@ from threading import Event, Lock
 import rospy
 
 from ros_bt_py.exceptions import BehaviorTreeException
+from ros_bt_py.ros_helpers import has_subscribers
 from ros_bt_py_msgs.msg import DebugInfo, DebugSettings, Node, NodeDiagnostics
 
 
@@ -55,6 +56,10 @@ class DebugManager(object):
         self.publish_node_diagnostics = node_diagnostics_publish_callback
 
         self.subtrees = dict()
+        # Version of the debug info in which each subtree last changed
+        self._subtree_versions = dict()
+        # Version of the debug info in which each subtree was removed, by subtree name
+        self._removed_subtrees = dict()
 
         self.diagnostics_state = dict()
         self.diagnostics_state["SETUP"] = (
@@ -74,11 +79,10 @@ class DebugManager(object):
             NodeDiagnostics.POST_SHUTDOWN,
         )
 
-        # TODO(nberg): Check performance, maybe hold dict of TickTime objects
-        # instead of just using the list in DebugInfo to reduce time spent
-        # searching.
+        # The debug info message is never modified, every change replaces it
+        # with a new message with a higher version
         with self._lock:
-            self._debug_info_msg = DebugInfo()
+            self._debug_info_msg = DebugInfo(version=0)
 
         self._debug_settings_msg = DebugSettings(
             # List of node names to break on
@@ -140,6 +144,12 @@ class DebugManager(object):
                 or self._debug_settings_msg.single_step
             )
 
+    def _collect_node_diagnostics(self):
+        """Check whether node diagnostics are enabled and anyone receives them."""
+        return self._debug_settings_msg.collect_node_diagnostics and has_subscribers(
+            self.publish_node_diagnostics
+        )
+
     @contextmanager
     def report_state(self, node_instance, state):
         """A context manager that collects debug data from Node executuin.
@@ -154,7 +164,7 @@ class DebugManager(object):
         :param state: The state of the node
         """
         diagnostics_message = None
-        if self._debug_settings_msg.collect_node_diagnostics:
+        if self._collect_node_diagnostics():
             diagnostics_message = NodeDiagnostics(
                 stamp=rospy.Time.now(),
                 module=type(node_instance).__module__,
@@ -174,7 +184,7 @@ class DebugManager(object):
         # Contextmanager'ed code is executed here
         yield
 
-        if self._debug_settings_msg.collect_node_diagnostics:
+        if diagnostics_message is not None:
             diagnostics_message.state = self.diagnostics_state[state][1]
             diagnostics_message.stamp = rospy.Time.now()
             if self.publish_node_diagnostics:
@@ -196,7 +206,7 @@ class DebugManager(object):
         :param instance: The node that's executing
         """
         diagnostics_message = None
-        if self._debug_settings_msg.collect_node_diagnostics:
+        if self._collect_node_diagnostics():
             diagnostics_message = NodeDiagnostics(
                 stamp=rospy.Time.now(),
                 module=type(node_instance).__module__,
@@ -218,19 +228,15 @@ class DebugManager(object):
             self.wait_for_continue()
             node_instance.state = old_state
         if self._debug_settings_msg.collect_performance_data:
-            with self._lock:
-                self._debug_info_msg.current_recursion_depth = len(inspect.stack())
-                self._debug_info_msg.max_recursion_depth = getrecursionlimit()
+            self._update_recursion_depth()
 
         # Contextmanager'ed code is executed here
         yield
 
         if self._debug_settings_msg.collect_performance_data:
-            with self._lock:
-                self._debug_info_msg.current_recursion_depth = len(inspect.stack())
-                self._debug_info_msg.max_recursion_depth = getrecursionlimit()
+            self._update_recursion_depth()
 
-        if self._debug_settings_msg.collect_node_diagnostics:
+        if diagnostics_message is not None:
             diagnostics_message.state = NodeDiagnostics.POST_TICK
             diagnostics_message.stamp = rospy.Time.now()
             if self.publish_node_diagnostics:
@@ -257,9 +263,75 @@ class DebugManager(object):
         self.continue_event.wait()
         self.continue_event.clear()
 
+    def _update_recursion_depth(self):
+        current_recursion_depth = len(inspect.stack())
+        max_recursion_depth = getrecursionlimit()
+        with self._lock:
+            if (
+                self._debug_info_msg.current_recursion_depth != current_recursion_depth
+                or self._debug_info_msg.max_recursion_depth != max_recursion_depth
+            ):
+                self._replace_debug_info(
+                    current_recursion_depth=current_recursion_depth,
+                    max_recursion_depth=max_recursion_depth,
+                )
+
+    def _replace_debug_info(self, **fields):
+        """Replace the debug info message with a copy that has a new version.
+
+        Must be called with `self._lock` held.
+        """
+        values = {
+            slot: getattr(self._debug_info_msg, slot)
+            for slot in self._debug_info_msg.__slots__
+        }
+        values.update(fields)
+        values["version"] = self._debug_info_msg.version + 1
+        self._debug_info_msg = DebugInfo(**values)
+
     def get_debug_info_msg(self):
+        """Return the current debug info.
+
+        The message is shared with every other caller and must not be modified. Its
+        `version` changes whenever the debug info does.
+        """
         with self._lock:
-            return deepcopy(self._debug_info_msg)
+            return self._debug_info_msg
+
+    def get_debug_info_delta(self, base_version=None):
+        """Return the changes to the debug info since `base_version`.
+
+        :param int base_version:
+
+        The version of the last debug info the receiver got. If this is `None` or not a
+        version of this debug info, the complete debug info is returned.
+
+        :returns:
+
+        A :class:`ros_bt_py_msgs.msg.DebugInfo` message with `is_delta` set, that
+        only contains the subtree states that changed since `base_version`.
+        """
+        with self._lock:
+            msg = self._debug_info_msg
+            if base_version is None or base_version > msg.version:
+                return msg
+            return DebugInfo(
+                current_recursion_depth=msg.current_recursion_depth,
+                max_recursion_depth=msg.max_recursion_depth,
+                subtree_states=[
+                    self.subtrees[subtree_name]
+                    for subtree_name, version in self._subtree_versions.items()
+                    if version > base_version
+                ],
+                version=msg.version,
+                is_delta=True,
+                base_version=base_version,
+                removed_subtrees=[
+                    name
+                    for name, version in self._removed_subtrees.items()
+                    if version > base_version
+                ],
+            )
 
     def add_subtree_info(self, node_name, subtree_msg):
         """Used by the :class:`ros_bt_py.nodes.Subtree` node to publish subtree states
@@ -283,15 +355,29 @@ class DebugManager(object):
                 raise BehaviorTreeException(
                     "Trying to add subtree info when subtree publishing is disabled!"
                 )
-            self.subtrees[subtree_name] = subtree_msg
-            self._debug_info_msg.subtree_states = [
-                msg for msg in self.subtrees.values()
-            ]
+            old_msg = self.subtrees.get(subtree_name)
+            if old_msg == subtree_msg:
+                return
+            # The subtree's tree manager keeps modifying the message it
+            # returned, so keep a copy
+            self.subtrees[subtree_name] = deepcopy(subtree_msg)
+            version = self._debug_info_msg.version + 1
+            self._subtree_versions[subtree_name] = version
+            self._removed_subtrees.pop(subtree_msg.name, None)
+            if old_msg is not None and old_msg.name != subtree_msg.name:
+                self._removed_subtrees[old_msg.name] = version
+            self._replace_debug_info(subtree_states=list(self.subtrees.values()))
 
     def clear_subtrees(self):
         with self._lock:
+            if not self.subtrees:
+                return
+            version = self._debug_info_msg.version + 1
+            for msg in self.subtrees.values():
+                self._removed_subtrees[msg.name] = version
             self.subtrees.clear()
-            self._debug_info_msg.subtree_states = []
+            self._subtree_versions.clear()
+            self._replace_debug_info(subtree_states=[])
 
     def get_publish_subtrees(self):
         with self._lock:
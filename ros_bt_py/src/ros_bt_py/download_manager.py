@@ -0,0 +1,275 @@
+# Copyright 2018-2023 FZI Forschungszentrum Informatik
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#    * Redistributions of source code must retain the above copyright
+#      notice, this list of conditions and the following disclaimer.
+#
+#    * Redistributions in binary form must reproduce the above copyright
+#      notice, this list of conditions and the following disclaimer in the
+#      documentation and/or other materials provided with the distribution.
+#
+#    * Neither the name of the FZI Forschungszentrum Informatik nor the names of its
+#      contributors may be used to endorse or promote products derived from
+#      this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+"""Background downloads into a file cache for nodes that must not block a tick.
+
+A :class:`DownloadManager` downloads files with a pool of worker threads that share one
+HTTP session, so nodes can start a download and check on it in later ticks. Files that
+are requested again while they are being downloaded are only downloaded once.
+"""
+from concurrent.futures import Future, ThreadPoolExecutor
+import json
+import os
+import shutil
+import tempfile
+import time
+from threading import Lock
+from typing import Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+import rospy
+
+_META_SUFFIX = ".meta"
+_PART_SUFFIX = ".part"
+
+
+class DownloadError(Exception):
+    """Exception when a file cannot be downloaded."""
+
+    pass
+
+
+def _file_mode():
+    """Return the mode files created with `open` get under the current umask."""
+    umask = os.umask(0)
+    os.umask(umask)
+    return 0o666 & ~umask
+
+
+def _read_meta(path):
+    try:
+        with open(path + _META_SUFFIX, "r") as meta_file:
+            return json.load(meta_file)
+    except (IOError, ValueError):
+        return None
+
+
+class DownloadManager(object):
+    """Download files into cache folders without blocking the caller.
+
+    Downloaded files are kept in their cache folder together with a `.meta` file that
+    records the `ETag` and `Last-Modified` headers of the response. Cached files are
+    used without a request until they are older than `max_age` seconds, then they are
+    revalidated with a conditional request and only downloaded again if they changed.
+
+    If `max_cache_bytes` is set, the least recently used downloaded files of a cache
+    folder are deleted once the folder holds more than that many bytes. Files that were
+    not downloaded by a `DownloadManager` are never deleted.
+
+    All methods are thread-safe.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 4,
+        max_cache_bytes: Optional[int] = None,
+        max_age: Optional[float] = None,
+        timeout: float = 30.0,
+    ):
+        """
+        :param max_workers: Number of downloads that run at the same time.
+        :param max_cache_bytes: Size limit of every cache folder. If `None`, cache
+        folders grow without limit.
+        :param max_age: Seconds after which cached files are revalidated. If `None`,
+        cached files are used until they are evicted.
+        :param timeout: Seconds to wait for the server to respond.
+        """
+        self.max_cache_bytes = max_cache_bytes
+        self.max_age = max_age
+        self.timeout = timeout
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="download"
+        )
+        # Maps target paths to the futures of their running downloads
+        self._in_flight: Dict[str, Future] = {}
+        self._lock = Lock()
+        # Serializes evictions, so two workers do not delete the same files
+        self._evict_lock = Lock()
+
+    def request(self, url: str, path: str) -> Future:
+        """Download `url` to `path` unless a fresh copy is cached there.
+
+        :returns: A future that resolves to `path` once the file is ready, or raises
+        :class:`DownloadError` if the download failed. Cached files are returned as an
+        already resolved future.
+        """
+        with self._lock:
+            future = self._in_flight.get(path)
+            if future is not None:
+                return future
+            if self._is_fresh(path):
+                future = Future()
+                future.set_result(path)
+                return future
+            future = self._executor.submit(self._download, url, path)
+            self._in_flight[path] = future
+        future.add_done_callback(lambda _: self._done(path))
+        return future
+
+    def shutdown(self, wait: bool = True):
+        """Stop the workers, waiting for running downloads if `wait` is `True`."""
+        self._executor.shutdown(wait=wait)
+        self._session.close()
+
+    def _done(self, path):
+        with self._lock:
+            self._in_flight.pop(path, None)
+
+    def _is_fresh(self, path):
+        if not os.path.isfile(path):
+            return False
+        if self.max_age is not None:
+            meta = _read_meta(path)
+            if meta is not None and time.time() - meta["fetched"] >= self.max_age:
+                return False
+        self._touch(path)
+        return True
+
+    @staticmethod
+    def _touch(path):
+        # The modification time orders the cached files for eviction
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+    def _download(self, url, path):
+        folder = os.path.dirname(path) or "."
+        os.makedirs(folder, exist_ok=True)
+        meta = _read_meta(path) if os.path.isfile(path) else None
+        headers = {}
+        if meta is not None:
+            if meta.get("etag"):
+                headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                headers["If-Modified-Since"] = meta["last_modified"]
+
+        try:
+            with self._session.get(
+                url, headers=headers, stream=True, timeout=self.timeout
+            ) as response:
+                if response.status_code == 304 and meta is not None:
+                    self._touch(path)
+                elif response.status_code == 200:
+                    self._store(response, path)
+                    meta = {
+                        "url": url,
+                        "etag": response.headers.get("ETag"),
+                        "last_modified": response.headers.get("Last-Modified"),
+                    }
+                else:
+                    raise DownloadError(
+                        "Could not download image, http error code: "
+                        f"{response.status_code}"
+                    )
+        except requests.RequestException as ex:
+            raise DownloadError(f"Could not download {url}: {str(ex)}")
+
+        meta["fetched"] = time.time()
+        with open(path + _META_SUFFIX, "w") as meta_file:
+            json.dump(meta, meta_file)
+        if self.max_cache_bytes is not None:
+            self._evict(folder, keep=path)
+        return path
+
+    @staticmethod
+    def _store(response, path):
+        # Write to a temporary file first, so readers never see a partial file
+        part = tempfile.NamedTemporaryFile(
+            dir=os.path.dirname(path) or ".", suffix=_PART_SUFFIX, delete=False
+        )
+        try:
+            with part:
+                response.raw.decode_content = True
+                shutil.copyfileobj(response.raw, part)
+            # Temporary files are private, cached files are readable like before
+            os.chmod(part.name, _file_mode())
+            os.replace(part.name, path)
+        except BaseException:
+            os.unlink(part.name)
+            raise
+
+    def _evict(self, folder, keep):
+        with self._evict_lock:
+            files = []
+            with os.scandir(folder) as entries:
+                for entry in entries:
+                    if entry.name.endswith((_META_SUFFIX, _PART_SUFFIX)):
+                        continue
+                    if not os.path.isfile(entry.path + _META_SUFFIX):
+                        continue
+                    try:
+                        stat = entry.stat()
+                    except OSError:
+                        continue
+                    files.append((stat.st_mtime, stat.st_size, entry.path))
+
+            total = sum(size for _, size, _ in files)
+            for _, size, path in sorted(files):
+                if total <= self.max_cache_bytes:
+                    break
+                if path == keep:
+                    continue
+                with self._lock:
+                    if path in self._in_flight:
+                        continue
+                    for evicted in (path, path + _META_SUFFIX):
+                        try:
+                            os.unlink(evicted)
+                        except OSError:
+                            pass
+                total -= size
+
+
+_download_manager: Optional[DownloadManager] = None
+_download_manager_lock = Lock()
+
+
+def get_download_manager() -> DownloadManager:
+    """
+    Return the download manager of this process, creating it on first use.
+
+    Reads the parameters `download_workers` (default 4), `download_cache_max_mb` and
+    `download_max_age_sec`. The cache is not limited and cached files are not
+    revalidated unless the latter two are set to positive numbers.
+    """
+    global _download_manager  # pylint: disable=global-statement
+    with _download_manager_lock:
+        if _download_manager is None:
+            max_mb = rospy.get_param("download_cache_max_mb", 0.0)
+            max_age = rospy.get_param("download_max_age_sec", 0.0)
+            _download_manager = DownloadManager(
+                max_workers=rospy.get_param("download_workers", 4),
+                max_cache_bytes=int(max_mb * 1024 * 1024) if max_mb > 0 else None,
+                max_age=max_age if max_age > 0 else None,
+            )
+        return _download_manager
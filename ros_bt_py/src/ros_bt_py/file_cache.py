@@ -0,0 +1,150 @@
+# Copyright 2018-2023 FZI Forschungszentrum Informatik
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#    * Redistributions of source code must retain the above copyright
+#      notice, this list of conditions and the following disclaimer.
+#
+#    * Redistributions in binary form must reproduce the above copyright
+#      notice, this list of conditions and the following disclaimer in the
+#      documentation and/or other materials provided with the distribution.
+#
+#    * Neither the name of the FZI Forschungszentrum Informatik nor the names of its
+#      contributors may be used to endorse or promote products derived from
+#      this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+"""Shared loading of data files for nodes that read them while a tree runs.
+
+Resolving a package:// path with a new :class:`rospkg.RosPack` crawls the package path
+again and parsing a YAML file is far slower than copying the parsed data. The functions
+in this module share one `RosPack` and a :class:`FileCache` that parses every file once
+until it changes on disk.
+"""
+import mmap
+import os
+import pickle
+from threading import Lock
+from typing import Any, Dict, Optional, Tuple
+
+import rospkg
+import yaml
+
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:  # pragma: no cover
+    # libyaml is not available
+    from yaml import SafeLoader
+
+_rospack: Optional[rospkg.RosPack] = None
+_rospack_lock = Lock()
+
+
+def get_rospack() -> rospkg.RosPack:
+    """Return the `RosPack` of this process, creating it on first use."""
+    global _rospack  # pylint: disable=global-statement
+    with _rospack_lock:
+        if _rospack is None:
+            _rospack = rospkg.RosPack()
+        return _rospack
+
+
+def resolve_path(path: str) -> str:
+    """Turn a file:// or package:// URI into a file path.
+
+    :raises: ValueError if the URI uses neither scheme, rospkg.ResourceNotFound if the
+    package does not exist.
+    """
+    if path.startswith("file://"):
+        return path[len("file://") :]
+    if path.startswith("package://"):
+        package_name = path[len("package://") :].split("/", 1)[0]
+        package_path = get_rospack().get_path(package_name)
+        return package_path + path[len("package://") + len(package_name) :]
+    raise ValueError(
+        f'File path "{path}" is malformed. '
+        'It needs to start with either "file://" or "package://"'
+    )
+
+
+class FileCache(object):
+    """Parse YAML files once and return copies of the parsed data.
+
+    Entries are validated against the modification time and size of the file, so a
+    changed file is parsed again. The parsed data is kept pickled, which is both smaller
+    than the objects and much faster to copy than parsing the file again. Files of at
+    least `mmap_threshold` bytes are memory-mapped instead of read into a buffer.
+
+    All methods are thread-safe.
+    """
+
+    def __init__(self, mmap_threshold: Optional[int] = 1024 * 1024):
+        """
+        :param mmap_threshold: Size in bytes from which files are memory-mapped. If
+        `None`, files are never memory-mapped.
+        """
+        self.mmap_threshold = mmap_threshold
+        # Maps file paths to their modification time, size and pickled data
+        self._entries: Dict[str, Tuple[int, int, bytes]] = {}
+        self._lock = Lock()
+
+    def load_yaml(self, file_path: str) -> Any:
+        """Load the YAML file at `file_path`.
+
+        Every call returns a new copy of the data, so callers may modify it.
+
+        :raises: OSError if the file cannot be read, yaml.YAMLError if it is invalid.
+        """
+        stat = os.stat(file_path)
+        with self._lock:
+            entry = self._entries.get(file_path)
+        if entry is not None and entry[:2] == (stat.st_mtime_ns, stat.st_size):
+            return pickle.loads(entry[2])
+
+        data = self._parse(file_path, stat.st_size)
+        with self._lock:
+            self._entries[file_path] = (
+                stat.st_mtime_ns,
+                stat.st_size,
+                pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL),
+            )
+        return data
+
+    def invalidate(self, file_path: Optional[str] = None):
+        """Parse `file_path` (or all files if `None`) again on the next access."""
+        with self._lock:
+            if file_path is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(file_path, None)
+
+    def _parse(self, file_path, size):
+        with open(file_path, "rb") as data_file:
+            if self.mmap_threshold is None or size < max(self.mmap_threshold, 1):
+                return yaml.load(data_file, Loader=SafeLoader)
+            with mmap.mmap(data_file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                return yaml.load(mapped, Loader=SafeLoader)
+
+
+_file_cache: Optional[FileCache] = None
+_file_cache_lock = Lock()
+
+
+def get_file_cache() -> FileCache:
+    """Return the file cache of this process, creating it on first use."""
+    global _file_cache  # pylint: disable=global-statement
+    with _file_cache_lock:
+        if _file_cache is None:
+            _file_cache = FileCache()
+        return _file_cache
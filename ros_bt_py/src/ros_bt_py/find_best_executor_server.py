@@ -35,11 +35,13 @@ from actionlib.simple_action_server import SimpleActionServer
 from ros_bt_py_msgs.msg import FindBestExecutorAction, FindBestExecutorResult
 from ros_bt_py_msgs.srv import EvaluateUtility, EvaluateUtilityRequest, LoadTreeRequest
 from ros_bt_py.tree_manager import TreeManager
+from ros_bt_py.tree_transfer import SentTrees, compress_tree
 
 
 class FindBestExecutorServer(object):
     def __init__(self):
         self.tree_manager = TreeManager()
+        self._sent_trees = SentTrees()
         self._as = SimpleActionServer(
             "find_best_executor",
             FindBestExecutorAction,
@@ -54,6 +56,7 @@ class FindBestExecutorServer(object):
         rospy.loginfo("Found these eval services: %s", eval_services)
 
         bounds = []
+        compressed_tree = compress_tree(goal.tree)
         res = self.tree_manager.load_tree(LoadTreeRequest(tree=goal.tree))
         if res.success:
             bounds.append(
@@ -77,7 +80,7 @@ class FindBestExecutorServer(object):
             bounds.append(
                 (
                     srv_namespace,
-                    service_client(EvaluateUtilityRequest(tree=goal.tree)).utility,
+                    self.evaluate_utility(service_client, srv_name, compressed_tree),
                 )
             )
 
@@ -118,6 +121,23 @@ class FindBestExecutorServer(object):
 
         self._as.set_succeeded(result)
 
+    def evaluate_utility(self, service_client, srv_name, compressed_tree):
+        """Call an EvaluateUtility service, sending the full tree only if needed."""
+        response = service_client(
+            EvaluateUtilityRequest(
+                compressed_tree=self._sent_trees.message_for(srv_name, compressed_tree)
+            )
+        )
+        if response.unknown_tree:
+            response = service_client(
+                EvaluateUtilityRequest(compressed_tree=compressed_tree)
+            )
+        if response.unknown_tree:
+            self._sent_trees.forget(srv_name, compressed_tree.hash)
+        else:
+            self._sent_trees.mark_sent(srv_name, compressed_tree.hash)
+        return response.utility
+
 
 def num_set_bounds(bounds):
     """Count how many of the 4 bounds are set"""
@@ -0,0 +1,282 @@
+# Copyright 2018-2023 FZI Forschungszentrum Informatik
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#    * Redistributions of source code must retain the above copyright
+#      notice, this list of conditions and the following disclaimer.
+#
+#    * Redistributions in binary form must reproduce the above copyright
+#      notice, this list of conditions and the following disclaimer in the
+#      documentation and/or other materials provided with the distribution.
+#
+#    * Neither the name of the FZI Forschungszentrum Informatik nor the names of its
+#      contributors may be used to endorse or promote products derived from
+#      this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+"""
+Process wide multiplexing of capability heartbeats and status messages.
+
+Remote capability slots signal that the execution of a capability is still alive on every
+tick. Instead of one ping message per slot and tick, and one subscriber per capability, a
+single :class:`HeartbeatMultiplexer` per process collects the beats of all running executions
+and publishes them with one timer. The same timer advances a :class:`TimerWheel` that detects
+the executions whose heartbeats stopped.
+"""
+
+# pylint: disable=no-name-in-module,import-error
+
+import itertools
+import math
+from threading import Lock
+from typing import Dict, Hashable, List, Optional, Tuple
+
+import genpy
+import rospy
+
+from ros_bt_py_msgs.msg import Heartbeat
+
+
+class TimerWheel(object):
+    """
+    Hashed timer wheel holding the deadlines of many keys.
+
+    Scheduling a deadline and advancing the wheel take constant time per expiring key,
+    regardless of the number of scheduled deadlines. Deadlines are rounded up to the
+    resolution of the wheel.
+    """
+
+    def __init__(self, resolution: float, slots: int = 64):
+        """
+        Initialize the `TimerWheel`.
+
+        :param resolution: Duration of one tick of the wheel in seconds.
+        :param slots: Number of buckets of the wheel.
+        """
+        self.resolution = resolution
+        self._buckets: List[List[Tuple[Hashable, float]]] = [[] for _ in range(slots)]
+        self._last_tick: Optional[int] = None
+        self._lock = Lock()
+
+    def schedule(self, key: Hashable, deadline: float):
+        """
+        Schedule a deadline.
+
+        :param key: The key returned by :meth:`advance` once the deadline passed.
+        :param deadline: The deadline in seconds.
+        """
+        tick = math.ceil(deadline / self.resolution)
+        with self._lock:
+            # Deadlines that already passed are returned by the next advance
+            if self._last_tick is not None and tick <= self._last_tick:
+                tick = self._last_tick + 1
+            self._buckets[tick % len(self._buckets)].append((key, deadline))
+
+    def advance(self, now: float) -> List[Tuple[Hashable, float]]:
+        """
+        Advance the wheel to `now` and remove all deadlines that passed.
+
+        :param now: The current time in seconds.
+        :returns: The (key, deadline) pairs whose deadline passed.
+        """
+        now_tick = math.floor(now / self.resolution)
+        expired = []
+        with self._lock:
+            if self._last_tick is None:
+                ticks = len(self._buckets)
+            else:
+                ticks = min(now_tick - self._last_tick, len(self._buckets))
+            for tick in range(now_tick - ticks + 1, now_tick + 1):
+                bucket = self._buckets[tick % len(self._buckets)]
+                if not bucket:
+                    continue
+                pending = []
+                for entry in bucket:
+                    if entry[1] <= now:
+                        expired.append(entry)
+                    else:
+                        pending.append(entry)
+                self._buckets[tick % len(self._buckets)] = pending
+            if self._last_tick is None or now_tick > self._last_tick:
+                self._last_tick = now_tick
+        return expired
+
+
+def _status_fields(msg: genpy.Message) -> Tuple:
+    return tuple(getattr(msg, slot) for slot in msg.__slots__ if slot != "timestamp")
+
+
+class HeartbeatMultiplexer(object):
+    """
+    Aggregates the heartbeats and status messages of all capability nodes of a process.
+
+    Senders call :meth:`beat` with the id of a capability node whenever the execution for it
+    makes progress. Every `period`, the ids that were beaten since the previous period are
+    published in one :class:`ros_bt_py_msgs.msg.Heartbeat` message.
+
+    Receivers :meth:`watch` the ids of the executions they wait for and check
+    :meth:`timed_out`. Beating and receiving heartbeats only write to dicts, which is atomic
+    in CPython, so neither the tick of a node nor the subscriber callback take a lock.
+
+    Status messages published through :meth:`publish_status` share one publisher per topic
+    that lives as long as the process. They are only sent when they change, and repeated
+    every `status_refresh_period` for late subscribers.
+    """
+
+    def __init__(
+        self, topic: str, period: float = 0.1, status_refresh_period: float = 1.0
+    ):
+        """
+        Initialize the `HeartbeatMultiplexer`.
+
+        :param topic: The topic the heartbeats are exchanged on.
+        :param period: Seconds between two heartbeat messages.
+        :param status_refresh_period: Seconds between two repetitions of unchanged statuses.
+        """
+        self.period = period
+        self.status_refresh_period = status_refresh_period
+
+        self._beats: Dict[str, bool] = {}
+        self._last_seen: Dict[str, float] = {}
+        self._watches: Dict[str, Tuple[float, int]] = {}
+        self._timed_out: Dict[str, bool] = {}
+        self._generations = itertools.count()
+        self._wheel = TimerWheel(resolution=period)
+
+        self._status_lock = Lock()
+        self._status_publishers: Dict[str, rospy.Publisher] = {}
+        self._statuses: Dict[Hashable, Tuple[rospy.Publisher, genpy.Message]] = {}
+        self._last_status_refresh: Optional[rospy.Time] = None
+
+        self._publisher = rospy.Publisher(topic, Heartbeat, queue_size=1)
+        self._subscriber = rospy.Subscriber(
+            topic, Heartbeat, self._heartbeat_cb, queue_size=10
+        )
+        self._timer = rospy.Timer(rospy.Duration.from_sec(period), self._timer_cb)
+
+    def beat(self, node_id: str):
+        """Signal that the execution for the capability node `node_id` is alive."""
+        self._beats[node_id] = True
+
+    def watch(self, node_id: str, timeout: float):
+        """
+        Start watching the heartbeats for `node_id`.
+
+        :param node_id: The id of the capability node.
+        :param timeout: Seconds without a heartbeat after which `node_id` times out.
+        """
+        self._timed_out.pop(node_id, None)
+        now = rospy.Time.now().to_sec()
+        self._last_seen[node_id] = now
+        generation = next(self._generations)
+        self._watches[node_id] = (timeout, generation)
+        self._wheel.schedule((node_id, generation), now + timeout)
+
+    def unwatch(self, node_id: str):
+        """Stop watching the heartbeats for `node_id`."""
+        self._watches.pop(node_id, None)
+        self._last_seen.pop(node_id, None)
+        self._timed_out.pop(node_id, None)
+
+    def timed_out(self, node_id: str) -> bool:
+        """Check whether the watched `node_id` did not receive heartbeats for its timeout."""
+        return node_id in self._timed_out
+
+    def publish_status(
+        self, topic: str, key: Hashable, msg: genpy.Message, latch: bool = False
+    ):
+        """
+        Publish a status message if it differs from the last one published for `key`.
+
+        :param topic: The topic to publish on.
+        :param key: Identifies the sender of the status, e.g. the node publishing it.
+        :param msg: The status message. A `timestamp` field is ignored when comparing.
+        :param latch: Whether the publisher of a new topic is latched.
+        """
+        with self._status_lock:
+            publisher = self._status_publishers.get(topic)
+            if publisher is None:
+                publisher = rospy.Publisher(
+                    topic, type(msg), queue_size=10, latch=latch
+                )
+                self._status_publishers[topic] = publisher
+            previous = self._statuses.get(key)
+            self._statuses[key] = (publisher, msg)
+        if previous is None or _status_fields(previous[1]) != _status_fields(msg):
+            publisher.publish(msg)
+
+    def remove_status(self, key: Hashable):
+        """Stop repeating the status published for `key`."""
+        with self._status_lock:
+            self._statuses.pop(key, None)
+
+    def _heartbeat_cb(self, msg: Heartbeat):
+        timestamp = msg.timestamp.to_sec()
+        for node_id in msg.node_ids:
+            if node_id in self._watches:
+                self._last_seen[node_id] = timestamp
+
+    def _timer_cb(self, event):
+        now = rospy.Time.now()
+        # Beats arriving while the dict is swapped end up in the next heartbeat
+        beats, self._beats = self._beats, {}
+        if beats:
+            self._publisher.publish(Heartbeat(timestamp=now, node_ids=list(beats)))
+
+        now_sec = now.to_sec()
+        for (node_id, generation), _ in self._wheel.advance(now_sec):
+            watch = self._watches.get(node_id)
+            if watch is None or watch[1] != generation:
+                # Unwatched or watched again since the deadline was scheduled
+                continue
+            deadline = self._last_seen.get(node_id, now_sec) + watch[0]
+            if deadline <= now_sec:
+                self._timed_out[node_id] = True
+            else:
+                self._wheel.schedule((node_id, generation), deadline)
+
+        if (
+            self._last_status_refresh is None
+            or (now - self._last_status_refresh).to_sec() >= self.status_refresh_period
+        ):
+            self._last_status_refresh = now
+            with self._status_lock:
+                statuses = list(self._statuses.values())
+            for publisher, msg in statuses:
+                if hasattr(msg, "timestamp"):
+                    msg.timestamp = now
+                publisher.publish(msg)
+
+
+_multiplexer: Optional[HeartbeatMultiplexer] = None
+_multiplexer_lock = Lock()
+
+
+def get_heartbeat_multiplexer() -> HeartbeatMultiplexer:
+    """
+    Return the heartbeat multiplexer of this process, creating it on first use.
+
+    The topic and period are read from the `capability_heartbeat_topic` and
+    `capability_heartbeat_period_sec` parameters.
+    """
+    global _multiplexer  # pylint: disable=global-statement
+    with _multiplexer_lock:
+        if _multiplexer is None:
+            _multiplexer = HeartbeatMultiplexer(
+                topic=rospy.get_param(
+                    "capability_heartbeat_topic", "~/capabilities/heartbeat"
+                ),
+                period=rospy.get_param("capability_heartbeat_period_sec", 0.1),
+            )
+        return _multiplexer
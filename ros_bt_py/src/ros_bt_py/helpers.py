@@ -28,10 +28,12 @@
 
 
 import sys
+import hashlib
 import jsonpickle
 import logging
 import rospy
 import functools
+import threading
 from collections import OrderedDict
 
 from ros_bt_py_msgs.msg import CapabilityInterface
@@ -161,6 +163,57 @@ def remove_input_output_values(tree):
     return tree
 
 
+def tree_hash(tree):
+    """Compute a hash identifying the structure of a tree message.
+
+    The hash covers the nodes, their options, the types of their inputs and outputs,
+    the data wirings and the public node data. Runtime information, i.e. the tree name,
+    node states and input/output values, is ignored, so the same tree loaded twice has
+    the same hash.
+
+    :param ros_bt_py_msgs.msg.Tree tree: The tree to hash
+
+    :rtype: str
+    :returns: The hex digest of the tree
+    """
+    digest = hashlib.sha256()
+
+    def update(*values):
+        for value in values:
+            digest.update(str(value).encode("utf-8"))
+            digest.update(b"\0")
+
+    update("tree", tree.path, tree.root_name, len(tree.nodes))
+    for node in tree.nodes:
+        update(
+            "node",
+            node.module,
+            node.node_class,
+            node.version,
+            node.max_children,
+            node.name,
+            len(node.child_names),
+            *node.child_names,
+        )
+        update("options", len(node.options))
+        for option in node.options:
+            update(option.key, option.serialized_value, option.serialized_type)
+        update("inputs", len(node.inputs))
+        for node_input in node.inputs:
+            update(node_input.key, node_input.serialized_type)
+        update("outputs", len(node.outputs))
+        for node_output in node.outputs:
+            update(node_output.key, node_output.serialized_type)
+    update("wirings", len(tree.data_wirings))
+    for wiring in tree.data_wirings:
+        for location in (wiring.source, wiring.target):
+            update(location.node_name, location.data_kind, location.data_key)
+    update("public", len(tree.public_node_data))
+    for location in tree.public_node_data:
+        update(location.node_name, location.data_kind, location.data_key)
+    return digest.hexdigest()
+
+
 # handling nested objects,
 # see https://stackoverflow.com/questions/31174295/getattr-and-setattr-on-nested-objects
 def rgetattr(obj, attr, *args):
@@ -220,6 +273,50 @@ def json_decode(data):
     return jsonpickle.decode(data)
 
 
+# Every option, input and output of every node carries its serialized type,
+# and there are only a few distinct types. These tables make sure each one
+# is run through jsonpickle only once per process.
+_serialized_types = {}
+_deserialized_types = {}
+_type_table_lock = threading.Lock()
+
+
+def json_encode_type(data_type):
+    """Like :func:`json_encode`, but looks types up in a process wide table
+
+    All callers share the same (interned) string for the same type.
+    Values that cannot be used as dict keys (e.g. an
+    :class:`ros_bt_py.node_config.OptionRef`) are encoded every time.
+    """
+    try:
+        return _serialized_types[data_type]
+    except KeyError:
+        pass
+    except TypeError:
+        return json_encode(data_type)
+    serialized_type = sys.intern(json_encode(data_type))
+    with _type_table_lock:
+        return _serialized_types.setdefault(data_type, serialized_type)
+
+
+def json_decode_type(serialized_type):
+    """Like :func:`json_decode`, but looks types up in a process wide table
+
+    Only results that are types are remembered, so this is safe to call
+    with any serialized value. Types are never modified, so handing the
+    same object to every caller is fine.
+    """
+    try:
+        return _deserialized_types[serialized_type]
+    except KeyError:
+        pass
+    data = json_decode(serialized_type)
+    if isinstance(data, type):
+        with _type_table_lock:
+            data = _deserialized_types.setdefault(serialized_type, data)
+    return data
+
+
 class MathUnaryOperator(object):
     def __init__(self, operator):
         self.operator = operator
@@ -250,8 +347,8 @@ class HashableCapabilityInterface:
 
     def __eq__(self, other: object) -> bool:
         def compare_node_data_lists(list1: list, list2: list) -> bool:
-            l1_node_data = {(x.key, json_decode(x.serialized_type)) for x in list1}
-            l2_node_data = {(x.key, json_decode(x.serialized_type)) for x in list2}
+            l1_node_data = {(x.key, json_decode_type(x.serialized_type)) for x in list1}
+            l2_node_data = {(x.key, json_decode_type(x.serialized_type)) for x in list2}
 
             return l1_node_data == l2_node_data
 
@@ -274,19 +371,19 @@ class HashableCapabilityInterface:
                 self.interface.name,
                 frozenset(
                     {
-                        (x.key, json_decode(x.serialized_type))
+                        (x.key, json_decode_type(x.serialized_type))
                         for x in self.interface.inputs
                     }
                 ),
                 frozenset(
                     {
-                        (x.key, json_decode(x.serialized_type))
+                        (x.key, json_decode_type(x.serialized_type))
                         for x in self.interface.outputs
                     }
                 ),
                 frozenset(
                     {
-                        (x.key, json_decode(x.serialized_type))
+                        (x.key, json_decode_type(x.serialized_type))
                         for x in self.interface.options
                     }
                 ),
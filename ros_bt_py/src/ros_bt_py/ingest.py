@@ -0,0 +1,137 @@
+# Copyright 2018-2023 FZI Forschungszentrum Informatik
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#    * Redistributions of source code must retain the above copyright
+#      notice, this list of conditions and the following disclaimer.
+#
+#    * Redistributions in binary form must reproduce the above copyright
+#      notice, this list of conditions and the following disclaimer in the
+#      documentation and/or other materials provided with the distribution.
+#
+#    * Neither the name of the FZI Forschungszentrum Informatik nor the names of its
+#      contributors may be used to endorse or promote products derived from
+#      this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+"""
+Single pass ingest of tree messages and files.
+
+Loading a tree that may need migration used to take three steps: `check_node_versions`,
+`MigrationManager.migrate_tree` and `TreeManager.load_tree`. Each step resolved and parsed a
+tree file again, and the migration copied the whole tree for every migrated node.
+:func:`ingest_tree` runs the same stages on a single copy of the tree and reports how long
+each stage took.
+"""
+
+import dataclasses
+import time
+from copy import deepcopy
+from typing import Optional, Tuple
+
+import rospy
+
+from ros_bt_py_msgs.srv import LoadTreeRequest, LoadTreeResponse, MigrateTreeRequest
+
+from ros_bt_py.migration import MigrationManager, tree_needs_migration
+from ros_bt_py.tree_manager import TreeManager, load_tree_from_file
+
+
+@dataclasses.dataclass
+class IngestTimings:
+    """Seconds spent in the stages of :func:`ingest_tree`."""
+
+    parse: float = 0.0
+    version_check: float = 0.0
+    migration: float = 0.0
+    instantiation: float = 0.0
+    migrated: bool = False
+
+    @property
+    def total(self) -> float:
+        """Seconds spent in all stages."""
+        return self.parse + self.version_check + self.migration + self.instantiation
+
+
+def ingest_tree(
+    tree_manager: TreeManager,
+    request: LoadTreeRequest,
+    migration_manager: Optional[MigrationManager] = None,
+    prefix: Optional[str] = None,
+) -> Tuple[LoadTreeResponse, IngestTimings]:
+    """
+    Load a tree into a tree manager, migrating it first if necessary.
+
+    If the migration fails, the unmigrated tree is loaded.
+
+    :param tree_manager: The tree manager to load the tree into.
+    :param request: The tree to load, it may point to a file.
+    :param migration_manager: Used to migrate the tree. If None and the tree needs migration,
+    a migration manager for `tree_manager` is created.
+    :param prefix: Prefix for all node names, see :meth:`TreeManager.load_tree`.
+    :return: The response of loading the tree and the timings of the stages.
+    """
+    timings = IngestTimings()
+
+    start = time.perf_counter()
+    parse_response = load_tree_from_file(MigrateTreeRequest(tree=request.tree))
+    timings.parse = time.perf_counter() - start
+    if not parse_response.success:
+        return (
+            LoadTreeResponse(success=False, error_message=parse_response.error_message),
+            timings,
+        )
+    tree = parse_response.tree
+
+    start = time.perf_counter()
+    needs_migration = tree_needs_migration(tree)
+    timings.version_check = time.perf_counter() - start
+
+    if needs_migration:
+        start = time.perf_counter()
+        # Migrate a single copy, the original is loaded if the migration fails
+        migrated_tree = deepcopy(tree)
+        if migration_manager is None:
+            migration_manager = MigrationManager(tree_manager=tree_manager)
+        migration_response = migration_manager.migrate_loaded_tree(
+            migrated_tree, in_place=True
+        )
+        timings.migration = time.perf_counter() - start
+        if migration_response.success:
+            tree = migrated_tree
+            timings.migrated = migration_response.migrated
+        else:
+            rospy.logwarn(
+                "Failed to migrate tree %s, loading it unmigrated: %s",
+                tree.name,
+                migration_response.error_message,
+            )
+
+    start = time.perf_counter()
+    response = tree_manager.load_tree(
+        LoadTreeRequest(tree=tree, permissive=request.permissive), prefix=prefix
+    )
+    timings.instantiation = time.perf_counter() - start
+
+    rospy.logdebug(
+        "Ingested tree %s in %.4fs (parse: %.4fs, version check: %.4fs, "
+        "migration: %.4fs, instantiation: %.4fs)",
+        tree.name,
+        timings.total,
+        timings.parse,
+        timings.version_check,
+        timings.migration,
+        timings.instantiation,
+    )
+    return response, timings
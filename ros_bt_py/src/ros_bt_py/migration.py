@@ -34,7 +34,7 @@ This includes a versioning system and automated patches.
 import importlib
 import inspect
 from copy import deepcopy
-from typing import Any
+from typing import Any, Dict, Optional, Tuple
 
 try:  # pragma: no cover
     from itertools import izip
@@ -42,21 +42,20 @@ except ImportError:  # pragma: no cover
     izip = zip
 import os
 import sys
+from threading import Lock
 import traceback
 
-import rospkg
 import rospy
 
-from ros_bt_py.tree_manager import get_available_nodes, TreeManager, load_tree_from_file
+from ros_bt_py.tree_manager import TreeManager, load_tree_from_file
 from ros_bt_py.exceptions import MigrationException
 from ros_bt_py.helpers import get_default_value, json_decode
-from ros_bt_py.node import increment_name, load_node_module
+from ros_bt_py.node import Node as BTNode, increment_name, load_node_module
 from ros_bt_py.node_config import OptionRef
 from ros_bt_py.node_data import NodeData
 
 from ros_bt_py_msgs.msg import NodeData as NodeDataMsg, Tree, Node
 from ros_bt_py_msgs.srv import (
-    GetAvailableNodesRequest,
     MigrateTreeResponse,
     MigrateTreeRequest,
 )
@@ -70,6 +69,49 @@ def load_migration_module(package_name):
         return None
 
 
+_node_class_versions: Dict[Tuple[str, str], str] = {}
+"""Versions of the node classes looked up so far, keyed by module and class name."""
+
+
+def loaded_node_version(module: str, node_class: str) -> Optional[str]:
+    """Return the version of a loaded node class, importing its module if necessary.
+
+    Found versions are cached, so the module is only imported and searched once.
+
+    :param module: The module of the node class.
+    :param node_class: The name of the node class.
+    :return: The version of the node class, or None if the class does not exist.
+    """
+    key = (module, node_class)
+    version = _node_class_versions.get(key)
+    if version is None:
+        node_cls = getattr(load_node_module(module), node_class, None)
+        if node_cls is None:
+            return None
+        version = node_cls._node_config.version
+        _node_class_versions[key] = version
+    return version
+
+
+def tree_needs_migration(tree: Tree) -> bool:
+    """Check whether a node of a loaded tree differs from its loaded node class.
+
+    :param tree: A tree message containing nodes.
+    :return: True if a node class is missing or has a different version.
+    """
+    for msg in tree.nodes:
+        version = loaded_node_version(msg.module, msg.node_class)
+        rospy.logdebug(
+            'version in tree: "%s", loaded: "%s"',
+            msg.version,
+            version,
+            logger_name="migration",
+        )
+        if version is None or msg.version != version:
+            return True
+    return False
+
+
 def check_node_versions(request: MigrateTreeRequest) -> MigrateTreeResponse:
     """Check the provided tree against the current version loaded from disk.
 
@@ -86,45 +128,51 @@ def check_node_versions(request: MigrateTreeRequest) -> MigrateTreeResponse:
     if not load_response.success:
         return load_response
 
-    tree = load_response.tree
-
-    perform_migration = False
+    return MigrateTreeResponse(
+        migrated=tree_needs_migration(load_response.tree), success=True
+    )
 
-    for msg in tree.nodes:
-        m = load_node_module(msg.module)
-        c = getattr(m, msg.node_class, None)
-
-        if c is None:
-            perform_migration = True
-        else:
-            rospy.loginfo(
-                'version in tree: "%s", loaded: "%s"',
-                msg.version,
-                c._node_config.version,
-                logger_name="migration",
-            )
 
-            if msg.version != c._node_config.version:
-                perform_migration = True
+class MigrationIndex(object):
+    """Index of the migration classes available for the registered node classes.
 
-    return MigrateTreeResponse(migrated=perform_migration, success=True)
-
-
-class MigrationManager(object):
-    """Checks the loaded node modules for missing version tags, incorrect migrations, etc."""
+    The index is shared by all :class:`MigrationManager` instances of a process (see
+    :func:`get_migration_index`). It is built on first use and only checks node classes that
+    were registered since the last update, e.g. by :func:`ros_bt_py.node.load_node_module`.
+    """
 
-    def __init__(self, tree_manager: TreeManager):
-        """Create a new MigrationManager for a specific TreeManager and its tree."""
-        rospy.loginfo("initializing MigrationManager", logger_name="migration")
-        self.rospack = rospkg.RosPack()
+    def __init__(self):
+        """Create an empty index, node classes are checked by :meth:`update`."""
         self.migrations_classes = {}
-        self.tree_manager = tree_manager
-        response = get_available_nodes(request=GetAvailableNodesRequest())
-        available_nodes = response.available_nodes
-        # sort the list by module then name:
-        available_nodes.sort(key=lambda node: (node.module, node.node_class))
-        for node in available_nodes:
-            self.check_for_available_migration(node)
+        self._checked_node_classes = set()
+        self._generation = None
+        self._lock = Lock()
+
+    def update(self):
+        """Check the node classes that were registered since the last update."""
+        if self._generation == BTNode.node_classes_generation:
+            return
+        with self._lock:
+            generation = BTNode.node_classes_generation
+            new_nodes = []
+            for module, nodes in list(BTNode.node_classes.items()):
+                for class_name, node_classes in list(nodes.items()):
+                    for node_class in node_classes:
+                        key = (module, class_name, node_class._node_config.version)
+                        if key not in self._checked_node_classes:
+                            self._checked_node_classes.add(key)
+                            new_nodes.append(
+                                Node(
+                                    module=module,
+                                    node_class=class_name,
+                                    version=node_class._node_config.version,
+                                )
+                            )
+            # sort the list by module then name:
+            new_nodes.sort(key=lambda node: (node.module, node.node_class))
+            for node in new_nodes:
+                self.check_for_available_migration(node)
+            self._generation = generation
 
     def check_for_available_migration(self, node, old_node=False):
         """Check if any migration for the provided node is available.
@@ -294,6 +342,45 @@ class MigrationManager(object):
                         logger_name="migration",
                     )
 
+
+_migration_index = None
+_migration_index_lock = Lock()
+
+
+def get_migration_index() -> MigrationIndex:
+    """Return the migration index of this process, creating it on first use."""
+    global _migration_index  # pylint: disable=global-statement
+    with _migration_index_lock:
+        if _migration_index is None:
+            _migration_index = MigrationIndex()
+        return _migration_index
+
+
+class MigrationManager(object):
+    """Checks the loaded node modules for missing version tags, incorrect migrations, etc."""
+
+    def __init__(self, tree_manager: TreeManager):
+        """Create a new MigrationManager for a specific TreeManager and its tree.
+
+        The available migrations are looked up in the index shared by all managers, which is
+        only built once a tree is migrated.
+        """
+        self.tree_manager = tree_manager
+        self.index = get_migration_index()
+
+    @property
+    def migrations_classes(self):
+        """Migration classes of the registered node classes, keyed by migration name."""
+        self.index.update()
+        return self.index.migrations_classes
+
+    def check_for_available_migration(self, node, old_node=False):
+        """Check if any migration for the provided node is available.
+
+        See :meth:`MigrationIndex.check_for_available_migration`.
+        """
+        self.index.check_for_available_migration(node, old_node=old_node)
+
     def migrate_tree(self, request: MigrateTreeRequest) -> MigrateTreeResponse:
         """Migrate a tree by applying all available migrations to nodes.
 
@@ -307,12 +394,24 @@ class MigrationManager(object):
         if not load_response.success:
             return load_response
 
-        tree = load_response.tree
+        return self.migrate_loaded_tree(load_response.tree)
+
+    def migrate_loaded_tree(
+        self, tree: Tree, in_place: bool = False
+    ) -> MigrateTreeResponse:
+        """Migrate a tree that has been loaded from its file already.
 
+        :param tree: The tree to be migrated.
+        :param in_place: If True, the migrations modify `tree` and its node messages
+        directly instead of copies of them.
+        :return: Response if the migration was successfull.
+        :rtype: MigrateTreeResponse
+        """
         migration_performed = False
-        modified_tree = deepcopy(tree)
+        modified_tree = tree if in_place else deepcopy(tree)
 
-        for msg in tree.nodes:
+        # Migrations may add nodes to the tree they are working on
+        for msg in list(tree.nodes):
             index = msg.module.rindex(".")
             migrations_module = f"{msg.module[:index]}.migrations{msg.module[index:]}"
             migrations_module_name = f"{migrations_module}.{msg.node_class}"
@@ -328,11 +427,14 @@ class MigrationManager(object):
                 old_version = msg.version
                 migrations_class = getattr(node_module_migrations, msg.node_class, None)
                 try:
-                    m = migrations_class(msg, modified_tree)
+                    m = migrations_class(msg, modified_tree, copy=not in_place)
                     try:
                         new_msg, new_tree = m.migrate()
                         if old_version != new_msg.version:
-                            if modified_tree != new_tree:
+                            if in_place:
+                                # msg and modified_tree have been changed directly
+                                pass
+                            elif modified_tree != new_tree:
                                 # the tree itself has been modified, so update it
                                 modified_tree = new_tree
                             else:
@@ -453,16 +555,18 @@ class Migration:
             )
             return inner_func
 
-    def __init__(self, msg: Node, tree: Tree):
+    def __init__(self, msg: Node, tree: Tree, copy: bool = True):
         """Create a new migration from a Node and a Tree.
 
         :param msg: Node instance to be migrated.
         :type msg: Node
         :param tree: Tree to migrate the node in.
         :type tree: Tree
+        :param copy: If False, `msg` and `tree` are modified directly.
+        :type copy: bool
         """
-        self.msg = deepcopy(msg)
-        self.tree = deepcopy(tree)
+        self.msg = deepcopy(msg) if copy else msg
+        self.tree = deepcopy(tree) if copy else tree
 
     def migrate(self):
         """Migrate the node within the tree."""
@@ -70,7 +70,6 @@ from ros_bt_py_msgs.srv import (
     LoadTreeRequest,
     PrepareLocalImplementationRequest,
     PrepareLocalImplementationResponse,
-    LoadTreeResponse,
     AddNodeRequest,
     AddNodeResponse,
     MoveNodeRequest,
@@ -87,7 +86,6 @@ from ros_bt_py_msgs.srv import (
     GetLocalBid,
     FindBestCapabilityExecutor,
     FindBestCapabilityExecutorRequest,
-    MigrateTreeRequest,
     RequestCapabilityExecution,
     RunRemoteCapabilitySlot,
     RunRemoteCapabilitySlotRequest,
@@ -107,9 +105,11 @@ from ros_bt_py.nodes.sequence import Sequence
 from ros_bt_py.capability import set_capability_io_bridge_id
 from ros_bt_py.debug_manager import DebugManager
 from ros_bt_py.helpers import HashableCapabilityInterface, json_decode
-from ros_bt_py.migration import MigrationManager, check_node_versions
+from ros_bt_py.ingest import ingest_tree
+from ros_bt_py.node_pool import NodePool
 from ros_bt_py.ros_helpers import AsyncServiceProxy
 from ros_bt_py.tree_manager import TreeManager
+from ros_bt_py.tree_transfer import SentTrees, compress_tree
 
 
 @dataclasses.dataclass
@@ -191,6 +191,13 @@ class MissionControl:
             self.prepare_local_capability_implementation,
         )
         self.__prepare_local_implementation_service_lock = RLock()
+        # Implementation trees the remote capability slots already know
+        self.__sent_implementation_trees = SentTrees()
+        # The staging tree managers load the same implementations for every bid,
+        # share their nodes between them
+        self.__staging_node_pool = NodePool(
+            max_size=rospy.get_param("~staging_node_pool_size", 500)
+        )
 
         self._capability_execution_status_subscriber = rospy.Subscriber(
             "~notify_capability_execution_status",
@@ -441,26 +448,13 @@ class MissionControl:
             debug_manager=DebugManager(),
             simulate_tick=True,
             succeed_always=False,
+            node_pool=self.__staging_node_pool,
         )
-        get_local_bid_migration_manager = MigrationManager(
-            tree_manager=get_local_bid_tree_manager
-        )
-
         implementation_utility: Dict[str, float] = {}
         for implementation in valid_implementations:
-            tree = implementation.tree
-
-            migration_request = MigrateTreeRequest(tree=tree)
-            migration_response = check_node_versions(migration_request)
-
-            if migration_response.migrated:
-                migration_response = get_local_bid_migration_manager.migrate_tree(
-                    migration_request
-                )
-                if migration_response.success:
-                    tree = migration_response.tree
-
-            res = get_local_bid_tree_manager.load_tree(LoadTreeRequest(tree=tree))
+            res, _ = ingest_tree(
+                get_local_bid_tree_manager, LoadTreeRequest(tree=implementation.tree)
+            )
             if not res.success:
                 rospy.logerr(
                     "Failed to load implementation for calculating the local bid: "
@@ -651,6 +645,7 @@ class MissionControl:
                 PrepareLocalImplementationRequest(
                     interface=goal.interface,
                     implementation_name=goal.implementation_name,
+                    compress=True,
                 )
             )
         )
@@ -710,25 +705,17 @@ class MissionControl:
             f"Send goal to {run_remote_capability_slot_topic}",
             logger_name="remote_capability_execution",
         )
-        run_remote_capability_slot_service_proxy.call_service(
-            RunRemoteCapabilitySlotRequest(
-                implementation_tree=response.implementation_subtree,
-                interface=goal.interface,
-                node_id=goal.node_id,
-            )
+        compressed_tree = response.compressed_implementation_subtree
+        run_request = RunRemoteCapabilitySlotRequest(
+            compressed_implementation_tree=self.__sent_implementation_trees.message_for(
+                run_remote_capability_slot_topic, compressed_tree
+            ),
+            interface=goal.interface,
+            node_id=goal.node_id,
         )
-        try:
-            response: Optional[
-                RunRemoteCapabilitySlotResponse
-            ] = self.__handle_async_service_call(
-                run_remote_capability_slot_service_proxy
-            )
-        except RuntimeError as exc:
-            rospy.logerr(
-                f"Failed to execute remote capability: {exc}",
-                logger_name="remote_capability_execution",
-            )
-            return
+        full_tree_sent = bool(run_request.compressed_implementation_tree.data)
+        run_remote_capability_slot_service_proxy.call_service(run_request)
+        response: Optional[RunRemoteCapabilitySlotResponse] = None
 
         expended_costs = 0
 
@@ -797,6 +784,23 @@ class MissionControl:
                 )
                 return
 
+            if response is not None and response.unknown_tree and not full_tree_sent:
+                # The slot does not know the implementation tree (anymore),
+                # send it in full.
+                run_request.compressed_implementation_tree = compressed_tree
+                full_tree_sent = True
+                run_remote_capability_slot_service_proxy.call_service(run_request)
+                response = None
+
+        if response.unknown_tree:
+            self.__sent_implementation_trees.forget(
+                run_remote_capability_slot_topic, compressed_tree.hash
+            )
+        else:
+            self.__sent_implementation_trees.mark_sent(
+                run_remote_capability_slot_topic, compressed_tree.hash
+            )
+
         self.__execute_remote_capability_action_server.publish_result(
             status=GoalStatus(
                 goal_id=goal_handle.get_goal_id(), status=GoalStatus.SUCCEEDED
@@ -1084,9 +1088,7 @@ class MissionControl:
                 publish_debug_settings_callback=nop,
                 publish_node_diagnostics_callback=nop,
                 debug_manager=DebugManager(),
-            )
-            prepare_local_implementation_migration_manager = MigrationManager(
-                tree_manager=prepare_local_implementation_tree_manager
+                node_pool=self.__staging_node_pool,
             )
 
             with self.__get_capability_implementations_proxy_lock:
@@ -1108,24 +1110,12 @@ class MissionControl:
                 response.error_message = "Could not get local implementation!"
                 return response
 
-            tree = implementation.tree
-
-            migration_request = MigrateTreeRequest(tree=tree)
-            migration_response = check_node_versions(migration_request)
-
-            if migration_response.migrated:
-                migration_response = (
-                    prepare_local_implementation_migration_manager.migrate_tree(
-                        migration_request
-                    )
-                )
-                if migration_response.success:
-                    tree = migration_response.tree
-
-            service_response: LoadTreeResponse = (
-                prepare_local_implementation_tree_manager.load_tree(
-                    LoadTreeRequest(tree=tree)
-                )
+            service_response, timings = ingest_tree(
+                prepare_local_implementation_tree_manager,
+                LoadTreeRequest(tree=implementation.tree),
+            )
+            rospy.logdebug(
+                f"Loaded implementation {implementation.name} in {timings.total:.4f}s"
             )
             if not service_response.success:
                 response.success = False
@@ -1211,9 +1201,14 @@ class MissionControl:
                 rospy.logdebug(f"Precondition: {precondition} is fulfilled")
 
             response.success = True
-            response.implementation_subtree = (
-                prepare_local_implementation_tree_manager.tree_msg
-            )
+            if request.compress:
+                response.compressed_implementation_subtree = compress_tree(
+                    prepare_local_implementation_tree_manager.tree_msg
+                )
+            else:
+                response.implementation_subtree = (
+                    prepare_local_implementation_tree_manager.tree_msg
+                )
             return response
 
     def get_available_remote_capability_slots(
@@ -48,7 +48,7 @@ from ros_bt_py.debug_manager import DebugManager
 from ros_bt_py.exceptions import BehaviorTreeException, NodeStateError, NodeConfigError
 from ros_bt_py.node_data import NodeData, NodeDataMap
 from ros_bt_py.node_config import NodeConfig, OptionRef
-from ros_bt_py.helpers import get_default_value, json_decode
+from ros_bt_py.helpers import get_default_value, json_decode_type
 
 
 def _check_node_data_match(
@@ -70,7 +70,7 @@ def _set_data_port(
     try:
         for msg in configuration:
             try:
-                data_map[msg.key] = json_decode(msg.serialized_value)
+                data_map[msg.key] = json_decode_type(msg.serialized_value)
             except KeyError as exc:
                 rospy.logwarn(f"Could not set a non existing {type} {str(exc)}")
             except AttributeError as exc:
@@ -211,6 +211,9 @@ def define_bt_node(node_config):
                     ].append(node_class)
                 else:
                     rospy.logdebug("Node class is already registered with this config!")
+        # Only count the class once it is registered, readers that see the new
+        # generation must also see the class
+        Node.node_classes_generation += 1
         return node_class
 
     return inner_dec
@@ -319,6 +322,9 @@ class Node(object):
         yield
 
     node_classes = {}
+    # Incremented whenever a class is added to node_classes, so caches of the
+    # registry can tell when they are outdated
+    node_classes_generation = 0
     _node_config = None
     permissive = False
 
@@ -373,13 +379,13 @@ class Node(object):
         if not self._node_config:
             raise NodeConfigError("Missing node_config, cannot initialize!")
 
-        # Copy the class NodeConfig so we can mess with it (but we
-        # only should in very rare cases!)
-        self.node_config = deepcopy(self._node_config)
+        # All nodes of a class share the class NodeConfig until one of them
+        # accesses node_config, see there
+        self._own_node_config = None
 
         self.options = NodeDataMap(name="options")
         self._register_node_data(
-            source_map=self.node_config.options,
+            source_map=self._config.options,
             target_map=self.options,
             values=options,
             permissive=self.permissive,
@@ -392,7 +398,7 @@ class Node(object):
         if unset_option_keys:
             optional_keys = []
             for key in unset_option_keys:
-                if key in self.node_config.optional_options:
+                if key in self._config.optional_options:
                     optional_keys.append(key)
             if unset_option_keys == optional_keys:
                 rospy.logwarn("missing optional keys: %s", optional_keys)
@@ -406,18 +412,65 @@ class Node(object):
                 raise ValueError(f"Extra options: {str(extra_option_keys)}")
 
         self.inputs = NodeDataMap(name="inputs")
-        self._register_node_data(
-            source_map=self.node_config.inputs, target_map=self.inputs
-        )
+        self._register_node_data(source_map=self._config.inputs, target_map=self.inputs)
 
         self.outputs = NodeDataMap(name="outputs")
         self._register_node_data(
-            source_map=self.node_config.outputs, target_map=self.outputs
+            source_map=self._config.outputs, target_map=self.outputs
         )
 
         # Don't setup automatically - nodes should be available as pure data
         # containers before the user decides to call setup() themselves!
 
+    @property
+    def node_config(self) -> NodeConfig:
+        """The interface of this node.
+
+        Nodes that change their interface at runtime (e.g. by calling `extend()` like
+        :class:`ros_bt_py.nodes.subtree.Subtree`) need a config of their own, so the
+        class NodeConfig is copied the first time this is accessed. Until then, all nodes
+        of a class share one NodeConfig.
+        """
+        if self._own_node_config is None:
+            self._own_node_config = deepcopy(self._node_config)
+        return self._own_node_config
+
+    @node_config.setter
+    def node_config(self, node_config: NodeConfig):
+        self._own_node_config = node_config
+
+    def _reset_for_reuse(
+        self, name: Optional[str] = None, debug_manager: Optional[DebugManager] = None
+    ):
+        """Return a node that was shut down to the state it had right after `__init__()`.
+
+        Used by :class:`ros_bt_py.node_pool.NodePool`. The options are kept, all inputs
+        and outputs are set to `None` and the node is neither wired nor part of a tree.
+        """
+        self.name = name if name is not None else type(self).__name__
+        self.parent = None
+        self.state = NodeMsg.UNINITIALIZED
+        self.children = []
+        self.subscriptions = []
+        self.subscribers = []
+        self.debug_manager = debug_manager
+        self.succeed_always = False
+        self.simulate_tick = False
+
+        self.options.callbacks = {}
+        for data_map in (self.inputs, self.outputs):
+            data_map.callbacks = {}
+            for key in data_map:
+                data_map[key] = None
+            data_map.reset_updated()
+
+    @property
+    def _config(self) -> NodeConfig:
+        """Read-only access to the NodeConfig that does not copy the class NodeConfig."""
+        if self._own_node_config is None:
+            return self._node_config
+        return self._own_node_config
+
     @property
     def state(self) -> str:
         """State of the node."""
@@ -486,7 +539,7 @@ class Node(object):
             if self.inputs[input_name] is None:
                 # Omit the Error if we declared it to be "okay"
                 # This might still not be the best solution but enables some flexibility
-                if input_name not in self.node_config.optional_options:
+                if input_name not in self._config.optional_options:
                     raise ValueError(
                         f"Trying to tick a node ({self.name}) with an unset input ({input_name})!"
                     )
@@ -524,7 +577,7 @@ class Node(object):
             for option_name in self.options:
                 if (
                     not self.options.is_updated(option_name)
-                    and option_name not in self.node_config.optional_options
+                    and option_name not in self._config.optional_options
                 ):
                     unset_options.append(option_name)
             if unset_options:
@@ -812,12 +865,12 @@ class Node(object):
         child of the same name already exists
         """
         if (
-            self.node_config.max_children is not None
-            and len(self.children) == self.node_config.max_children
+            self._config.max_children is not None
+            and len(self.children) == self._config.max_children
         ):
             error_msg = (
                 "Trying to add child when maximum number of "
-                "children (%d) is already present" % self.node_config.max_children
+                "children (%d) is already present" % self._config.max_children
             )
             self.logerr(error_msg)
             raise BehaviorTreeException(error_msg)
@@ -1162,7 +1215,7 @@ class Node(object):
         options_dict = {}
         try:
             for option in msg.options:
-                options_dict[option.key] = json_decode(option.serialized_value)
+                options_dict[option.key] = json_decode_type(option.serialized_value)
         except ValueError as exc:
             raise BehaviorTreeException(
                 f"Failed to instantiate node from message: {str(exc)}"
@@ -1552,7 +1605,7 @@ class Node(object):
         return NodeMsg(
             module=node_type.__module__,
             node_class=node_type.__name__,
-            version=self.node_config.version,
+            version=self._config.version,
             name=self.name,
             child_names=[child.name for child in self.children],
             options=[
@@ -1580,8 +1633,8 @@ class Node(object):
                 for key in self.outputs
             ],
             max_children=(
-                self.node_config.max_children
-                if self.node_config.max_children is not None
+                self._config.max_children
+                if self._config.max_children is not None
                 else -1
             ),
             state=self.state,
@@ -29,7 +29,7 @@
 
 import rospy
 
-from ros_bt_py.helpers import loglevel_is, json_encode, json_decode
+from ros_bt_py.helpers import loglevel_is, json_encode, json_encode_type
 
 try:  # pragma: no cover
     basestring
@@ -58,10 +58,21 @@ class NodeData(object):
     update (the initial value, if not empty, counts as an update!)
     """
 
+    # Trees can contain thousands of NodeData objects, so avoid a __dict__ per object
+    __slots__ = (
+        "updated",
+        "_value",
+        "_serialized_value",
+        "_static",
+        "data_type",
+        "_serialized_type",
+    )
+
     def __init__(self, data_type, initial_value=None, static=False):
         self.updated = False
         self._value = None
-        self._serialized_value = json_encode(None)
+        # Serialized lazily by get_serialized()
+        self._serialized_value = None
         self._static = static
 
         # Relax type checking for string types
@@ -70,7 +81,7 @@ class NodeData(object):
         else:
             self.data_type = data_type
 
-        self._serialized_type = json_encode(self.data_type)
+        self._serialized_type = json_encode_type(self.data_type)
 
         # use set here to ensure initial_value is the right type
         # this also sets updated to True
@@ -138,7 +149,7 @@ class NodeData(object):
                     % (self.data_type.__name__, type(new_value).__name__)
                 )
         if self._serialized_value is not None and new_value != self._value:
-            self._serialized_value = json_encode(new_value)
+            self._serialized_value = None
         self._value = new_value
         self.set_updated()
 
@@ -182,6 +193,8 @@ class NodeDataMap(object):
     be used as callbacks elsewhere, leading to unexpected breakage!
     """
 
+    __slots__ = ("name", "_map", "callbacks")
+
     def __init__(self, name="data"):
         self.name = name
         self._map = {}
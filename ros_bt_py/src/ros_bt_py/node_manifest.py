@@ -0,0 +1,205 @@
+# Copyright 2018-2023 FZI Forschungszentrum Informatik
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#    * Redistributions of source code must retain the above copyright
+#      notice, this list of conditions and the following disclaimer.
+#
+#    * Redistributions in binary form must reproduce the above copyright
+#      notice, this list of conditions and the following disclaimer in the
+#      documentation and/or other materials provided with the distribution.
+#
+#    * Neither the name of the FZI Forschungszentrum Informatik nor the names of its
+#      contributors may be used to endorse or promote products derived from
+#      this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+
+"""On-disk manifest of the node classes defined by node modules.
+
+Importing every configured node module at startup is slow, although a tree usually only
+uses a few of them. The manifest stores the documentation of the node classes of each
+module, so a process can list them without importing the module. The module is only
+imported once :meth:`ros_bt_py.node.Node.from_msg` instantiates one of its classes.
+"""
+import importlib.util
+import json
+import os
+from typing import List, Optional
+
+import rospkg
+import rospy
+
+from ros_bt_py_msgs.msg import DocumentedNode, NodeData
+
+from ros_bt_py.node import Node, load_node_module
+from ros_bt_py.tree_manager import document_node_class, get_node_catalogue
+
+MANIFEST_FORMAT = 1
+
+
+def default_manifest_path() -> str:
+    """Return the default location of the manifest in the ROS home directory."""
+    return os.path.join(rospkg.get_ros_home(), "ros_bt_py", "node_manifest.json")
+
+
+def _source_stamp(module_name: str) -> Optional[List]:
+    """Identify the current state of a module's source file without importing it.
+
+    Only the module's own file is considered. Parent packages are imported by the lookup.
+    """
+    try:
+        spec = importlib.util.find_spec(module_name)
+    except (ImportError, ValueError, AttributeError):
+        return None
+    if spec is None or not spec.has_location or not spec.origin:
+        return None
+    try:
+        stat = os.stat(spec.origin)
+    except OSError:
+        return None
+    return [spec.origin, stat.st_mtime_ns, stat.st_size]
+
+
+def _node_data_to_list(node_data):
+    return [[data.key, data.serialized_value] for data in node_data]
+
+
+def _node_data_from_list(node_data):
+    return [NodeData(key=key, serialized_value=value) for key, value in node_data]
+
+
+def _node_to_dict(node: DocumentedNode) -> dict:
+    return {
+        "module": node.module,
+        "node_class": node.node_class,
+        "version": node.version,
+        "max_children": node.max_children,
+        "options": _node_data_to_list(node.options),
+        "inputs": _node_data_to_list(node.inputs),
+        "outputs": _node_data_to_list(node.outputs),
+        "doc": node.doc,
+        "tags": list(node.tags),
+    }
+
+
+def _node_from_dict(node: dict) -> DocumentedNode:
+    return DocumentedNode(
+        module=node["module"],
+        node_class=node["node_class"],
+        version=node["version"],
+        max_children=node["max_children"],
+        name=node["node_class"],
+        options=_node_data_from_list(node["options"]),
+        inputs=_node_data_from_list(node["inputs"]),
+        outputs=_node_data_from_list(node["outputs"]),
+        doc=node["doc"],
+        tags=node["tags"],
+    )
+
+
+class NodeManifest(object):
+    """Documentation of the node classes of node modules, cached in a JSON file.
+
+    Entries are keyed by module name and only used while the module's source file has the
+    same path, modification time and size as when the entry was written.
+    """
+
+    def __init__(self, path: str):
+        """Read the manifest at `path`, a missing or invalid file yields an empty manifest."""
+        self.path = path
+        self._modules = {}
+        self._changed = False
+        try:
+            with open(path, "r") as manifest_file:
+                manifest = json.load(manifest_file)
+            if manifest.get("format") == MANIFEST_FORMAT:
+                self._modules = manifest["modules"]
+        except (OSError, ValueError, KeyError, AttributeError) as exc:
+            rospy.logdebug(f"Not using node manifest {path}: {exc}")
+
+    def nodes(self, module_name: str) -> Optional[List[DocumentedNode]]:
+        """Return the node classes of a module, or None if the entry is missing or outdated."""
+        entry = self._modules.get(module_name)
+        if entry is None or entry["stamp"] != _source_stamp(module_name):
+            return None
+        return [_node_from_dict(node) for node in entry["nodes"]]
+
+    def add(self, module_name: str, nodes: List[DocumentedNode]):
+        """Store the node classes of a module that has been imported."""
+        stamp = _source_stamp(module_name)
+        if stamp is None:
+            return
+        self._modules[module_name] = {
+            "stamp": stamp,
+            "nodes": [_node_to_dict(node) for node in nodes],
+        }
+        self._changed = True
+
+    def save(self):
+        """Write the manifest back to disk if entries were added."""
+        if not self._changed:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w") as manifest_file:
+                json.dump(
+                    {"format": MANIFEST_FORMAT, "modules": self._modules}, manifest_file
+                )
+            os.replace(tmp_path, self.path)
+            self._changed = False
+        except OSError as exc:
+            rospy.logwarn(f"Failed to write node manifest {self.path}: {exc}")
+
+
+def load_node_modules_lazily(
+    module_names: List[str], manifest_path: Optional[str] = None
+) -> List[str]:
+    """Make the node classes of the given modules available, importing as few as possible.
+
+    Modules with a current manifest entry are only added to the node catalogue, they are
+    imported when a tree instantiates one of their classes. All other modules are imported
+    right away and their manifest entries are updated.
+
+    :param module_names: Names of the node modules to load.
+    :param manifest_path: Path of the manifest, defaults to :func:`default_manifest_path`.
+    :returns: The names of the modules that could not be imported.
+    """
+    manifest = NodeManifest(manifest_path or default_manifest_path())
+    catalogue = get_node_catalogue()
+    failed_modules = []
+    for module_name in module_names:
+        if not module_name:
+            continue
+        nodes = manifest.nodes(module_name)
+        if nodes is not None:
+            catalogue.add_unloaded_nodes(nodes)
+            continue
+        if load_node_module(module_name) is None:
+            failed_modules.append(module_name)
+            continue
+        manifest.add(
+            module_name,
+            [
+                document_node_class(module_name, class_name, node_class)
+                for (class_name, node_classes) in Node.node_classes.get(
+                    module_name, {}
+                ).items()
+                for node_class in node_classes
+            ],
+        )
+    manifest.save()
+    return failed_modules
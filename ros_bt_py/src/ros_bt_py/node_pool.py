@@ -0,0 +1,153 @@
+# Copyright 2018-2023 FZI Forschungszentrum Informatik
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#    * Redistributions of source code must retain the above copyright
+#      notice, this list of conditions and the following disclaimer.
+#
+#    * Redistributions in binary form must reproduce the above copyright
+#      notice, this list of conditions and the following disclaimer in the
+#      documentation and/or other materials provided with the distribution.
+#
+#    * Neither the name of the FZI Forschungszentrum Informatik nor the names of its
+#      contributors may be used to endorse or promote products derived from
+#      this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+"""Reuse node instances when trees are loaded again.
+
+Loading a tree creates every node from its message, and clearing the tree throws them
+all away. A :class:`NodePool` keeps the nodes of a cleared tree and hands them out
+again when a node of the same class with the same options is loaded, so reloading the
+same trees over and over does not construct new nodes every time.
+"""
+from threading import Lock
+from typing import Iterable, Optional
+
+from ros_bt_py_msgs.msg import Node as NodeMsg
+
+from ros_bt_py.debug_manager import DebugManager
+from ros_bt_py.node import Node, _set_data_port
+
+
+def _pool_key_from_msg(msg: NodeMsg):
+    return (
+        msg.module,
+        msg.node_class,
+        tuple(sorted((option.key, option.serialized_value) for option in msg.options)),
+    )
+
+
+def _pool_key_from_node(node: Node):
+    return (
+        type(node).__module__,
+        type(node).__name__,
+        tuple(sorted((key, node.options.get_serialized(key)) for key in node.options)),
+    )
+
+
+class NodePool(object):
+    """Shut down nodes that can be reused instead of creating new ones.
+
+    Nodes are pooled by class and option values, so a node handed out by
+    :meth:`acquire` has the same interface as the one :meth:`Node.from_msg` would create.
+    Only nodes of classes without their own `__init__()` are pooled, because the pool
+    cannot repeat whatever such a constructor does.
+
+    All methods are thread-safe, so several tree managers can share one pool.
+    """
+
+    def __init__(self, max_size: int = 1000):
+        """
+        :param max_size: The maximum number of nodes kept in the pool. Once it is full,
+        released nodes are dropped.
+        """
+        self.max_size = max_size
+        self._nodes = {}
+        self._size = 0
+        self._lock = Lock()
+
+    def __len__(self):
+        with self._lock:
+            return self._size
+
+    @staticmethod
+    def can_pool(node: Node) -> bool:
+        """Check whether `node` can be reused once its tree is cleared."""
+        return type(node).__init__ is Node.__init__ and node.state in (
+            NodeMsg.UNINITIALIZED,
+            NodeMsg.SHUTDOWN,
+        )
+
+    def release(self, nodes: Iterable[Node]) -> int:
+        """Put nodes that are no longer part of a tree into the pool.
+
+        The nodes must not be used by their previous owner afterwards.
+
+        :returns: The number of nodes that were added to the pool.
+        """
+        added = 0
+        with self._lock:
+            for node in nodes:
+                if self._size >= self.max_size:
+                    break
+                if not self.can_pool(node):
+                    continue
+                self._nodes.setdefault(_pool_key_from_node(node), []).append(node)
+                self._size += 1
+                added += 1
+        return added
+
+    def acquire(
+        self,
+        msg: NodeMsg,
+        debug_manager: Optional[DebugManager] = None,
+        permissive: bool = False,
+    ) -> Optional[Node]:
+        """Take a node matching `msg` from the pool.
+
+        The node is reset and its inputs and outputs are set from `msg`, just like
+        :meth:`Node.from_msg` would do.
+
+        :returns: The node, or `None` if the pool holds no matching node.
+        """
+        key = _pool_key_from_msg(msg)
+        with self._lock:
+            nodes = self._nodes.get(key, [])
+            # Messages without a version take any version, like Node.from_msg does
+            index = next(
+                (
+                    index
+                    for index, node in enumerate(nodes)
+                    if not msg.version or node._config.version == msg.version
+                ),
+                None,
+            )
+            if index is None:
+                return None
+            node = nodes.pop(index)
+            if not nodes:
+                del self._nodes[key]
+            self._size -= 1
+
+        node._reset_for_reuse(name=msg.name or None, debug_manager=debug_manager)
+        _set_data_port(node.inputs, msg.inputs, "input", permissive)
+        _set_data_port(node.outputs, msg.outputs, "output", permissive)
+        return node
+
+    def clear(self):
+        """Drop all pooled nodes."""
+        with self._lock:
+            self._nodes = {}
+            self._size = 0
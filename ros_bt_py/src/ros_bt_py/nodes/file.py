@@ -33,6 +33,7 @@ import rospkg
 
 from ros_bt_py_msgs.msg import Node as NodeMsg
 
+from ros_bt_py.file_cache import get_file_cache, resolve_path
 from ros_bt_py.node import Leaf, define_bt_node
 from ros_bt_py.node_config import NodeConfig
 
@@ -44,31 +45,21 @@ class LoadFileError(Exception):
 
 
 def load_file(path):
-    """Load a file from a ROS url."""
-    rospack = rospkg.RosPack()
-    file_path = ""
-    if path.startswith("file://"):
-        file_path = path[len("file://") :]
-    elif path.startswith("package://"):
-        package_name = path[len("package://") :].split("/", 1)[0]
-        package_path = rospack.get_path(package_name)
-        file_path = package_path + path[len("package://") + len(package_name) :]
-    else:
-        raise LoadFileError(
-            f'File path "{path}" is malformed.'
-            'It needs to start with either "file://" or "package://"'
-        )
+    """Load a file from a ROS url.
+
+    Files are parsed once and then served from the shared
+    :class:`ros_bt_py.file_cache.FileCache` until they change.
+    """
     try:
-        data_file = open(file_path, "r")
-    except IOError as ex:
-        error_msg = f"Error opening file {file_path}: {str(ex)}"
-        raise LoadFileError(error_msg)
-    with data_file:
-        try:
-            data = yaml.safe_load(data_file)
-        except yaml.YAMLError as ex:
-            raise LoadFileError(f"Yaml error in file {file_path}: {str(ex)}")
-    return data
+        file_path = resolve_path(path)
+    except (ValueError, rospkg.ResourceNotFound) as ex:
+        raise LoadFileError(str(ex))
+    try:
+        return get_file_cache().load_yaml(file_path)
+    except (IOError, ValueError) as ex:
+        raise LoadFileError(f"Error opening file {file_path}: {str(ex)}")
+    except yaml.YAMLError as ex:
+        raise LoadFileError(f"Yaml error in file {file_path}: {str(ex)}")
 
 
 @define_bt_node(
@@ -32,6 +32,9 @@ from ros_bt_py_msgs.msg import Node as NodeMsg
 from ros_bt_py.node import Leaf, define_bt_node
 from ros_bt_py.node_config import NodeConfig
 
+from _string import formatter_field_name_split
+from functools import lru_cache
+from operator import itemgetter
 from string import Formatter
 import os
 
@@ -71,6 +74,126 @@ class ExtendedFormatter(Formatter):
 myformatter = ExtendedFormatter()
 
 
+def _compile_getter(field_name):
+    """Compile the lookup of `field_name`, `None` for positional fields."""
+    first, rest = formatter_field_name_split(field_name)
+    if not isinstance(first, str) or not first:
+        return None
+    accessors = list(rest)
+    if not accessors:
+        return itemgetter(first)
+
+    def get(values):
+        value = values[first]
+        for is_attribute, key in accessors:
+            value = getattr(value, key) if is_attribute else value[key]
+        return value
+
+    return get
+
+
+def _compile_conversion(conversion):
+    """Compile a conversion of :class:`ExtendedFormatter`, `None` if it does nothing."""
+    if conversion == "u":
+        return lambda value: str(value).upper()
+    if conversion == "l":
+        return lambda value: str(value).lower()
+    if conversion == "c":
+        return lambda value: str(value).capitalize()
+    # ExtendedFormatter only checks that the default conversions exist,
+    # it does not apply them
+    myformatter.convert_field(None, conversion)
+    return None
+
+
+class CompiledFormatList(object):
+    """A list of format strings parsed into the steps needed to render them.
+
+    Renders the same strings as :func:`ExtendedFormatter.format` with the values
+    passed as keyword arguments, but each field is only looked up and converted once
+    for all format strings. Format strings that need features the compiled form does
+    not cover (positional fields and nested fields in format specs) are rendered by
+    `myformatter`.
+
+    :raises: ValueError if a format string is invalid.
+    """
+
+    def __init__(self, format_strings):
+        self.format_strings = tuple(format_strings)
+        self._fields = []
+        field_indices = {}
+        self._templates = []
+        for format_string in self.format_strings:
+            template = []
+            for literal, field_name, format_spec, conversion in myformatter.parse(
+                format_string
+            ):
+                if literal:
+                    template.append(literal)
+                if field_name is None:
+                    continue
+                getter = _compile_getter(field_name)
+                if getter is None or "{" in format_spec:
+                    template = None
+                    break
+                key = (field_name, conversion)
+                if key not in field_indices:
+                    field_indices[key] = len(self._fields)
+                    self._fields.append((getter, _compile_conversion(conversion)))
+                template.append((field_indices[key], format_spec))
+            self._templates.append(template)
+
+    def render(self, values):
+        """Render all format strings with `values`, a dict of the field values."""
+        resolved = self._resolve(values)
+        return [
+            self._render_template(template, format_string, resolved, values)
+            for template, format_string in zip(self._templates, self.format_strings)
+        ]
+
+    def _resolve(self, values):
+        return [
+            getter(values) if convert is None else convert(getter(values))
+            for getter, convert in self._fields
+        ]
+
+    @staticmethod
+    def _render_template(template, format_string, resolved, values):
+        if template is None:
+            return myformatter.format(format_string, **values)
+        return "".join(
+            [
+                part if type(part) is str else format(resolved[part[0]], part[1])
+                for part in template
+            ]
+        )
+
+
+class CompiledFormat(CompiledFormatList):
+    """A single format string parsed into the steps needed to render it."""
+
+    def __init__(self, format_string):
+        super(CompiledFormat, self).__init__([format_string])
+
+    def render(self, values):
+        """Render the format string with `values`, a dict of the field values."""
+        return self._render_template(
+            self._templates[0], self.format_strings[0], self._resolve(values), values
+        )
+
+
+@lru_cache(maxsize=1024)
+def compile_format(format_string):
+    """Return the shared :class:`CompiledFormat` of `format_string`."""
+    return CompiledFormat(format_string)
+
+
+@lru_cache(maxsize=1024)
+def compile_format_list(format_strings):
+    """Return the shared :class:`CompiledFormatList` of a tuple of format strings."""
+    return CompiledFormatList(format_strings)
+
+
 @define_bt_node(
     NodeConfig(
         version="0.9.0",
@@ -121,19 +244,31 @@ class FormatOptionNode(Leaf):
 
     results in the following output:
     formatted_string: 'foo bar'
+
+    The format string is parsed once on setup and the output is only
+    formatted again when `dict` changes.
     """
 
     def _do_setup(self):
+        self._result = None
+        try:
+            self._format = compile_format(self.options["format_string"])
+        except Exception:
+            self._format = None
         return NodeMsg.IDLE
 
     def _do_tick(self):
+        if self._result is not None and not self.inputs.is_updated("dict"):
+            return self._result
+        self._result = NodeMsg.FAILED
+        if self._format is None:
+            return self._result
         try:
-            self.outputs["formatted_string"] = myformatter.format(
-                self.options["format_string"], **self.inputs["dict"]
-            )
+            self.outputs["formatted_string"] = self._format.render(self.inputs["dict"])
         except Exception:
-            return NodeMsg.FAILED
-        return NodeMsg.SUCCEEDED
+            return self._result
+        self._result = NodeMsg.SUCCEEDED
+        return self._result
 
     def _do_untick(self):
         return NodeMsg.IDLE
@@ -142,6 +277,7 @@ class FormatOptionNode(Leaf):
         pass
 
     def _do_reset(self):
+        self._result = None
         self.outputs["formatted_string"] = None
         self.outputs.reset_updated()
         return NodeMsg.IDLE
@@ -166,19 +302,31 @@ class FormatInputNode(Leaf):
 
     results in the following output:
     formatted_string: 'foo bar'
+
+    The format string is parsed when it changes and the output is only
+    formatted again when one of the inputs changes.
     """
 
     def _do_setup(self):
+        self._result = None
         return NodeMsg.IDLE
 
     def _do_tick(self):
+        if (
+            self._result is not None
+            and not self.inputs.is_updated("dict")
+            and not self.inputs.is_updated("format_string")
+        ):
+            return self._result
+        self._result = NodeMsg.FAILED
         try:
-            self.outputs["formatted_string"] = myformatter.format(
-                self.inputs["format_string"], **self.inputs["dict"]
-            )
+            self.outputs["formatted_string"] = compile_format(
+                self.inputs["format_string"]
+            ).render(self.inputs["dict"])
         except Exception:
-            return NodeMsg.FAILED
-        return NodeMsg.SUCCEEDED
+            return self._result
+        self._result = NodeMsg.SUCCEEDED
+        return self._result
 
     def _do_untick(self):
         return NodeMsg.IDLE
@@ -187,6 +335,7 @@ class FormatInputNode(Leaf):
         pass
 
     def _do_reset(self):
+        self._result = None
         self.outputs["formatted_string"] = None
         self.outputs.reset_updated()
         return NodeMsg.IDLE
@@ -211,20 +360,33 @@ class FormatOptionListNode(Leaf):
 
     results in the following output:
     formatted_strings: ['foo bar', 'bar bar']
+
+    The format strings are parsed once on setup and the output is only
+    formatted again when `dict` changes.
     """
 
     def _do_setup(self):
+        self._result = None
+        try:
+            self._formats = compile_format_list(tuple(self.options["format_strings"]))
+        except Exception:
+            self._formats = None
         return NodeMsg.IDLE
 
     def _do_tick(self):
+        if self._result is not None and not self.inputs.is_updated("dict"):
+            return self._result
+        self._result = NodeMsg.FAILED
+        if self._formats is None:
+            return self._result
         try:
-            self.outputs["formatted_strings"] = [
-                myformatter.format(phrase, **self.inputs["dict"])
-                for phrase in self.options["format_strings"]
-            ]
+            self.outputs["formatted_strings"] = self._formats.render(
+                self.inputs["dict"]
+            )
         except Exception:
-            return NodeMsg.FAILED
-        return NodeMsg.SUCCEEDED
+            return self._result
+        self._result = NodeMsg.SUCCEEDED
+        return self._result
 
     def _do_untick(self):
         return NodeMsg.IDLE
@@ -233,6 +395,7 @@ class FormatOptionListNode(Leaf):
         pass
 
     def _do_reset(self):
+        self._result = None
         self.outputs["formatted_strings"] = None
         self.outputs.reset_updated()
         return NodeMsg.IDLE
@@ -257,20 +420,31 @@ class FormatInputListNode(Leaf):
 
     results in the following output:
     formatted_strings: ['foo bar', 'bar bar']
+
+    The format strings are parsed when they change and the output is only
+    formatted again when one of the inputs changes.
     """
 
     def _do_setup(self):
+        self._result = None
         return NodeMsg.IDLE
 
     def _do_tick(self):
+        if (
+            self._result is not None
+            and not self.inputs.is_updated("dict")
+            and not self.inputs.is_updated("format_strings")
+        ):
+            return self._result
+        self._result = NodeMsg.FAILED
         try:
-            self.outputs["formatted_strings"] = [
-                myformatter.format(phrase, **self.inputs["dict"])
-                for phrase in self.inputs["format_strings"]
-            ]
+            self.outputs["formatted_strings"] = compile_format_list(
+                tuple(self.inputs["format_strings"])
+            ).render(self.inputs["dict"])
         except Exception:
-            return NodeMsg.FAILED
-        return NodeMsg.SUCCEEDED
+            return self._result
+        self._result = NodeMsg.SUCCEEDED
+        return self._result
 
     def _do_untick(self):
         return NodeMsg.IDLE
@@ -279,6 +453,7 @@ class FormatInputListNode(Leaf):
         pass
 
     def _do_reset(self):
+        self._result = None
         self.outputs["formatted_strings"] = None
         self.outputs.reset_updated()
         return NodeMsg.IDLE
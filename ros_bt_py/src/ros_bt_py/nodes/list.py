@@ -27,6 +27,8 @@
 # POSSIBILITY OF SUCH DAMAGE.
 
 
+from time import monotonic
+
 from ros_bt_py_msgs.msg import Node as NodeMsg
 
 from ros_bt_py.node import Leaf, Decorator, define_bt_node
@@ -246,3 +248,252 @@ class IterateList(Decorator):
     def _do_shutdown(self):
         for child in self.children:
             return child.shutdown()
+
+
+class _BatchListIteration(Decorator):
+    """Base class for decorators that tick their child for many list elements per tick
+
+    Every element of the input `list` is put on the output `list_item` and the child is
+    ticked with it right away, so a single tick can process many elements. The options
+    `max_items_per_tick` and `max_time_per_tick` (in seconds) limit the work done in one
+    tick, a value of 0 means no limit. If a limit is reached, the node returns RUNNING
+    and continues with the next element on the next tick. At least one element is
+    processed per tick.
+
+    Without a child, every element counts as succeeded.
+    """
+
+    def _do_setup(self):
+        self._reset_iteration()
+        for child in self.children:
+            child.setup()
+        return NodeMsg.IDLE
+
+    def _reset_iteration(self):
+        self._list = None
+        self._index = 0
+        self._item_sent = False
+        self._start_iteration()
+
+    def _start_iteration(self):
+        """Prepare the outputs of a new iteration, called before the first element"""
+
+    def _send_item(self, item):
+        """Put `item` on the outputs, called before the child is ticked with it"""
+        self.outputs["list_item"] = item
+
+    def _item_done(self, item, child_state):
+        """Handle the child state of `item`, return `False` to fail the iteration"""
+        return child_state == NodeMsg.SUCCEEDED
+
+    def _finish_iteration(self):
+        """Set the outputs after all elements have been processed"""
+
+    def _budget_exhausted(self, processed, start):
+        max_items = self.options["max_items_per_tick"]
+        max_time = self.options["max_time_per_tick"]
+        return processed > 0 and (
+            (max_items > 0 and processed >= max_items)
+            or (max_time > 0 and monotonic() - start >= max_time)
+        )
+
+    def _do_tick(self):
+        items = self.inputs["list"]
+        list_changed = self.inputs.is_updated("list") and items != self._list
+        if self._list is None or list_changed:
+            if self._index > 0:
+                self.logwarn("Input list changed - restarting iteration")
+            self._reset_iteration()
+            self._list = list(items)
+
+        start = monotonic()
+        processed = 0
+        while self._index < len(self._list):
+            if self._budget_exhausted(processed, start):
+                return NodeMsg.RUNNING
+            item = self._list[self._index]
+            if not self._item_sent:
+                self._send_item(item)
+                # Deliver the item to the child now instead of after this tick
+                self._handle_outputs()
+                self._item_sent = True
+
+            child_state = NodeMsg.SUCCEEDED
+            for child in self.children:
+                child_state = child.tick()
+            if child_state == NodeMsg.RUNNING:
+                return NodeMsg.RUNNING
+            if not self._item_done(item, child_state):
+                self._reset_iteration()
+                return NodeMsg.FAILED
+
+            self._index += 1
+            self._item_sent = False
+            processed += 1
+
+        self._finish_iteration()
+        self._reset_iteration()
+        return NodeMsg.SUCCEEDED
+
+    def _do_untick(self):
+        for child in self.children:
+            return child.untick()
+        return NodeMsg.IDLE
+
+    def _do_reset(self):
+        self.inputs.reset_updated()
+        self._reset_iteration()
+        for child in self.children:
+            return child.reset()
+        return NodeMsg.IDLE
+
+    def _do_shutdown(self):
+        for child in self.children:
+            return child.shutdown()
+
+
+@define_bt_node(
+    NodeConfig(
+        version="1.0.0",
+        options={
+            "item_type": type,
+            "max_items_per_tick": int,
+            "max_time_per_tick": float,
+        },
+        inputs={"list": list},
+        outputs={"list_item": OptionRef("item_type")},
+        max_children=1,
+        tags=["list", "iterate", "loop", "batch", "foreach"],
+    )
+)
+class BatchIterateList(_BatchListIteration):
+    """Iterate through the input list, ticking the child for many elements per tick
+
+    Like :class:`IterateList`, but the child is ticked with the next element as soon as
+    it succeeded, so a list can be processed within a single tick. Succeeds once the
+    child succeeded for every element and fails as soon as the child fails.
+    """
+
+
+@define_bt_node(
+    NodeConfig(
+        version="1.0.0",
+        options={
+            "item_type": type,
+            "result_type": type,
+            "max_items_per_tick": int,
+            "max_time_per_tick": float,
+        },
+        inputs={"list": list, "result": OptionRef("result_type")},
+        outputs={"list_item": OptionRef("item_type"), "results": list},
+        max_children=1,
+        optional_options=["result"],
+        tags=["list", "iterate", "loop", "batch", "map", "transform"],
+    )
+)
+class MapList(_BatchListIteration):
+    """Map every element of the input list to a new value using the child
+
+    The child reads `list_item` and writes its result to the input `result`. The
+    values of `result` after the child succeeded are collected in `results`. Fails
+    as soon as the child fails.
+    """
+
+    def _start_iteration(self):
+        self._results = []
+
+    def _item_done(self, item, child_state):
+        if child_state != NodeMsg.SUCCEEDED:
+            return False
+        self._results.append(self.inputs["result"])
+        return True
+
+    def _finish_iteration(self):
+        self.outputs["results"] = self._results
+
+
+@define_bt_node(
+    NodeConfig(
+        version="1.0.0",
+        options={
+            "item_type": type,
+            "max_items_per_tick": int,
+            "max_time_per_tick": float,
+        },
+        inputs={"list": list},
+        outputs={"list_item": OptionRef("item_type"), "filtered": list},
+        max_children=1,
+        tags=["list", "iterate", "loop", "batch", "filter", "select"],
+    )
+)
+class FilterList(_BatchListIteration):
+    """Keep the elements of the input list for which the child succeeds
+
+    The elements for which the child fails are dropped, so this node always succeeds
+    once every element has been checked.
+    """
+
+    def _start_iteration(self):
+        self._filtered = []
+
+    def _item_done(self, item, child_state):
+        if child_state == NodeMsg.SUCCEEDED:
+            self._filtered.append(item)
+        return True
+
+    def _finish_iteration(self):
+        self.outputs["filtered"] = self._filtered
+
+
+@define_bt_node(
+    NodeConfig(
+        version="1.0.0",
+        options={
+            "item_type": type,
+            "accumulator_type": type,
+            "max_items_per_tick": int,
+            "max_time_per_tick": float,
+        },
+        inputs={
+            "list": list,
+            "initial": OptionRef("accumulator_type"),
+            "result": OptionRef("accumulator_type"),
+        },
+        outputs={
+            "list_item": OptionRef("item_type"),
+            "accumulator": OptionRef("accumulator_type"),
+            "reduced": OptionRef("accumulator_type"),
+        },
+        max_children=1,
+        optional_options=["result"],
+        tags=["list", "iterate", "loop", "batch", "reduce", "fold", "accumulate"],
+    )
+)
+class ReduceList(_BatchListIteration):
+    """Combine the elements of the input list into one value using the child
+
+    The child reads `list_item` and `accumulator` and writes the combined value to the
+    input `result`, which becomes the `accumulator` for the next element. The
+    accumulator starts at `initial` and its final value is put on `reduced`. Fails as
+    soon as the child fails.
+    """
+
+    def _start_iteration(self):
+        self._accumulator = None
+
+    def _send_item(self, item):
+        if self._index == 0:
+            self._accumulator = self.inputs["initial"]
+        self.outputs["accumulator"] = self._accumulator
+        super()._send_item(item)
+
+    def _item_done(self, item, child_state):
+        if child_state != NodeMsg.SUCCEEDED:
+            return False
+        self._accumulator = self.inputs["result"]
+        return True
+
+    def _finish_iteration(self):
+        if not self._list:
+            self._accumulator = self.inputs["initial"]
+        self.outputs["reduced"] = self._accumulator
@@ -31,6 +31,8 @@ import operator
 import math
 from typing import Optional, Dict
 
+import numpy as np
+
 from ros_bt_py_msgs.msg import Node as NodeMsg
 
 from ros_bt_py.debug_manager import DebugManager
@@ -404,3 +406,273 @@ class UnaryOperation(Leaf):
     #
     # def _do_calculate_utility(self):
     #     pass
+
+
+# NumPy equivalents of the operators of Operation and UnaryOperation
+_BATCH_OPERATORS = {
+    "add": np.add,
+    "+": np.add,
+    "and": np.bitwise_and,
+    "&": np.bitwise_and,
+    "div": np.true_divide,
+    "/": np.true_divide,
+    "floordiv": np.floor_divide,
+    "//": np.floor_divide,
+    "lshift": np.left_shift,
+    "<<": np.left_shift,
+    "mod": np.mod,
+    "%": np.mod,
+    "mul": np.multiply,
+    "*": np.multiply,
+    "or": np.bitwise_or,
+    "|": np.bitwise_or,
+    "pow": np.power,
+    "**": np.power,
+    "rshift": np.right_shift,
+    ">>": np.right_shift,
+    "sub": np.subtract,
+    "-": np.subtract,
+    "truediv": np.true_divide,
+    "xor": np.bitwise_xor,
+    "^": np.bitwise_xor,
+}
+
+_BATCH_UNARY_OPERATORS = {
+    "not": np.logical_not,
+    "inv": np.invert,
+    "~": np.invert,
+    "neg": np.negative,
+    "-": np.negative,
+    "pos": np.positive,
+    "+": np.positive,
+    "exp": np.exp,
+    "expm1": np.expm1,
+    "log": np.log,
+    "log1p": np.log1p,
+    "log10": np.log10,
+    "ceil": np.ceil,
+    "fabs": np.fabs,
+    # NumPy has no ufuncs for these
+    "factorial": np.frompyfunc(math.factorial, 1, 1),
+    "floor": np.floor,
+    "sqrt": np.sqrt,
+    "acos": np.arccos,
+    "asin": np.arcsin,
+    "atan": np.arctan,
+    "acosh": np.arccosh,
+    "asinh": np.arcsinh,
+    "atanh": np.arctanh,
+    "cos": np.cos,
+    "sin": np.sin,
+    "tan": np.tan,
+    "cosh": np.cosh,
+    "sinh": np.sinh,
+    "tanh": np.tanh,
+    "degrees": np.degrees,
+    "radians": np.radians,
+    "erf": np.frompyfunc(math.erf, 1, 1),
+    "erfc": np.frompyfunc(math.erfc, 1, 1),
+    "gamma": np.frompyfunc(math.gamma, 1, 1),
+    "lgamma": np.frompyfunc(math.lgamma, 1, 1),
+}
+
+_BATCH_OPERAND_TYPES = {"int": np.int64, "float": np.float64, "bool": np.bool_}
+
+_REDUCTIONS = {
+    "sum": np.sum,
+    "prod": np.prod,
+    "min": np.min,
+    "max": np.max,
+    "mean": np.mean,
+    "median": np.median,
+    "std": np.std,
+    "var": np.var,
+    "norm": np.linalg.norm,
+}
+
+
+def _batch_operand_type(node, operand_type):
+    try:
+        return _BATCH_OPERAND_TYPES[operand_type.operand_type]
+    except KeyError:
+        raise BehaviorTreeException(
+            f"{node.name}: Operand type {operand_type.operand_type} is not supported."
+        )
+
+
+@define_bt_node(
+    NodeConfig(
+        version="1.0.0",
+        options={"operand_type": MathOperandType, "operator": MathBinaryOperator},
+        inputs={"a": list, "b": list},
+        outputs={"result": list},
+        max_children=0,
+        tags=[
+            "math",
+            "operator",
+            "operation",
+            "calculation",
+            "result",
+            "batch",
+            "list",
+            "array",
+            "vector",
+            "elementwise",
+        ],
+    )
+)
+class BatchOperation(Leaf):
+    """Performs the desired binary operation element-wise on the lists a and b.
+
+    Supports the same operators as :class:`Operation`. If one of the lists has only one
+    element, that element is combined with every element of the other list.
+    """
+
+    def _do_setup(self):
+        try:
+            self._operator = _BATCH_OPERATORS[self.options["operator"].operator]
+        except KeyError:
+            raise BehaviorTreeException(
+                f"Operator {self.options['operator'].operator} is not recognized."
+            )
+        self._dtype = _batch_operand_type(self, self.options["operand_type"])
+
+    def _do_tick(self):
+        try:
+            with np.errstate(divide="raise", invalid="raise"):
+                result = self._operator(
+                    np.asarray(self.inputs["a"], dtype=self._dtype),
+                    np.asarray(self.inputs["b"], dtype=self._dtype),
+                )
+        except (ArithmeticError, TypeError, ValueError) as exc:
+            self.logerr(f"Failed to apply {self.options['operator'].operator}: {exc}")
+            return NodeMsg.FAILED
+        self.outputs["result"] = result.tolist()
+        return NodeMsg.SUCCEEDED
+
+    def _do_shutdown(self):
+        pass
+
+    def _do_reset(self):
+        return NodeMsg.IDLE
+
+    def _do_untick(self):
+        return NodeMsg.IDLE
+
+
+@define_bt_node(
+    NodeConfig(
+        version="1.0.0",
+        options={"operand_type": MathUnaryOperandType, "operator": MathUnaryOperator},
+        inputs={"in": list},
+        outputs={"result": list},
+        max_children=0,
+        tags=[
+            "math",
+            "operator",
+            "operation",
+            "calculation",
+            "result",
+            "batch",
+            "list",
+            "array",
+            "vector",
+            "elementwise",
+        ],
+    )
+)
+class BatchUnaryOperation(Leaf):
+    """Performs the desired unary operation on every element of the list in.
+
+    Supports the same operators as :class:`UnaryOperation`.
+    """
+
+    def _do_setup(self):
+        try:
+            self._operator = _BATCH_UNARY_OPERATORS[self.options["operator"].operator]
+        except KeyError:
+            raise BehaviorTreeException(
+                f"Operator {self.options['operator'].operator} is not recognized."
+            )
+        self._dtype = _batch_operand_type(self, self.options["operand_type"])
+
+    def _do_tick(self):
+        try:
+            with np.errstate(divide="raise", invalid="raise"):
+                result = self._operator(
+                    np.asarray(self.inputs["in"], dtype=self._dtype)
+                )
+        except (ArithmeticError, TypeError, ValueError) as exc:
+            self.logerr(f"Failed to apply {self.options['operator'].operator}: {exc}")
+            return NodeMsg.FAILED
+        self.outputs["result"] = result.tolist()
+        return NodeMsg.SUCCEEDED
+
+    def _do_shutdown(self):
+        pass
+
+    def _do_reset(self):
+        return NodeMsg.IDLE
+
+    def _do_untick(self):
+        return NodeMsg.IDLE
+
+
+@define_bt_node(
+    NodeConfig(
+        version="1.0.0",
+        options={"reduction": str},
+        inputs={"in": list},
+        outputs={"result": float},
+        max_children=0,
+        tags=[
+            "math",
+            "batch",
+            "list",
+            "array",
+            "reduce",
+            "sum",
+            "prod",
+            "min",
+            "max",
+            "mean",
+            "median",
+            "std",
+            "var",
+            "norm",
+        ],
+    )
+)
+class ArrayReduction(Leaf):
+    """Reduces the list of numbers in to a single number.
+
+    The `reduction` can be one of sum, prod, min, max, mean, median, std (the
+    standard deviation), var (the variance) and norm (the euclidean norm). Fails
+    for an empty list, unless the reduction is sum, prod or norm.
+    """
+
+    def _do_setup(self):
+        try:
+            self._reduction = _REDUCTIONS[self.options["reduction"]]
+        except KeyError:
+            raise BehaviorTreeException(
+                f"Reduction {self.options['reduction']} is not recognized."
+            )
+
+    def _do_tick(self):
+        values = np.asarray(self.inputs["in"], dtype=np.float64)
+        reduction = self.options["reduction"]
+        if values.size == 0 and reduction not in ["sum", "prod", "norm"]:
+            self.logerr(f"Cannot compute the {reduction} of an empty list")
+            return NodeMsg.FAILED
+        self.outputs["result"] = float(self._reduction(values))
+        return NodeMsg.SUCCEEDED
+
+    def _do_shutdown(self):
+        pass
+
+    def _do_reset(self):
+        return NodeMsg.IDLE
+
+    def _do_untick(self):
+        return NodeMsg.IDLE
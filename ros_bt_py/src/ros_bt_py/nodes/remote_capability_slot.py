@@ -38,13 +38,12 @@ from typing import Optional, Dict
 
 import rospy
 import std_msgs.msg
-from rospy import Publisher, Service, ROSException
+from rospy import Service
 from ros_bt_py_msgs.msg import (
     Node as NodeMsg,
     RemoteCapabilitySlotStatus,
     CapabilityExecutionStatus,
     CapabilityInterface,
-    PingMsg,
 )
 from ros_bt_py_msgs.srv import (
     LoadTreeRequest,
@@ -64,6 +63,8 @@ from ros_bt_py.node import Node, define_bt_node
 from ros_bt_py.node_config import NodeConfig
 from ros_bt_py.tree_manager import TreeManager
 from ros_bt_py.capability import set_capability_io_bridge_id
+from ros_bt_py.heartbeat import HeartbeatMultiplexer, get_heartbeat_multiplexer
+from ros_bt_py.tree_transfer import TreeStore
 
 
 @define_bt_node(
@@ -107,14 +108,14 @@ class RemoteCapabilitySlot(Node):
             debug_manager=self.debug_manager,
         )
         self._tree_root: Optional[Node] = None
-        self._ping_publisher: Optional[Publisher] = None
+        self._heartbeat: Optional[HeartbeatMultiplexer] = None
         self.node_id: Optional[str] = None
 
         self._run_remote_capability_service: Optional[Service] = None
         self._cancel_remote_capability_service: Optional[Service] = None
 
-        self._capability_execution_status_publisher: Optional[Publisher] = None
-        self._remote_capability_slot_status_publisher: Optional[Publisher] = None
+        self._capability_execution_status_topic: Optional[str] = None
+        self._remote_capability_slot_status_topic: Optional[str] = None
 
         self._capability_implementation_available_event: Event = Event()
         self._is_finished_event: Event = Event()
@@ -129,6 +130,9 @@ class RemoteCapabilitySlot(Node):
 
         self.capability_interface: Optional[CapabilityInterface] = None
 
+        # Implementation trees received so far, senders may refer to them by their hash
+        self._received_trees = TreeStore()
+
     def run_remote_capability_callback(
         self, req: RunRemoteCapabilitySlotRequest
     ) -> RunRemoteCapabilitySlotResponse:
@@ -140,13 +144,30 @@ class RemoteCapabilitySlot(Node):
         """
         with self._callback_lock:
             response = RunRemoteCapabilitySlotResponse()
+
+            implementation_tree = req.implementation_tree
+            if req.compressed_implementation_tree.hash:
+                try:
+                    implementation_tree = self._received_trees.resolve(
+                        req.compressed_implementation_tree
+                    )
+                except ValueError as exc:
+                    response.success = False
+                    response.error_message = (
+                        f"Could not load implementation tree: {exc}"
+                    )
+                    return response
+                if implementation_tree is None:
+                    response.success = False
+                    response.unknown_tree = True
+                    response.error_message = "Implementation tree is not known"
+                    return response
+
             self._canceled_event.clear()
 
             self.capability_interface = req.interface
             self.node_id = req.node_id
-            self._ping_publisher.publish(
-                PingMsg(node_id=self.node_id, timestamp=rospy.Time.now())
-            )
+            self._heartbeat.beat(self.node_id)
 
             if self._tree_loaded_event.is_set():
                 self._tree_root.shutdown()
@@ -159,7 +180,7 @@ class RemoteCapabilitySlot(Node):
             # Setup tree
 
             service_response: LoadTreeResponse = self._tree_manager.load_tree(
-                LoadTreeRequest(tree=req.implementation_tree), prefix=self.name + "_"
+                LoadTreeRequest(tree=implementation_tree), prefix=self.name + "_"
             )
 
             if not service_response.success:
@@ -234,17 +255,15 @@ class RemoteCapabilitySlot(Node):
             f"{rospy.get_namespace()}/mission_control/remote_capability_slot/{self.name}/cancel"
         )
 
-        capability_execution_status_topic = rospy.resolve_name(
+        self._capability_execution_status_topic = rospy.resolve_name(
             f"{rospy.get_namespace()}/mission_control/notify_capability_execution_status"
         )
 
-        remote_capability_slot_status_topic = rospy.resolve_name(
+        self._remote_capability_slot_status_topic = rospy.resolve_name(
             f"{rospy.get_namespace()}/mission_control/remote_slot_status"
         )
 
-        self._ping_publisher = Publisher(
-            "~/capabilities/ping", data_class=PingMsg, queue_size=1
-        )
+        self._heartbeat = get_heartbeat_multiplexer()
 
         self._run_remote_capability_service = Service(
             remote_tree_slot_executor_run_topic,
@@ -258,80 +277,45 @@ class RemoteCapabilitySlot(Node):
             self.cancel_remote_capability_callback,
         )
 
-        self._capability_execution_status_publisher = Publisher(
-            capability_execution_status_topic,
-            CapabilityExecutionStatus,
-            queue_size=1,
-            latch=True,
-        )
-
-        self._remote_capability_slot_status_publisher = Publisher(
-            remote_capability_slot_status_topic,
-            RemoteCapabilitySlotStatus,
-            queue_size=1,
-            latch=False,
-        )
-
-    def _tick_idle(self) -> str:
-        self._remote_capability_slot_status_publisher.publish(
+    def _publish_slot_status(self, status: str):
+        self._heartbeat.publish_status(
+            self._remote_capability_slot_status_topic,
+            (self._remote_capability_slot_status_topic, id(self)),
             RemoteCapabilitySlotStatus(
-                name=self.name,
-                status=RemoteCapabilitySlotStatus.IDLE,
-                timestamp=rospy.Time.now(),
-            )
+                name=self.name, status=status, timestamp=rospy.Time.now()
+            ),
         )
-        self._capability_execution_status_publisher.publish(
+
+    def _publish_execution_status(self, status: str):
+        self._heartbeat.publish_status(
+            self._capability_execution_status_topic,
+            (self._capability_execution_status_topic, id(self)),
             CapabilityExecutionStatus(
                 interface=self.capability_interface,
                 node_name=self.name,
-                status=CapabilityExecutionStatus.IDLE,
-            )
+                status=status,
+            ),
+            latch=True,
         )
+
+    def _tick_idle(self) -> str:
+        self._publish_slot_status(RemoteCapabilitySlotStatus.IDLE)
+        self._publish_execution_status(CapabilityExecutionStatus.IDLE)
         return NodeMsg.UNASSIGNED
 
     def _tick_unassigned(self) -> str:
-        self._remote_capability_slot_status_publisher.publish(
-            RemoteCapabilitySlotStatus(
-                name=self.name,
-                status=RemoteCapabilitySlotStatus.IDLE,
-                timestamp=rospy.Time.now(),
-            )
-        )
+        self._publish_slot_status(RemoteCapabilitySlotStatus.IDLE)
 
         if self._capability_implementation_available_event.is_set():
-            self._remote_capability_slot_status_publisher.publish(
-                RemoteCapabilitySlotStatus(
-                    name=self.name,
-                    status=RemoteCapabilitySlotStatus.RUNNING,
-                    timestamp=rospy.Time.now(),
-                )
-            )
-            self._capability_execution_status_publisher.publish(
-                CapabilityExecutionStatus(
-                    interface=self.capability_interface,
-                    node_name=self.name,
-                    status=CapabilityExecutionStatus.EXECUTING,
-                )
-            )
+            self._publish_slot_status(RemoteCapabilitySlotStatus.RUNNING)
+            self._publish_execution_status(CapabilityExecutionStatus.EXECUTING)
             return NodeMsg.ASSIGNED
 
         return NodeMsg.UNASSIGNED
 
     def _tick_assigned(self) -> str:
-        self._remote_capability_slot_status_publisher.publish(
-            RemoteCapabilitySlotStatus(
-                name=self.name,
-                status=RemoteCapabilitySlotStatus.RUNNING,
-                timestamp=rospy.Time.now(),
-            )
-        )
-        self._capability_execution_status_publisher.publish(
-            CapabilityExecutionStatus(
-                interface=self.capability_interface,
-                node_name=self.name,
-                status=CapabilityExecutionStatus.EXECUTING,
-            )
-        )
+        self._publish_slot_status(RemoteCapabilitySlotStatus.RUNNING)
+        self._publish_execution_status(CapabilityExecutionStatus.EXECUTING)
 
         if (
             self._canceled_event.is_set()
@@ -352,13 +336,7 @@ class RemoteCapabilitySlot(Node):
         ):
             return NodeMsg.UNASSIGNED
 
-        self._remote_capability_slot_status_publisher.publish(
-            RemoteCapabilitySlotStatus(
-                name=self.name,
-                status=RemoteCapabilitySlotStatus.RUNNING,
-                timestamp=rospy.Time.now(),
-            )
-        )
+        self._publish_slot_status(RemoteCapabilitySlotStatus.RUNNING)
 
         new_state = self._tree_root.tick()
         if self.debug_manager and self.debug_manager.get_publish_subtrees():
@@ -371,21 +349,9 @@ class RemoteCapabilitySlot(Node):
             else:
                 status = CapabilityExecutionStatus.FAILED
 
-            self._capability_execution_status_publisher.publish(
-                CapabilityExecutionStatus(
-                    interface=self.capability_interface,
-                    node_name=self.name,
-                    status=status,
-                )
-            )
+            self._publish_execution_status(status)
 
-            self._remote_capability_slot_status_publisher.publish(
-                RemoteCapabilitySlotStatus(
-                    name=self.name,
-                    status=RemoteCapabilitySlotStatus.IDLE,
-                    timestamp=rospy.Time.now(),
-                )
-            )
+            self._publish_slot_status(RemoteCapabilitySlotStatus.IDLE)
             self._capability_implementation_available_event.clear()
             self._is_finished_event.set()
             return NodeMsg.UNASSIGNED
@@ -399,13 +365,8 @@ class RemoteCapabilitySlot(Node):
 
             return NodeMsg.RUNNING
 
-        if self._ping_publisher is not None and self.node_id is not None:
-            try:
-                self._ping_publisher.publish(
-                    PingMsg(node_id=self.node_id, timestamp=rospy.Time.now())
-                )
-            except ROSException as exc:
-                self.logwarn(f"Exception when publishing ping: {exc}")
+        if self._heartbeat is not None and self.node_id is not None:
+            self._heartbeat.beat(self.node_id)
 
         if self.state is NodeMsg.SHUTDOWN:
             raise BehaviorTreeException("Ticking shutdown node!")
@@ -431,27 +392,22 @@ class RemoteCapabilitySlot(Node):
         if self._capability_implementation_available_event.is_set():
             self.cancel_remote_capability_callback(CancelRemoteCapabilitySlotRequest())
 
-        self._remote_capability_slot_status_publisher.publish(
-            RemoteCapabilitySlotStatus(
-                name=self.name,
-                status=RemoteCapabilitySlotStatus.SHUTDOWN,
-                timestamp=rospy.Time.now(),
-            )
-        )
+        self._publish_slot_status(RemoteCapabilitySlotStatus.SHUTDOWN)
 
     def _do_shutdown(self):
         if self._capability_implementation_available_event.is_set():
             self.cancel_remote_capability_callback(CancelRemoteCapabilitySlotRequest())
 
-        if self._remote_capability_slot_status_publisher is not None:
-            self._remote_capability_slot_status_publisher.publish(
-                RemoteCapabilitySlotStatus(
-                    name=self.name,
-                    status=RemoteCapabilitySlotStatus.SHUTDOWN,
-                    timestamp=rospy.Time.now(),
-                )
+        if self._heartbeat is not None:
+            # The publishers are shared and outlive this node, so the
+            # last status is delivered without waiting for it here.
+            self._publish_slot_status(RemoteCapabilitySlotStatus.SHUTDOWN)
+            self._heartbeat.remove_status(
+                (self._remote_capability_slot_status_topic, id(self))
+            )
+            self._heartbeat.remove_status(
+                (self._capability_execution_status_topic, id(self))
             )
-        rospy.sleep(rospy.Duration.from_sec(1))
 
         self._run_remote_capability_service.shutdown()
         self._run_remote_capability_service = None
@@ -459,12 +415,6 @@ class RemoteCapabilitySlot(Node):
         self._cancel_remote_capability_service.shutdown()
         self._cancel_remote_capability_service = None
 
-        self._remote_capability_slot_status_publisher.unregister()
-        self._remote_capability_slot_status_publisher = None
-
-        self._capability_execution_status_publisher.unregister()
-        self._capability_execution_status_publisher = None
-
         self._capability_implementation_available_event.clear()
         self._tree_loaded_event.clear()
         self._is_finished_event.clear()
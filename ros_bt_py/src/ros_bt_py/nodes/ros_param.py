@@ -34,6 +34,7 @@ from ros_bt_py_msgs.msg import UtilityBounds
 
 from ros_bt_py.node import Leaf, define_bt_node
 from ros_bt_py.node_config import NodeConfig, OptionRef
+from ros_bt_py.param_cache import get_param_cache
 
 
 @define_bt_node(
@@ -56,7 +57,7 @@ class RosParamNoInput(Leaf):
         pass
 
     def _do_tick(self):
-        param = rospy.get_param(
+        param = get_param_cache().get(
             self.options["param_name"], default=self.options["default_value"]
         )
         if isinstance(param, self.options["param_type"]):
@@ -94,7 +95,7 @@ class RosParamInput(Leaf):
         pass
 
     def _do_tick(self):
-        param = rospy.get_param(
+        param = get_param_cache().get(
             self.inputs["param_name"], default=self.options["default_value"]
         )
         if isinstance(param, self.options["param_type"]):
@@ -132,7 +133,7 @@ class RosParamOption(Leaf):
         pass
 
     def _do_tick(self):
-        param = rospy.get_param(
+        param = get_param_cache().get(
             self.options["param_name"], default=self.inputs["default_value"]
         )
         if isinstance(param, self.options["param_type"]):
@@ -153,12 +154,10 @@ class RosParamOption(Leaf):
     def _do_calculate_utility(self):
         resolved_param_name = rospy.resolve_name(self.options["param_name"])
         try:
-            params = rospy.get_param_names()
+            param = get_param_cache().get(resolved_param_name, default=None)
         except rospy.ROSException:
             return UtilityBounds()
-        if resolved_param_name in params and isinstance(
-            rospy.get_param(resolved_param_name), self.options["param_type"]
-        ):
+        if param is not None and isinstance(param, self.options["param_type"]):
             return UtilityBounds(
                 can_execute=True,
                 has_lower_bound_success=True,
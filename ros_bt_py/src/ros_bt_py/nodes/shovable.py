@@ -47,6 +47,7 @@ from ros_bt_py.node_config import NodeConfig, OptionRef
 
 from ros_bt_py.helpers import json_decode
 from ros_bt_py.exceptions import BehaviorTreeException
+from ros_bt_py.tree_transfer import compress_tree, tree_reference
 
 
 @define_bt_node(
@@ -108,6 +109,8 @@ class Shovable(Decorator):
         # Save this so we can be sure we're actually executing the same tree we
         # evaluated the utility value for
         self._subtree_msg = None
+        self._compressed_subtree = None
+        self._send_full_subtree = False
 
         # Don't setup subtree here - we don't know yet if it is going
         # to be executed locally, or if it even can be!
@@ -268,10 +271,20 @@ class Shovable(Decorator):
         self.logdebug(
             f"Sending goal to action server at {self._remote_namespace}/run_tree"
         )
+        if self._compressed_subtree is None:
+            self._compressed_subtree = compress_tree(self._subtree_msg)
+        # The executor evaluated the utility of this very tree, so it
+        # should know it already. If it does not, it rejects the goal
+        # and the full tree is sent instead.
+        if self._send_full_subtree:
+            compressed_subtree = self._compressed_subtree
+        else:
+            compressed_subtree = tree_reference(self._compressed_subtree)
+
         self._subtree_action_start_time = rospy.Time.now()
         self._subtree_action_client.send_goal(
             RunTreeGoal(
-                tree=self._subtree_msg,
+                compressed_tree=compressed_subtree,
                 tick_frequency_hz=self.options["remote_tick_frequency_hz"],
             )
         )
@@ -317,9 +330,20 @@ class Shovable(Decorator):
 
             # Send a new RunTree action goal on the next tick
             self._state = Shovable.START_REMOTE_EXEC_ACTION
+            self._send_full_subtree = False
             return final_state
         elif action_state in [GoalStatus.PENDING, GoalStatus.ACTIVE]:
             return NodeMsg.RUNNING
+        elif (
+            action_state == GoalStatus.REJECTED
+            and not self._send_full_subtree
+            and self._subtree_action_client.get_result() is not None
+            and self._subtree_action_client.get_result().unknown_tree
+        ):
+            # Send the full tree on the next tick
+            self._state = Shovable.START_REMOTE_EXEC_ACTION
+            self._send_full_subtree = True
+            return NodeMsg.RUNNING
         else:
             # Send a new RunTree action goal on the next tick
             self._state = Shovable.START_REMOTE_EXEC_ACTION
@@ -435,4 +459,6 @@ class Shovable(Decorator):
         self._subtree_action_client = None
         self._subtree_action_client_creation_time = None
         self._subtree_msg = None
+        self._compressed_subtree = None
+        self._send_full_subtree = False
         self._state = Shovable.IDLE
@@ -28,14 +28,13 @@
 
 
 """BT node to retrieve information from the web."""
-import rospkg
 from ros_bt_py_msgs.msg import Node as NodeMsg
 
+from ros_bt_py.download_manager import DownloadError, get_download_manager
+from ros_bt_py.file_cache import resolve_path
 from ros_bt_py.node import Leaf, define_bt_node
 from ros_bt_py.node_config import NodeConfig, OptionRef
 
-import requests
-import shutil
 import os
 import hashlib
 
@@ -49,10 +48,16 @@ import hashlib
     )
 )
 class DownloadImage(Leaf):
-    """Download an image from a URL and store it on the filesystem."""
+    """Download an image from a URL and store it on the filesystem.
+
+    The download runs in the background through the shared
+    :class:`ros_bt_py.download_manager.DownloadManager`, the node returns RUNNING until
+    the image is stored in `cache_folder`.
+    """
 
     def _do_setup(self):
         self.output_filepath = ""
+        self._download = None
         try:
             self.output_path = self.expend_path(self.options["cache_folder"])
         except ValueError:
@@ -77,52 +82,41 @@ class DownloadImage(Leaf):
             )
 
             self.output_filepath = os.path.join(self.output_path, output_filename)
+            self._download = None
 
-        self.outputs["filepath"] = self.output_filepath
+        if self._download is None:
+            self._download = get_download_manager().request(
+                self.inputs["image_url"], self.output_filepath
+            )
+        if not self._download.done():
+            return NodeMsg.RUNNING
 
-        if self.output_filepath != "" and os.path.exists(self.output_filepath):
-            # image already cached
-            self.outputs["download_success"] = True
-            self.outputs["download_error_msg"] = ""
-            return NodeMsg.SUCCEEDED
-        else:
-            # download image
-            r = requests.get(url=self.inputs["image_url"], stream=True)
-            if r.status_code != 200:
-                self.outputs["download_success"] = False
-                self.outputs[
-                    "download_error_msg"
-                ] = f"Could not download image, http error code: {r.status_code}"
-                self.outputs["filepath"] = ""
-                return NodeMsg.FAILED
-
-        with open(self.output_filepath, "wb") as f:
-            r.raw.decode_content = True
-            shutil.copyfileobj(r.raw, f)
+        download, self._download = self._download, None
+        try:
+            download.result()
+        except (DownloadError, OSError) as ex:
+            self.outputs["download_success"] = False
+            self.outputs["download_error_msg"] = str(ex)
+            self.outputs["filepath"] = ""
+            return NodeMsg.FAILED
 
+        self.outputs["filepath"] = self.output_filepath
         self.outputs["download_success"] = True
         self.outputs["download_error_msg"] = ""
         return NodeMsg.SUCCEEDED
 
     def _do_untick(self):
+        # A running download still finishes and fills the cache
+        self._download = None
         return NodeMsg.IDLE
 
     def _do_reset(self):
+        self._download = None
         return NodeMsg.IDLE
 
     def _do_shutdown(self):
-        pass
+        self._download = None
 
     def expend_path(self, path):
         """Expand the path to a absolute file path."""
-        rospack = rospkg.RosPack()
-        file_path = ""
-        if path.startswith("file://"):
-            file_path = path[len("file://") :]
-        elif path.startswith("package://"):
-            package_name = path[len("package://") :].split("/", 1)[0]
-            package_path = rospack.get_path(package_name)
-            file_path = package_path + path[len("package://") + len(package_name) :]
-        else:
-            raise ValueError("Malformed path")
-        return file_path
+        return resolve_path(path)
@@ -27,7 +27,12 @@
 # POSSIBILITY OF SUCH DAMAGE.
 
 
+import fnmatch
+import json
 import os
+from collections import OrderedDict
+from stat import S_ISDIR
+from threading import Lock
 
 import roslib.message
 import rospkg
@@ -54,11 +59,140 @@ from ros_bt_py.helpers import (
 from ros_bt_py.ros_helpers import get_message_constant_fields
 
 
+MESSAGE_INDEX_FORMAT = 1
+
+ACTION_MESSAGE_SUFFIXES = ["Feedback", "Goal", "Result"]
+
+
+def default_message_index_path():
+    """Return the default location of the message index in the ROS home directory."""
+    return os.path.join(rospkg.get_ros_home(), "ros_bt_py", "message_index.json")
+
+
+def remove_action_messages(msg_types):
+    """Remove the messages generated for actions, e.g. FooActionGoal for FooAction."""
+    action_messages = {
+        f"{msg_type}{suffix}"
+        for msg_type in msg_types
+        if msg_type.endswith("Action")
+        for suffix in ACTION_MESSAGE_SUFFIXES
+    }
+    return [msg_type for msg_type in msg_types if msg_type not in action_messages]
+
+
+class MessageIndex(object):
+    """Message and service types found in package directories, cached in a JSON file.
+
+    Listing the `msg` and `srv` directories of every package is slow on large workspaces.
+    The index stores the type names of every directory together with its modification time,
+    so only the directories that changed since they were last listed are read again.
+    """
+
+    def __init__(self, path):
+        """Read the index at `path`, a missing or invalid file yields an empty index."""
+        self.path = path
+        self._directories = {}
+        self._changed = False
+        try:
+            with open(path, "r") as index_file:
+                index = json.load(index_file)
+            if index.get("format") == MESSAGE_INDEX_FORMAT:
+                self._directories = index["directories"]
+        except (OSError, ValueError, KeyError, AttributeError) as exc:
+            rospy.logdebug(f"Not using message index {path}: {exc}")
+
+    def types(self, directory, extension):
+        """Return the sorted names of the files in `directory` ending with `extension`.
+
+        The extension is removed from the names.
+        """
+        try:
+            mtime = os.stat(directory).st_mtime_ns
+        except OSError:
+            return []
+        entry = self._directories.get(directory)
+        if entry is not None and entry["mtime"] == mtime:
+            return entry["types"]
+        try:
+            with os.scandir(directory) as entries:
+                types = sorted(
+                    entry.name[: -len(extension)]
+                    for entry in entries
+                    if entry.name.endswith(extension) and entry.is_file()
+                )
+        except OSError:
+            return []
+        self._directories[directory] = {"mtime": mtime, "types": types}
+        self._changed = True
+        return types
+
+    def save(self):
+        """Write the index back to disk if directories were listed again."""
+        if not self._changed:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w") as index_file:
+                json.dump(
+                    {"format": MESSAGE_INDEX_FORMAT, "directories": self._directories},
+                    index_file,
+                )
+            os.replace(tmp_path, self.path)
+            self._changed = False
+        except OSError as exc:
+            rospy.logwarn(f"Failed to write message index {self.path}: {exc}")
+
+
+class DirectoryCache(object):
+    """Directory listings read with :func:`os.scandir`, keyed by path.
+
+    A listing is read again once the modification time of its directory changed. The least
+    recently used listings are dropped once `max_directories` is exceeded.
+    """
+
+    def __init__(self, max_directories=4096):
+        self.max_directories = max_directories
+        self._listings = OrderedDict()
+        self._lock = Lock()
+
+    def list(self, path):
+        """Return the sorted (name, is_directory) tuples of the entries of `path`.
+
+        Returns None if `path` is not a directory.
+        """
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        if not S_ISDIR(stat.st_mode):
+            return None
+        with self._lock:
+            cached = self._listings.get(path)
+            if cached is not None and cached[0] == stat.st_mtime_ns:
+                self._listings.move_to_end(path)
+                return cached[1]
+        try:
+            with os.scandir(path) as entries:
+                listing = sorted((entry.name, entry.is_dir()) for entry in entries)
+        except OSError:
+            return None
+        with self._lock:
+            self._listings[path] = (stat.st_mtime_ns, listing)
+            self._listings.move_to_end(path)
+            while len(self._listings) > self.max_directories:
+                self._listings.popitem(last=False)
+        return listing
+
+
 class PackageManager(object):
     """Provides functionality to interact with ROS messages and catkin packages"""
 
     def __init__(
-        self, publish_message_list_callback=None, publish_packages_list_callback=None
+        self,
+        publish_message_list_callback=None,
+        publish_packages_list_callback=None,
+        message_index_path=None,
     ):
         # using rospkg is nice because it provides path resolution and honors CATKIN_IGNORE file
         # so we do not have to do this manually
@@ -68,12 +202,24 @@ class PackageManager(object):
         self.message_list_pub = publish_message_list_callback
         self.packages_list_pub = publish_packages_list_callback
 
+        self.message_index = MessageIndex(
+            message_index_path or default_message_index_path()
+        )
+        # (package name, package path) -> all paths of the package
+        self._package_paths = {}
+        self.directory_cache = DirectoryCache()
+
     def _get_package_paths(self, pkgname, rospack):
+        path = rospack.get_path(pkgname)
+        key = (pkgname, path)
+        if key not in self._package_paths:
+            self._package_paths[key] = self._find_package_paths(pkgname, path)
+        return self._package_paths[key]
+
+    def _find_package_paths(self, pkgname, path):
         _catkin_workspace_to_source_spaces = {}
         _catkin_source_path_to_packages = {}
-        paths = []
-        path = rospack.get_path(pkgname)
-        paths.append(path)
+        paths = [path]
         results = find_in_workspaces(
             search_dirs=["share"],
             project=pkgname,
@@ -88,6 +234,8 @@ class PackageManager(object):
     def publish_message_list(self):
         """Publishes a list of all ROS messages/services available on the system.
         Uses a similar strategy to rosmsg/rossrv to detect message/service files.
+
+        The directory listings are cached in :attr:`message_index`.
         """
         if self.message_list_pub is None:
             rospy.logwarn("No callback for publishing message list data provided.")
@@ -97,46 +245,15 @@ class PackageManager(object):
         messages = []
         packages = rospack.list()
 
-        actions = []
         for package in packages:
             for package_path in self._get_package_paths(package, rospack):
-                path = f"{package_path}/msg"
-                resources = []
-                if os.path.isdir(path):
-                    resources = [
-                        f
-                        for f in os.listdir(path)
-                        if os.path.isfile(os.path.join(path, f))
-                    ]
-                result = [x[: -len(".msg")] for x in resources]
-                result.sort()
-                for msg_type in result:
-                    if msg_type[-6:] == "Action":
-                        actions.append(msg_type)
-                    append_msg = True
-                    for action in actions:
-                        if (
-                            msg_type == f"{action}Feedback"
-                            or msg_type == f"{action}Goal"
-                            or msg_type == f"{action}Result"
-                        ):
-                            append_msg = False
-                    if append_msg:
-                        messages.append(
-                            Message(msg=f"{package}/{msg_type}", service=False)
-                        )
-                path = f"{package_path}/srv"
-                resources = []
-                if os.path.isdir(path):
-                    resources = [
-                        f
-                        for f in os.listdir(path)
-                        if os.path.isfile(os.path.join(path, f))
-                    ]
-                result = [x[: -len(".srv")] for x in resources]
-                result.sort()
-                for srv_type in result:
+                msg_types = self.message_index.types(f"{package_path}/msg", ".msg")
+                for msg_type in remove_action_messages(msg_types):
+                    messages.append(Message(msg=f"{package}/{msg_type}", service=False))
+                srv_types = self.message_index.types(f"{package_path}/srv", ".srv")
+                for srv_type in srv_types:
                     messages.append(Message(msg=f"{package}/{srv_type}", service=True))
+        self.message_index.save()
 
         msg = Messages()
         msg.messages = messages
@@ -223,43 +340,148 @@ class PackageManager(object):
     def reset_id(self):
         self.item_id = 0
 
-    def path_to_dict(self, path, show_hidden=False, parent=0):
-        """Turns a path into a dictionary"""
+    def list_directory(self, path, show_hidden=False, filters=None):
+        """Return the sorted (name, is_directory) tuples of the entries of `path`.
+
+        Hidden entries are skipped unless `show_hidden` is set. If `filters` is not empty,
+        only directories and the files matching one of its glob patterns are returned.
+        Returns None if `path` is not a directory.
+        """
+        entries = self.directory_cache.list(path)
+        if entries is None:
+            return None
+        return [
+            (name, is_dir)
+            for (name, is_dir) in entries
+            if (show_hidden or not name.startswith("."))
+            and (
+                is_dir
+                or not filters
+                or any(fnmatch.fnmatch(name, pattern) for pattern in filters)
+            )
+        ]
+
+    def path_to_dict(
+        self,
+        path,
+        show_hidden=False,
+        parent=0,
+        max_depth=0,
+        filters=None,
+        offset=0,
+        limit=0,
+    ):
+        """Turns a path into a dictionary
+
+        Subdirectories are included up to `max_depth` levels below `path`, 0 means no limit.
+        Directories whose entries were left out are marked with `"loaded": False`.
+        `offset` and `limit` select a page of the entries of `path` itself, a `limit` of 0
+        returns all of them.
+        """
+        return self._path_to_dict(
+            path,
+            show_hidden=show_hidden,
+            parent=parent,
+            levels=max_depth if max_depth > 0 else None,
+            filters=filters,
+            offset=offset,
+            limit=limit,
+        )
+
+    def _path_to_dict(
+        self, path, show_hidden, parent, levels, filters, offset=0, limit=0
+    ):
         d = {"name": os.path.basename(path)}
         d["item_id"] = self.get_id()
         d["parent"] = parent
-        if os.path.isdir(path):
-            d["type"] = "directory"
-            d["children"] = [
-                self.path_to_dict(
-                    os.path.join(path, f), show_hidden=show_hidden, parent=d["item_id"]
-                )
-                for f in os.listdir(path)
-                if (show_hidden or not f.startswith("."))
-            ]
-        else:
+        entries = self.list_directory(path, show_hidden=show_hidden, filters=filters)
+        if entries is None:
             d["type"] = "file"
+            return d
+        d["type"] = "directory"
+        d["children"] = []
+        entries = entries[offset : offset + limit] if limit > 0 else entries[offset:]
+        for name, is_dir in entries:
+            if is_dir and levels == 1:
+                # Do not list directories below the depth limit
+                d["children"].append(
+                    {
+                        "name": name,
+                        "item_id": self.get_id(),
+                        "parent": d["item_id"],
+                        "type": "directory",
+                        "children": [],
+                        "loaded": False,
+                    }
+                )
+            elif is_dir:
+                d["children"].append(
+                    self._path_to_dict(
+                        os.path.join(path, name),
+                        show_hidden=show_hidden,
+                        parent=d["item_id"],
+                        levels=None if levels is None else levels - 1,
+                        filters=filters,
+                    )
+                )
+            else:
+                d["children"].append(
+                    {
+                        "name": name,
+                        "item_id": self.get_id(),
+                        "parent": d["item_id"],
+                        "type": "file",
+                    }
+                )
         return d
 
     def get_package_structure(self, request):
         """Returns a listing of files and subdirectories of a ROS package as a jsonpickled string
 
         Hides hidden files by default, unless show_hidden is set to true.
+
+        By default the whole package is listed. `request.path` selects a directory inside the
+        package, `request.max_depth` limits how many levels below it are listed,
+        `request.filters` only lists the files matching one of the glob patterns and
+        `request.offset` and `request.limit` select a page of the entries of the directory.
         """
         response = GetPackageStructureResponse()
         try:
             package_path = self.rospack.get_path(request.package)
-            self.reset_id()
-            package_structure = self.path_to_dict(
-                path=package_path, show_hidden=request.show_hidden
-            )
-
-            response.success = True
-            response.package_structure = json_encode(package_structure)
         except rospkg.common.ResourceNotFound:
             response.success = False
             response.error_message = f'Package "{request.package}" does not exist'
+            return response
 
+        path = os.path.normpath(os.path.join(package_path, request.path))
+        real_package_path = os.path.realpath(package_path)
+        if (
+            os.path.commonpath([os.path.realpath(path), real_package_path])
+            != real_package_path
+        ):
+            response.success = False
+            response.error_message = "Path outside package path"
+            return response
+        entries = self.list_directory(
+            path, show_hidden=request.show_hidden, filters=request.filters
+        )
+        if entries is None:
+            response.success = False
+            response.error_message = f'"{request.path}" is not a directory'
+            return response
+
+        self.reset_id()
+        package_structure = self.path_to_dict(
+            path=path,
+            show_hidden=request.show_hidden,
+            max_depth=request.max_depth,
+            filters=request.filters,
+            offset=request.offset,
+            limit=request.limit,
+        )
+        response.success = True
+        response.package_structure = json_encode(package_structure)
+        response.total_entries = len(entries)
         return response
 
     def make_filepath_unique(self, filepath):
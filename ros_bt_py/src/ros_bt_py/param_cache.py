@@ -0,0 +1,185 @@
+# Copyright 2018-2023 FZI Forschungszentrum Informatik
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#    * Redistributions of source code must retain the above copyright
+#      notice, this list of conditions and the following disclaimer.
+#
+#    * Redistributions in binary form must reproduce the above copyright
+#      notice, this list of conditions and the following disclaimer in the
+#      documentation and/or other materials provided with the distribution.
+#
+#    * Neither the name of the FZI Forschungszentrum Informatik nor the names of its
+#      contributors may be used to endorse or promote products derived from
+#      this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+"""Local copies of ROS parameters for nodes that read them on every tick.
+
+Every :func:`rospy.get_param` call is a round trip to the parameter server. A
+:class:`ParamCache` either subscribes to the parameters it is asked for, so the parameter
+server pushes changes and reads stay in this process, or reads them again once their
+values are older than a time to live.
+"""
+from copy import deepcopy
+import posixpath
+import time
+from threading import Lock
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+import rospy
+
+_MISSING = object()
+
+
+def _is_missing(value) -> bool:
+    # The parameter server reports unset parameters as empty namespaces
+    return value is _MISSING or (isinstance(value, dict) and not value)
+
+
+def _lookup(namespace_value, namespace: str, name: str):
+    """Find the value of `name` in the value of its parent `namespace`."""
+    value = namespace_value
+    for key in name[len(namespace) :].strip("/").split("/"):
+        if not key:
+            continue
+        if not isinstance(value, dict) or key not in value:
+            return _MISSING
+        value = value[key]
+    return value
+
+
+class ParamCache(object):
+    """Read ROS parameters from local memory.
+
+    By default parameters are read with :func:`rospy.get_param_cached`, which subscribes
+    to the parameter on first use and keeps the value up to date. With a `ttl`, values
+    are read with :func:`rospy.get_param` instead and kept for `ttl` seconds, which also
+    works with parameter servers that do not push updates.
+
+    All methods are thread-safe.
+    """
+
+    def __init__(self, ttl: Optional[float] = None):
+        """
+        :param ttl: Seconds after which a parameter is read again. If `None`, parameters
+        are subscribed to instead.
+        """
+        self.ttl = ttl
+        # Maps resolved parameter names to their value and the time it was read
+        self._values: Dict[str, Tuple[Any, float]] = {}
+        self._lock = Lock()
+
+    def get(self, name: str, default: Any = _MISSING) -> Any:
+        """Like :func:`rospy.get_param`, but from the cache.
+
+        :raises: KeyError if the parameter is not set and there is no `default`.
+        """
+        return self.get_many([name], default=default)[name]
+
+    def has(self, name: str) -> bool:
+        """Check whether the parameter `name` is set."""
+        return not _is_missing(self._read([rospy.resolve_name(name)])[0])
+
+    def get_many(self, names: Iterable[str], default: Any = _MISSING) -> Dict[str, Any]:
+        """Read several parameters, fetching expired ones with a single request.
+
+        :returns: A dict from the given names to the parameter values.
+        :raises: KeyError if a parameter is not set and there is no `default`.
+        """
+        names = list(names)
+        values = self._read([rospy.resolve_name(name) for name in names])
+        result = {}
+        for name, value in zip(names, values):
+            if _is_missing(value):
+                if default is _MISSING:
+                    raise KeyError(name)
+                value = default
+            # Callers may modify lists and dicts, but not the cached values
+            elif isinstance(value, (list, dict)):
+                value = deepcopy(value)
+            result[name] = value
+        return result
+
+    def invalidate(self, name: Optional[str] = None):
+        """Read `name` (or all parameters if `None`) again on the next access.
+
+        Only needed with a `ttl`, subscribed parameters are updated anyway.
+        """
+        with self._lock:
+            if name is None:
+                self._values.clear()
+            else:
+                self._values.pop(rospy.resolve_name(name), None)
+
+    def _read(self, resolved_names):
+        if self.ttl is None:
+            return [self._read_subscribed(name) for name in resolved_names]
+
+        now = time.monotonic()
+        with self._lock:
+            entries = [self._values.get(name) for name in resolved_names]
+        expired = {
+            name
+            for name, entry in zip(resolved_names, entries)
+            if entry is None or now - entry[1] >= self.ttl
+        }
+        fetched = {}
+        if expired:
+            fetched = self._fetch(sorted(expired))
+            with self._lock:
+                for name, value in fetched.items():
+                    self._values[name] = (value, now)
+        return [
+            fetched[name] if name in fetched else entry[0]
+            for name, entry in zip(resolved_names, entries)
+        ]
+
+    @staticmethod
+    def _read_subscribed(resolved_name):
+        try:
+            return rospy.get_param_cached(resolved_name)
+        except KeyError:
+            return _MISSING
+
+    @staticmethod
+    def _fetch(resolved_names):
+        """Read parameters from the parameter server with a single request."""
+        if len(resolved_names) == 1:
+            return {resolved_names[0]: rospy.get_param(resolved_names[0], _MISSING)}
+        # Read the closest namespace that contains all of them and pick them out
+        namespace = posixpath.commonpath(resolved_names)
+        namespace_value = rospy.get_param(namespace, _MISSING)
+        return {
+            name: _lookup(namespace_value, namespace, name) for name in resolved_names
+        }
+
+
+_param_cache: Optional[ParamCache] = None
+_param_cache_lock = Lock()
+
+
+def get_param_cache() -> ParamCache:
+    """
+    Return the parameter cache of this process, creating it on first use.
+
+    If the `param_cache_ttl_sec` parameter is set to a positive number, parameters are
+    read again after that many seconds. Otherwise they are subscribed to.
+    """
+    global _param_cache  # pylint: disable=global-statement
+    with _param_cache_lock:
+        if _param_cache is None:
+            ttl = rospy.get_param("param_cache_ttl_sec", 0.0)
+            _param_cache = ParamCache(ttl=ttl if ttl > 0.0 else None)
+        return _param_cache
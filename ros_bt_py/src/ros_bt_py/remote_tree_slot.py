@@ -25,20 +25,200 @@
 # CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
 # ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
 # POSSIBILITY OF SUCH DAMAGE.
-
-
 """BT node allowing the execution of remote subtrees using the shovable decorator."""
-from threading import Lock
+from collections import OrderedDict
+from threading import Lock, RLock
 
 import rospy
 
 from ros_bt_py_msgs.srv import EvaluateUtilityResponse, LoadTreeRequest
 from ros_bt_py_msgs.srv import ControlTreeExecutionRequest, ControlTreeExecutionResponse
+from ros_bt_py_msgs.srv import MigrateTreeRequest
 from ros_bt_py_msgs.msg import RunTreeResult
 from ros_bt_py_msgs.msg import RemoteSlotState
-from ros_bt_py_msgs.msg import Node as NodeMsg
+from ros_bt_py_msgs.msg import Node as NodeMsg, NodeDataLocation
+
+from ros_bt_py.exceptions import BehaviorTreeException
+from ros_bt_py.helpers import json_decode, tree_hash
+from ros_bt_py.tree_manager import (
+    TreeManager,
+    get_success,
+    get_error_message,
+    load_tree_from_file,
+)
+from ros_bt_py.tree_transfer import TreeStore
+
+
+def _nop(msg):
+    """Discard tree messages of trees that are not used by a slot."""
+
+
+def _apply_input_values(tree_manager, tree):
+    """Set the unwired input values of a loaded tree to the ones in `tree`.
 
-from ros_bt_py.tree_manager import TreeManager, get_success, get_error_message
+    This has the same effect as loading `tree`, without instantiating
+    its nodes again.
+
+    :param ros_bt_py.tree_manager.TreeManager tree_manager:
+
+    Tree manager holding a tree with the same structure as `tree`
+
+    :param ros_bt_py_msgs.msg.Tree tree:
+
+    The tree containing the input values
+
+    :raises: BehaviorTreeException if a value cannot be set
+    """
+    wired_inputs = {
+        (wiring.target.node_name, wiring.target.data_key)
+        for wiring in tree_manager.tree_msg.data_wirings
+        if wiring.target.data_kind == NodeDataLocation.INPUT_DATA
+    }
+    for node_msg in tree.nodes:
+        node = tree_manager.nodes.get(node_msg.name)
+        if node is None:
+            raise BehaviorTreeException(f"Node {node_msg.name} is not loaded")
+        for node_input in node_msg.inputs:
+            if (node_msg.name, node_input.key) in wired_inputs:
+                continue
+            try:
+                node.inputs[node_input.key] = json_decode(node_input.serialized_value)
+            except (KeyError, TypeError, ValueError, AttributeError) as exc:
+                raise BehaviorTreeException(
+                    f"Failed to set input {node_input.key} of {node_msg.name}: {exc}"
+                ) from exc
+
+
+class RemoteTreeSlotPool(object):
+    """Shared state of all :class:`RemoteTreeSlot` instances of one executor.
+
+    Keeps loaded trees that are not used by any slot, keyed by their
+    :func:`ros_bt_py.helpers.tree_hash`. When the same tree is run
+    again, a slot takes the loaded tree from the pool instead of
+    loading it from scratch.
+
+    The pool also knows all slots it serves, which allows every slot
+    to advertise the capacity of the executor in its
+    :class:`ros_bt_py_msgs.msg.RemoteSlotState`.
+
+    Compressed trees received by any slot are kept in
+    `received_trees`, so senders can refer to them by their hash.
+    """
+
+    def __init__(self, max_cached_trees=1, max_received_trees=16):
+        """Initialize the `RemoteTreeSlotPool`.
+
+        :param int max_cached_trees:
+
+        Maximum number of unused loaded trees to keep. If more trees
+        are returned to the pool, the least recently used ones are
+        shut down and cleared.
+
+        :param int max_received_trees:
+
+        Maximum number of received tree messages to keep
+        """
+        self.max_cached_trees = max_cached_trees
+        self.received_trees = TreeStore(max_trees=max_received_trees)
+        self._slots = []
+        self._cached_trees = OrderedDict()
+        self._spare_tree_managers = []
+        self._lock = RLock()
+
+    def register(self, slot):
+        """Register a slot served by this pool."""
+        with self._lock:
+            self._slots.append(slot)
+
+    @property
+    def capacity(self):
+        """Number of slots served by this pool."""
+        with self._lock:
+            return len(self._slots)
+
+    @property
+    def available_slots(self):
+        """Number of slots that do not run a tree."""
+        with self._lock:
+            return len([slot for slot in self._slots if not slot.run_tree_gh])
+
+    @property
+    def cached_trees(self):
+        """Number of loaded trees kept for reuse."""
+        with self._lock:
+            return len(self._cached_trees)
+
+    def publish_slot_states(self):
+        """Make all slots publish their state, e.g. because the capacity changed."""
+        with self._lock:
+            slots = list(self._slots)
+        for slot in slots:
+            slot.publish_state()
+
+    def get_tree_manager(self):
+        """Return a tree manager without a tree.
+
+        :rtype: ros_bt_py.tree_manager.TreeManager
+        """
+        with self._lock:
+            if self._spare_tree_managers:
+                return self._spare_tree_managers.pop()
+        return TreeManager(publish_tree_callback=_nop)
+
+    def take(self, key):
+        """Take the loaded tree with the hash `key` out of the pool.
+
+        :returns:
+
+        The tree manager holding the tree, or None if no such tree is
+        kept
+        """
+        with self._lock:
+            return self._cached_trees.pop(key, None)
+
+    def put(self, key, tree_manager):
+        """Keep a loaded tree for later reuse.
+
+        If the tree cannot be stopped, it is discarded instead.
+        """
+        tree_manager.publish_tree = _nop
+        stop_res = tree_manager.control_execution(
+            ControlTreeExecutionRequest(command=ControlTreeExecutionRequest.STOP)
+        )
+        if not get_success(stop_res):
+            self.discard(tree_manager)
+            return
+
+        with self._lock:
+            previous = self._cached_trees.pop(key, None)
+            if previous is not None:
+                self.discard(previous)
+            self._cached_trees[key] = tree_manager
+            while len(self._cached_trees) > self.max_cached_trees:
+                _, evicted = self._cached_trees.popitem(last=False)
+                self.discard(evicted)
+
+    def discard(self, tree_manager):
+        """Shut down and clear a tree, then keep its tree manager for other trees."""
+        tree_manager.publish_tree = _nop
+        try:
+            res = tree_manager.control_execution(
+                ControlTreeExecutionRequest(
+                    command=ControlTreeExecutionRequest.SHUTDOWN
+                )
+            )
+            if get_success(res):
+                res = tree_manager.clear(None)
+            if not get_success(res):
+                rospy.logwarn(
+                    f"Failed to discard loaded tree: {get_error_message(res)}"
+                )
+                return
+        except BehaviorTreeException as exc:
+            rospy.logwarn(f"Failed to discard loaded tree: {exc}")
+            return
+        with self._lock:
+            self._spare_tree_managers.append(tree_manager)
 
 
 class RemoteTreeSlot(object):
@@ -62,9 +242,14 @@ class RemoteTreeSlot(object):
     can determine when the remote tree in this slot (if any) is
     allowed to execute.
 
+    Trees stay loaded after they finished. If the same tree is sent
+    again, it is reset and its input values are updated instead of
+    loading it again. Slots of the same executor share the trees they
+    keep loaded through a :class:`RemoteTreeSlotPool`.
+
     """
 
-    def __init__(self, publish_slot_state):
+    def __init__(self, publish_slot_state, pool=None):
         """Initialize the `RemoteTreeSlot`.
 
         :param function publish_slot_state:
@@ -72,6 +257,11 @@ class RemoteTreeSlot(object):
         A callback that will be called with the current state of the
         RemoteTreeSlot whenever it changes
 
+        :param RemoteTreeSlotPool pool:
+
+        The pool shared with the other slots of the executor. If None,
+        the slot uses a pool of its own.
+
         """
         self.run_tree_gh = None
         self.latest_tree = None
@@ -81,9 +271,122 @@ class RemoteTreeSlot(object):
 
         self._lock = Lock()
 
+        self._pool = pool if pool is not None else RemoteTreeSlotPool()
+        self._pool.register(self)
+
         self.publish_slot_state = publish_slot_state
+        self.tree_manager = self._pool.get_tree_manager()
+        self.tree_manager.publish_tree = self.update_tree_msg
+        # Hash of the tree loaded into self.tree_manager, None if there is none
+        self._tree_hash = None
+        self._pool.publish_slot_states()
+
+    def publish_state(self):
+        """Publish the state of this slot, including the capacity of its pool."""
+        self.slot_state.capacity = self._pool.capacity
+        self.slot_state.available_slots = self._pool.available_slots
+        self.slot_state.cached_trees = self._pool.cached_trees
         self.publish_slot_state(self.slot_state)
-        self.tree_manager = TreeManager(publish_tree_callback=self.update_tree_msg)
+
+    def _received_tree(self, tree, compressed_tree):
+        """Return the tree sent in a request.
+
+        :param ros_bt_py_msgs.msg.Tree tree:
+
+        The uncompressed tree, only used if `compressed_tree` is unset
+
+        :param ros_bt_py_msgs.msg.CompressedTree compressed_tree:
+
+        The compressed tree or a reference to a previously received one
+
+        :raises: ValueError if the compressed tree is corrupt
+
+        :returns: The tree, or None if only an unknown hash was sent
+        """
+        if not compressed_tree.hash:
+            return tree
+        return self._pool.received_trees.resolve(compressed_tree)
+
+    def _load_tree(self, tree):
+        """Load `tree` into this slot, reusing an already loaded tree if possible.
+
+        :param ros_bt_py_msgs.msg.Tree tree: The tree to load
+
+        :returns: A response with `success` and `error_message` members
+        """
+        resolve_res = load_tree_from_file(MigrateTreeRequest(tree=tree))
+        if not get_success(resolve_res):
+            return resolve_res
+        tree = resolve_res.tree
+        key = tree_hash(tree)
+
+        if key != self._tree_hash:
+            cached_tree_manager = self._pool.take(key)
+            if self._tree_hash is not None:
+                self._pool.put(self._tree_hash, self.tree_manager)
+            elif cached_tree_manager is not None:
+                self._pool.discard(self.tree_manager)
+
+            if cached_tree_manager is not None:
+                self.tree_manager = cached_tree_manager
+                self._tree_hash = key
+            elif self._tree_hash is not None:
+                self.tree_manager = self._pool.get_tree_manager()
+                self._tree_hash = None
+        self.tree_manager.publish_tree = self.update_tree_msg
+
+        if self._tree_hash is not None:
+            try:
+                res = self._reuse_loaded_tree(tree)
+                if get_success(res):
+                    rospy.loginfo("Reusing loaded tree")
+                    return res
+                error_message = get_error_message(res)
+            except BehaviorTreeException as exc:
+                error_message = str(exc)
+            rospy.logwarn(
+                f"Failed to reuse loaded tree, loading it again: {error_message}"
+            )
+            self._tree_hash = None
+
+        stop_res = self.tree_manager.control_execution(
+            ControlTreeExecutionRequest(command=ControlTreeExecutionRequest.SHUTDOWN)
+        )
+        if not get_success(stop_res):
+            return ControlTreeExecutionResponse(
+                success=False,
+                error_message=(
+                    f"Failed to shutdown old tree: {get_error_message(stop_res)}"
+                ),
+            )
+
+        res = self.tree_manager.load_tree(LoadTreeRequest(tree=tree))
+        if get_success(res):
+            self._tree_hash = key
+        return res
+
+    def _reuse_loaded_tree(self, tree):
+        """Prepare the loaded tree for another run with the input values of `tree`.
+
+        :raises: BehaviorTreeException if the tree cannot be reset
+
+        :returns: A response with `success` and `error_message` members
+        """
+        stop_res = self.tree_manager.control_execution(
+            ControlTreeExecutionRequest(command=ControlTreeExecutionRequest.STOP)
+        )
+        if not get_success(stop_res):
+            return stop_res
+
+        root = self.tree_manager.find_root()
+        if root is not None and root.state not in [
+            NodeMsg.UNINITIALIZED,
+            NodeMsg.SHUTDOWN,
+            NodeMsg.IDLE,
+        ]:
+            root.reset()
+        _apply_input_values(self.tree_manager, tree)
+        return ControlTreeExecutionResponse(success=True)
 
     def evaluate_utility_handler(self, request):
         """Service handler for :class:`ros_bt_py_msgs.srv.EvaluateUtility`.
@@ -104,14 +407,17 @@ class RemoteTreeSlot(object):
             )
             return EvaluateUtilityResponse()
 
-        # shut down and clear TreeManager, just to be sure
-        self.tree_manager.control_execution(
-            ControlTreeExecutionRequest(command=ControlTreeExecutionRequest.SHUTDOWN)
-        )
-        self.tree_manager.clear(None)
+        try:
+            tree = self._received_tree(request.tree, request.compressed_tree)
+        except ValueError as exc:
+            rospy.logerr(str(exc))
+            return EvaluateUtilityResponse()
+        if tree is None:
+            rospy.loginfo("Unable to evaluate utility of an unknown tree")
+            return EvaluateUtilityResponse(unknown_tree=True)
 
-        rospy.loginfo(f"Loading tree: {str(request.tree)}")
-        res = self.tree_manager.load_tree(LoadTreeRequest(tree=request.tree))
+        rospy.loginfo(f"Loading tree: {tree.name}")
+        res = self._load_tree(tree)
         if not get_success(res):
             rospy.logerr(get_error_message(res))
             return EvaluateUtilityResponse()
@@ -139,22 +445,21 @@ class RemoteTreeSlot(object):
             goal_handle.set_rejected()
             return
 
-        stop_res = self.tree_manager.control_execution(
-            ControlTreeExecutionRequest(command=ControlTreeExecutionRequest.SHUTDOWN)
-        )
-        if not get_success(stop_res):
-            rospy.loginfo(
-                "Rejected goal because shutting down the old tree failed with error "
-                f"{get_error_message(stop_res)}"
-            )
+        goal = goal_handle.get_goal()
+        try:
+            tree = self._received_tree(goal.tree, goal.compressed_tree)
+        except ValueError as exc:
+            rospy.loginfo(f"Rejected goal because of a corrupt tree: {exc}")
+            goal_handle.set_rejected(text=f"Failed to load tree: {exc}")
+            return
+        if tree is None:
+            rospy.loginfo("Rejected goal because its tree is not known")
             goal_handle.set_rejected(
-                text=f"Failed to shutdown old tree: {get_error_message(stop_res)}"
+                result=RunTreeResult(unknown_tree=True), text="Unknown tree"
             )
             return
 
-        res = self.tree_manager.load_tree(
-            LoadTreeRequest(tree=goal_handle.get_goal().tree)
-        )
+        res = self._load_tree(tree)
         if not get_success(res):
             rospy.loginfo(
                 "Rejected goal because loading the tree failed with error "
@@ -171,7 +476,7 @@ class RemoteTreeSlot(object):
         rospy.loginfo("Successfully loaded tree")
         self.slot_state.tree_in_slot = True
         self.slot_state.tree_finished = False
-        self.publish_slot_state(self.slot_state)
+        self._pool.publish_slot_states()
         goal_handle.set_accepted()
 
     def control_tree_execution_handler(self, request):
@@ -224,7 +529,7 @@ class RemoteTreeSlot(object):
             # the tree is not running any more
             self.slot_state.tree_running = False
 
-        self.publish_slot_state(self.slot_state)
+        self.publish_state()
         return res
 
     def cancel_run_tree_handler(self, goal_handle):
@@ -259,12 +564,13 @@ class RemoteTreeSlot(object):
                     f"Failed to stop tree in RemoteTreeSlot: {get_success(stop_res)}"
                 )
 
+            # The canceled tree is not kept for reuse
             self.tree_manager.clear(None)
+            self._tree_hash = None
 
             self.slot_state.tree_in_slot = False
             self.slot_state.tree_running = False
             self.slot_state.tree_finished = False
-            self.publish_slot_state(self.slot_state)
 
             with self._lock:
                 if self.latest_tree:
@@ -276,6 +582,7 @@ class RemoteTreeSlot(object):
             # Remove existing goal handle and empty latest_tree
             self.run_tree_gh = None
             self.latest_tree = None
+            self._pool.publish_slot_states()
         else:
             goal_handle.set_canceled()
 
@@ -296,17 +603,16 @@ class RemoteTreeSlot(object):
                         self.slot_state.tree_running = False
                         self.slot_state.tree_finished = True
                         self.slot_state.tree_in_slot = False
-                        self.publish_slot_state(self.slot_state)
 
-                        # TODO(nberg): Can't shutdown and clear the
-                        # tree from here, because that would deadlock
-                        # the TreeManager. Is that okay, or do we need
-                        # to figure out a way aruond that deadlock?
+                        # The tree stays loaded, it is reset if the
+                        # same tree is sent again, or kept in the pool
+                        # when another tree is loaded into this slot.
 
                         self.run_tree_gh.set_succeeded(
                             result=RunTreeResult(final_tree=self.latest_tree)
                         )
                         self.run_tree_gh = None
                         self.latest_tree = None
+                        self._pool.publish_slot_states()
 
                         break
@@ -27,13 +27,16 @@
 # POSSIBILITY OF SUCH DAMAGE.
 
 
+from functools import lru_cache
 import inspect
+from operator import attrgetter
 from threading import Event, Lock, Thread
-from typing import Callable, Dict, Optional, Tuple, Type
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Type
 
 import genpy
 
 import rospy
+from std_msgs.msg import Duration, Time
 
 from ros_bt_py.exceptions import BehaviorTreeException
 
@@ -413,6 +416,45 @@ class EnumValue(object):
         self.enum_value = enum_value
 
 
+class SubscriberAwarePublisher(rospy.SubscribeListener):
+    """Publish callback that knows whether anyone subscribed to its topic.
+
+    Calling it publishes a message via a :class:`rospy.Publisher` created with the given
+    arguments. Users of the callback can check :func:`has_subscribers` to skip building
+    messages nobody would receive. Since a latched topic then holds an outdated message,
+    `on_subscribe` is called whenever a new subscriber connects, so the current state can
+    be published.
+    """
+
+    def __init__(self, name, data_class, on_subscribe=None, **kwargs):
+        self.on_subscribe = on_subscribe
+        self.publisher = rospy.Publisher(
+            name, data_class, subscriber_listener=self, **kwargs
+        )
+
+    def __call__(self, msg):
+        self.publisher.publish(msg)
+
+    def has_subscribers(self):
+        return self.publisher.get_num_connections() > 0
+
+    def peer_subscribe(self, topic_name, topic_publish, peer_publish):
+        if self.on_subscribe is not None:
+            self.on_subscribe()
+
+
+def has_subscribers(publish_callback):
+    """Check whether a message passed to `publish_callback` would reach anyone.
+
+    Callbacks that cannot tell, i.e. anything but a :class:`SubscriberAwarePublisher`, are
+    assumed to have subscribers.
+    """
+    if publish_callback is None:
+        return False
+    check = getattr(publish_callback, "has_subscribers", None)
+    return check is None or check()
+
+
 def get_message_constant_fields(message_class):
     """Returns all constant fields of a message as a list"""
     if (
@@ -445,3 +487,169 @@ def get_message_constant_fields(message_class):
         return constants
     else:
         raise BehaviorTreeException(f"{message_class} is not a ROS Message")
+
+
+def _time_to_std_msg(value):
+    time_value = Time()
+    time_value.data.secs = value.secs
+    time_value.data.nsecs = value.nsecs
+    return time_value
+
+
+def _duration_to_std_msg(value):
+    duration_value = Duration()
+    duration_value.data.secs = value.secs
+    duration_value.data.nsecs = value.nsecs
+    return duration_value
+
+
+def _time_from_std_msg(value):
+    return genpy.rostime.Time(secs=value.data.secs, nsecs=value.data.nsecs)
+
+
+def _duration_from_std_msg(value):
+    return genpy.rostime.Duration(secs=value.data.secs, nsecs=value.data.nsecs)
+
+
+def _tuple_to_list(value):
+    return list(value) if type(value) is tuple else value
+
+
+class MessageFields(object):
+    """Precompiled access to a fixed set of fields of a ROS message type.
+
+    Fields are given as paths, nested fields are separated by dots, e.g.
+    `pose.position.x`. Reading all fields is a single :func:`operator.attrgetter` call,
+    and messages are built with the keyword constructor of the message class, so
+    neither needs to inspect the message on every call.
+
+    `genpy.rostime.Time` and `genpy.rostime.Duration` fields are exchanged as
+    `std_msgs/Time` and `std_msgs/Duration` messages, tuples of array fields as lists.
+
+    Use :func:`get_message_fields` to share the instances for a message type.
+    """
+
+    def __init__(self, message_type, paths: Optional[Sequence[str]] = None):
+        """
+        :param message_type: The ROS message class.
+        :param paths: The field paths, defaults to all fields of the message.
+
+        :raises: BehaviorTreeException if `message_type` is not a message class or a
+        path does not name a field.
+        """
+        if not (
+            inspect.isclass(message_type)
+            and genpy.message.Message in message_type.__mro__
+        ):
+            raise BehaviorTreeException(f"{message_type} is not a ROS Message")
+        self.message_type = message_type
+        self.paths: Tuple[str, ...] = tuple(
+            message_type.__slots__ if paths is None else paths
+        )
+        default = message_type()
+        #: The port types of the fields, by path
+        self.types: Dict[str, type] = {}
+        self._to_port: List[Optional[Callable[[Any], Any]]] = []
+        self._from_port: List[Optional[Callable[[Any], Any]]] = []
+        for path in self.paths:
+            try:
+                value = attrgetter(path)(default)
+            except AttributeError:
+                raise BehaviorTreeException(
+                    f"{message_type.__name__} has no field {path}"
+                )
+            if isinstance(value, genpy.rostime.Time):
+                self.types[path] = Time
+                self._to_port.append(_time_to_std_msg)
+                self._from_port.append(_time_from_std_msg)
+            elif isinstance(value, genpy.rostime.Duration):
+                self.types[path] = Duration
+                self._to_port.append(_duration_to_std_msg)
+                self._from_port.append(_duration_from_std_msg)
+            else:
+                self.types[path] = type(value)
+                self._to_port.append(_tuple_to_list if type(value) is list else None)
+                self._from_port.append(None)
+
+        if not self.paths:
+            self._getter = lambda msg: ()
+        elif len(self.paths) == 1:
+            getter = attrgetter(self.paths[0])
+            self._getter = lambda msg: (getter(msg),)
+        else:
+            self._getter = attrgetter(*self.paths)
+
+        # Top level fields are passed to the constructor, nested ones set afterwards
+        self._top_level = [
+            (index, path) for index, path in enumerate(self.paths) if "." not in path
+        ]
+        self._nested = []
+        for index, path in enumerate(self.paths):
+            if "." in path:
+                parent, name = path.rsplit(".", 1)
+                self._nested.append((index, attrgetter(parent), name))
+
+    def get(self, msg) -> Tuple:
+        """Read the raw values of all fields of `msg`, in the order of :attr:`paths`."""
+        return self._getter(msg)
+
+    def to_port(self, index: int, value):
+        """Convert the raw value of the field at `index` to its port type."""
+        convert = self._to_port[index]
+        return value if convert is None else convert(value)
+
+    def extract(self, msg) -> List:
+        """Read all fields of `msg`, converted to their port types."""
+        return [
+            value if convert is None else convert(value)
+            for value, convert in zip(self._getter(msg), self._to_port)
+        ]
+
+    def build(self, values: Sequence):
+        """Create a message from values of the port types, in the order of :attr:`paths`.
+
+        Fields that are not part of :attr:`paths` keep their default values.
+        """
+        values = [
+            value if convert is None else convert(value)
+            for value, convert in zip(values, self._from_port)
+        ]
+        msg = self.message_type(
+            **{path: values[index] for index, path in self._top_level}
+        )
+        for index, get_parent, name in self._nested:
+            setattr(get_parent(msg), name, values[index])
+        return msg
+
+
+@lru_cache(maxsize=None)
+def _cached_message_fields(message_type, paths):
+    return MessageFields(message_type, paths)
+
+
+def get_message_fields(message_type, paths: Optional[Sequence[str]] = None):
+    """Return the shared :class:`MessageFields` of `message_type` and `paths`."""
+    return _cached_message_fields(message_type, None if paths is None else tuple(paths))
+
+
+def expand_field_paths(values: Dict[str, Any]) -> Dict[str, Any]:
+    """Turn keys with nested field paths into nested dicts.
+
+    `{"pose.position.x": 1.0}` becomes `{"pose": {"position": {"x": 1.0}}}`, keys
+    without dots are kept as they are.
+    """
+    if not any("." in key for key in values):
+        return values
+    expanded = {}
+    for key, value in values.items():
+        target = expanded
+        *parents, name = key.split(".")
+        for parent in parents:
+            if not isinstance(target.get(parent), dict):
+                target[parent] = {}
+            target = target[parent]
+        if isinstance(value, dict) and isinstance(target.get(name), dict):
+            target[name].update(value)
+        else:
+            target[name] = value
+    return expanded
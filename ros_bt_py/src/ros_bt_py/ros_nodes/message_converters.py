@@ -33,11 +33,19 @@ from typing import Optional, Dict
 import genpy
 
 from ros_bt_py_msgs.msg import Node as NodeMsg
-from std_msgs.msg import Duration, Time
 
 from ros_bt_py.debug_manager import DebugManager
 from ros_bt_py.node import Leaf, define_bt_node
 from ros_bt_py.node_config import NodeConfig, OptionRef
+from ros_bt_py.ros_helpers import get_message_fields
+
+
+# Field values of these types cannot change in place and are safe to compare
+_IMMUTABLE_TYPES = (bool, int, float, str, bytes)
+
+
+def _is_message_type(data_type):
+    return inspect.isclass(data_type) and genpy.message.Message in data_type.__mro__
 
 
 @define_bt_node(
@@ -56,6 +64,9 @@ class MessageToFields(Leaf):
 
     If the input is not as ROS message, it will be be passed through
 
+    Only the outputs of fields that changed since the last tick are updated.
+    Fields holding messages or lists can be changed in place, so their outputs
+    are updated with every new input.
     """
 
     def __init__(
@@ -74,27 +85,22 @@ class MessageToFields(Leaf):
             simulate_tick=simulate_tick,
         )
 
-        node_outputs = {}
-
         self.passthrough = True
-
-        if (
-            inspect.isclass(self.options["input_type"])
-            and genpy.message.Message in self.options["input_type"].__mro__
-        ):
-            msg = self.options["input_type"]()
-            for field in msg.__slots__:
-                if isinstance(getattr(msg, field), genpy.rostime.Time):
-                    # change the type of a genpy.rostime.Time field to std_msgs/Time
-                    node_outputs[field] = Time
-                elif isinstance(getattr(msg, field), genpy.rostime.Duration):
-                    # change the type of a genpy.rostime.Duration field to std_msgs/Duration
-                    node_outputs[field] = Duration
-                else:
-                    node_outputs[field] = type(getattr(msg, field))
+        self._fields = None
+        self._compared = ()
+
+        if _is_message_type(self.options["input_type"]):
+            self._fields = get_message_fields(
+                self.options["input_type"], self._field_paths()
+            )
+            node_outputs = dict(self._fields.types)
+            self._compared = tuple(
+                self._fields.types[path] in _IMMUTABLE_TYPES
+                for path in self._fields.paths
+            )
             self.passthrough = False
         else:
-            node_outputs["out"] = self.options["input_type"]
+            node_outputs = {"out": self.options["input_type"]}
 
         self.node_config.extend(
             NodeConfig(options={}, inputs={}, outputs=node_outputs, max_children=0)
@@ -102,30 +108,28 @@ class MessageToFields(Leaf):
 
         self._register_node_data(source_map=node_outputs, target_map=self.outputs)
 
+    def _field_paths(self):
+        """The paths of the fields to output, `None` for all top level fields."""
+        return None
+
     def _do_setup(self):
+        self._last_values = None
         return NodeMsg.IDLE
 
     def _do_tick(self):
         if self.passthrough:
             self.outputs["out"] = self.inputs["in"]
-        else:
-            for field in self.outputs:
-                value = getattr(self.inputs["in"], field)
-                if isinstance(value, genpy.rostime.Time):
-                    time_value = Time()
-                    time_value.data.secs = value.secs
-                    time_value.data.nsecs = value.nsecs
-                    self.outputs[field] = time_value
-                elif isinstance(value, genpy.rostime.Duration):
-                    duration_value = Duration()
-                    duration_value.data.secs = value.secs
-                    duration_value.data.nsecs = value.nsecs
-                    self.outputs[field] = duration_value
-                else:
-                    if type(value) == tuple and self.outputs.get_type(field) == list:
-                        self.outputs[field] = list(value)
-                    else:
-                        self.outputs[field] = value
+        elif self.inputs.is_updated("in") or self._last_values is None:
+            values = self._fields.get(self.inputs["in"])
+            last_values = self._last_values
+            for index, path in enumerate(self._fields.paths):
+                if (
+                    last_values is None
+                    or not self._compared[index]
+                    or values[index] != last_values[index]
+                ):
+                    self.outputs[path] = self._fields.to_port(index, values[index])
+            self._last_values = values
         return NodeMsg.SUCCEEDED
 
     def _do_untick(self):
@@ -135,6 +139,7 @@ class MessageToFields(Leaf):
         pass
 
     def _do_reset(self):
+        self._last_values = None
         return NodeMsg.IDLE
 
 
@@ -154,6 +159,7 @@ class FieldsToMessage(Leaf):
 
     If the output is not as ROS message, the input will be be passed through
 
+    A new message is only built if an input changed since the last tick.
     """
 
     def __init__(
@@ -172,27 +178,17 @@ class FieldsToMessage(Leaf):
             simulate_tick=simulate_tick,
         )
 
-        node_inputs = {}
-
         self.passthrough = True
+        self._fields = None
 
-        if (
-            inspect.isclass(self.options["output_type"])
-            and genpy.message.Message in self.options["output_type"].__mro__
-        ):
-            msg = self.options["output_type"]()
-            for field in msg.__slots__:
-                if isinstance(getattr(msg, field), genpy.rostime.Time):
-                    # change the type of a genpy.rostime.Time field to std_msgs/Time
-                    node_inputs[field] = Time
-                elif isinstance(getattr(msg, field), genpy.rostime.Duration):
-                    # change the type of a genpy.rostime.Duration field to std_msgs/Duration
-                    node_inputs[field] = Duration
-                else:
-                    node_inputs[field] = type(getattr(msg, field))
+        if _is_message_type(self.options["output_type"]):
+            self._fields = get_message_fields(
+                self.options["output_type"], self._field_paths()
+            )
+            node_inputs = dict(self._fields.types)
             self.passthrough = False
         else:
-            node_inputs["in"] = self.options["output_type"]
+            node_inputs = {"in": self.options["output_type"]}
 
         self.node_config.extend(
             NodeConfig(options={}, inputs=node_inputs, outputs={}, max_children=0)
@@ -200,32 +196,24 @@ class FieldsToMessage(Leaf):
 
         self._register_node_data(source_map=node_inputs, target_map=self.inputs)
 
+    def _field_paths(self):
+        """The paths of the fields to set, `None` for all top level fields."""
+        return None
+
     def _do_setup(self):
+        self._built = False
         return NodeMsg.IDLE
 
     def _do_tick(self):
         if self.passthrough:
             self.outputs["out"] = self.inputs["in"]
-        else:
-            msg = self.options["output_type"]()
-
-            for field in msg.__slots__:
-                if isinstance(getattr(msg, field), genpy.rostime.Time):
-                    time_value = genpy.rostime.Time(
-                        secs=self.inputs[field].data.secs,
-                        nsecs=self.inputs[field].data.nsecs,
-                    )
-                    setattr(msg, field, time_value)
-                elif isinstance(getattr(msg, field), genpy.rostime.Duration):
-                    duration_value = genpy.rostime.Duration(
-                        secs=self.inputs[field].data.secs,
-                        nsecs=self.inputs[field].data.nsecs,
-                    )
-                    setattr(msg, field, duration_value)
-                else:
-                    setattr(msg, field, self.inputs[field])
-
-            self.outputs["out"] = msg
+        elif not self._built or any(
+            self.inputs.is_updated(path) for path in self._fields.paths
+        ):
+            self.outputs["out"] = self._fields.build(
+                [self.inputs[path] for path in self._fields.paths]
+            )
+            self._built = True
         return NodeMsg.SUCCEEDED
 
     def _do_untick(self):
@@ -235,4 +223,47 @@ class FieldsToMessage(Leaf):
         pass
 
     def _do_reset(self):
+        self._built = False
         return NodeMsg.IDLE
+
+
+@define_bt_node(
+    NodeConfig(
+        version="1.0.0",
+        options={"input_type": type, "field_paths": list},
+        inputs={"in": OptionRef("input_type")},
+        outputs={},
+        max_children=0,
+        tags=["message", "fields", "nested", "converter"],
+    )
+)
+class MessageToFieldPaths(MessageToFields):
+    """Like :class:`MessageToFields`, but outputs the (nested) fields in `field_paths`
+
+    Nested fields are separated by dots, e.g. `pose.position.x`. The outputs are named
+    after the paths.
+    """
+
+    def _field_paths(self):
+        return self.options["field_paths"]
+
+
+@define_bt_node(
+    NodeConfig(
+        version="1.0.0",
+        options={"output_type": type, "field_paths": list},
+        inputs={},
+        outputs={"out": OptionRef("output_type")},
+        max_children=0,
+        tags=["message", "fields", "nested", "converter"],
+    )
+)
+class FieldPathsToMessage(FieldsToMessage):
+    """Like :class:`FieldsToMessage`, but only sets the (nested) fields in `field_paths`
+
+    Nested fields are separated by dots, e.g. `pose.position.x`. The inputs are named
+    after the paths, all other fields keep their default values.
+    """
+
+    def _field_paths(self):
+        return self.options["field_paths"]
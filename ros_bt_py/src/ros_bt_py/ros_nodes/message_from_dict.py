@@ -38,6 +38,7 @@ from ros_bt_py_msgs.msg import Node as NodeMsg
 
 from ros_bt_py.node import Leaf, define_bt_node
 from ros_bt_py.node_config import NodeConfig, OptionRef
+from ros_bt_py.ros_helpers import expand_field_paths
 
 
 @define_bt_node(
@@ -50,7 +51,10 @@ from ros_bt_py.node_config import NodeConfig, OptionRef
     )
 )
 class MessageFromDict(Leaf):
-    """Fill a ROS message with the values from `dict`."""
+    """Fill a ROS message with the values from `dict`.
+
+    Keys can be nested field paths separated by dots, e.g. `pose.position.x`.
+    """
 
     def _do_setup(self):
         pass
@@ -59,7 +63,7 @@ class MessageFromDict(Leaf):
         if self.inputs.is_updated("dict"):
             message = self.options["message_type"]()
             try:
-                populate_instance(self.inputs["dict"], message)
+                populate_instance(expand_field_paths(self.inputs["dict"]), message)
                 self.outputs["message"] = message
             except (
                 InvalidMessageException,
@@ -93,26 +97,35 @@ class MessageFromDict(Leaf):
     )
 )
 class MessageFromConstDict(Leaf):
-    """Fill a ROS message with the values from `dict`."""
+    """Fill a ROS message with the values from `dict`.
 
-    def _do_setup(self):
-        pass
+    Keys can be nested field paths separated by dots, e.g. `pose.position.x`. The
+    message is filled once on setup and only output on the first tick.
+    """
 
-    def _do_tick(self):
+    def _do_setup(self):
+        self._message = None
+        self._error = None
         message = self.options["message_type"]()
         try:
-            populate_instance(self.options["dict"], message)
-            self.outputs["message"] = message
+            populate_instance(expand_field_paths(self.options["dict"]), message)
+            self._message = message
         except (
             InvalidMessageException,
             NonexistentFieldException,
             FieldTypeMismatchException,
         ) as ex:
-            self.logerr(
+            self._error = (
                 f"Error populating message of type {self.options['message_type'].__name__}: "
                 f"{str(ex)}"
             )
+
+    def _do_tick(self):
+        if self._error is not None:
+            self.logerr(self._error)
             return NodeMsg.FAILED
+        if self.outputs["message"] is not self._message:
+            self.outputs["message"] = self._message
         return NodeMsg.SUCCEEDED
 
     def _do_shutdown(self):
@@ -27,12 +27,14 @@
 # POSSIBILITY OF SUCH DAMAGE.
 
 
+import numpy as np
 import rospy
 
 from tf import transformations
 from geometry_msgs.msg import Pose
 from ros_bt_py_msgs.msg import Node as NodeMsg
 
+from ros_bt_py.exceptions import BehaviorTreeException
 from ros_bt_py.node import Leaf, define_bt_node, Decorator
 from ros_bt_py.node_config import NodeConfig, OptionRef
 
@@ -166,3 +168,195 @@ class PoseDistance(Leaf):
 
     def _do_untick(self):
         return NodeMsg.IDLE
+
+
+# Same threshold as tf.transformations
+_EPS = np.finfo(float).eps * 4.0
+
+
+def _positions(poses):
+    return np.array(
+        [[p.position.x, p.position.y, p.position.z] for p in poses], dtype=np.float64
+    ).reshape(-1, 3)
+
+
+def _orientations(poses):
+    return np.array(
+        [
+            [p.orientation.x, p.orientation.y, p.orientation.z, p.orientation.w]
+            for p in poses
+        ],
+        dtype=np.float64,
+    ).reshape(-1, 4)
+
+
+def _euler_norms(quaternions):
+    """Norm of the (static xyz) euler angles of every quaternion.
+
+    Vectorized version of ``vector_norm(euler_from_quaternion(q))``, following
+    :func:`transformations.quaternion_matrix` and :func:`transformations.euler_from_matrix`.
+    """
+    squared_norms = np.einsum("ij,ij->i", quaternions, quaternions)
+    identity = squared_norms < _EPS
+    q = quaternions * np.sqrt(2.0 / np.where(identity, 1.0, squared_norms))[:, None]
+    x, y, z, w = q.T
+    # The rotation matrix entries that are needed for the euler angles
+    m00 = np.where(identity, 1.0, 1.0 - y * y - z * z)
+    m10 = np.where(identity, 0.0, x * y + z * w)
+    m11 = np.where(identity, 1.0, 1.0 - x * x - z * z)
+    m12 = np.where(identity, 0.0, y * z - x * w)
+    m20 = np.where(identity, 0.0, x * z - y * w)
+    m21 = np.where(identity, 0.0, y * z + x * w)
+    m22 = np.where(identity, 1.0, 1.0 - x * x - y * y)
+
+    cy = np.sqrt(m00 * m00 + m10 * m10)
+    regular = cy > _EPS
+    ax = np.where(regular, np.arctan2(m21, m22), np.arctan2(-m12, m11))
+    ay = np.arctan2(-m20, cy)
+    az = np.where(regular, np.arctan2(m10, m00), 0.0)
+    return np.sqrt(ax * ax + ay * ay + az * az)
+
+
+def pose_distances(pose, poses):
+    """Calculate the distances from `pose` to each of `poses` at once.
+
+    :returns: Two arrays with the same values the `distance_pos` and `distance_angle`
+      outputs of :class:`PoseDistance` would have for each pair of poses.
+    """
+    distances_pos = np.linalg.norm(_positions(poses) - _positions([pose]), axis=1)
+
+    # Difference between the quaternions is a * inv(b), like in PoseDistance
+    x1, y1, z1, w1 = _orientations([pose])[0]
+    others = _orientations(poses)
+    # Invalid quaternions result in NaN, just like in PoseDistance
+    with np.errstate(divide="ignore", invalid="ignore"):
+        x0, y0, z0, w0 = (
+            others
+            * np.array([-1.0, -1.0, -1.0, 1.0])
+            / np.einsum("ij,ij->i", others, others)[:, None]
+        ).T
+        diff = np.stack(
+            [
+                x1 * w0 + y1 * z0 - z1 * y0 + w1 * x0,
+                -x1 * z0 + y1 * w0 + z1 * x0 + w1 * y0,
+                x1 * y0 - y1 * x0 + z1 * w0 + w1 * z0,
+                -x1 * x0 - y1 * y0 - z1 * z0 + w1 * w0,
+            ],
+            axis=1,
+        )
+        distances_angle = _euler_norms(diff)
+    return distances_pos, distances_angle
+
+
+@define_bt_node(
+    NodeConfig(
+        options={"succeed_on_stale_data": bool},
+        inputs={"pose": Pose, "poses": list},
+        outputs={"distances_pos": list, "distances_angle": list},
+        max_children=0,
+        version="1.0.0",
+        tags=["pose", "distance", "batch", "list"],
+    )
+)
+class PoseDistances(Leaf):
+    """Calculates the distances between `pose` and every pose in `poses` in one tick
+
+    The distances are the same as those of :class:`PoseDistance`, in the order of
+    `poses`.
+
+    The option parameter `succeed_on_stale_data` determines whether
+    the node returns SUCCEEDED or RUNNING if the two inputs haven't been
+    updated since the last tick.
+
+    """
+
+    def _do_setup(self):
+        return NodeMsg.IDLE
+
+    def _do_tick(self):
+        if self.inputs.is_updated("pose") or self.inputs.is_updated("poses"):
+            distances_pos, distances_angle = pose_distances(
+                self.inputs["pose"], self.inputs["poses"]
+            )
+            self.outputs["distances_pos"] = distances_pos.tolist()
+            self.outputs["distances_angle"] = distances_angle.tolist()
+            return NodeMsg.SUCCEEDED
+        else:
+            if self.options["succeed_on_stale_data"]:
+                return NodeMsg.SUCCEEDED
+            else:
+                self.loginfo("No new data since last tick!")
+                return NodeMsg.RUNNING
+
+    def _do_shutdown(self):
+        pass
+
+    def _do_reset(self):
+        return NodeMsg.IDLE
+
+    def _do_untick(self):
+        return NodeMsg.IDLE
+
+
+@define_bt_node(
+    NodeConfig(
+        options={"k": int, "succeed_on_stale_data": bool},
+        inputs={"pose": Pose, "poses": list},
+        outputs={"nearest_poses": list, "indices": list, "distances": list},
+        max_children=0,
+        version="1.0.0",
+        tags=["pose", "distance", "nearest", "closest", "batch", "list"],
+    )
+)
+class NearestPoses(Leaf):
+    """Selects the `k` poses from `poses` that are closest to `pose`
+
+    `nearest_poses` holds the poses ordered by their distance to `pose`, starting
+    with the closest one, `indices` their indices in `poses` and `distances` their
+    distances. If `poses` has less than `k` elements, all of them are selected.
+
+    The option parameter `succeed_on_stale_data` determines whether
+    the node returns SUCCEEDED or RUNNING if the two inputs haven't been
+    updated since the last tick.
+
+    """
+
+    def _do_setup(self):
+        if self.options["k"] < 0:
+            raise BehaviorTreeException(
+                f"{self.name}: k must not be negative, but is {self.options['k']}"
+            )
+        return NodeMsg.IDLE
+
+    def _do_tick(self):
+        if self.inputs.is_updated("pose") or self.inputs.is_updated("poses"):
+            poses = self.inputs["poses"]
+            distances = np.linalg.norm(
+                _positions(poses) - _positions([self.inputs["pose"]]), axis=1
+            )
+            k = min(self.options["k"], len(poses))
+            if k < len(poses):
+                # Only sort the k nearest poses
+                indices = np.argpartition(distances, k)[:k]
+            else:
+                indices = np.arange(len(poses))
+            indices = indices[np.argsort(distances[indices], kind="stable")]
+            self.outputs["nearest_poses"] = [poses[index] for index in indices]
+            self.outputs["indices"] = indices.tolist()
+            self.outputs["distances"] = distances[indices].tolist()
+            return NodeMsg.SUCCEEDED
+        else:
+            if self.options["succeed_on_stale_data"]:
+                return NodeMsg.SUCCEEDED
+            else:
+                self.loginfo("No new data since last tick!")
+                return NodeMsg.RUNNING
+
+    def _do_shutdown(self):
+        pass
+
+    def _do_reset(self):
+        return NodeMsg.IDLE
+
+    def _do_untick(self):
+        return NodeMsg.IDLE
@@ -31,6 +31,7 @@
 import inspect
 import os
 import traceback
+from contextlib import contextmanager
 from copy import deepcopy
 from functools import wraps
 from threading import Thread, Lock, RLock
@@ -46,6 +47,7 @@ from ros_bt_py_msgs.msg import (
     DocumentedNode,
     NodeData,
     NodeDataLocation,
+    TreeEdit,
 )
 from ros_bt_py_msgs.srv import (
     LoadTreeRequest,
@@ -88,9 +90,17 @@ from ros_bt_py_msgs.srv import (
     ReplaceNodeRequest,
     GenerateSubtreeRequest,
     GetSubtreeRequest,
+    GetDebugInfoRequest,
+    GetDebugInfoResponse,
     SetOptionsRequest,
     SetSimulateTickRequest,
     SetSimulateTickResponse,
+    EditTreeRequest,
+    EditTreeResponse,
+    UndoEditRequest,
+    UndoEditResponse,
+    RedoEditRequest,
+    RedoEditResponse,
 )
 
 from ros_bt_py.debug_manager import DebugManager
@@ -102,11 +112,13 @@ from ros_bt_py.exceptions import (
 from ros_bt_py.helpers import (
     fix_yaml,
     remove_input_output_values,
-    json_encode,
+    json_encode_type,
     json_decode,
 )
 from ros_bt_py.node import Node, load_node_module, increment_name
 from ros_bt_py.node_config import OptionRef
+from ros_bt_py.ros_helpers import has_subscribers
+from ros_bt_py.tree_snapshot import EditHistory, TreeSnapshot
 
 from diagnostic_msgs.msg import DiagnosticArray, DiagnosticStatus
 from std_msgs.msg import Float64
@@ -250,6 +262,146 @@ def load_tree_from_file(request: MigrateTreeRequest) -> MigrateTreeResponse:
     return response
 
 
+class NodeCatalogue(object):
+    """Documentation of the registered node classes, as served by :func:`get_available_nodes`.
+
+    Building a :class:`ros_bt_py_msgs.msg.DocumentedNode` means reading the docstring and
+    jsonpickle-encoding the types of all options, inputs and outputs, so every class is only
+    documented once, when it first shows up in :attr:`ros_bt_py.node.Node.node_classes`.
+    Documentation of classes whose module has not been imported yet can be added with
+    :meth:`add_unloaded_nodes`.
+
+    Node classes are never unregistered, so the catalogue only grows. Its version is a
+    revision counter prefixed by a token that is unique to this process. Clients can pass the
+    version of the catalogue they already know to only receive the nodes added since then.
+    """
+
+    def __init__(self):
+        """Create an empty catalogue, node classes are documented by :meth:`update`."""
+        self._token = os.urandom(4).hex()
+        self._documented_classes = set()
+        # (module, node_class) of the nodes added by add_unloaded_nodes
+        self._unloaded_nodes = set()
+        # (revision the node was added at, DocumentedNode)
+        self._entries = []
+        self._revision = 0
+        self._generation = None
+        self._lock = Lock()
+
+    def update(self):
+        """Document the node classes that were registered since the last update."""
+        if self._generation == Node.node_classes_generation:
+            return
+        with self._lock:
+            generation = Node.node_classes_generation
+            revision = self._revision + 1
+            for (module, nodes) in list(Node.node_classes.items()):
+                for (class_name, node_classes) in list(nodes.items()):
+                    for node_class in node_classes:
+                        if node_class in self._documented_classes:
+                            continue
+                        self._documented_classes.add(node_class)
+                        if (module, class_name) in self._unloaded_nodes:
+                            # Documented before its module was imported
+                            continue
+                        self._entries.append(
+                            (
+                                revision,
+                                document_node_class(module, class_name, node_class),
+                            )
+                        )
+                        self._revision = revision
+            self._generation = generation
+
+    def add_unloaded_nodes(self, nodes):
+        """Add the documentation of node classes whose module has not been imported yet.
+
+        When the module is imported later on, its classes are not documented again.
+
+        :param nodes: :class:`ros_bt_py_msgs.msg.DocumentedNode` messages, e.g. read from
+        a :class:`ros_bt_py.node_manifest.NodeManifest`.
+        """
+        self.update()
+        with self._lock:
+            revision = self._revision + 1
+            for node in nodes:
+                key = (node.module, node.node_class)
+                if node.module in Node.node_classes or key in self._unloaded_nodes:
+                    continue
+                self._unloaded_nodes.add(key)
+                self._entries.append((revision, node))
+                self._revision = revision
+
+    def nodes(self, since_version="", modules=None, tags=None):
+        """Return the documented node classes.
+
+        The returned messages are shared between all callers and must not be modified.
+
+        :param str since_version: A version returned by an earlier call. If it is from this
+        process, only the nodes added after that version are returned.
+        :param modules: If not empty, only return nodes from these modules or packages.
+        :param tags: If not empty, only return nodes that have at least one of these tags.
+        :returns: A tuple of the catalogue version, the documented nodes and whether they are
+        only the nodes added since `since_version`.
+        """
+        self.update()
+        with self._lock:
+            version = f"{self._token}:{self._revision}"
+            entries = list(self._entries)
+        since_revision = None
+        token, _, revision = since_version.partition(":")
+        if token == self._token and revision.isdigit():
+            since_revision = int(revision)
+
+        nodes = []
+        for (added, node) in entries:
+            if since_revision is not None and added <= since_revision:
+                continue
+            if modules and not any(
+                node.module == module or node.module.startswith(module + ".")
+                for module in modules
+            ):
+                continue
+            if tags and not any(tag in node.tags for tag in tags):
+                continue
+            nodes.append(node)
+        return version, nodes, since_revision is not None
+
+
+def document_node_class(module, class_name, node_class) -> DocumentedNode:
+    """Create the :class:`ros_bt_py_msgs.msg.DocumentedNode` describing a node class."""
+
+    def to_node_data(data_map):
+        return [
+            NodeData(key=name, serialized_value=json_encode_type(type_or_ref))
+            for (name, type_or_ref) in data_map.items()
+        ]
+
+    max_children = node_class._node_config.max_children
+    max_children = -1 if max_children is None else max_children
+    doc = inspect.getdoc(node_class) or ""
+    return DocumentedNode(
+        module=module,
+        node_class=class_name,
+        version=node_class._node_config.version,
+        max_children=max_children,
+        name=class_name,
+        options=to_node_data(node_class._node_config.options),
+        inputs=to_node_data(node_class._node_config.inputs),
+        outputs=to_node_data(node_class._node_config.outputs),
+        doc=str(doc),
+        tags=node_class._node_config.tags,
+    )
+
+
+_node_catalogue = NodeCatalogue()
+
+
+def get_node_catalogue() -> NodeCatalogue:
+    """Return the node catalogue of this process."""
+    return _node_catalogue
+
+
 def get_available_nodes(
     request: GetAvailableNodesRequest,
 ) -> Optional[GetAvailableNodesResponse]:
@@ -260,10 +412,16 @@ def get_available_nodes(
     been successfully loaded from since launch, and ones from
     modules explicitly asked for in `request.node_modules`
 
+    The nodes are served from a :class:`NodeCatalogue` shared by the
+    whole process, so the returned messages must not be modified.
+
     :param ros_bt_py_msgs.srv.GetAvailableNodesRequest request:
 
     If `request.node_modules` is not empty, try to load those
-    modules before responding.
+    modules before responding. `request.module_filter` and
+    `request.tag_filter` limit the returned nodes, and if
+    `request.since_version` is a version returned earlier, only the
+    nodes added since then are returned.
 
     :returns: :class:`ros_bt_py_msgs.src.GetAvailableNodesResponse` or `None`
     """
@@ -274,33 +432,15 @@ def get_available_nodes(
             response.error_message = f"Failed to import module {module_name}"
             return response
 
-    def to_node_data(data_map):
-        return [
-            NodeData(key=name, serialized_value=json_encode(type_or_ref))
-            for (name, type_or_ref) in data_map.items()
-        ]
-
-    for (module, nodes) in Node.node_classes.items():
-        for (class_name, node_classes) in nodes.items():
-            for node_class in node_classes:
-                max_children = node_class._node_config.max_children
-                max_children = -1 if max_children is None else max_children
-                doc = inspect.getdoc(node_class) or ""
-                response.available_nodes.append(
-                    DocumentedNode(
-                        module=module,
-                        node_class=class_name,
-                        version=node_class._node_config.version,
-                        max_children=max_children,
-                        name=class_name,
-                        options=to_node_data(node_class._node_config.options),
-                        inputs=to_node_data(node_class._node_config.inputs),
-                        outputs=to_node_data(node_class._node_config.outputs),
-                        doc=str(doc),
-                        tags=node_class._node_config.tags,
-                    )
-                )
-
+    (
+        response.version,
+        response.available_nodes,
+        response.delta,
+    ) = _node_catalogue.nodes(
+        since_version=request.since_version,
+        modules=request.module_filter,
+        tags=request.tag_filter,
+    )
     response.success = True
     return response
 
@@ -328,6 +468,8 @@ class TreeManager:
         capability_interfaces_callback=None,
         simulate_tick=False,
         succeed_always=False,
+        edit_history_length=100,
+        node_pool=None,
     ):
         self.name = name
         self.publish_tree = publish_tree_callback
@@ -388,11 +530,24 @@ class TreeManager:
         self.debug_manager.publish_debug_info = self.publish_info
         self.debug_manager.publish_debug_settings = self.publish_debug_settings
         self.debug_manager.publish_node_diagnostics = self.publish_node_diagnostics
+        # Version of the last debug info that was published
+        self._published_debug_info_version = None
+        self._debug_info_publish_lock = Lock()
 
         self.nodes = {}
 
         self._state_lock = Lock()
         self._edit_lock = RLock()
+        # Nesting depth of edit_tree transactions, edits are only published
+        # once the outermost transaction is done
+        self._edit_batch_depth = 0
+        self._edit_publish_pending = False
+        # Snapshots of the tree after every edit, for undo and redo
+        self._edit_history = EditHistory(max_length=edit_history_length)
+        self._recording_edits = True
+        # Optional NodePool that takes the nodes of cleared trees, so they can
+        # be reused when a tree is loaded
+        self._node_pool = node_pool
 
         self._setting_up = False
         # Stop the tick thread after a single tick
@@ -413,6 +568,7 @@ class TreeManager:
         self._last_error = None
         with self._state_lock:
             self.tree_msg.state = Tree.EDITABLE
+        self._edit_history.record(TreeSnapshot.from_msg(self.tree_msg))
 
         self._tick_thread = None
 
@@ -477,18 +633,92 @@ class TreeManager:
             self.diagnostic_status.message = "Error in Behavior Tree"
         self.publish_diagnostic(self.diagnostic_array)
 
-    def publish_info(self, debug_info_msg=None, ticked=False):
+    def publish_info(self, debug_info_msg=None, ticked=False, tree_msg=None):
         """Publish the current tree state using the callback supplied to the constructor.
 
         In most cases, you'll want that callback to publish to a ROS
         topic.
 
-        If debugging is enabled, also publish debug info.
+        If `tree_msg` is given, it is published instead of building the tree message
+        again. It has to be the current result of :meth:`to_msg`.
+
+        If debugging is enabled, also publish debug info. Debug info is only published
+        if it changed since it was last published, and only with the subtree states that
+        changed (see :meth:`DebugManager.get_debug_info_delta`).
+
+        Messages are not built for callbacks without subscribers (see
+        :func:`ros_bt_py.ros_helpers.has_subscribers`).
         """
-        if self.publish_tree:
-            self.publish_tree(self.to_msg(ticked=ticked))
+        if has_subscribers(self.publish_tree):
+            if tree_msg is None:
+                tree_msg = self.to_msg(ticked=ticked)
+            self.publish_tree(tree_msg)
         if debug_info_msg and self.publish_debug_info:
-            self.publish_debug_info(debug_info_msg)
+            with self._debug_info_publish_lock:
+                if not has_subscribers(self.publish_debug_info):
+                    # Nobody got the versions we skip, start over with the
+                    # complete debug info
+                    self._published_debug_info_version = None
+                elif debug_info_msg.version != self._published_debug_info_version:
+                    debug_info_delta = self.debug_manager.get_debug_info_delta(
+                        self._published_debug_info_version
+                    )
+                    self._published_debug_info_version = debug_info_delta.version
+                    self.publish_debug_info(debug_info_delta)
+
+    def publish_full_info(self):
+        """Publish the tree and the complete debug info.
+
+        Use this when a new subscriber connects, since publishing is skipped while there
+        are no subscribers and the debug info is only published as a delta.
+
+        This is called from the connection threads of rospy, so it waits for running
+        edits to finish before it builds the tree message.
+        """
+        with self._edit_lock:
+            with self._debug_info_publish_lock:
+                self._published_debug_info_version = None
+            self.publish_info(self.debug_manager.get_debug_info_msg())
+
+    def publish_edit(self):
+        """Publish the tree after an edit.
+
+        While a transaction of :meth:`edit_tree` is running, publishing is deferred until
+        the transaction is done. The edited tree is recorded in the edit history.
+        """
+        if self._edit_batch_depth > 0:
+            self._edit_publish_pending = True
+            return
+        tree_msg = None
+        if self._recording_edits:
+            # Build the tree message once for the snapshot and for publishing it
+            tree_msg = self.to_msg()
+            self._edit_history.record(self.snapshot(tree_msg))
+        self.publish_info(self.debug_manager.get_debug_info_msg(), tree_msg=tree_msg)
+
+    @contextmanager
+    def _batched_edits(self):
+        """Defer publishing the tree until the end of the block."""
+        self._edit_batch_depth += 1
+        try:
+            yield
+        finally:
+            self._edit_batch_depth -= 1
+        if self._edit_batch_depth == 0 and self._edit_publish_pending:
+            self._edit_publish_pending = False
+            self.publish_edit()
+
+    def snapshot(self, tree_msg: Optional[Tree] = None) -> TreeSnapshot:
+        """Take a snapshot of the tree.
+
+        The snapshot shares the messages of all unchanged nodes with the last snapshot in
+        the edit history, so only the nodes changed since the last edit are copied.
+
+        :param tree_msg: The current result of :meth:`to_msg`, built if not given.
+        """
+        if tree_msg is None:
+            tree_msg = self.to_msg()
+        return TreeSnapshot.from_msg(tree_msg, previous=self._edit_history.current)
 
     def find_root(self) -> Optional[Node]:
         """Find the root node of the tree.
@@ -604,7 +834,7 @@ class TreeManager:
                 self.tick_sliding_window
             )
 
-            if self.publish_tick_frequency is not None:
+            if has_subscribers(self.publish_tick_frequency):
                 self.publish_tick_frequency(Float64(tick_frequency_avg))
             self.rate.sleep()
 
@@ -661,6 +891,8 @@ class TreeManager:
         except TreeTopologyError as exc:
             rospy.logwarn(f"Could not find root {exc}")
 
+        if self._node_pool is not None:
+            self._node_pool.release(self.nodes.values())
         self.nodes = {}
         with self._state_lock:
             self.tree_msg = Tree(
@@ -669,7 +901,7 @@ class TreeManager:
                 tick_frequency_hz=self.tree_msg.tick_frequency_hz,
             )
 
-        self.publish_info(self.debug_manager.get_debug_info_msg())
+        self.publish_edit()
         self.clear_diagnostics_name()
         return response
 
@@ -690,9 +922,7 @@ class TreeManager:
         return response
 
     @is_edit_service
-    def load_tree(  # noqa: C901
-        self, request: LoadTreeRequest, prefix=None
-    ) -> LoadTreeResponse:
+    def load_tree(self, request: LoadTreeRequest, prefix=None) -> LoadTreeResponse:
         """Load a tree from the given message (which may point to a file).
 
         :param ros_bt_py_msgs.srv.LoadTree request:
@@ -713,6 +943,13 @@ class TreeManager:
         unique node names for easier debugging.
 
         """
+        # Clearing the old tree and loading the new one is a single edit
+        with self._batched_edits():
+            return self._load_tree(request, prefix=prefix)
+
+    def _load_tree(  # noqa: C901
+        self, request: LoadTreeRequest, prefix=None
+    ) -> LoadTreeResponse:
         if prefix is None:
             prefix = ""
         response = LoadTreeResponse()
@@ -815,7 +1052,7 @@ class TreeManager:
                 self.tree_msg.root_name = root.name
 
         response.success = True
-        self.publish_info(self.debug_manager.get_debug_info_msg())
+        self.publish_edit()
         rospy.loginfo("Successfully loaded tree")
         if self.publish_diagnostic is None:
             self.set_diagnostics_name()
@@ -845,6 +1082,14 @@ class TreeManager:
             self.publish_info(self.debug_manager.get_debug_info_msg())
         return SetExecutionModeResponse()
 
+    def get_debug_info(self, request: GetDebugInfoRequest) -> GetDebugInfoResponse:
+        """Return the complete debug info.
+
+        Subscribers of the debug info topic need it to apply the deltas published
+        there, if they missed the complete message sent to new subscribers.
+        """
+        return GetDebugInfoResponse(debug_info=self.debug_manager.get_debug_info_msg())
+
     def debug_step(self, _):
         """Continue execution.
 
@@ -1300,7 +1545,7 @@ class TreeManager:
                 RemoveNodeRequest(node_name=instance.name, remove_children=False)
             )
             return response
-        self.publish_info(self.debug_manager.get_debug_info_msg())
+        self.publish_edit()
         return response
 
     @is_edit_service
@@ -1321,7 +1566,7 @@ class TreeManager:
         """Change the name of the currently loaded tree."""
         self.tree_msg.name = request.name
 
-        self.publish_info(self.debug_manager.get_debug_info_msg())
+        self.publish_edit()
 
         response = ChangeTreeNameResponse()
         response.success = True
@@ -1436,7 +1681,7 @@ class TreeManager:
         ]
 
         response.success = True
-        self.publish_info(self.debug_manager.get_debug_info_msg())
+        self.publish_edit()
         return response
 
     @is_edit_service
@@ -1543,7 +1788,7 @@ class TreeManager:
             return response
 
         response.success = True
-        self.publish_info(self.debug_manager.get_debug_info_msg())
+        self.publish_edit()
         return response
 
     @is_edit_service
@@ -1824,7 +2069,7 @@ class TreeManager:
             )
 
         # We made it!
-        self.publish_info(self.debug_manager.get_debug_info_msg())
+        self.publish_edit()
         return SetOptionsResponse(success=True)
 
     @is_edit_service
@@ -1841,7 +2086,7 @@ class TreeManager:
             node = self.nodes[request.node_name]
             if node.parent is not None:
                 node.parent.remove_child(node.name)
-            self.publish_info(self.debug_manager.get_debug_info_msg())
+            self.publish_edit()
             return MoveNodeResponse(success=True)
 
         if request.new_parent_name not in self.nodes:
@@ -1893,7 +2138,7 @@ class TreeManager:
             child=self.nodes[request.node_name], at_index=request.new_child_index
         )
 
-        self.publish_info(self.debug_manager.get_debug_info_msg())
+        self.publish_edit()
         return MoveNodeResponse(success=True)
 
     @is_edit_service
@@ -2002,7 +2247,7 @@ class TreeManager:
         if not get_success(res):
             with self._state_lock:
                 self.tree_msg.state = Tree.ERROR
-            self.publish_info(self.debug_manager.get_debug_info_msg())
+            self.publish_edit()
             return ReplaceNodeResponse(
                 success=False,
                 error_message=f'Could not remove old node: "{get_error_message(res)}"',
@@ -2018,7 +2263,7 @@ class TreeManager:
                 )
             )
 
-        self.publish_info(self.debug_manager.get_debug_info_msg())
+        self.publish_edit()
         return ReplaceNodeResponse(success=True)
 
     @is_edit_service
@@ -2088,7 +2333,7 @@ class TreeManager:
             # them.
             self.tree_msg.data_wirings.extend(successful_wirings)
 
-            self.publish_info(self.debug_manager.get_debug_info_msg())
+            self.publish_edit()
         return response
 
     @is_edit_service
@@ -2159,9 +2404,176 @@ class TreeManager:
                 if wiring in self.tree_msg.data_wirings:
                     self.tree_msg.data_wirings.remove(wiring)
 
-            self.publish_info(self.debug_manager.get_debug_info_msg())
+            self.publish_edit()
         return response
 
+    @is_edit_service
+    def edit_tree(self, request: EditTreeRequest) -> EditTreeResponse:
+        """Apply a list of edits as a single transaction.
+
+        The edits are applied in order by the handlers of the individual edit services, but
+        the tree is only published once, after the last edit. If an edit fails, the tree is
+        restored to the state it had before the first edit.
+
+        :param ros_bt_py_msgs.srv.EditTreeRequest request:
+
+        Contains a list of :class:`ros_bt_py_msgs.msg.TreeEdit` messages.
+        """
+        response = EditTreeResponse(failed_edit=-1)
+        for index, edit in enumerate(request.edits):
+            if edit.type not in self._edit_handlers:
+                response.success = False
+                response.failed_edit = index
+                response.error_message = f"Edit {index} has unknown type {edit.type}"
+                return response
+        if not request.edits:
+            response.success = True
+            return response
+
+        snapshot = self.snapshot()
+        with self._batched_edits():
+            for index, edit in enumerate(request.edits):
+                edit_response = self._edit_handlers[edit.type](self, edit)
+                if not get_success(edit_response):
+                    response.success = False
+                    response.failed_edit = index
+                    response.error_message = (
+                        f"Edit {index} failed: {get_error_message(edit_response)}"
+                    )
+                    break
+                if edit.type in (TreeEdit.ADD_NODE, TreeEdit.ADD_NODE_AT_INDEX):
+                    response.actual_node_names.append(edit_response.actual_node_name)
+            else:
+                response.success = True
+
+            if not response.success:
+                # Failed edits may leave the tree in the error state
+                with self._state_lock:
+                    self.tree_msg.state = Tree.EDITABLE
+                restore_response = self._restore_snapshot(snapshot)
+                if not get_success(restore_response):
+                    response.error_message += (
+                        "\nFailed to restore the tree: "
+                        f"{get_error_message(restore_response)}"
+                    )
+                    with self._state_lock:
+                        self.tree_msg.state = Tree.ERROR
+                response.actual_node_names = []
+        return response
+
+    @is_edit_service
+    def undo(self, request: UndoEditRequest) -> UndoEditResponse:
+        """Restore the tree to the state before the last edit."""
+        snapshot = self._edit_history.undo()
+        if snapshot is None:
+            return UndoEditResponse(success=False, error_message="Nothing to undo")
+        restore_response = self._restore_from_history(snapshot)
+        if not get_success(restore_response):
+            self._edit_history.redo()
+        return UndoEditResponse(
+            success=get_success(restore_response),
+            error_message=get_error_message(restore_response),
+        )
+
+    @is_edit_service
+    def redo(self, request: RedoEditRequest) -> RedoEditResponse:
+        """Apply the last edit that was reverted by :meth:`undo` again."""
+        snapshot = self._edit_history.redo()
+        if snapshot is None:
+            return RedoEditResponse(success=False, error_message="Nothing to redo")
+        restore_response = self._restore_from_history(snapshot)
+        if not get_success(restore_response):
+            self._edit_history.undo()
+        return RedoEditResponse(
+            success=get_success(restore_response),
+            error_message=get_error_message(restore_response),
+        )
+
+    def _restore_from_history(self, snapshot: TreeSnapshot) -> LoadTreeResponse:
+        """Restore a snapshot of the edit history without recording it as a new edit."""
+        self._recording_edits = False
+        try:
+            with self._batched_edits():
+                return self._restore_snapshot(snapshot)
+        finally:
+            self._recording_edits = True
+
+    def _restore_snapshot(self, snapshot: TreeSnapshot) -> LoadTreeResponse:
+        """Restore the tree from a snapshot taken by :meth:`snapshot`."""
+        if not snapshot.nodes:
+            clear_response = self.clear(None)
+            self.tree_msg.name = snapshot.name
+            return clear_response
+        try:
+            load_response = self.load_tree(LoadTreeRequest(tree=snapshot.to_msg()))
+        except TreeTopologyError:
+            # The nodes and wirings are restored, but like the snapshot
+            # the tree has more than one root
+            load_response = LoadTreeResponse(success=True)
+        if get_success(load_response):
+            self.tree_msg.name = snapshot.name
+        return load_response
+
+    _edit_handlers = {
+        TreeEdit.ADD_NODE: lambda self, edit: self.add_node_at_index(
+            AddNodeAtIndexRequest(
+                parent_name=edit.parent_name,
+                node=edit.node,
+                allow_rename=edit.allow_rename,
+                new_child_index=-1,
+            )
+        ),
+        TreeEdit.ADD_NODE_AT_INDEX: lambda self, edit: self.add_node_at_index(
+            AddNodeAtIndexRequest(
+                parent_name=edit.parent_name,
+                node=edit.node,
+                allow_rename=edit.allow_rename,
+                new_child_index=edit.new_child_index,
+            )
+        ),
+        TreeEdit.REMOVE_NODE: lambda self, edit: self.remove_node(
+            RemoveNodeRequest(
+                node_name=edit.node_name, remove_children=edit.remove_children
+            )
+        ),
+        TreeEdit.MORPH_NODE: lambda self, edit: self.morph_node(
+            MorphNodeRequest(node_name=edit.node_name, new_node=edit.new_node)
+        ),
+        TreeEdit.MOVE_NODE: lambda self, edit: self.move_node(
+            MoveNodeRequest(
+                node_name=edit.node_name,
+                new_parent_name=edit.new_parent_name,
+                new_child_index=edit.new_child_index,
+            )
+        ),
+        TreeEdit.REPLACE_NODE: lambda self, edit: self.replace_node(
+            ReplaceNodeRequest(
+                old_node_name=edit.old_node_name, new_node_name=edit.new_node_name
+            )
+        ),
+        TreeEdit.SET_OPTIONS: lambda self, edit: self.set_options(
+            SetOptionsRequest(
+                node_name=edit.node_name,
+                rename_node=edit.rename_node,
+                new_name=edit.new_name,
+                options=edit.options,
+            )
+        ),
+        TreeEdit.WIRE_DATA: lambda self, edit: self.wire_data(
+            WireNodeDataRequest(
+                wirings=edit.wirings, ignore_failure=edit.ignore_failure
+            )
+        ),
+        TreeEdit.UNWIRE_DATA: lambda self, edit: self.unwire_data(
+            WireNodeDataRequest(
+                wirings=edit.wirings, ignore_failure=edit.ignore_failure
+            )
+        ),
+        TreeEdit.CHANGE_TREE_NAME: lambda self, edit: self.change_tree_name(
+            ChangeTreeNameRequest(name=edit.name)
+        ),
+    }
+
     def get_subtree(self, request: GetSubtreeRequest) -> GetSubtreeResponse:
         if request.subtree_root_name not in self.nodes:
             return GetSubtreeResponse(
@@ -2191,53 +2603,46 @@ class TreeManager:
         """
         response = GenerateSubtreeResponse()
 
-        whole_tree = deepcopy(self.tree_msg)
-
         root = self.find_root()
 
         if not root:
             response.success = False
             response.error_message = "No tree message available"
-        else:
-            nodes = set()
-            for node in whole_tree.nodes:
-                nodes.add(node.name)
-
-            nodes_to_keep = set()
-            nodes_to_remove = set()
-            for node in whole_tree.nodes:
-                for search_node in request.nodes:
-                    if node.name == search_node or search_node in node.child_names:
-                        nodes_to_keep.add(node.name)
+            return response
 
-            for node in nodes:
-                if node not in nodes_to_keep:
-                    nodes_to_remove.add(node)
-
-            manager = TreeManager(
-                name="temporary_tree_manager",
-                publish_tree_callback=lambda *args: None,
-                publish_debug_info_callback=lambda *args: None,
-                publish_debug_settings_callback=lambda *args: None,
-                debug_manager=DebugManager(),
-            )
+        snapshot = self.snapshot()
+        nodes_to_keep = set()
+        for node in snapshot.nodes:
+            for search_node in request.nodes:
+                if node.name == search_node or search_node in node.child_names:
+                    nodes_to_keep.add(node.name)
+
+        manager = TreeManager(
+            name="temporary_tree_manager",
+            publish_tree_callback=lambda *args: None,
+            publish_debug_info_callback=lambda *args: None,
+            publish_debug_settings_callback=lambda *args: None,
+            debug_manager=DebugManager(),
+            edit_history_length=0,
+        )
 
+        if nodes_to_keep:
+            # Only the nodes that are kept are instantiated
             load_response = manager.load_tree(
-                request=LoadTreeRequest(tree=whole_tree), prefix=""
+                request=LoadTreeRequest(tree=snapshot.to_msg(node_names=nodes_to_keep)),
+                prefix="",
             )
-
-            if load_response.success:
-                for node_name in nodes_to_remove:
-                    manager.remove_node(
-                        RemoveNodeRequest(node_name=node_name, remove_children=False)
-                    )
-                root = manager.find_root()
-                if not root:
-                    rospy.loginfo("No nodes in tree")
-                else:
-                    manager.tree_msg.root_name = root.name
-                response.success = True
-                response.tree = manager.to_msg()
+            if not get_success(load_response):
+                response.success = False
+                response.error_message = get_error_message(load_response)
+                return response
+        root = manager.find_root()
+        if not root:
+            rospy.loginfo("No nodes in tree")
+        else:
+            manager.tree_msg.root_name = root.name
+        response.success = True
+        response.tree = manager.to_msg()
         return response
 
     #########################
@@ -2246,9 +2651,15 @@ class TreeManager:
 
     def instantiate_node_from_msg(self, node_msg, allow_rename, permissive=False):
         try:
-            node_instance = Node.from_msg(
-                node_msg, debug_manager=self.debug_manager, permissive=permissive
-            )
+            node_instance = None
+            if self._node_pool is not None:
+                node_instance = self._node_pool.acquire(
+                    node_msg, debug_manager=self.debug_manager, permissive=permissive
+                )
+            if node_instance is None:
+                node_instance = Node.from_msg(
+                    node_msg, debug_manager=self.debug_manager, permissive=permissive
+                )
         except TypeError as exc:
             raise BehaviorTreeException(str(exc))
         except AttributeError as exc:
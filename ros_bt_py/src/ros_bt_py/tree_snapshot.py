@@ -0,0 +1,256 @@
+# Copyright 2018-2023 FZI Forschungszentrum Informatik
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#    * Redistributions of source code must retain the above copyright
+#      notice, this list of conditions and the following disclaimer.
+#
+#    * Redistributions in binary form must reproduce the above copyright
+#      notice, this list of conditions and the following disclaimer in the
+#      documentation and/or other materials provided with the distribution.
+#
+#    * Neither the name of the FZI Forschungszentrum Informatik nor the names of its
+#      contributors may be used to endorse or promote products derived from
+#      this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+
+"""Snapshots of a behavior tree that share unchanged nodes with each other.
+
+Every edit of a tree only touches a few nodes. A :class:`TreeSnapshot` created from a
+previous snapshot reuses that snapshot's messages for all nodes that did not change, so
+taking a snapshot after every edit and keeping an undo history of them only copies the
+nodes each edit changed.
+"""
+from collections import deque
+from copy import deepcopy
+
+from ros_bt_py_msgs.msg import Tree
+
+
+def _same_node(node, other):
+    """Compare two Node messages, ignoring their runtime state."""
+    if other is None:
+        return False
+    return all(
+        getattr(node, slot) == getattr(other, slot)
+        for slot in node.__slots__
+        if slot != "state"
+    )
+
+
+class TreeSnapshot(object):
+    """Read-only copy of a :class:`ros_bt_py_msgs.msg.Tree` message.
+
+    The messages held by a snapshot may be shared with other snapshots and must not be
+    modified, :meth:`to_msg` returns a copy that can be. The runtime state of the tree
+    and its nodes is not part of the snapshot.
+    """
+
+    __slots__ = (
+        "name",
+        "root_name",
+        "tick_frequency_hz",
+        "nodes",
+        "data_wirings",
+        "public_node_data",
+        "_nodes_by_name",
+    )
+
+    def __init__(
+        self,
+        name="",
+        root_name="",
+        tick_frequency_hz=0.0,
+        nodes=(),
+        data_wirings=(),
+        public_node_data=(),
+    ):
+        self.name = name
+        self.root_name = root_name
+        self.tick_frequency_hz = tick_frequency_hz
+        self.nodes = tuple(nodes)
+        self.data_wirings = tuple(data_wirings)
+        self.public_node_data = tuple(public_node_data)
+        self._nodes_by_name = {node.name: node for node in self.nodes}
+
+    @classmethod
+    def from_msg(cls, tree, previous=None):
+        """Take a snapshot of `tree`.
+
+        :param ros_bt_py_msgs.msg.Tree tree: The tree, usually from `TreeManager.to_msg`
+
+        :param TreeSnapshot previous:
+
+        If given, the messages of all nodes that are equal in `tree` and `previous` are
+        taken from `previous` instead of being copied.
+        """
+        if previous is None:
+            previous = cls()
+        nodes = []
+        for node in tree.nodes:
+            previous_node = previous.get_node(node.name)
+            if _same_node(node, previous_node):
+                nodes.append(previous_node)
+            else:
+                nodes.append(deepcopy(node))
+
+        data_wirings = previous.data_wirings
+        if list(data_wirings) != list(tree.data_wirings):
+            data_wirings = deepcopy(tree.data_wirings)
+        public_node_data = previous.public_node_data
+        if list(public_node_data) != list(tree.public_node_data):
+            public_node_data = deepcopy(tree.public_node_data)
+
+        return cls(
+            name=tree.name,
+            root_name=tree.root_name,
+            tick_frequency_hz=tree.tick_frequency_hz,
+            nodes=nodes,
+            data_wirings=data_wirings,
+            public_node_data=public_node_data,
+        )
+
+    def get_node(self, name):
+        """Return the message of the node called `name`, or `None`."""
+        return self._nodes_by_name.get(name)
+
+    def changed_nodes(self, other):
+        """Return the names of the nodes that were added, removed or changed since `other`."""
+        changed = {
+            name
+            for name, node in self._nodes_by_name.items()
+            if other.get_node(name) is not node
+        }
+        changed.update(
+            name for name in other._nodes_by_name if name not in self._nodes_by_name
+        )
+        return changed
+
+    def same_as(self, other):
+        """Check whether `other` shares all of its messages with this snapshot."""
+        return (
+            other is not None
+            and self.name == other.name
+            and self.root_name == other.root_name
+            and self.tick_frequency_hz == other.tick_frequency_hz
+            and self.data_wirings is other.data_wirings
+            and self.public_node_data is other.public_node_data
+            and len(self.nodes) == len(other.nodes)
+            and all(
+                node is other_node for node, other_node in zip(self.nodes, other.nodes)
+            )
+        )
+
+    def to_msg(self, node_names=None):
+        """Return a Tree message with copies of the snapshot's messages.
+
+        :param node_names:
+
+        If given, only the nodes in `node_names` are part of the message. Child names,
+        wirings and public node data referring to other nodes are left out.
+        """
+        if node_names is None:
+            return Tree(
+                name=self.name,
+                root_name=self.root_name,
+                tick_frequency_hz=self.tick_frequency_hz,
+                nodes=deepcopy(list(self.nodes)),
+                data_wirings=deepcopy(list(self.data_wirings)),
+                public_node_data=deepcopy(list(self.public_node_data)),
+            )
+
+        node_names = set(node_names)
+        nodes = []
+        for node in self.nodes:
+            if node.name in node_names:
+                node = deepcopy(node)
+                node.child_names = [
+                    name for name in node.child_names if name in node_names
+                ]
+                nodes.append(node)
+        return Tree(
+            name=self.name,
+            tick_frequency_hz=self.tick_frequency_hz,
+            nodes=nodes,
+            data_wirings=[
+                deepcopy(wiring)
+                for wiring in self.data_wirings
+                if wiring.source.node_name in node_names
+                and wiring.target.node_name in node_names
+            ],
+            public_node_data=[
+                deepcopy(datum)
+                for datum in self.public_node_data
+                if datum.node_name in node_names
+            ],
+        )
+
+
+class EditHistory(object):
+    """Undo and redo history of a tree, made of :class:`TreeSnapshot` objects.
+
+    :param int max_length: The number of edits that can be undone
+    """
+
+    def __init__(self, max_length=100):
+        self.current = None
+        self._undo = deque(maxlen=max_length)
+        self._redo = []
+
+    @property
+    def can_undo(self):
+        return bool(self._undo)
+
+    @property
+    def can_redo(self):
+        return bool(self._redo)
+
+    def record(self, snapshot):
+        """Make `snapshot` the current state of the tree.
+
+        Anything that could have been redone is dropped.
+
+        :returns: `True` if `snapshot` differs from the previous state and was recorded
+        """
+        if snapshot.same_as(self.current):
+            return False
+        if self.current is not None:
+            self._undo.append(self.current)
+        self._redo = []
+        self.current = snapshot
+        return True
+
+    def undo(self):
+        """Step back to the state before the last edit and return it.
+
+        :returns: The snapshot to restore, or `None` if there is nothing to undo
+        """
+        if not self._undo:
+            return None
+        self._redo.append(self.current)
+        self.current = self._undo.pop()
+        return self.current
+
+    def redo(self):
+        """Step forward to the state before the last :meth:`undo` and return it.
+
+        :returns: The snapshot to restore, or `None` if there is nothing to redo
+        """
+        if not self._redo:
+            return None
+        self._undo.append(self.current)
+        self.current = self._redo.pop()
+        return self.current
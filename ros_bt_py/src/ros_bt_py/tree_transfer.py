@@ -0,0 +1,225 @@
+# Copyright 2018-2023 FZI Forschungszentrum Informatik
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#    * Redistributions of source code must retain the above copyright
+#      notice, this list of conditions and the following disclaimer.
+#
+#    * Redistributions in binary form must reproduce the above copyright
+#      notice, this list of conditions and the following disclaimer in the
+#      documentation and/or other materials provided with the distribution.
+#
+#    * Neither the name of the FZI Forschungszentrum Informatik nor the names of its
+#      contributors may be used to endorse or promote products derived from
+#      this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+"""
+Content addressed transfer of :class:`ros_bt_py_msgs.msg.Tree` messages.
+
+Trees are sent as :class:`ros_bt_py_msgs.msg.CompressedTree` messages, which carry the sha256
+hash of the serialized tree and its zlib compressed serialization. Senders that expect the
+receiver to know a tree only send its hash. A receiver keeps the trees it received in a
+:class:`TreeStore` and reports unknown hashes, so the sender can fall back to the full tree.
+"""
+
+# pylint: disable=no-name-in-module,import-error
+
+import hashlib
+import zlib
+from collections import OrderedDict
+from io import BytesIO
+from threading import Lock
+from typing import Hashable, Optional
+
+import genpy
+
+from ros_bt_py_msgs.msg import CompressedTree, Tree
+
+
+def compress_tree(tree: Tree) -> CompressedTree:
+    """
+    Serialize, hash and compress a tree.
+
+    :param tree: The tree to compress.
+    :returns: The compressed tree, including its data.
+    """
+    buff = BytesIO()
+    tree.serialize(buff)
+    data = buff.getvalue()
+    return CompressedTree(
+        hash=hashlib.sha256(data).hexdigest(), data=zlib.compress(data)
+    )
+
+
+def tree_reference(compressed_tree: CompressedTree) -> CompressedTree:
+    """
+    Return a message referencing `compressed_tree` by its hash only.
+
+    :param compressed_tree: The tree to reference.
+    :returns: A compressed tree without data.
+    """
+    return CompressedTree(hash=compressed_tree.hash)
+
+
+def _decompress(compressed_tree: CompressedTree) -> bytes:
+    try:
+        data = zlib.decompress(compressed_tree.data)
+    except zlib.error as exc:
+        raise ValueError(f"Failed to decompress tree: {exc}") from exc
+    if hashlib.sha256(data).hexdigest() != compressed_tree.hash:
+        raise ValueError("Tree data does not match its hash")
+    return data
+
+
+def _deserialize(data: bytes) -> Tree:
+    tree = Tree()
+    try:
+        tree.deserialize(data)
+    except genpy.DeserializationError as exc:
+        raise ValueError(f"Failed to deserialize tree: {exc}") from exc
+    return tree
+
+
+def decompress_tree(compressed_tree: CompressedTree) -> Tree:
+    """
+    Restore a tree from its compressed form.
+
+    :param compressed_tree: A compressed tree, including its data.
+    :raises ValueError: If the data is corrupt or does not match the hash.
+    :returns: The decompressed tree.
+    """
+    return _deserialize(_decompress(compressed_tree))
+
+
+class TreeStore(object):
+    """
+    Trees received by a node, addressed by their hash.
+
+    Only the serialized trees are kept, every lookup returns a new
+    :class:`ros_bt_py_msgs.msg.Tree` instance that the caller may modify.
+    The least recently used trees are dropped once `max_trees` is exceeded.
+    """
+
+    def __init__(self, max_trees: int = 16):
+        """
+        Initialize the `TreeStore`.
+
+        :param max_trees: Maximum number of trees to keep.
+        """
+        self.max_trees = max_trees
+        self._trees = OrderedDict()
+        self._lock = Lock()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._trees)
+
+    def __contains__(self, tree_hash: str):
+        with self._lock:
+            return tree_hash in self._trees
+
+    def get(self, tree_hash: str) -> Optional[Tree]:
+        """
+        Return the tree with the given hash.
+
+        :param tree_hash: The hash of the tree.
+        :returns: The tree, or None if it is not known.
+        """
+        with self._lock:
+            data = self._trees.get(tree_hash)
+            if data is None:
+                return None
+            self._trees.move_to_end(tree_hash)
+        return _deserialize(data)
+
+    def add(self, compressed_tree: CompressedTree) -> Tree:
+        """
+        Decompress a received tree and keep it.
+
+        :param compressed_tree: A compressed tree, including its data.
+        :raises ValueError: If the data is corrupt or does not match the hash.
+        :returns: The decompressed tree.
+        """
+        data = _decompress(compressed_tree)
+        tree = _deserialize(data)
+        with self._lock:
+            self._trees[compressed_tree.hash] = data
+            self._trees.move_to_end(compressed_tree.hash)
+            while len(self._trees) > self.max_trees:
+                self._trees.popitem(last=False)
+        return tree
+
+    def resolve(self, compressed_tree: CompressedTree) -> Optional[Tree]:
+        """
+        Return the tree a received message refers to.
+
+        Trees sent with their data are added to the store.
+
+        :param compressed_tree: A compressed tree, with or without data.
+        :raises ValueError: If the data is corrupt or does not match the hash.
+        :returns: The tree, or None if only the hash was sent and it is not known.
+        """
+        if compressed_tree.data:
+            return self.add(compressed_tree)
+        return self.get(compressed_tree.hash)
+
+
+class SentTrees(object):
+    """
+    Remembers which trees a sender has successfully sent to which receivers.
+
+    This allows a sender to only send the hash of a tree to receivers that already know it.
+    """
+
+    def __init__(self, max_entries: int = 256):
+        """
+        Initialize the `SentTrees`.
+
+        :param max_entries: Maximum number of (receiver, tree) pairs to remember.
+        """
+        self.max_entries = max_entries
+        self._sent = OrderedDict()
+        self._lock = Lock()
+
+    def message_for(
+        self, receiver: Hashable, compressed_tree: CompressedTree
+    ) -> CompressedTree:
+        """
+        Return the message to send `compressed_tree` to `receiver`.
+
+        :param receiver: Anything identifying the receiver, e.g. its namespace.
+        :param compressed_tree: The tree to send, including its data.
+        :returns: A reference to the tree if the receiver knows it, the full tree otherwise.
+        """
+        key = (receiver, compressed_tree.hash)
+        with self._lock:
+            if key in self._sent:
+                self._sent.move_to_end(key)
+                return tree_reference(compressed_tree)
+        return compressed_tree
+
+    def mark_sent(self, receiver: Hashable, tree_hash: str):
+        """Remember that `receiver` knows the tree with the hash `tree_hash`."""
+        key = (receiver, tree_hash)
+        with self._lock:
+            self._sent[key] = True
+            self._sent.move_to_end(key)
+            while len(self._sent) > self.max_entries:
+                self._sent.popitem(last=False)
+
+    def forget(self, receiver: Hashable, tree_hash: str):
+        """Forget that `receiver` knows the tree, e.g. because it reported it unknown."""
+        with self._lock:
+            self._sent.pop((receiver, tree_hash), None)
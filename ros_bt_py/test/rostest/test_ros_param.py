@@ -29,6 +29,7 @@
 
 
 from threading import Lock
+import time
 import unittest
 
 try:
@@ -43,6 +44,7 @@ from ros_bt_py_msgs.msg import Node as NodeMsg, UtilityBounds
 
 from ros_bt_py.node_config import NodeConfig
 from ros_bt_py.nodes.ros_param import RosParamOption, RosParamInput
+from ros_bt_py.param_cache import ParamCache
 
 PKG = "ros_bt_py"
 
@@ -125,8 +127,8 @@ class TestRosParam(unittest.TestCase):
         )
 
         expected_bounds = UtilityBounds()
-        with mock.patch("rospy.get_param_names") as mocked_get_param_names:
-            mocked_get_param_names.side_effect = rospy.ROSException()
+        with mock.patch.object(ParamCache, "get") as mocked_get:
+            mocked_get.side_effect = rospy.ROSException()
             self.assertEqual(ros_param.calculate_utility(), expected_bounds)
 
     def testExistingParamInput(self):
@@ -212,6 +214,46 @@ class TestRosParam(unittest.TestCase):
         ros_param.inputs["param_name"] = "param_int"
         self.assertEqual(ros_param.tick(), NodeMsg.FAILED)
 
+    def testParamCacheTtl(self):
+        cache = ParamCache(ttl=60.0)
+        rospy.set_param("/param_cache/a", 1)
+        rospy.set_param("/param_cache/b", [1, 2])
+        self.assertEqual(
+            cache.get_many(
+                ["/param_cache/a", "/param_cache/b", "/param_cache/c"], default=None
+            ),
+            {"/param_cache/a": 1, "/param_cache/b": [1, 2], "/param_cache/c": None},
+        )
+        self.assertRaises(KeyError, cache.get, "/param_cache/c")
+
+        # Values are kept until their time to live is over or they are invalidated
+        rospy.set_param("/param_cache/a", 2)
+        self.assertEqual(cache.get("/param_cache/a"), 1)
+        cache.invalidate("/param_cache/a")
+        self.assertEqual(cache.get("/param_cache/a"), 2)
+
+        # Changing a returned value does not change the cached one
+        cache.get("/param_cache/b").append(3)
+        self.assertEqual(cache.get("/param_cache/b"), [1, 2])
+
+    def testParamCacheSubscribed(self):
+        cache = ParamCache()
+        self.assertEqual(cache.get("/param_int"), 42)
+        self.assertTrue(cache.has("/param_int"))
+        self.assertFalse(cache.has("/param_cache_missing"))
+        self.assertEqual(cache.get("/param_cache_missing", 23), 23)
+
+        rospy.set_param("/param_cache_subscribed", "first")
+        self.assertEqual(cache.get("/param_cache_subscribed"), "first")
+        # The parameter server pushes the new value
+        rospy.set_param("/param_cache_subscribed", "second")
+        deadline = time.time() + 5.0
+        while (
+            cache.get("/param_cache_subscribed") != "second" and time.time() < deadline
+        ):
+            rospy.sleep(0.05)
+        self.assertEqual(cache.get("/param_cache_subscribed"), "second")
+
 
 if __name__ == "__main__":
     rospy.init_node("test_ros_param")
@@ -0,0 +1,83 @@
+# Copyright 2018-2023 FZI Forschungszentrum Informatik
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#    * Redistributions of source code must retain the above copyright
+#      notice, this list of conditions and the following disclaimer.
+#
+#    * Redistributions in binary form must reproduce the above copyright
+#      notice, this list of conditions and the following disclaimer in the
+#      documentation and/or other materials provided with the distribution.
+#
+#    * Neither the name of the FZI Forschungszentrum Informatik nor the names of its
+#      contributors may be used to endorse or promote products derived from
+#      this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+import unittest
+
+from geometry_msgs.msg import Pose, Point
+from ros_bt_py_msgs.msg import BinaryNodeData
+
+from ros_bt_py.capability_io import decode_value, encode_node_data_map, encode_value
+from ros_bt_py.helpers import json_encode
+from ros_bt_py.node_data import NodeData, NodeDataMap
+
+
+class TestCapabilityIO(unittest.TestCase):
+    def testPrimitiveRoundTrip(self):
+        for value, data_type in [
+            (None, int),
+            (True, bool),
+            (False, bool),
+            (-42, int),
+            (3.25, float),
+            ("hello wörld", str),
+            (b"\x00\x01", bytes),
+        ]:
+            encoded = encode_value("key", value, json_encode(data_type))
+            self.assertEqual(encoded.encoding, BinaryNodeData.PRIMITIVE)
+            self.assertEqual(decode_value(encoded), value)
+
+    def testMessageRoundTrip(self):
+        pose = Pose(position=Point(x=1.0, y=2.0, z=3.0))
+        encoded = encode_value("pose", pose, json_encode(Pose))
+        self.assertEqual(encoded.encoding, BinaryNodeData.GENPY)
+        self.assertEqual(decode_value(encoded), pose)
+
+    def testJsonFallback(self):
+        value = {"a": [1, 2, 3]}
+        encoded = encode_value("dict", value, json_encode(dict))
+        self.assertEqual(encoded.encoding, BinaryNodeData.JSON)
+        self.assertEqual(decode_value(encoded), value)
+
+        # Integers too large for the compact encoding fall back as well
+        encoded = encode_value("int", 2**70, json_encode(int))
+        self.assertEqual(encoded.encoding, BinaryNodeData.JSON)
+        self.assertEqual(decode_value(encoded), 2**70)
+
+    def testUnknownEncoding(self):
+        with self.assertRaises(TypeError):
+            decode_value(BinaryNodeData(key="key", encoding=42))
+
+    def testEncodeNodeDataMap(self):
+        node_data_map = NodeDataMap(name="inputs")
+        node_data_map.add("pose", NodeData(data_type=Pose, initial_value=Pose()))
+        node_data_map.add("count", NodeData(data_type=int, initial_value=3))
+
+        encoded = {data.key: data for data in encode_node_data_map(node_data_map)}
+        self.assertEqual(encoded["pose"].encoding, BinaryNodeData.GENPY)
+        self.assertEqual(decode_value(encoded["pose"]), Pose())
+        self.assertEqual(encoded["count"].encoding, BinaryNodeData.PRIMITIVE)
+        self.assertEqual(decode_value(encoded["count"]), 3)
@@ -35,7 +35,7 @@ import unittest
 
 import rospy
 
-from ros_bt_py_msgs.msg import Node as NodeMsg
+from ros_bt_py_msgs.msg import Node as NodeMsg, Tree
 
 from ros_bt_py.debug_manager import DebugManager
 from ros_bt_py.exceptions import BehaviorTreeException
@@ -254,6 +254,50 @@ class TestDebugManager(unittest.TestCase):
         info_msg = debug_manager.get_debug_info_msg()
         self.assertEqual(info_msg.subtree_states, [])
 
+    def testDebugInfoDeltas(self):
+        debug_manager = DebugManager()
+        debug_manager.set_execution_mode(
+            single_step=False,
+            collect_performance_data=False,
+            publish_subtrees=True,
+            collect_node_diagnostics=False,
+        )
+        first = debug_manager.get_debug_info_msg()
+        self.assertIs(debug_manager.get_debug_info_msg(), first)
+
+        tree_a = Tree(name="a", nodes=[NodeMsg(name="A")])
+        debug_manager.add_subtree_info("node_a", tree_a)
+        debug_manager.add_subtree_info("node_b", Tree(name="b"))
+        second = debug_manager.get_debug_info_msg()
+        self.assertEqual(second.version, first.version + 2)
+        self.assertEqual([tree.name for tree in second.subtree_states], ["a", "b"])
+        # The stored state is a copy
+        tree_a.nodes[0].state = NodeMsg.RUNNING
+        self.assertEqual(second.subtree_states[0].nodes[0].state, "")
+
+        # Adding an unchanged subtree does not create a new version
+        debug_manager.add_subtree_info("node_b", Tree(name="b"))
+        self.assertIs(debug_manager.get_debug_info_msg(), second)
+
+        debug_manager.add_subtree_info("node_a", tree_a)
+        delta = debug_manager.get_debug_info_delta(second.version)
+        self.assertTrue(delta.is_delta)
+        self.assertEqual(delta.base_version, second.version)
+        self.assertEqual(delta.version, second.version + 1)
+        self.assertEqual([tree.name for tree in delta.subtree_states], ["a"])
+        self.assertEqual(delta.removed_subtrees, [])
+        # The previous message was not modified
+        self.assertEqual(second.subtree_states[0].nodes[0].state, "")
+
+        debug_manager.clear_subtrees()
+        delta = debug_manager.get_debug_info_delta(second.version)
+        self.assertEqual(delta.subtree_states, [])
+        self.assertEqual(sorted(delta.removed_subtrees), ["a", "b"])
+
+        full = debug_manager.get_debug_info_delta(None)
+        self.assertFalse(full.is_delta)
+        self.assertIs(full, debug_manager.get_debug_info_msg())
+
     def _publish_node_diagnostics_callback(self, msg):
         self.diagnostics_messages.append(msg)
 
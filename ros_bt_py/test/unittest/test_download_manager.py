@@ -0,0 +1,154 @@
+# Copyright 2018-2023 FZI Forschungszentrum Informatik
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#    * Redistributions of source code must retain the above copyright
+#      notice, this list of conditions and the following disclaimer.
+#
+#    * Redistributions in binary form must reproduce the above copyright
+#      notice, this list of conditions and the following disclaimer in the
+#      documentation and/or other materials provided with the distribution.
+#
+#    * Neither the name of the FZI Forschungszentrum Informatik nor the names of its
+#      contributors may be used to endorse or promote products derived from
+#      this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import os
+import shutil
+import tempfile
+from threading import Event, Thread
+import time
+import unittest
+
+from ros_bt_py.download_manager import DownloadError, DownloadManager
+
+
+class ImageHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        server = self.server
+        server.requests.append(self.path)
+        server.release.wait(5.0)
+        if self.path not in server.images:
+            self.send_response(404)
+            self.end_headers()
+            return
+        body = server.images[self.path]
+        etag = f'"{len(body)}"'
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("ETag", etag)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestDownloadManager(unittest.TestCase):
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), ImageHandler)
+        self.server.images = {"/a.png": b"a" * 100, "/b.png": b"b" * 100}
+        self.server.requests = []
+        self.server.release = Event()
+        self.server.release.set()
+        self.server_thread = Thread(target=self.server.serve_forever, daemon=True)
+        self.server_thread.start()
+        self.tmp_dir = tempfile.mkdtemp()
+        self.managers = []
+
+    def tearDown(self):
+        for manager in self.managers:
+            manager.shutdown()
+        self.server.shutdown()
+        self.server.server_close()
+        shutil.rmtree(self.tmp_dir)
+
+    def make_manager(self, **kwargs):
+        manager = DownloadManager(**kwargs)
+        self.managers.append(manager)
+        return manager
+
+    def url(self, name):
+        return f"http://127.0.0.1:{self.server.server_address[1]}/{name}"
+
+    def path(self, name):
+        return os.path.join(self.tmp_dir, name)
+
+    def testDownload(self):
+        manager = self.make_manager()
+        future = manager.request(self.url("a.png"), self.path("a.png"))
+        self.assertEqual(future.result(5.0), self.path("a.png"))
+        with open(self.path("a.png"), "rb") as image:
+            self.assertEqual(image.read(), b"a" * 100)
+
+        # Cached files are returned without a request
+        future = manager.request(self.url("a.png"), self.path("a.png"))
+        self.assertTrue(future.done())
+        self.assertEqual(future.result(), self.path("a.png"))
+        self.assertEqual(self.server.requests, ["/a.png"])
+
+    def testDownloadFailed(self):
+        manager = self.make_manager()
+        future = manager.request(self.url("missing.png"), self.path("missing.png"))
+        self.assertRaises(DownloadError, future.result, 5.0)
+        self.assertFalse(os.path.exists(self.path("missing.png")))
+
+    def testDeduplicateRequests(self):
+        manager = self.make_manager()
+        self.server.release.clear()
+        first = manager.request(self.url("a.png"), self.path("a.png"))
+        second = manager.request(self.url("a.png"), self.path("a.png"))
+        self.assertIs(first, second)
+        self.assertFalse(first.done())
+
+        self.server.release.set()
+        self.assertEqual(first.result(5.0), self.path("a.png"))
+        self.assertEqual(self.server.requests, ["/a.png"])
+
+    def testConditionalRequest(self):
+        manager = self.make_manager(max_age=0.0)
+        manager.request(self.url("a.png"), self.path("a.png")).result(5.0)
+
+        # The file is revalidated and the server answers with 304 Not Modified
+        future = manager.request(self.url("a.png"), self.path("a.png"))
+        self.assertEqual(future.result(5.0), self.path("a.png"))
+        self.assertEqual(self.server.requests, ["/a.png", "/a.png"])
+        with open(self.path("a.png"), "rb") as image:
+            self.assertEqual(image.read(), b"a" * 100)
+
+        self.server.images["/a.png"] = b"c" * 50
+        manager.request(self.url("a.png"), self.path("a.png")).result(5.0)
+        with open(self.path("a.png"), "rb") as image:
+            self.assertEqual(image.read(), b"c" * 50)
+
+    def testEvictLeastRecentlyUsed(self):
+        with open(self.path("other.txt"), "wb") as other:
+            other.write(b"o" * 1000)
+
+        manager = self.make_manager(max_cache_bytes=150)
+        manager.request(self.url("a.png"), self.path("a.png")).result(5.0)
+        os.utime(self.path("a.png"), (time.time() - 10.0, time.time() - 10.0))
+        manager.request(self.url("b.png"), self.path("b.png")).result(5.0)
+
+        self.assertFalse(os.path.exists(self.path("a.png")))
+        self.assertFalse(os.path.exists(self.path("a.png.meta")))
+        self.assertTrue(os.path.exists(self.path("b.png")))
+        # Files that were not downloaded are kept
+        self.assertTrue(os.path.exists(self.path("other.txt")))
@@ -0,0 +1,114 @@
+# Copyright 2018-2023 FZI Forschungszentrum Informatik
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#    * Redistributions of source code must retain the above copyright
+#      notice, this list of conditions and the following disclaimer.
+#
+#    * Redistributions in binary form must reproduce the above copyright
+#      notice, this list of conditions and the following disclaimer in the
+#      documentation and/or other materials provided with the distribution.
+#
+#    * Neither the name of the FZI Forschungszentrum Informatik nor the names of its
+#      contributors may be used to endorse or promote products derived from
+#      this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+import mmap
+import os
+import shutil
+import tempfile
+import unittest
+
+try:
+    import unittest.mock as mock
+except ImportError:
+    import mock
+
+import yaml
+
+from ros_bt_py.file_cache import FileCache, get_rospack, resolve_path
+
+
+class TestResolvePath(unittest.TestCase):
+    def testFilePath(self):
+        self.assertEqual(resolve_path("file:///tmp/data.yaml"), "/tmp/data.yaml")
+
+    def testPackagePath(self):
+        self.assertEqual(
+            resolve_path("package://ros_bt_py/etc/data.yaml"),
+            get_rospack().get_path("ros_bt_py") + "/etc/data.yaml",
+        )
+
+    def testMalformedPath(self):
+        self.assertRaises(ValueError, resolve_path, "malformed://ros_bt_py/data.yaml")
+
+    def testSharedRosPack(self):
+        self.assertIs(get_rospack(), get_rospack())
+
+
+class TestFileCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp_dir, "data.yaml")
+        self.write(["a", "b"])
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def write(self, data, mtime_ns=None):
+        with open(self.path, "w") as data_file:
+            yaml.safe_dump(data, data_file)
+        if mtime_ns is not None:
+            os.utime(self.path, ns=(mtime_ns, mtime_ns))
+
+    def testParsesOnce(self):
+        cache = FileCache()
+        with mock.patch("ros_bt_py.file_cache.yaml.load", wraps=yaml.load) as load:
+            self.assertEqual(cache.load_yaml(self.path), ["a", "b"])
+            self.assertEqual(cache.load_yaml(self.path), ["a", "b"])
+            self.assertEqual(load.call_count, 1)
+
+            cache.invalidate(self.path)
+            self.assertEqual(cache.load_yaml(self.path), ["a", "b"])
+            self.assertEqual(load.call_count, 2)
+
+    def testReturnsCopies(self):
+        cache = FileCache()
+        data = cache.load_yaml(self.path)
+        data.append("c")
+        self.assertEqual(cache.load_yaml(self.path), ["a", "b"])
+
+    def testReloadsChangedFile(self):
+        cache = FileCache()
+        self.write(["a", "b"], mtime_ns=1000000000)
+        self.assertEqual(cache.load_yaml(self.path), ["a", "b"])
+
+        self.write({"a": 1}, mtime_ns=2000000000)
+        self.assertEqual(cache.load_yaml(self.path), {"a": 1})
+
+    def testMemoryMapped(self):
+        cache = FileCache(mmap_threshold=1)
+        with mock.patch("ros_bt_py.file_cache.mmap.mmap", wraps=mmap.mmap) as mapped:
+            self.assertEqual(cache.load_yaml(self.path), ["a", "b"])
+            self.assertEqual(mapped.call_count, 1)
+
+    def testErrors(self):
+        cache = FileCache()
+        missing = os.path.join(self.tmp_dir, "missing.yaml")
+        self.assertRaises(OSError, cache.load_yaml, missing)
+
+        with open(self.path, "w") as data_file:
+            data_file.write("[a")
+        self.assertRaises(yaml.YAMLError, cache.load_yaml, self.path)
@@ -31,6 +31,9 @@ import unittest
 
 from ros_bt_py_msgs.msg import Node as NodeMsg
 from ros_bt_py.nodes.format import (
+    compile_format,
+    compile_format_list,
+    myformatter,
     FormatOptionNode,
     FormatInputNode,
     FormatOptionListNode,
@@ -147,6 +150,27 @@ class TestFormatInputNode(unittest.TestCase):
         self.assertEqual(format_input.state, NodeMsg.IDLE)
         self.assertEqual(format_input.tick(), NodeMsg.FAILED)
 
+    def testOnlyFormatOnChange(self):
+        format_input = FormatInputNode()
+        format_input.inputs["format_string"] = "foo {first}"
+        format_input.inputs["dict"] = {"first": "bar"}
+        format_input.setup()
+
+        self.assertEqual(format_input.tick(), NodeMsg.SUCCEEDED)
+        self.assertTrue(format_input.outputs.is_updated("formatted_string"))
+
+        self.assertEqual(format_input.tick(), NodeMsg.SUCCEEDED)
+        self.assertFalse(format_input.outputs.is_updated("formatted_string"))
+        self.assertEqual(format_input.outputs["formatted_string"], "foo bar")
+
+        format_input.inputs["format_string"] = "{first} foo"
+        self.assertEqual(format_input.tick(), NodeMsg.SUCCEEDED)
+        self.assertEqual(format_input.outputs["formatted_string"], "bar foo")
+
+        format_input.inputs["dict"] = {}
+        self.assertEqual(format_input.tick(), NodeMsg.FAILED)
+        self.assertEqual(format_input.tick(), NodeMsg.FAILED)
+
 
 class TestFormatInputListNode(unittest.TestCase):
     def testSimpleFormatString(self):
@@ -185,6 +209,50 @@ class TestFormatInputListNode(unittest.TestCase):
         self.assertEqual(format_input.tick(), NodeMsg.FAILED)
 
 
+class TestCompiledFormat(unittest.TestCase):
+    class Robot(object):
+        name = "Bob"
+        position = [1.5, 2.25]
+
+    def setUp(self):
+        self.values = {
+            "first": "bar",
+            "third": "ToTo",
+            "number": 3.14159,
+            "width": 8,
+            "robot": self.Robot(),
+            "mapping": {"key": "value"},
+        }
+
+    def testSameAsFormatter(self):
+        format_strings = [
+            "foo {first} {third!u} {third!l} {third!c}",
+            "{number:.2f}|{number:>10}|{robot.name!u}|{robot.position[1]}",
+            "{{literal}} {first!s} {first!r:>6} {mapping[key]}",
+            # Nested fields in format specs are rendered by the formatter
+            "{number:{width}.1f}",
+            "",
+        ]
+        for format_string in format_strings:
+            self.assertEqual(
+                compile_format(format_string).render(self.values),
+                myformatter.format(format_string, **self.values),
+            )
+        self.assertEqual(
+            compile_format_list(tuple(format_strings)).render(self.values),
+            [myformatter.format(phrase, **self.values) for phrase in format_strings],
+        )
+
+    def testErrors(self):
+        self.assertRaises(KeyError, compile_format("{missing}").render, self.values)
+        self.assertRaises(IndexError, compile_format("{}").render, self.values)
+        self.assertRaises(ValueError, compile_format, "{first!z}")
+        self.assertRaises(ValueError, compile_format, "{")
+
+    def testShared(self):
+        self.assertIs(compile_format("foo {first}"), compile_format("foo {first}"))
+
+
 class TestStringConcatenation(unittest.TestCase):
     def testConcatenation(self):
         concat = StringConcatenation()
@@ -0,0 +1,67 @@
+# Copyright 2018-2023 FZI Forschungszentrum Informatik
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#    * Redistributions of source code must retain the above copyright
+#      notice, this list of conditions and the following disclaimer.
+#
+#    * Redistributions in binary form must reproduce the above copyright
+#      notice, this list of conditions and the following disclaimer in the
+#      documentation and/or other materials provided with the distribution.
+#
+#    * Neither the name of the FZI Forschungszentrum Informatik nor the names of its
+#      contributors may be used to endorse or promote products derived from
+#      this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+import unittest
+
+from ros_bt_py.heartbeat import TimerWheel
+
+
+class TestTimerWheel(unittest.TestCase):
+    def testExpiry(self):
+        wheel = TimerWheel(resolution=0.1, slots=8)
+        wheel.schedule("a", 1.0)
+        wheel.schedule("b", 1.25)
+
+        self.assertEqual(wheel.advance(0.95), [])
+        self.assertEqual(wheel.advance(1.0), [("a", 1.0)])
+        self.assertEqual(wheel.advance(1.2), [])
+        self.assertEqual(wheel.advance(1.3), [("b", 1.25)])
+        self.assertEqual(wheel.advance(5.0), [])
+
+    def testDeadlinesBeyondOneRound(self):
+        wheel = TimerWheel(resolution=0.1, slots=8)
+        wheel.advance(0.0)
+        # Lands in the same bucket as 0.2, but one round later
+        wheel.schedule("late", 1.0)
+        wheel.schedule("early", 0.2)
+
+        self.assertEqual(wheel.advance(0.2), [("early", 0.2)])
+        self.assertEqual(wheel.advance(0.9), [])
+        self.assertEqual(wheel.advance(1.0), [("late", 1.0)])
+
+    def testPastDeadline(self):
+        wheel = TimerWheel(resolution=0.1, slots=8)
+        wheel.advance(2.0)
+        wheel.schedule("past", 1.0)
+        self.assertEqual(wheel.advance(2.1), [("past", 1.0)])
+
+    def testLongPause(self):
+        wheel = TimerWheel(resolution=0.1, slots=8)
+        wheel.advance(0.0)
+        for index in range(20):
+            wheel.schedule(index, 0.1 * (index + 1))
+        self.assertEqual(sorted(key for key, _ in wheel.advance(10.0)), list(range(20)))
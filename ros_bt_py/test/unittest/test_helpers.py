@@ -38,8 +38,12 @@ except ImportError:
 import logging
 import rospy
 
+from ros_bt_py_msgs.msg import Node as NodeMsg, NodeData, Tree
+
 from ros_bt_py.helpers import rospy_log_level_to_logging_log_level, get_default_value
-from ros_bt_py.helpers import json_encode, json_decode
+from ros_bt_py.helpers import json_encode, json_decode, tree_hash
+from ros_bt_py.helpers import json_encode_type, json_decode_type
+from ros_bt_py.node_config import OptionRef
 from ros_bt_py.ros_helpers import LoggerLevel, EnumValue
 
 
@@ -81,3 +85,59 @@ class TestHelpers(unittest.TestCase):
             self.assertEqual(json_decode("{}"), {})
             version_info.major = 3
             self.assertEqual(json_decode("{}"), {})
+
+    def testTreeHash(self):
+        def make_tree(name, state, value):
+            return Tree(
+                name=name,
+                root_name="root",
+                nodes=[
+                    NodeMsg(
+                        module="ros_bt_py.nodes.constant",
+                        node_class="Constant",
+                        name="root",
+                        state=state,
+                        options=[
+                            NodeData(
+                                key="constant_value",
+                                serialized_value="42",
+                                serialized_type=json_encode(int),
+                            )
+                        ],
+                        outputs=[
+                            NodeData(
+                                key="constant",
+                                serialized_value=value,
+                                serialized_type=json_encode(int),
+                            )
+                        ],
+                    )
+                ],
+            )
+
+        tree = make_tree("tree", NodeMsg.IDLE, "null")
+        self.assertEqual(
+            tree_hash(tree), tree_hash(make_tree("other", NodeMsg.RUNNING, "42"))
+        )
+
+        tree.nodes[0].options[0].serialized_value = "23"
+        self.assertNotEqual(
+            tree_hash(tree), tree_hash(make_tree("tree", NodeMsg.IDLE, "null"))
+        )
+
+    def testTypeTables(self):
+        serialized_type = json_encode_type(int)
+        self.assertEqual(serialized_type, json_encode(int))
+        self.assertIs(serialized_type, json_encode_type(int))
+        self.assertIs(json_decode_type(serialized_type), int)
+
+        # Unhashable values are encoded every time
+        self.assertEqual(
+            json_encode_type(OptionRef("foo")), json_encode(OptionRef("foo"))
+        )
+
+        # Values that are not types are decoded, but not remembered
+        first = json_decode_type(json_encode([1, 2]))
+        second = json_decode_type(json_encode([1, 2]))
+        self.assertEqual(first, [1, 2])
+        self.assertIsNot(first, second)
@@ -0,0 +1,129 @@
+# Copyright 2018-2023 FZI Forschungszentrum Informatik
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#    * Redistributions of source code must retain the above copyright
+#      notice, this list of conditions and the following disclaimer.
+#
+#    * Redistributions in binary form must reproduce the above copyright
+#      notice, this list of conditions and the following disclaimer in the
+#      documentation and/or other materials provided with the distribution.
+#
+#    * Neither the name of the FZI Forschungszentrum Informatik nor the names of its
+#      contributors may be used to endorse or promote products derived from
+#      this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+import unittest
+from copy import deepcopy
+
+try:
+    import unittest.mock as mock
+except ImportError:
+    import mock
+
+from ros_bt_py_msgs.msg import Tree
+from ros_bt_py_msgs.srv import (
+    LoadTreeRequest,
+    LoadTreeResponse,
+    MigrateTreeRequest,
+    MigrateTreeResponse,
+)
+
+from ros_bt_py.ingest import ingest_tree
+from ros_bt_py.migration import MigrationManager
+from ros_bt_py.tree_manager import TreeManager, load_tree_from_file
+
+TREE_PATH = "package://ros_bt_py/test/testdata/trees/migrations_sequence.yaml"
+
+
+class TestIngest(unittest.TestCase):
+    def testIngestFile(self):
+        migrated = MigrationManager(tree_manager=TreeManager()).migrate_tree(
+            MigrateTreeRequest(tree=Tree(path=TREE_PATH))
+        )
+        self.assertTrue(migrated.success)
+        self.assertTrue(migrated.migrated)
+
+        tree_manager = TreeManager()
+        with mock.patch(
+            "ros_bt_py.ingest.load_tree_from_file", wraps=load_tree_from_file
+        ) as load_mock:
+            response, timings = ingest_tree(
+                tree_manager, LoadTreeRequest(tree=Tree(path=TREE_PATH))
+            )
+        self.assertTrue(response.success, response.error_message)
+        load_mock.assert_called_once()
+
+        self.assertTrue(timings.migrated)
+        self.assertGreater(timings.parse, 0.0)
+        self.assertGreater(timings.migration, 0.0)
+        self.assertGreaterEqual(timings.total, timings.instantiation)
+
+        self.assertEqual(
+            {(node.name, node.version) for node in tree_manager.tree_msg.nodes},
+            {(node.name, node.version) for node in migrated.tree.nodes},
+        )
+
+    def testIngestDoesNotModifyRequest(self):
+        tree = load_tree_from_file(MigrateTreeRequest(tree=Tree(path=TREE_PATH))).tree
+        original = deepcopy(tree)
+
+        response, timings = ingest_tree(TreeManager(), LoadTreeRequest(tree=tree))
+        self.assertTrue(response.success, response.error_message)
+        self.assertTrue(timings.migrated)
+        self.assertEqual(tree, original)
+
+    def testFailedMigrationLoadsOriginalTree(self):
+        tree = load_tree_from_file(MigrateTreeRequest(tree=Tree(path=TREE_PATH))).tree
+
+        def migrate_partially(tree, in_place):
+            tree.nodes[0].version = "migrated"
+            return MigrateTreeResponse(success=False, error_message="failed")
+
+        migration_manager = mock.Mock()
+        migration_manager.migrate_loaded_tree.side_effect = migrate_partially
+        tree_manager = TreeManager()
+        tree_manager.load_tree = mock.Mock(return_value=LoadTreeResponse(success=True))
+
+        response, timings = ingest_tree(
+            tree_manager,
+            LoadTreeRequest(tree=deepcopy(tree)),
+            migration_manager=migration_manager,
+        )
+        self.assertTrue(response.success)
+        self.assertFalse(timings.migrated)
+        migration_manager.migrate_loaded_tree.assert_called_once()
+        self.assertEqual(tree_manager.load_tree.call_args[0][0].tree, tree)
+
+    def testIngestCurrentTree(self):
+        tree_manager = TreeManager()
+        response, _ = ingest_tree(
+            tree_manager, LoadTreeRequest(tree=Tree(path=TREE_PATH))
+        )
+        self.assertTrue(response.success, response.error_message)
+
+        response, timings = ingest_tree(
+            TreeManager(), LoadTreeRequest(tree=deepcopy(tree_manager.tree_msg))
+        )
+        self.assertTrue(response.success, response.error_message)
+        self.assertFalse(timings.migrated)
+        self.assertEqual(timings.migration, 0.0)
+
+    def testInvalidPath(self):
+        response, timings = ingest_tree(
+            TreeManager(), LoadTreeRequest(tree=Tree(path="/notareal.file"))
+        )
+        self.assertFalse(response.success)
+        self.assertEqual(timings.instantiation, 0.0)
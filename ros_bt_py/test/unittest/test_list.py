@@ -34,6 +34,10 @@ from ros_bt_py_msgs.msg import NodeDataWiring
 from ros_bt_py_msgs.msg import NodeDataLocation
 
 from ros_bt_py.nodes.list import (
+    BatchIterateList,
+    FilterList,
+    MapList,
+    ReduceList,
     ListLength,
     IsInList,
     IterateList,
@@ -43,6 +47,8 @@ from ros_bt_py.nodes.list import (
 from ros_bt_py.nodes.mock_nodes import MockLeaf
 from ros_bt_py.nodes.compare import CompareConstant
 from ros_bt_py.nodes.decorators import IgnoreFailure
+from ros_bt_py.nodes.maths import Operation
+from ros_bt_py.helpers import MathBinaryOperator, MathOperandType
 
 try:
     import unittest.mock as mock
@@ -277,3 +283,176 @@ class TestIterateList(unittest.TestCase):
         self.assertEqual(self.iterate.untick(), Node.IDLE)
         self.assertEqual(self.iterate.reset(), Node.IDLE)
         self.assertEqual(self.iterate.shutdown(), Node.SHUTDOWN)
+
+
+def wire(source, source_kind, source_key, target, target_key):
+    target.wire_data(
+        NodeDataWiring(
+            source=NodeDataLocation(
+                node_name=source.name, data_kind=source_kind, data_key=source_key
+            ),
+            target=NodeDataLocation(
+                node_name=target.name,
+                data_kind=NodeDataLocation.INPUT_DATA,
+                data_key=target_key,
+            ),
+        )
+    )
+
+
+def make_operation(operator):
+    return Operation(
+        {
+            "operand_type": MathOperandType("int"),
+            "operator": MathBinaryOperator(operator),
+        }
+    )
+
+
+class TestBatchIterateList(unittest.TestCase):
+    def setUp(self):
+        self.compare = CompareConstant({"compare_type": str, "expected": "toto"})
+        self.tick_count = mock.Mock(wraps=self.compare._do_tick)
+        self.compare._do_tick = self.tick_count
+
+    def make_iterate(self, max_items_per_tick=0, max_time_per_tick=0.0):
+        iterate = BatchIterateList(
+            {
+                "item_type": str,
+                "max_items_per_tick": max_items_per_tick,
+                "max_time_per_tick": max_time_per_tick,
+            }
+        )
+        iterate.add_child(self.compare)
+        wire(iterate, NodeDataLocation.OUTPUT_DATA, "list_item", self.compare, "in")
+        return iterate
+
+    def testIterateInOneTick(self):
+        iterate = self.make_iterate()
+        iterate.inputs["list"] = ["toto"] * 100
+        iterate.setup()
+
+        self.assertEqual(iterate.tick(), Node.SUCCEEDED)
+        self.assertEqual(self.tick_count.call_count, 100)
+
+        # Starts over on the next tick
+        self.assertEqual(iterate.tick(), Node.SUCCEEDED)
+        self.assertEqual(self.tick_count.call_count, 200)
+
+        self.assertEqual(iterate.untick(), Node.IDLE)
+        self.assertEqual(iterate.reset(), Node.IDLE)
+        self.assertEqual(iterate.shutdown(), Node.SHUTDOWN)
+
+    def testMaxItemsPerTick(self):
+        iterate = self.make_iterate(max_items_per_tick=2)
+        iterate.inputs["list"] = ["toto"] * 5
+        iterate.setup()
+
+        self.assertEqual(iterate.tick(), Node.RUNNING)
+        self.assertEqual(self.tick_count.call_count, 2)
+        self.assertEqual(iterate.tick(), Node.RUNNING)
+        self.assertEqual(self.tick_count.call_count, 4)
+        self.assertEqual(iterate.tick(), Node.SUCCEEDED)
+        self.assertEqual(self.tick_count.call_count, 5)
+
+    def testMaxTimePerTick(self):
+        iterate = self.make_iterate(max_time_per_tick=1e-9)
+        iterate.inputs["list"] = ["toto"] * 3
+        iterate.setup()
+
+        # At least one element is processed per tick
+        self.assertEqual(iterate.tick(), Node.RUNNING)
+        self.assertEqual(self.tick_count.call_count, 1)
+
+    def testChildFails(self):
+        iterate = self.make_iterate()
+        iterate.inputs["list"] = ["toto", "fail", "toto"]
+        iterate.setup()
+
+        self.assertEqual(iterate.tick(), Node.FAILED)
+        self.assertEqual(self.compare.inputs["in"], "fail")
+        self.assertEqual(self.tick_count.call_count, 2)
+
+    def testChildRunning(self):
+        iterate = self.make_iterate()
+        self.tick_count.side_effect = [Node.SUCCEEDED, Node.RUNNING, Node.SUCCEEDED]
+        iterate.inputs["list"] = ["a", "b"]
+        iterate.setup()
+
+        self.assertEqual(iterate.tick(), Node.RUNNING)
+        self.assertEqual(self.compare.inputs["in"], "b")
+        self.assertEqual(iterate.tick(), Node.SUCCEEDED)
+        self.assertEqual(self.compare.inputs["in"], "b")
+        self.assertEqual(self.tick_count.call_count, 3)
+
+
+class TestMapList(unittest.TestCase):
+    def testMap(self):
+        map_list = MapList(
+            {
+                "item_type": int,
+                "result_type": int,
+                "max_items_per_tick": 0,
+                "max_time_per_tick": 0.0,
+            }
+        )
+        multiply = make_operation("*")
+        map_list.add_child(multiply)
+        wire(map_list, NodeDataLocation.OUTPUT_DATA, "list_item", multiply, "a")
+        wire(multiply, NodeDataLocation.OUTPUT_DATA, "result", map_list, "result")
+        multiply.inputs["b"] = 10
+
+        map_list.inputs["list"] = [1, 2, 3]
+        map_list.setup()
+
+        self.assertEqual(map_list.tick(), Node.SUCCEEDED)
+        self.assertEqual(map_list.outputs["results"], [10, 20, 30])
+
+        map_list.inputs["list"] = []
+        self.assertEqual(map_list.tick(), Node.SUCCEEDED)
+        self.assertEqual(map_list.outputs["results"], [])
+
+
+class TestFilterList(unittest.TestCase):
+    def testFilter(self):
+        filter_list = FilterList(
+            {"item_type": str, "max_items_per_tick": 2, "max_time_per_tick": 0.0}
+        )
+        compare = CompareConstant({"compare_type": str, "expected": "toto"})
+        filter_list.add_child(compare)
+        wire(filter_list, NodeDataLocation.OUTPUT_DATA, "list_item", compare, "in")
+
+        filter_list.inputs["list"] = ["toto", "a", "toto", "b"]
+        filter_list.setup()
+
+        self.assertEqual(filter_list.tick(), Node.RUNNING)
+        self.assertEqual(filter_list.tick(), Node.SUCCEEDED)
+        self.assertEqual(filter_list.outputs["filtered"], ["toto", "toto"])
+
+
+class TestReduceList(unittest.TestCase):
+    def testReduce(self):
+        reduce_list = ReduceList(
+            {
+                "item_type": int,
+                "accumulator_type": int,
+                "max_items_per_tick": 0,
+                "max_time_per_tick": 0.0,
+            }
+        )
+        add = make_operation("+")
+        reduce_list.add_child(add)
+        wire(reduce_list, NodeDataLocation.OUTPUT_DATA, "list_item", add, "a")
+        wire(reduce_list, NodeDataLocation.OUTPUT_DATA, "accumulator", add, "b")
+        wire(add, NodeDataLocation.OUTPUT_DATA, "result", reduce_list, "result")
+
+        reduce_list.inputs["list"] = [1, 2, 3, 4]
+        reduce_list.inputs["initial"] = 100
+        reduce_list.setup()
+
+        self.assertEqual(reduce_list.tick(), Node.SUCCEEDED)
+        self.assertEqual(reduce_list.outputs["reduced"], 110)
+
+        reduce_list.inputs["list"] = []
+        self.assertEqual(reduce_list.tick(), Node.SUCCEEDED)
+        self.assertEqual(reduce_list.outputs["reduced"], 100)
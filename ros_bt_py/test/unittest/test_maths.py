@@ -32,6 +32,7 @@ import unittest
 from ros_bt_py_msgs.msg import Node as NodeMsg
 from ros_bt_py.exceptions import BehaviorTreeException
 from ros_bt_py.nodes.maths import Convert, Operation, UnaryOperation
+from ros_bt_py.nodes.maths import ArrayReduction, BatchOperation, BatchUnaryOperation
 from ros_bt_py.helpers import MathUnaryOperator, MathBinaryOperator
 from ros_bt_py.helpers import MathOperandType, MathUnaryOperandType
 
@@ -263,3 +264,138 @@ class TestUnaryOperation(unittest.TestCase):
                 "operator": MathUnaryOperator("does_not_exist"),
             },
         )
+
+
+class TestBatchOperation(unittest.TestCase):
+    def testAdd(self):
+        operation = BatchOperation(
+            {
+                "operand_type": MathOperandType("int"),
+                "operator": MathBinaryOperator("+"),
+            }
+        )
+        operation.setup()
+
+        operation.inputs["a"] = [1, 2, 3]
+        operation.inputs["b"] = [10, 20, 30]
+        self.assertEqual(operation.tick(), NodeMsg.SUCCEEDED)
+        self.assertEqual(operation.outputs["result"], [11, 22, 33])
+        self.assertEqual(type(operation.outputs["result"][0]), int)
+
+        # A single element is combined with every element of the other list
+        operation.inputs["b"] = [1]
+        self.assertEqual(operation.tick(), NodeMsg.SUCCEEDED)
+        self.assertEqual(operation.outputs["result"], [2, 3, 4])
+
+        operation.inputs["b"] = [1, 2]
+        self.assertEqual(operation.tick(), NodeMsg.FAILED)
+
+        self.assertEqual(operation.reset(), NodeMsg.IDLE)
+        self.assertEqual(operation.shutdown(), NodeMsg.SHUTDOWN)
+
+    def testSameAsOperation(self):
+        for operand_type, values, operators in [
+            ("float", ([1.5, -2.0, 3.25], [0.5, 4.0, -1.0]), ["+", "-", "*", "/"]),
+            ("bool", ([True, True, False], [True, False, False]), ["&", "|", "^"]),
+        ]:
+            for operator in operators:
+                options = {
+                    "operand_type": MathOperandType(operand_type),
+                    "operator": MathBinaryOperator(operator),
+                }
+                batch = BatchOperation(options)
+                batch.setup()
+                batch.inputs["a"], batch.inputs["b"] = values
+                self.assertEqual(batch.tick(), NodeMsg.SUCCEEDED)
+
+                single = Operation(options)
+                single.setup()
+                for index, (a, b) in enumerate(zip(*values)):
+                    single.inputs["a"] = a
+                    single.inputs["b"] = b
+                    single.tick()
+                    self.assertEqual(
+                        batch.outputs["result"][index], single.outputs["result"]
+                    )
+
+    def testDivisionByZero(self):
+        operation = BatchOperation(
+            {
+                "operand_type": MathOperandType("float"),
+                "operator": MathBinaryOperator("/"),
+            }
+        )
+        operation.setup()
+        operation.inputs["a"] = [1.0, 2.0]
+        operation.inputs["b"] = [1.0, 0.0]
+        self.assertEqual(operation.tick(), NodeMsg.FAILED)
+
+    def testWrongOperator(self):
+        operation = BatchOperation(
+            {
+                "operand_type": MathOperandType("int"),
+                "operator": MathBinaryOperator("does_not_exist"),
+            }
+        )
+        self.assertRaises(BehaviorTreeException, operation.setup)
+
+
+class TestBatchUnaryOperation(unittest.TestCase):
+    def testSqrt(self):
+        operation = BatchUnaryOperation(
+            {
+                "operand_type": MathUnaryOperandType("float"),
+                "operator": MathUnaryOperator("sqrt"),
+            }
+        )
+        operation.setup()
+        operation.inputs["in"] = [4.0, 9.0, 0.25]
+        self.assertEqual(operation.tick(), NodeMsg.SUCCEEDED)
+        self.assertEqual(operation.outputs["result"], [2.0, 3.0, 0.5])
+
+    def testFactorial(self):
+        operation = BatchUnaryOperation(
+            {
+                "operand_type": MathUnaryOperandType("int"),
+                "operator": MathUnaryOperator("factorial"),
+            }
+        )
+        operation.setup()
+        operation.inputs["in"] = [0, 3, 5]
+        self.assertEqual(operation.tick(), NodeMsg.SUCCEEDED)
+        self.assertEqual(operation.outputs["result"], [1, 6, 120])
+
+
+class TestArrayReduction(unittest.TestCase):
+    def testReductions(self):
+        for reduction, expected in [
+            ("sum", 10.0),
+            ("prod", 24.0),
+            ("min", 1.0),
+            ("max", 4.0),
+            ("mean", 2.5),
+            ("median", 2.5),
+            ("var", 1.25),
+            ("norm", 30.0**0.5),
+        ]:
+            node = ArrayReduction({"reduction": reduction})
+            node.setup()
+            node.inputs["in"] = [3, 1, 4, 2]
+            self.assertEqual(node.tick(), NodeMsg.SUCCEEDED)
+            self.assertAlmostEqual(node.outputs["result"], expected)
+
+    def testEmptyList(self):
+        node = ArrayReduction({"reduction": "sum"})
+        node.setup()
+        node.inputs["in"] = []
+        self.assertEqual(node.tick(), NodeMsg.SUCCEEDED)
+        self.assertEqual(node.outputs["result"], 0.0)
+
+        node = ArrayReduction({"reduction": "max"})
+        node.setup()
+        node.inputs["in"] = []
+        self.assertEqual(node.tick(), NodeMsg.FAILED)
+
+    def testWrongReduction(self):
+        node = ArrayReduction({"reduction": "does_not_exist"})
+        self.assertRaises(BehaviorTreeException, node.setup)
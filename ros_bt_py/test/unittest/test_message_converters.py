@@ -29,11 +29,17 @@
 
 import unittest
 
+from geometry_msgs.msg import Point, Pose, PoseStamped
 from ros_bt_py_msgs.msg import Node as NodeMsg, Tree
 from std_msgs.msg import Duration, Header, Time
 
 from ros_bt_py.exceptions import BehaviorTreeException
 from ros_bt_py.ros_nodes.message_converters import MessageToFields, FieldsToMessage
+from ros_bt_py.ros_nodes.message_converters import (
+    FieldPathsToMessage,
+    MessageToFieldPaths,
+)
+from ros_bt_py.ros_helpers import expand_field_paths, get_message_fields
 from ros_bt_py.node_config import NodeConfig
 from ros_bt_py.node_data import NodeData
 
@@ -185,3 +191,128 @@ class TestFieldsToMessage(unittest.TestCase):
         self.assertEqual(converter.state, NodeMsg.SUCCEEDED)
         self.assertEqual(converter.outputs["out"].data.secs, 0)
         self.assertEqual(converter.outputs["out"].data.nsecs, 0)
+
+    def testOnlyBuildOnChange(self):
+        converter = FieldsToMessage({"output_type": Header})
+        converter.setup()
+
+        converter.inputs["stamp"] = Time()
+        converter.inputs["frame_id"] = "foo"
+        converter.inputs["seq"] = 42
+        converter.tick()
+        message = converter.outputs["out"]
+
+        converter.tick()
+        self.assertIs(converter.outputs["out"], message)
+
+        converter.inputs["seq"] = 43
+        converter.tick()
+        self.assertEqual(converter.outputs["out"].seq, 43)
+        self.assertEqual(converter.outputs["out"].frame_id, "foo")
+
+
+class TestMessageToFieldsChanges(unittest.TestCase):
+    def testOnlyChangedOutputs(self):
+        converter = MessageToFields({"input_type": Header})
+        converter.setup()
+
+        converter.inputs["in"] = Header(frame_id="foo", seq=42)
+        converter.tick()
+        self.assertTrue(converter.outputs.is_updated("frame_id"))
+        self.assertTrue(converter.outputs.is_updated("seq"))
+
+        converter.inputs["in"] = Header(frame_id="foo", seq=43)
+        converter.tick()
+        self.assertFalse(converter.outputs.is_updated("frame_id"))
+        self.assertTrue(converter.outputs.is_updated("seq"))
+        self.assertEqual(converter.outputs["seq"], 43)
+
+        # Without a new input, nothing changes
+        converter.tick()
+        self.assertFalse(converter.outputs.is_updated("seq"))
+        self.assertEqual(converter.outputs["seq"], 43)
+
+    def testMutatedMessage(self):
+        converter = MessageToFields({"input_type": PoseStamped})
+        converter.setup()
+
+        msg = PoseStamped()
+        msg.header.frame_id = "foo"
+        converter.inputs["in"] = msg
+        converter.tick()
+        self.assertEqual(converter.outputs["pose"].position.x, 0.0)
+
+        # Changing the same message in place still updates the outputs
+        msg.pose.position.x = 1.0
+        msg.header.frame_id = "bar"
+        converter.inputs["in"] = msg
+        converter.tick()
+        self.assertTrue(converter.outputs.is_updated("pose"))
+        self.assertEqual(converter.outputs["pose"].position.x, 1.0)
+        self.assertTrue(converter.outputs.is_updated("header"))
+        self.assertEqual(converter.outputs["header"].frame_id, "bar")
+
+
+class TestFieldPaths(unittest.TestCase):
+    def testMessageToFieldPaths(self):
+        converter = MessageToFieldPaths(
+            {
+                "input_type": PoseStamped,
+                "field_paths": ["header.frame_id", "header.stamp", "pose.position.x"],
+            }
+        )
+        self.assertEqual(converter.outputs.get_type("header.frame_id"), str)
+        self.assertEqual(converter.outputs.get_type("header.stamp"), Time)
+        self.assertEqual(converter.outputs.get_type("pose.position.x"), float)
+        converter.setup()
+
+        message = PoseStamped()
+        message.header.frame_id = "map"
+        message.header.stamp.secs = 23
+        message.pose.position.x = 4.2
+        converter.inputs["in"] = message
+
+        self.assertEqual(converter.tick(), NodeMsg.SUCCEEDED)
+        self.assertEqual(converter.outputs["header.frame_id"], "map")
+        self.assertEqual(converter.outputs["header.stamp"].data.secs, 23)
+        self.assertEqual(converter.outputs["pose.position.x"], 4.2)
+
+    def testFieldPathsToMessage(self):
+        converter = FieldPathsToMessage(
+            {
+                "output_type": PoseStamped,
+                "field_paths": ["header.frame_id", "pose.position"],
+            }
+        )
+        converter.setup()
+        converter.inputs["header.frame_id"] = "map"
+        converter.inputs["pose.position"] = Point(x=1.0, y=2.0, z=3.0)
+
+        self.assertEqual(converter.tick(), NodeMsg.SUCCEEDED)
+        expected = PoseStamped()
+        expected.header.frame_id = "map"
+        expected.pose.position = Point(x=1.0, y=2.0, z=3.0)
+        self.assertEqual(converter.outputs["out"], expected)
+
+    def testInvalidPath(self):
+        self.assertRaises(
+            BehaviorTreeException,
+            MessageToFieldPaths,
+            {"input_type": PoseStamped, "field_paths": ["pose.frob"]},
+        )
+
+    def testSharedFields(self):
+        self.assertIs(get_message_fields(Pose), get_message_fields(Pose))
+        fields = get_message_fields(Pose, ["position.y", "orientation.w"])
+        pose = fields.build([2.0, 1.0])
+        self.assertEqual(pose.position.y, 2.0)
+        self.assertEqual(pose.orientation.w, 1.0)
+        self.assertEqual(fields.extract(pose), [2.0, 1.0])
+
+    def testExpandFieldPaths(self):
+        self.assertEqual(
+            expand_field_paths(
+                {"pose.position.x": 1.0, "pose.position.y": 2.0, "header": {"seq": 3}}
+            ),
+            {"pose": {"position": {"x": 1.0, "y": 2.0}}, "header": {"seq": 3}},
+        )
@@ -29,6 +29,7 @@
 
 import unittest
 
+from geometry_msgs.msg import PoseStamped
 from ros_bt_py_msgs.msg import Node as NodeMsg
 
 from ros_bt_py.ros_nodes.message_from_dict import MessageFromDict, MessageFromConstDict
@@ -49,6 +50,15 @@ class TestMessageFromDict(unittest.TestCase):
         self.assertEqual(self.mfd.reset(), NodeMsg.IDLE)
         self.assertEqual(self.mfd.shutdown(), NodeMsg.SHUTDOWN)
 
+    def testPopulateFieldPath(self):
+        mfd = MessageFromDict({"message_type": PoseStamped})
+        mfd.setup()
+        mfd.inputs["dict"] = {"header.frame_id": "map", "pose.position.x": 1.0}
+
+        self.assertEqual(mfd.tick(), NodeMsg.SUCCEEDED)
+        self.assertEqual(mfd.outputs["message"].header.frame_id, "map")
+        self.assertEqual(mfd.outputs["message"].pose.position.x, 1.0)
+
     def testPopulateInvalidKey(self):
         self.mfd.inputs["dict"] = {"frob": 123}
 
@@ -72,3 +82,16 @@ class TestMessageFromConstDict(unittest.TestCase):
         mfd.setup()
 
         self.assertEqual(mfd.tick(), NodeMsg.FAILED)
+
+    def testOutputOnce(self):
+        mfd = MessageFromConstDict(
+            {"message_type": PoseStamped, "dict": {"pose.position.z": 2.0}}
+        )
+        mfd.setup()
+
+        self.assertEqual(mfd.tick(), NodeMsg.SUCCEEDED)
+        self.assertTrue(mfd.outputs.is_updated("message"))
+        self.assertEqual(mfd.outputs["message"].pose.position.z, 2.0)
+
+        self.assertEqual(mfd.tick(), NodeMsg.SUCCEEDED)
+        self.assertFalse(mfd.outputs.is_updated("message"))
@@ -47,7 +47,14 @@ from ros_bt_py_msgs.srv import (
 
 from ros_bt_py.testing_nodes import migrations_test_nodes
 
-from ros_bt_py.migration import MigrationManager, check_node_versions
+from ros_bt_py.migration import (
+    MigrationIndex,
+    MigrationManager,
+    check_node_versions,
+    get_migration_index,
+)
+from ros_bt_py.node import Leaf, define_bt_node
+from ros_bt_py.node_config import NodeConfig
 from ros_bt_py.tree_manager import TreeManager, get_available_nodes
 
 
@@ -717,3 +724,64 @@ class TestMigrationManager(unittest.TestCase):
 
         migration_manager = MigrationManager(tree_manager=tree_manager)
         self.assertIsNotNone(migration_manager)
+
+    def testMigrationIndex(self):
+        request = GetAvailableNodesRequest(node_modules=["ros_bt_py.nodes.constant"])
+        response = get_available_nodes(request)
+        self.assertTrue(response.success)
+
+        index = MigrationIndex()
+        with mock.patch.object(
+            index,
+            "check_for_available_migration",
+            wraps=index.check_for_available_migration,
+        ) as check_mock:
+            # Creating a manager does not look for migrations
+            migration_manager = MigrationManager(tree_manager=TreeManager())
+            migration_manager.index = index
+            check_mock.assert_not_called()
+
+            self.assertIn(
+                "ros_bt_py.nodes.migrations.constant.Constant",
+                migration_manager.migrations_classes,
+            )
+            checked = check_mock.call_count
+            self.assertGreater(checked, 0)
+
+            # Node classes are only checked once
+            index.update()
+            self.assertEqual(check_mock.call_count, checked)
+
+            @define_bt_node(
+                NodeConfig(
+                    options={}, inputs={}, outputs={}, max_children=0, version="1.0.0"
+                )
+            )
+            class IndexedNode(Leaf):
+                def _do_setup(self):
+                    pass
+
+                def _do_tick(self):
+                    return NodeMsg.SUCCEEDED
+
+                def _do_untick(self):
+                    return NodeMsg.IDLE
+
+                def _do_reset(self):
+                    return NodeMsg.IDLE
+
+                def _do_shutdown(self):
+                    pass
+
+            index.update()
+            self.assertEqual(check_mock.call_count, checked + 1)
+            self.assertEqual(
+                check_mock.call_args[0][0].node_class, IndexedNode.__name__
+            )
+
+    def testMigrationIndexShared(self):
+        self.assertIs(
+            MigrationManager(tree_manager=TreeManager()).index,
+            MigrationManager(tree_manager=TreeManager()).index,
+        )
+        self.assertIs(get_migration_index(), get_migration_index())
@@ -444,6 +444,21 @@ class TestPassthroughNode(unittest.TestCase):
             ),
         )
 
+    def testPassthroughNodeSharesConfig(self):
+        first = PassthroughNode({"passthrough_type": int})
+        second = PassthroughNode({"passthrough_type": str})
+        self.assertIs(first._config, PassthroughNode._node_config)
+        self.assertIs(second._config, PassthroughNode._node_config)
+
+        # Accessing node_config gives the node its own copy
+        first.node_config.extend(
+            NodeConfig(options={}, inputs={"extra": int}, outputs={}, max_children=0)
+        )
+        self.assertIn("extra", first.node_config.inputs)
+        self.assertIs(first._config, first.node_config)
+        self.assertNotIn("extra", PassthroughNode._node_config.inputs)
+        self.assertIs(second._config, PassthroughNode._node_config)
+
     def testPassthroughNodeIO(self):
         passthrough = PassthroughNode({"passthrough_type": int})
         self.assertEqual(passthrough.inputs.name, "inputs")
@@ -0,0 +1,101 @@
+# Copyright 2018-2023 FZI Forschungszentrum Informatik
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#    * Redistributions of source code must retain the above copyright
+#      notice, this list of conditions and the following disclaimer.
+#
+#    * Redistributions in binary form must reproduce the above copyright
+#      notice, this list of conditions and the following disclaimer in the
+#      documentation and/or other materials provided with the distribution.
+#
+#    * Neither the name of the FZI Forschungszentrum Informatik nor the names of its
+#      contributors may be used to endorse or promote products derived from
+#      this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+import os
+import shutil
+import tempfile
+import unittest
+
+try:
+    import unittest.mock as mock
+except ImportError:
+    import mock
+
+from ros_bt_py.node import Node, load_node_module
+from ros_bt_py.node_manifest import NodeManifest, load_node_modules_lazily
+from ros_bt_py.tree_manager import document_node_class
+
+MODULE = "ros_bt_py.nodes.constant"
+
+
+class TestNodeManifest(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp_dir, "manifest", "node_manifest.json")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def documentModule(self, module_name):
+        self.assertIsNotNone(load_node_module(module_name))
+        return [
+            document_node_class(module_name, class_name, node_class)
+            for (class_name, node_classes) in Node.node_classes[module_name].items()
+            for node_class in node_classes
+        ]
+
+    def testRoundTrip(self):
+        nodes = self.documentModule(MODULE)
+        manifest = NodeManifest(self.path)
+        self.assertIsNone(manifest.nodes(MODULE))
+        manifest.add(MODULE, nodes)
+        manifest.save()
+
+        manifest = NodeManifest(self.path)
+        self.assertEqual(manifest.nodes(MODULE), nodes)
+        self.assertIsNone(manifest.nodes("ros_bt_py.nodes.sequence"))
+
+    def testOutdatedEntry(self):
+        manifest = NodeManifest(self.path)
+        manifest.add(MODULE, self.documentModule(MODULE))
+        with mock.patch(
+            "ros_bt_py.node_manifest._source_stamp", return_value=["changed", 0, 0]
+        ):
+            self.assertIsNone(manifest.nodes(MODULE))
+
+    def testInvalidFile(self):
+        os.makedirs(os.path.dirname(self.path))
+        with open(self.path, "w") as manifest_file:
+            manifest_file.write("not a manifest")
+        self.assertIsNone(NodeManifest(self.path).nodes(MODULE))
+
+    def testLoadLazily(self):
+        with mock.patch(
+            "ros_bt_py.node_manifest.load_node_module", wraps=load_node_module
+        ) as load_mock:
+            self.assertEqual(load_node_modules_lazily([MODULE], self.path), [])
+            load_mock.assert_called_once_with(MODULE)
+
+            # The manifest is current now, so the module is not imported again
+            load_mock.reset_mock()
+            self.assertEqual(load_node_modules_lazily([MODULE], self.path), [])
+            load_mock.assert_not_called()
+
+        self.assertEqual(
+            load_node_modules_lazily(["ros_bt_py.does_not_exist"], self.path),
+            ["ros_bt_py.does_not_exist"],
+        )
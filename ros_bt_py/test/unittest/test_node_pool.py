@@ -0,0 +1,122 @@
+# Copyright 2018-2023 FZI Forschungszentrum Informatik
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#    * Redistributions of source code must retain the above copyright
+#      notice, this list of conditions and the following disclaimer.
+#
+#    * Redistributions in binary form must reproduce the above copyright
+#      notice, this list of conditions and the following disclaimer in the
+#      documentation and/or other materials provided with the distribution.
+#
+#    * Neither the name of the FZI Forschungszentrum Informatik nor the names of its
+#      contributors may be used to endorse or promote products derived from
+#      this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+import unittest
+
+from ros_bt_py_msgs.msg import Node as NodeMsg, NodeDataWiring, NodeDataLocation
+
+from ros_bt_py.node_pool import NodePool
+from ros_bt_py.nodes.passthrough_node import PassthroughNode
+from ros_bt_py.nodes.sequence import Sequence
+from ros_bt_py.nodes.subtree import Subtree
+
+
+class TestNodePool(unittest.TestCase):
+    def setUp(self):
+        self.pool = NodePool(max_size=2)
+
+    def testReuseShutdownNode(self):
+        node = PassthroughNode(name="first", options={"passthrough_type": int})
+        msg = node.to_msg()
+        node.setup()
+        node.inputs["in"] = 42
+        node.tick()
+        node.shutdown()
+
+        self.assertEqual(self.pool.release([node]), 1)
+        self.assertEqual(len(self.pool), 1)
+
+        msg.name = "second"
+        reused = self.pool.acquire(msg)
+        self.assertIs(reused, node)
+        self.assertEqual(len(self.pool), 0)
+        self.assertEqual(reused.name, "second")
+        self.assertEqual(reused.state, NodeMsg.UNINITIALIZED)
+        self.assertIsNone(reused.inputs["in"])
+        self.assertIsNone(reused.outputs["out"])
+        self.assertFalse(reused.outputs.is_updated("out"))
+
+        reused.setup()
+        reused.inputs["in"] = 23
+        reused.tick()
+        self.assertEqual(reused.outputs["out"], 23)
+
+    def testOptionsMustMatch(self):
+        node = PassthroughNode(options={"passthrough_type": int})
+        self.pool.release([node])
+        msg = PassthroughNode(options={"passthrough_type": str}).to_msg()
+        self.assertIsNone(self.pool.acquire(msg))
+        self.assertEqual(len(self.pool), 1)
+
+    def testResetsWiringAndChildren(self):
+        root = Sequence(name="root")
+        source = PassthroughNode(name="source", options={"passthrough_type": int})
+        target = PassthroughNode(name="target", options={"passthrough_type": int})
+        root.add_child(source)
+        root.add_child(target)
+        target.wire_data(
+            NodeDataWiring(
+                source=NodeDataLocation(
+                    node_name="source",
+                    data_key="out",
+                    data_kind=NodeDataLocation.OUTPUT_DATA,
+                ),
+                target=NodeDataLocation(
+                    node_name="target",
+                    data_key="in",
+                    data_kind=NodeDataLocation.INPUT_DATA,
+                ),
+            )
+        )
+        root_msg = root.to_msg()
+        source_msg = source.to_msg()
+
+        self.assertEqual(self.pool.release([root, source, target]), 2)
+        reused_root = self.pool.acquire(root_msg)
+        self.assertIs(reused_root, root)
+        self.assertEqual(reused_root.children, [])
+        reused_source = self.pool.acquire(source_msg)
+        self.assertIsNone(reused_source.parent)
+        self.assertEqual(reused_source.subscribers, [])
+        self.assertEqual(reused_source.outputs.callbacks, {})
+
+    def testSkipsUnpoolableNodes(self):
+        running = PassthroughNode(options={"passthrough_type": int})
+        running.setup()
+        self.assertFalse(NodePool.can_pool(running))
+
+        subtree = Subtree(
+            options={
+                "subtree_path": "package://ros_bt_py/etc/trees/test.yaml",
+                "use_io_nodes": False,
+            }
+        )
+        self.assertFalse(NodePool.can_pool(subtree))
+        self.assertEqual(self.pool.release([running, subtree]), 0)
+
+        self.pool.clear()
+        self.assertEqual(len(self.pool), 0)
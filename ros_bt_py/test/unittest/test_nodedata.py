@@ -139,3 +139,15 @@ class TestNodeData(unittest.TestCase):
         # this should always return null, even after setting the member variable to None
         data._serialized_value = None
         self.assertEqual(data.get_serialized(), "null")
+
+    def testSerializedValueUpdated(self):
+        data = NodeData(data_type=int, initial_value=1)
+        self.assertEqual(data.get_serialized(), "1")
+        data.set(2)
+        self.assertEqual(data.get_serialized(), "2")
+
+    def testSharedSerializedType(self):
+        first = NodeData(data_type=int)
+        second = NodeData(data_type=int)
+        self.assertIs(first.get_serialized_type(), second.get_serialized_type())
+        self.assertFalse(hasattr(first, "__dict__"))
@@ -27,12 +27,146 @@
 # POSSIBILITY OF SUCH DAMAGE.
 
 
+import os
+import shutil
+import tempfile
 import unittest
 
-from ros_bt_py.package_manager import PackageManager
+try:
+    import unittest.mock as mock
+except ImportError:
+    import mock
+
+from ros_bt_py.package_manager import (
+    MessageIndex,
+    PackageManager,
+    remove_action_messages,
+)
 
 
 class TestPackageManager(unittest.TestCase):
     def testLoadPackageManager(self):
         manager = PackageManager()
         self.assertIsNotNone(manager)
+
+
+class TestDirectoryListing(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        os.makedirs(os.path.join(self.tmp_dir, "trees", "nested"))
+        os.makedirs(os.path.join(self.tmp_dir, ".hidden"))
+        for name in ["a.yaml", "b.yaml", "c.bag", "trees/d.yaml"]:
+            open(os.path.join(self.tmp_dir, name), "w").close()
+        open(os.path.join(self.tmp_dir, "trees", "nested", "e.yaml"), "w").close()
+        self.manager = PackageManager()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def testListDirectory(self):
+        self.assertEqual(
+            self.manager.list_directory(self.tmp_dir),
+            [("a.yaml", False), ("b.yaml", False), ("c.bag", False), ("trees", True)],
+        )
+        self.assertIn(
+            (".hidden", True),
+            self.manager.list_directory(self.tmp_dir, show_hidden=True),
+        )
+        self.assertEqual(
+            self.manager.list_directory(self.tmp_dir, filters=["*.bag"]),
+            [("c.bag", False), ("trees", True)],
+        )
+        self.assertIsNone(
+            self.manager.list_directory(os.path.join(self.tmp_dir, "a.yaml"))
+        )
+
+    def testListingCache(self):
+        self.manager.list_directory(self.tmp_dir)
+        with mock.patch("ros_bt_py.package_manager.os.scandir") as scandir_mock:
+            self.manager.list_directory(self.tmp_dir)
+            scandir_mock.assert_not_called()
+
+        open(os.path.join(self.tmp_dir, "f.yaml"), "w").close()
+        os.utime(self.tmp_dir, ns=(0, 1000))
+        self.assertIn(("f.yaml", False), self.manager.list_directory(self.tmp_dir))
+
+    def testPathToDict(self):
+        structure = self.manager.path_to_dict(self.tmp_dir)
+        trees = structure["children"][3]
+        self.assertEqual(trees["name"], "trees")
+        self.assertEqual(trees["parent"], structure["item_id"])
+        self.assertEqual(trees["children"][1]["children"][0]["name"], "e.yaml")
+
+        with mock.patch.object(
+            self.manager, "list_directory", wraps=self.manager.list_directory
+        ) as list_directory:
+            structure = self.manager.path_to_dict(self.tmp_dir, max_depth=1)
+            # Directories below the depth limit are not listed at all
+            self.assertEqual(list_directory.call_count, 1)
+        trees = structure["children"][3]
+        self.assertEqual(trees["type"], "directory")
+        self.assertEqual(trees["children"], [])
+        self.assertFalse(trees["loaded"])
+
+        structure = self.manager.path_to_dict(self.tmp_dir, offset=1, limit=2)
+        self.assertEqual(
+            [child["name"] for child in structure["children"]], ["b.yaml", "c.bag"]
+        )
+
+
+class TestMessageIndex(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.msg_dir = os.path.join(self.tmp_dir, "msg")
+        self.index_path = os.path.join(self.tmp_dir, "index", "message_index.json")
+        os.makedirs(os.path.join(self.msg_dir, "Directory.msg"))
+        for name in ["B.msg", "A.msg", "README"]:
+            open(os.path.join(self.msg_dir, name), "w").close()
+        os.utime(self.msg_dir, ns=(0, 1000))
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def testTypes(self):
+        index = MessageIndex(self.index_path)
+        self.assertEqual(index.types(self.msg_dir, ".msg"), ["A", "B"])
+        self.assertEqual(index.types(os.path.join(self.tmp_dir, "srv"), ".srv"), [])
+
+    def testCachedTypes(self):
+        index = MessageIndex(self.index_path)
+        self.assertEqual(index.types(self.msg_dir, ".msg"), ["A", "B"])
+        index.save()
+
+        index = MessageIndex(self.index_path)
+        with mock.patch("ros_bt_py.package_manager.os.scandir") as scandir_mock:
+            self.assertEqual(index.types(self.msg_dir, ".msg"), ["A", "B"])
+            scandir_mock.assert_not_called()
+
+        # Adding a file changes the modification time of the directory
+        open(os.path.join(self.msg_dir, "C.msg"), "w").close()
+        os.utime(self.msg_dir, ns=(0, 2000))
+        self.assertEqual(index.types(self.msg_dir, ".msg"), ["A", "B", "C"])
+
+    def testInvalidIndex(self):
+        os.makedirs(os.path.dirname(self.index_path))
+        with open(self.index_path, "w") as index_file:
+            index_file.write("not an index")
+        index = MessageIndex(self.index_path)
+        self.assertEqual(index.types(self.msg_dir, ".msg"), ["A", "B"])
+
+    def testRemoveActionMessages(self):
+        self.assertEqual(
+            remove_action_messages(
+                [
+                    "Foo",
+                    "MoveAction",
+                    "MoveActionFeedback",
+                    "MoveActionGoal",
+                    "MoveActionResult",
+                    "MoveFeedback",
+                    "MoveGoal",
+                    "MoveResult",
+                ]
+            ),
+            ["Foo", "MoveAction", "MoveFeedback", "MoveGoal", "MoveResult"],
+        )
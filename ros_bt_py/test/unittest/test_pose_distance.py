@@ -27,6 +27,7 @@
 # POSSIBILITY OF SUCH DAMAGE.
 
 
+import random
 import unittest
 
 from geometry_msgs.msg import Point, Pose, Quaternion
@@ -34,7 +35,11 @@ from tf import transformations
 
 from ros_bt_py_msgs.msg import Node as NodeMsg
 
-from ros_bt_py.ros_nodes.pose_distance import PoseDistance
+from ros_bt_py.ros_nodes.pose_distance import (
+    NearestPoses,
+    PoseDistance,
+    PoseDistances,
+)
 
 
 class testPoseDistance(unittest.TestCase):
@@ -90,3 +95,82 @@ class testPoseDistance(unittest.TestCase):
         self.assertEqual(self.pose_distance.untick(), NodeMsg.IDLE)
         self.assertEqual(self.pose_distance.reset(), NodeMsg.IDLE)
         self.assertEqual(self.pose_distance.shutdown(), NodeMsg.SHUTDOWN)
+
+
+def make_pose(x, y, z, roll, pitch, yaw):
+    return Pose(
+        position=Point(x, y, z),
+        orientation=Quaternion(
+            *transformations.quaternion_from_euler(roll, pitch, yaw)
+        ),
+    )
+
+
+class testPoseDistances(unittest.TestCase):
+    def testSameAsPoseDistance(self):
+        random.seed(42)
+        pose = make_pose(1.0, 2.0, 3.0, 0.1, 0.2, 0.3)
+        poses = [
+            make_pose(*[random.uniform(-3.0, 3.0) for _ in range(6)]) for _ in range(50)
+        ]
+
+        pose_distances = PoseDistances({"succeed_on_stale_data": False})
+        pose_distances.setup()
+        pose_distances.inputs["pose"] = pose
+        pose_distances.inputs["poses"] = poses
+        self.assertEqual(pose_distances.tick(), NodeMsg.SUCCEEDED)
+        self.assertEqual(len(pose_distances.outputs["distances_pos"]), len(poses))
+
+        pose_distance = PoseDistance({"succeed_on_stale_data": False})
+        pose_distance.setup()
+        for index, other in enumerate(poses):
+            pose_distance.inputs["pose_a"] = pose
+            pose_distance.inputs["pose_b"] = other
+            self.assertEqual(pose_distance.tick(), NodeMsg.SUCCEEDED)
+            self.assertAlmostEqual(
+                pose_distances.outputs["distances_pos"][index],
+                pose_distance.outputs["distance_pos"],
+            )
+            self.assertAlmostEqual(
+                pose_distances.outputs["distances_angle"][index],
+                pose_distance.outputs["distance_angle"],
+            )
+
+        # Should return RUNNING on stale data
+        self.assertEqual(pose_distances.tick(), NodeMsg.RUNNING)
+
+    def testEmptyPoses(self):
+        pose_distances = PoseDistances({"succeed_on_stale_data": True})
+        pose_distances.setup()
+        pose_distances.inputs["pose"] = make_pose(0, 0, 0, 0, 0, 0)
+        pose_distances.inputs["poses"] = []
+        self.assertEqual(pose_distances.tick(), NodeMsg.SUCCEEDED)
+        self.assertEqual(pose_distances.outputs["distances_pos"], [])
+        self.assertEqual(pose_distances.outputs["distances_angle"], [])
+
+
+class testNearestPoses(unittest.TestCase):
+    def testNearestPoses(self):
+        poses = [make_pose(x, 0, 0, 0, 0, 0) for x in [5.0, -1.0, 3.0, 0.5, -4.0]]
+        nearest = NearestPoses({"k": 3, "succeed_on_stale_data": False})
+        nearest.setup()
+        nearest.inputs["pose"] = make_pose(0, 0, 0, 0, 0, 0)
+        nearest.inputs["poses"] = poses
+
+        self.assertEqual(nearest.tick(), NodeMsg.SUCCEEDED)
+        self.assertEqual(nearest.outputs["indices"], [3, 1, 2])
+        self.assertEqual(
+            nearest.outputs["nearest_poses"], [poses[3], poses[1], poses[2]]
+        )
+        for distance, expected in zip(nearest.outputs["distances"], [0.5, 1.0, 3.0]):
+            self.assertAlmostEqual(distance, expected)
+
+    def testLessPosesThanK(self):
+        poses = [make_pose(x, 0, 0, 0, 0, 0) for x in [2.0, 1.0]]
+        nearest = NearestPoses({"k": 5, "succeed_on_stale_data": False})
+        nearest.setup()
+        nearest.inputs["pose"] = make_pose(0, 0, 0, 0, 0, 0)
+        nearest.inputs["poses"] = poses
+
+        self.assertEqual(nearest.tick(), NodeMsg.SUCCEEDED)
+        self.assertEqual(nearest.outputs["indices"], [1, 0])
@@ -42,7 +42,8 @@ from ros_bt_py_msgs.srv import ControlTreeExecutionRequest, ControlTreeExecution
 
 from ros_bt_py.node import Leaf, define_bt_node
 from ros_bt_py.node_config import NodeConfig, OptionRef
-from ros_bt_py.remote_tree_slot import RemoteTreeSlot
+from ros_bt_py.remote_tree_slot import RemoteTreeSlot, RemoteTreeSlotPool
+from ros_bt_py.tree_transfer import compress_tree, tree_reference
 from ros_bt_py.nodes.sequence import Sequence
 from ros_bt_py.nodes.mock_nodes import MockLeaf, MockUtilityLeaf
 
@@ -365,6 +366,119 @@ class TestRemoteTreeSlot(unittest.TestCase):
         self.remote_slot.cancel_run_tree_handler(gh)
         self.assertEqual(gh.state, MockGoalHandle.CANCELED)
 
+    def testRunCompressedTree(self):
+        execute_tree, _, _ = self.execute_root.get_subtree_msg()
+        compressed_tree = compress_tree(execute_tree)
+
+        gh = MockGoalHandle(
+            RunTreeGoal(compressed_tree=tree_reference(compressed_tree)), goal_id=1
+        )
+        self.remote_slot.run_tree_handler(gh)
+        self.assertEqual(gh.state, MockGoalHandle.REJECTED)
+        self.assertTrue(gh.result.unknown_tree)
+
+        gh = MockGoalHandle(RunTreeGoal(compressed_tree=compressed_tree), goal_id=2)
+        self.remote_slot.run_tree_handler(gh)
+        self.assertEqual(gh.state, MockGoalHandle.ACCEPTED)
+        self.remote_slot.cancel_run_tree_handler(gh)
+
+        # Now the slot knows the tree
+        gh = MockGoalHandle(
+            RunTreeGoal(compressed_tree=tree_reference(compressed_tree)), goal_id=3
+        )
+        self.remote_slot.run_tree_handler(gh)
+        self.assertEqual(gh.state, MockGoalHandle.ACCEPTED)
+        self.assertEqual(
+            set(self.remote_slot.tree_manager.nodes),
+            {node.name for node in execute_tree.nodes},
+        )
+
+    def testEvaluateUtilityUnknownTree(self):
+        utility_tree, _, _ = self.utility_root.get_subtree_msg()
+        compressed_tree = compress_tree(utility_tree)
+
+        res = self.remote_slot.evaluate_utility_handler(
+            EvaluateUtilityRequest(compressed_tree=tree_reference(compressed_tree))
+        )
+        self.assertTrue(res.unknown_tree)
+
+        res = self.remote_slot.evaluate_utility_handler(
+            EvaluateUtilityRequest(compressed_tree=compressed_tree)
+        )
+        self.assertFalse(res.unknown_tree)
+        self.assertEqual(res.utility, self.utility_root.calculate_utility())
+
+    def runUntilResult(self, remote_slot, tree, goal_id):
+        gh = MockGoalHandle(RunTreeGoal(tree=tree), goal_id=goal_id)
+        remote_slot.run_tree_handler(gh)
+        self.assertEqual(gh.state, MockGoalHandle.ACCEPTED)
+
+        res = remote_slot.control_tree_execution_handler(
+            ControlTreeExecutionRequest(
+                command=ControlTreeExecutionRequest.TICK_UNTIL_RESULT,
+                tick_frequency_hz=10,
+            )
+        )
+        self.assertTrue(get_success(res), get_error_message(res))
+        rospy.sleep(1.0)
+        self.assertEqual(gh.state, MockGoalHandle.SUCCEEDED)
+
+    def testReuseLoadedTree(self):
+        execute_tree, _, _ = self.execute_root.get_subtree_msg()
+        utility_tree, _, _ = self.utility_root.get_subtree_msg()
+
+        self.runUntilResult(self.remote_slot, execute_tree, goal_id=1)
+        loaded_nodes = dict(self.remote_slot.tree_manager.nodes)
+
+        # Running the same tree again reuses the loaded nodes
+        self.runUntilResult(self.remote_slot, execute_tree, goal_id=2)
+        self.assertEqual(set(loaded_nodes), set(self.remote_slot.tree_manager.nodes))
+        for name, node in loaded_nodes.items():
+            self.assertIs(node, self.remote_slot.tree_manager.nodes[name])
+
+        # Another tree needs to be loaded, the first one is kept in the pool
+        res = self.remote_slot.evaluate_utility_handler(
+            EvaluateUtilityRequest(utility_tree)
+        )
+        self.assertEqual(res.utility, self.utility_root.calculate_utility())
+        self.assertEqual(self.slot_state.cached_trees, 1)
+
+        self.runUntilResult(self.remote_slot, execute_tree, goal_id=3)
+        for name, node in loaded_nodes.items():
+            self.assertIs(node, self.remote_slot.tree_manager.nodes[name])
+
+    def testSharedPool(self):
+        pool = RemoteTreeSlotPool(max_cached_trees=2)
+        states = {}
+
+        def publish(name):
+            def _publish(msg):
+                states[name] = msg
+
+            return _publish
+
+        first_slot = RemoteTreeSlot(publish_slot_state=publish("first"), pool=pool)
+        second_slot = RemoteTreeSlot(publish_slot_state=publish("second"), pool=pool)
+        self.assertEqual(states["first"].capacity, 2)
+        self.assertEqual(states["first"].available_slots, 2)
+
+        execute_tree, _, _ = self.execute_root.get_subtree_msg()
+        gh = MockGoalHandle(RunTreeGoal(tree=execute_tree), goal_id=1)
+        first_slot.run_tree_handler(gh)
+        self.assertEqual(gh.state, MockGoalHandle.ACCEPTED)
+        self.assertEqual(states["first"].available_slots, 1)
+        self.assertEqual(states["second"].available_slots, 1)
+        self.assertFalse(states["second"].tree_in_slot)
+
+        # The second slot accepts a tree while the first one is busy
+        gh_2 = MockGoalHandle(RunTreeGoal(tree=execute_tree), goal_id=2)
+        second_slot.run_tree_handler(gh_2)
+        self.assertEqual(gh_2.state, MockGoalHandle.ACCEPTED)
+        self.assertEqual(states["first"].available_slots, 0)
+
+        first_slot.cancel_run_tree_handler(gh)
+        self.assertEqual(states["second"].available_slots, 1)
+
 
 def get_success(response):
     if isinstance(response, dict):
@@ -35,10 +35,13 @@ except ImportError:
     import mock
 
 import sys
+import threading
 import time
+from copy import deepcopy
 
-from ros_bt_py_msgs.msg import Node as NodeMsg, Message, Package
+from ros_bt_py_msgs.msg import Node as NodeMsg, DocumentedNode, Message, Package
 from ros_bt_py_msgs.msg import NodeData, NodeDataWiring, NodeDataLocation, Tree
+from ros_bt_py_msgs.msg import TreeEdit
 from ros_bt_py_msgs.srv import (
     WireNodeDataRequest,
     AddNodeRequest,
@@ -64,10 +67,15 @@ from ros_bt_py_msgs.srv import (
     GenerateSubtreeRequest,
     AddNodeAtIndexRequest,
     ChangeTreeNameRequest,
+    EditTreeRequest,
+    UndoEditRequest,
+    GetDebugInfoRequest,
+    RedoEditRequest,
 )
 
 from ros_bt_py.node import Node, Leaf, FlowControl, define_bt_node
 from ros_bt_py.node_config import NodeConfig
+from ros_bt_py.node_pool import NodePool
 from ros_bt_py.nodes.sequence import Sequence
 from ros_bt_py.nodes.mock_nodes import MockLeaf
 from ros_bt_py.exceptions import (
@@ -75,7 +83,7 @@ from ros_bt_py.exceptions import (
     MissingParentError,
     TreeTopologyError,
 )
-from ros_bt_py.tree_manager import TreeManager, get_available_nodes
+from ros_bt_py.tree_manager import NodeCatalogue, TreeManager, get_available_nodes
 from ros_bt_py.tree_manager import (
     get_success as tm_get_success,
     get_error_message as tm_get_error_message,
@@ -104,6 +112,18 @@ class LongRunningNode(Leaf):
         return NodeMsg.IDLE
 
 
+class SubscriberCountingCallback(object):
+    def __init__(self):
+        self.messages = []
+        self.subscribed = False
+
+    def __call__(self, msg):
+        self.messages.append(msg)
+
+    def has_subscribers(self):
+        return self.subscribed
+
+
 class TestTreeManager(unittest.TestCase):
     def setUp(self):
         self.tree_msg = None
@@ -571,6 +591,285 @@ class TestTreeManager(unittest.TestCase):
         self.assertEqual(len(self.manager.nodes["source_node"].outputs.callbacks), 1)
         self.assertEqual(len(self.manager.tree_msg.data_wirings), 1)
 
+    def testEditTree(self):
+        self.sequence_msg.name = "root"
+        self.node_msg.name = "source_node"
+        source_msg = deepcopy(self.node_msg)
+        self.node_msg.name = "target_node"
+        wiring = NodeDataWiring(
+            source=NodeDataLocation(
+                node_name="source_node",
+                data_key="out",
+                data_kind=NodeDataLocation.OUTPUT_DATA,
+            ),
+            target=NodeDataLocation(
+                node_name="target_node",
+                data_key="in",
+                data_kind=NodeDataLocation.INPUT_DATA,
+            ),
+        )
+        published = []
+        self.manager.publish_tree = published.append
+
+        response = self.manager.edit_tree(
+            EditTreeRequest(
+                edits=[
+                    TreeEdit(type=TreeEdit.ADD_NODE, node=self.sequence_msg),
+                    TreeEdit(
+                        type=TreeEdit.ADD_NODE, node=source_msg, parent_name="root"
+                    ),
+                    TreeEdit(
+                        type=TreeEdit.ADD_NODE_AT_INDEX,
+                        node=self.node_msg,
+                        parent_name="root",
+                        new_child_index=0,
+                    ),
+                    TreeEdit(type=TreeEdit.WIRE_DATA, wirings=[wiring]),
+                    TreeEdit(type=TreeEdit.CHANGE_TREE_NAME, name="batch"),
+                ]
+            )
+        )
+        self.assertTrue(get_success(response), get_error_message(response))
+        self.assertEqual(response.failed_edit, -1)
+        self.assertEqual(
+            response.actual_node_names, ["root", "source_node", "target_node"]
+        )
+        self.assertEqual(len(published), 1)
+        self.assertEqual(
+            [child.name for child in self.manager.nodes["root"].children],
+            ["target_node", "source_node"],
+        )
+        self.assertEqual(self.manager.tree_msg.data_wirings, [wiring])
+        self.assertEqual(self.manager.tree_msg.name, "batch")
+
+    def testEditTreeRollback(self):
+        self.sequence_msg.name = "root"
+        self.assertTrue(
+            get_success(self.manager.add_node(AddNodeRequest(node=self.sequence_msg)))
+        )
+        self.node_msg.name = "passthrough"
+        published = []
+        self.manager.publish_tree = published.append
+
+        response = self.manager.edit_tree(
+            EditTreeRequest(
+                edits=[
+                    TreeEdit(
+                        type=TreeEdit.ADD_NODE, node=self.node_msg, parent_name="root"
+                    ),
+                    TreeEdit(type=TreeEdit.CHANGE_TREE_NAME, name="changed"),
+                    TreeEdit(type=TreeEdit.REMOVE_NODE, node_name="does_not_exist"),
+                ]
+            )
+        )
+        self.assertFalse(get_success(response))
+        self.assertEqual(response.failed_edit, 2)
+        self.assertEqual(response.actual_node_names, [])
+        self.assertEqual(len(published), 1)
+        self.assertEqual(list(self.manager.nodes.keys()), ["root"])
+        self.assertEqual(self.manager.nodes["root"].children, [])
+        self.assertEqual(self.manager.tree_msg.name, "")
+        self.assertEqual(self.manager.get_state(), Tree.EDITABLE)
+
+        response = self.manager.edit_tree(EditTreeRequest(edits=[TreeEdit(type=42)]))
+        self.assertFalse(get_success(response))
+        self.assertEqual(response.failed_edit, 0)
+
+    def testUndoRedo(self):
+        self.assertFalse(get_success(self.manager.undo(UndoEditRequest())))
+        self.assertFalse(get_success(self.manager.redo(RedoEditRequest())))
+
+        self.sequence_msg.name = "root"
+        self.assertTrue(
+            get_success(self.manager.add_node(AddNodeRequest(node=self.sequence_msg)))
+        )
+        self.node_msg.name = "passthrough"
+        self.assertTrue(
+            get_success(
+                self.manager.add_node(
+                    AddNodeRequest(node=self.node_msg, parent_name="root")
+                )
+            )
+        )
+        self.assertTrue(
+            get_success(
+                self.manager.change_tree_name(ChangeTreeNameRequest(name="renamed"))
+            )
+        )
+        before_rename = self.manager.snapshot()
+
+        response = self.manager.undo(UndoEditRequest())
+        self.assertTrue(get_success(response), get_error_message(response))
+        self.assertEqual(self.manager.tree_msg.name, "")
+        self.assertEqual(self.tree_msg.name, "")
+        self.assertIn("passthrough", self.manager.nodes)
+        # Undoing the rename does not copy the unchanged nodes
+        self.assertEqual(before_rename.changed_nodes(self.manager.snapshot()), set())
+
+        response = self.manager.undo(UndoEditRequest())
+        self.assertTrue(get_success(response), get_error_message(response))
+        self.assertEqual(list(self.manager.nodes.keys()), ["root"])
+
+        response = self.manager.undo(UndoEditRequest())
+        self.assertTrue(get_success(response), get_error_message(response))
+        self.assertEqual(self.manager.nodes, {})
+        self.assertFalse(get_success(self.manager.undo(UndoEditRequest())))
+
+        for _ in range(3):
+            response = self.manager.redo(RedoEditRequest())
+            self.assertTrue(get_success(response), get_error_message(response))
+        self.assertFalse(get_success(self.manager.redo(RedoEditRequest())))
+        self.assertEqual(self.manager.tree_msg.name, "renamed")
+        self.assertEqual(
+            [child.name for child in self.manager.nodes["root"].children],
+            ["passthrough"],
+        )
+
+        # A new edit drops the edits that could have been redone
+        self.assertTrue(get_success(self.manager.undo(UndoEditRequest())))
+        self.assertTrue(
+            get_success(
+                self.manager.remove_node(RemoveNodeRequest(node_name="passthrough"))
+            )
+        )
+        self.assertFalse(get_success(self.manager.redo(RedoEditRequest())))
+
+    def testReuseNodesFromPool(self):
+        pool = NodePool(max_size=10)
+        manager = TreeManager(node_pool=pool)
+        load_request = LoadTreeRequest(
+            tree=Tree(
+                name="from_file",
+                path="package://ros_bt_py/test/testdata/trees/get_subtree.yaml",
+            )
+        )
+        self.assertTrue(get_success(manager.load_tree(load_request)))
+        first_nodes = dict(manager.nodes)
+        first_msg = deepcopy(manager.to_msg())
+
+        manager.find_root().setup()
+        manager.find_root().shutdown()
+        self.assertTrue(get_success(manager.clear(ClearTreeRequest())))
+        self.assertEqual(len(pool), len(first_nodes))
+
+        self.assertTrue(get_success(manager.load_tree(load_request)))
+        self.assertEqual(len(pool), 0)
+        self.assertEqual(
+            {id(node) for node in manager.nodes.values()},
+            {id(node) for node in first_nodes.values()},
+        )
+        for node in manager.nodes.values():
+            self.assertEqual(node.state, NodeMsg.UNINITIALIZED)
+        self.assertEqual(manager.to_msg().nodes, first_msg.nodes)
+        self.assertEqual(manager.to_msg().data_wirings, first_msg.data_wirings)
+
+    def testPublishDebugInfoOnChange(self):
+        published = []
+        self.manager.publish_debug_info = published.append
+        debug_manager = self.manager.debug_manager
+
+        # The debug info was already published by the constructor
+        self.manager.publish_info(debug_manager.get_debug_info_msg())
+        self.assertEqual(published, [])
+
+        debug_manager.set_execution_mode(
+            single_step=False,
+            collect_performance_data=False,
+            publish_subtrees=True,
+            collect_node_diagnostics=False,
+        )
+        debug_manager.add_subtree_info("node_a", Tree(name="a"))
+        debug_manager.add_subtree_info("node_b", Tree(name="b"))
+        self.manager.publish_info(debug_manager.get_debug_info_msg())
+        debug_manager.add_subtree_info("node_b", Tree(name="b", root_name="B"))
+        self.manager.publish_info(debug_manager.get_debug_info_msg())
+        self.manager.publish_info(debug_manager.get_debug_info_msg())
+
+        self.assertEqual(len(published), 2)
+        self.assertTrue(published[1].is_delta)
+        self.assertEqual(published[1].base_version, published[0].version)
+        self.assertEqual([tree.name for tree in published[1].subtree_states], ["b"])
+
+    def testGetDebugInfo(self):
+        debug_manager = self.manager.debug_manager
+        debug_manager.set_execution_mode(
+            single_step=False,
+            collect_performance_data=False,
+            publish_subtrees=True,
+            collect_node_diagnostics=False,
+        )
+        debug_manager.add_subtree_info("node_a", Tree(name="a"))
+        self.manager.publish_info(debug_manager.get_debug_info_msg())
+        debug_manager.add_subtree_info("node_b", Tree(name="b"))
+
+        # The complete debug info, even if only a delta would be published
+        debug_info = self.manager.get_debug_info(GetDebugInfoRequest()).debug_info
+        self.assertFalse(debug_info.is_delta)
+        self.assertEqual(debug_info.version, debug_manager.get_debug_info_msg().version)
+        self.assertEqual(
+            sorted(tree.name for tree in debug_info.subtree_states), ["a", "b"]
+        )
+
+    def testSkipPublishingWithoutSubscribers(self):
+        tree_callback = SubscriberCountingCallback()
+        debug_info_callback = SubscriberCountingCallback()
+        self.manager.publish_tree = tree_callback
+        self.manager.publish_debug_info = debug_info_callback
+        debug_manager = self.manager.debug_manager
+        debug_manager.set_execution_mode(
+            single_step=False,
+            collect_performance_data=False,
+            publish_subtrees=True,
+            collect_node_diagnostics=False,
+        )
+
+        with mock.patch.object(
+            self.manager, "to_msg", wraps=self.manager.to_msg
+        ) as to_msg:
+            debug_manager.add_subtree_info("node_a", Tree(name="a"))
+            self.manager.publish_info(debug_manager.get_debug_info_msg())
+            to_msg.assert_not_called()
+        self.assertEqual(tree_callback.messages, [])
+        self.assertEqual(debug_info_callback.messages, [])
+
+        tree_callback.subscribed = True
+        debug_info_callback.subscribed = True
+        self.manager.publish_full_info()
+        self.assertEqual(len(tree_callback.messages), 1)
+        self.assertEqual(len(debug_info_callback.messages), 1)
+        self.assertFalse(debug_info_callback.messages[0].is_delta)
+        self.assertEqual(
+            [tree.name for tree in debug_info_callback.messages[0].subtree_states],
+            ["a"],
+        )
+
+    def testPublishEditBuildsTreeOnce(self):
+        tree_callback = SubscriberCountingCallback()
+        tree_callback.subscribed = True
+        self.manager.publish_tree = tree_callback
+
+        with mock.patch.object(
+            self.manager, "to_msg", wraps=self.manager.to_msg
+        ) as to_msg:
+            self.manager.publish_edit()
+            self.assertEqual(to_msg.call_count, 1)
+        self.assertEqual(len(tree_callback.messages), 1)
+
+    def testPublishFullInfoWaitsForEdits(self):
+        tree_callback = SubscriberCountingCallback()
+        tree_callback.subscribed = True
+        self.manager.publish_tree = tree_callback
+
+        with self.manager._edit_lock:
+            publish_thread = threading.Thread(target=self.manager.publish_full_info)
+            publish_thread.start()
+            publish_thread.join(0.1)
+            self.assertTrue(publish_thread.is_alive())
+            self.assertEqual(tree_callback.messages, [])
+        publish_thread.join(1.0)
+        self.assertFalse(publish_thread.is_alive())
+        self.assertEqual(len(tree_callback.messages), 1)
+
     def testWireWithInvalidKey(self):
         self.node_msg.name = "source_node"
         self.manager.instantiate_node_from_msg(self.node_msg, allow_rename=True)
@@ -2409,6 +2708,98 @@ class TestTreeManager(unittest.TestCase):
         response = get_available_nodes(request)
         self.assertFalse(get_success(response))
 
+    def testGetAvailableNodesFilters(self):
+        request = GetAvailableNodesRequest(
+            node_modules=["ros_bt_py.nodes.constant", "ros_bt_py.nodes.sequence"],
+            module_filter=["ros_bt_py.nodes.constant"],
+        )
+        response = get_available_nodes(request)
+        self.assertTrue(get_success(response), get_error_message(response))
+        self.assertFalse(response.delta)
+        node_classes = [node.node_class for node in response.available_nodes]
+        self.assertIn("Constant", node_classes)
+        self.assertTrue(
+            all(
+                node.module == "ros_bt_py.nodes.constant"
+                for node in response.available_nodes
+            )
+        )
+
+        # Packages match all of their modules
+        response = get_available_nodes(
+            GetAvailableNodesRequest(module_filter=["ros_bt_py.nodes"])
+        )
+        node_classes = [node.node_class for node in response.available_nodes]
+        self.assertIn("Sequence", node_classes)
+
+        response = get_available_nodes(
+            GetAvailableNodesRequest(tag_filter=["constant"])
+        )
+        node_classes = [node.node_class for node in response.available_nodes]
+        self.assertIn("Constant", node_classes)
+        self.assertNotIn("Sequence", node_classes)
+
+    def testGetAvailableNodesDelta(self):
+        response = get_available_nodes(GetAvailableNodesRequest())
+        self.assertTrue(get_success(response), get_error_message(response))
+        self.assertFalse(response.delta)
+        version = response.version
+
+        response = get_available_nodes(GetAvailableNodesRequest(since_version=version))
+        self.assertTrue(response.delta)
+        self.assertEqual(response.version, version)
+        self.assertEqual(response.available_nodes, [])
+
+        @define_bt_node(NodeConfig(options={}, inputs={}, outputs={}, max_children=0))
+        class CatalogueDeltaNode(Leaf):
+            def _do_setup(self):
+                pass
+
+            def _do_tick(self):
+                return NodeMsg.SUCCEEDED
+
+            def _do_untick(self):
+                return NodeMsg.IDLE
+
+            def _do_reset(self):
+                return NodeMsg.IDLE
+
+            def _do_shutdown(self):
+                pass
+
+        response = get_available_nodes(GetAvailableNodesRequest(since_version=version))
+        self.assertTrue(response.delta)
+        self.assertNotEqual(response.version, version)
+        self.assertEqual(
+            [node.node_class for node in response.available_nodes],
+            ["CatalogueDeltaNode"],
+        )
+
+        # Unknown versions get the full catalogue
+        response = get_available_nodes(
+            GetAvailableNodesRequest(since_version="unknown:0")
+        )
+        self.assertFalse(response.delta)
+        self.assertIn(
+            "CatalogueDeltaNode",
+            [node.node_class for node in response.available_nodes],
+        )
+
+    def testCatalogueUnloadedNodes(self):
+        catalogue = NodeCatalogue()
+        version, nodes, _ = catalogue.nodes()
+        self.assertNotIn("UnloadedNode", [node.node_class for node in nodes])
+
+        unloaded = DocumentedNode(
+            module="ros_bt_py.unloaded_module",
+            node_class="UnloadedNode",
+            name="UnloadedNode",
+        )
+        catalogue.add_unloaded_nodes([unloaded, unloaded])
+        _, nodes, delta = catalogue.nodes(since_version=version)
+        self.assertTrue(delta)
+        self.assertEqual(nodes, [unloaded])
+
     def testSetOptions(self):
         self.assertTrue(
             get_success(self.manager.add_node(AddNodeRequest(node=self.node_msg)))
@@ -0,0 +1,120 @@
+# Copyright 2018-2023 FZI Forschungszentrum Informatik
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#    * Redistributions of source code must retain the above copyright
+#      notice, this list of conditions and the following disclaimer.
+#
+#    * Redistributions in binary form must reproduce the above copyright
+#      notice, this list of conditions and the following disclaimer in the
+#      documentation and/or other materials provided with the distribution.
+#
+#    * Neither the name of the FZI Forschungszentrum Informatik nor the names of its
+#      contributors may be used to endorse or promote products derived from
+#      this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+import unittest
+
+from ros_bt_py_msgs.msg import Node as NodeMsg, NodeDataWiring, NodeDataLocation, Tree
+
+from ros_bt_py.tree_snapshot import EditHistory, TreeSnapshot
+
+
+class TestTreeSnapshot(unittest.TestCase):
+    def setUp(self):
+        self.tree = Tree(
+            name="tree",
+            root_name="root",
+            nodes=[
+                NodeMsg(name="root", child_names=["A", "B"], state=NodeMsg.IDLE),
+                NodeMsg(name="A", state=NodeMsg.IDLE),
+                NodeMsg(name="B", state=NodeMsg.IDLE),
+            ],
+            data_wirings=[
+                NodeDataWiring(
+                    source=NodeDataLocation(
+                        node_name="A",
+                        data_key="out",
+                        data_kind=NodeDataLocation.OUTPUT_DATA,
+                    ),
+                    target=NodeDataLocation(
+                        node_name="B",
+                        data_key="in",
+                        data_kind=NodeDataLocation.INPUT_DATA,
+                    ),
+                )
+            ],
+        )
+
+    def testSharesUnchangedNodes(self):
+        first = TreeSnapshot.from_msg(self.tree)
+        self.assertIsNot(first.get_node("A"), self.tree.nodes[1])
+
+        self.tree.nodes[2].child_names = ["C"]
+        self.tree.nodes.append(NodeMsg(name="C"))
+        # The runtime state is not part of a snapshot
+        self.tree.nodes[1].state = NodeMsg.SUCCEEDED
+        second = TreeSnapshot.from_msg(self.tree, previous=first)
+
+        self.assertIs(second.get_node("root"), first.get_node("root"))
+        self.assertIs(second.get_node("A"), first.get_node("A"))
+        self.assertIs(second.data_wirings, first.data_wirings)
+        self.assertEqual(second.changed_nodes(first), {"B", "C"})
+        self.assertEqual(first.changed_nodes(second), {"B", "C"})
+        self.assertFalse(second.same_as(first))
+        self.assertTrue(
+            TreeSnapshot.from_msg(self.tree, previous=second).same_as(second)
+        )
+
+    def testToMsg(self):
+        snapshot = TreeSnapshot.from_msg(self.tree)
+        msg = snapshot.to_msg()
+        self.assertEqual(msg.nodes, self.tree.nodes)
+        self.assertEqual(msg.data_wirings, self.tree.data_wirings)
+        msg.nodes[0].child_names.append("D")
+        self.assertEqual(snapshot.get_node("root").child_names, ["A", "B"])
+
+        msg = snapshot.to_msg(node_names=["root", "A"])
+        self.assertEqual([node.name for node in msg.nodes], ["root", "A"])
+        self.assertEqual(msg.nodes[0].child_names, ["A"])
+        self.assertEqual(msg.data_wirings, [])
+        self.assertEqual(snapshot.get_node("root").child_names, ["A", "B"])
+
+
+class TestEditHistory(unittest.TestCase):
+    def testUndoRedo(self):
+        history = EditHistory(max_length=2)
+        self.assertIsNone(history.undo())
+        self.assertIsNone(history.redo())
+
+        snapshots = [
+            TreeSnapshot(name=str(index), nodes=[NodeMsg(name=str(index))])
+            for index in range(4)
+        ]
+        for snapshot in snapshots:
+            self.assertTrue(history.record(snapshot))
+        self.assertFalse(history.record(snapshots[-1]))
+
+        self.assertIs(history.undo(), snapshots[2])
+        self.assertIs(history.undo(), snapshots[1])
+        # Only two edits are kept
+        self.assertFalse(history.can_undo)
+        self.assertIsNone(history.undo())
+
+        self.assertIs(history.redo(), snapshots[2])
+        self.assertTrue(history.can_redo)
+        self.assertTrue(history.record(TreeSnapshot(name="new")))
+        self.assertFalse(history.can_redo)
+        self.assertIs(history.undo(), snapshots[2])
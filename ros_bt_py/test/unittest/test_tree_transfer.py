@@ -0,0 +1,104 @@
+# Copyright 2018-2023 FZI Forschungszentrum Informatik
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#    * Redistributions of source code must retain the above copyright
+#      notice, this list of conditions and the following disclaimer.
+#
+#    * Redistributions in binary form must reproduce the above copyright
+#      notice, this list of conditions and the following disclaimer in the
+#      documentation and/or other materials provided with the distribution.
+#
+#    * Neither the name of the FZI Forschungszentrum Informatik nor the names of its
+#      contributors may be used to endorse or promote products derived from
+#      this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+import unittest
+
+from ros_bt_py_msgs.msg import Node as NodeMsg, Tree
+
+from ros_bt_py.tree_transfer import (
+    SentTrees,
+    TreeStore,
+    compress_tree,
+    decompress_tree,
+    tree_reference,
+)
+
+
+def make_tree(name):
+    return Tree(
+        name=name,
+        root_name="root",
+        nodes=[NodeMsg(module="ros_bt_py.nodes.sequence", node_class="Sequence")],
+    )
+
+
+class TestTreeTransfer(unittest.TestCase):
+    def testRoundTrip(self):
+        tree = make_tree("test")
+        compressed = compress_tree(tree)
+        self.assertTrue(compressed.hash)
+        self.assertEqual(decompress_tree(compressed), tree)
+
+        self.assertEqual(compress_tree(make_tree("test")).hash, compressed.hash)
+        self.assertNotEqual(compress_tree(make_tree("other")).hash, compressed.hash)
+
+    def testCorruptData(self):
+        compressed = compress_tree(make_tree("test"))
+        compressed.hash = compress_tree(make_tree("other")).hash
+        self.assertRaises(ValueError, decompress_tree, compressed)
+
+        compressed.data = b"garbage"
+        self.assertRaises(ValueError, decompress_tree, compressed)
+
+    def testTreeStore(self):
+        store = TreeStore(max_trees=2)
+        first = compress_tree(make_tree("first"))
+        second = compress_tree(make_tree("second"))
+        third = compress_tree(make_tree("third"))
+
+        self.assertIsNone(store.resolve(tree_reference(first)))
+        self.assertEqual(store.resolve(first), make_tree("first"))
+        self.assertEqual(store.resolve(tree_reference(first)), make_tree("first"))
+
+        # Trees returned by the store can be modified safely
+        store.get(first.hash).name = "modified"
+        self.assertEqual(store.get(first.hash).name, "first")
+
+        store.add(second)
+        # Using first makes second the least recently used tree
+        store.get(first.hash)
+        store.add(third)
+        self.assertEqual(len(store), 2)
+        self.assertIn(first.hash, store)
+        self.assertNotIn(second.hash, store)
+        self.assertIn(third.hash, store)
+
+    def testSentTrees(self):
+        sent_trees = SentTrees(max_entries=1)
+        compressed = compress_tree(make_tree("test"))
+        self.assertEqual(sent_trees.message_for("a", compressed), compressed)
+
+        sent_trees.mark_sent("a", compressed.hash)
+        self.assertFalse(sent_trees.message_for("a", compressed).data)
+        self.assertEqual(sent_trees.message_for("b", compressed), compressed)
+
+        sent_trees.forget("a", compressed.hash)
+        self.assertEqual(sent_trees.message_for("a", compressed), compressed)
+
+        sent_trees.mark_sent("a", compressed.hash)
+        sent_trees.mark_sent("b", compressed.hash)
+        self.assertEqual(sent_trees.message_for("a", compressed), compressed)
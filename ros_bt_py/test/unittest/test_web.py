@@ -27,12 +27,18 @@
 # POSSIBILITY OF SUCH DAMAGE.
 
 
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import os
+import shutil
+import tempfile
+from threading import Event, Thread
+import time
 import unittest
 
-from ros_bt_py_msgs.msg import Node, UtilityBounds
+from ros_bt_py_msgs.msg import Node
 
+from ros_bt_py.download_manager import DownloadManager
 from ros_bt_py.nodes.web import DownloadImage
-from ros_bt_py.nodes.mock_nodes import MockLeaf
 
 try:
     import unittest.mock as mock
@@ -40,49 +46,96 @@ except ImportError:
     import mock
 
 
+class ImageHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        self.server.release.wait(5.0)
+        if self.path != "/picture.png":
+            self.send_response(404)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Length", "4")
+        self.end_headers()
+        self.wfile.write(b"\x89PNG")
+
+    def log_message(self, format, *args):
+        pass
+
+
 class TestDownloadImage(unittest.TestCase):
     def setUp(self):
-        self.image_raw = mock.mock_open()
-        self.get_success = mock.MagicMock(status_code=200, raw=self.image_raw())
-        self.get_failure = mock.MagicMock(status_code=404)
-
-    @mock.patch("ros_bt_py.nodes.web.requests.get")
-    def testDownloadAndSaveImage(self, mock_get):
-        mock_get.return_value = self.get_success
-        dl = DownloadImage({"cache_folder": "file:///toto"})
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), ImageHandler)
+        self.server.release = Event()
+        self.server.release.set()
+        Thread(target=self.server.serve_forever, daemon=True).start()
+        self.tmp_dir = tempfile.mkdtemp()
+
+        self.manager = DownloadManager()
+        patcher = mock.patch(
+            "ros_bt_py.nodes.web.get_download_manager", return_value=self.manager
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self.manager.shutdown()
+        self.server.shutdown()
+        self.server.server_close()
+        shutil.rmtree(self.tmp_dir)
+
+    def url(self, name):
+        return f"http://127.0.0.1:{self.server.server_address[1]}/{name}"
+
+    def tick_until_done(self, dl):
+        for _ in range(500):
+            state = dl.tick()
+            if state != Node.RUNNING:
+                return state
+            time.sleep(0.01)
+        self.fail("Download did not finish")
+
+    def testDownloadAndSaveImage(self):
+        dl = DownloadImage({"cache_folder": "file://" + self.tmp_dir})
         dl.setup()
-        dl.inputs["image_url"] = "www.foobar.com/picture.png"
-        with mock.patch("ros_bt_py.nodes.web.open", mock.mock_open()) as mocked_file:
-            self.assertEqual(dl.tick(), Node.SUCCEEDED)
-            assert mocked_file.call_count == 1
-            # test caching
-            with mock.patch("os.path.exists") as mocked_exists:
-                mocked_exists.return_value = True
-                self.assertEqual(dl.tick(), Node.SUCCEEDED)
-                assert mocked_exists.call_count == 1
+        self.server.release.clear()
+        dl.inputs["image_url"] = self.url("picture.png")
+
+        # The tick does not wait for the download
+        self.assertEqual(dl.tick(), Node.RUNNING)
+        self.server.release.set()
+        self.assertEqual(self.tick_until_done(dl), Node.SUCCEEDED)
 
         self.assertEqual(dl.outputs["download_error_msg"], "")
         self.assertTrue(dl.outputs["download_success"])
-        self.assertTrue(dl.outputs["filepath"].startswith("/toto"))
+        self.assertTrue(dl.outputs["filepath"].startswith(self.tmp_dir))
         self.assertTrue(dl.outputs["filepath"].endswith(".png"))
+        with open(dl.outputs["filepath"], "rb") as image:
+            self.assertEqual(image.read(), b"\x89PNG")
+        umask = os.umask(0)
+        os.umask(umask)
+        self.assertEqual(
+            os.stat(dl.outputs["filepath"]).st_mode & 0o777, 0o666 & ~umask
+        )
+
+        # test caching
+        self.server.release.clear()
+        self.assertEqual(dl.tick(), Node.SUCCEEDED)
+        self.server.release.set()
 
         self.assertEqual(dl.untick(), Node.IDLE)
         self.assertEqual(dl.reset(), Node.IDLE)
         self.assertEqual(dl.shutdown(), Node.SHUTDOWN)
 
-    @mock.patch("ros_bt_py.nodes.web.requests.get")
-    def testDownloadFail(self, mock_get):
-        mock_get.return_value = self.get_failure
-        dl = DownloadImage({"cache_folder": "file:///toto"})
+    def testDownloadFail(self):
+        dl = DownloadImage({"cache_folder": "file://" + self.tmp_dir})
         dl.setup()
-        dl.inputs["image_url"] = "www.foobar.com/picture.png"
-        with mock.patch("ros_bt_py.nodes.web.open", mock.mock_open()) as mocked_file:
-            self.assertEqual(dl.tick(), Node.FAILED)
-            assert mocked_file.call_count == 0
+        dl.inputs["image_url"] = self.url("missing.png")
+        self.assertEqual(self.tick_until_done(dl), Node.FAILED)
 
         self.assertNotEqual(dl.outputs["download_error_msg"], "")
         self.assertFalse(dl.outputs["download_success"])
         self.assertEqual(dl.outputs["filepath"], "")
+        self.assertEqual(os.listdir(self.tmp_dir), [])
 
         self.assertEqual(dl.untick(), Node.IDLE)
         self.assertEqual(dl.reset(), Node.IDLE)